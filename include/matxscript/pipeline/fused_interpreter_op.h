@@ -0,0 +1,58 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#pragma once
+
+#include <vector>
+
+#include <matxscript/pipeline/interpreter_op.h>
+#include <matxscript/pipeline/op_kernel.h>
+
+namespace matxscript {
+namespace runtime {
+
+/**
+ * A chain or tree of InterpreterOps fused into one graph node by the graph optimizer.
+ *
+ * attrs:
+ *   ops: the names of the InterpreterOps, in execution order
+ *   args: the arguments of each op, i >= 0 is the input i of the fused op
+ *         and i < 0 is the result of op (-i - 1)
+ * The result of the last op is the output.
+ */
+class FusedInterpreterOp : public OpKernel {
+ public:
+  FusedInterpreterOp() = default;
+  ~FusedInterpreterOp() override = default;
+
+  void Init() override;
+
+  String GetHumanName(bool with_debug_info) const;
+
+ public:
+  RTValue Process(PyArgs inputs) const override;
+
+ private:
+  std::vector<const InterpreterOp*> ops_;
+  std::vector<std::vector<int64_t>> args_;
+  size_t max_num_args_ = 0;
+};
+
+}  // namespace runtime
+}  // namespace matxscript
@@ -0,0 +1,85 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#pragma once
+
+#include <unordered_map>
+#include <vector>
+
+#include <matxscript/pipeline/node.h>
+
+namespace matxscript {
+namespace runtime {
+
+class TXSession;
+
+struct GraphOptimizeOptions {
+  // replace the pure InterpreterOps whose inputs are all constants by their result,
+  // only None, int, float, bytes and str results are folded so no mutable object is shared
+  bool fold_constants = true;
+  // merge the pure InterpreterOps and the constants which compute the same value
+  bool eliminate_common_subexpr = true;
+  // fuse the InterpreterOps whose result is only used by one InterpreterOp into one node
+  bool fuse_interpreter_ops = true;
+};
+
+/**
+ * Trace-time passes over the nodes of a traced graph.
+ * The nodes are rewritten in place, the caller rebuilds the graph from the returned
+ * output nodes, which drops the nodes no longer reachable from the outputs.
+ */
+class GraphOptimizer {
+ public:
+  GraphOptimizer(TXSession* sess, GraphOptimizeOptions options) : sess_(sess), options_(options) {
+  }
+
+  /**
+   * run the passes
+   * @param nodes topologically sorted nodes
+   * @param output_keys the keys of the graph outputs, updated when an output is merged
+   * @return the nodes of the outputs
+   */
+  std::vector<NodePtr> Run(const std::vector<NodePtr>& nodes, std::vector<String>* output_keys);
+
+  int64_t NumFolded() const {
+    return num_folded_;
+  }
+  int64_t NumMerged() const {
+    return num_merged_;
+  }
+  int64_t NumFused() const {
+    return num_fused_;
+  }
+
+ private:
+  void FoldConstants(const std::vector<NodePtr>& nodes);
+  void EliminateCommonSubexpr(const std::vector<NodePtr>& nodes, std::vector<String>* output_keys);
+  void FuseInterpreterOps(const std::vector<NodePtr>& nodes,
+                          const std::vector<String>& output_keys);
+
+ private:
+  TXSession* sess_;
+  GraphOptimizeOptions options_;
+  int64_t num_folded_ = 0;
+  int64_t num_merged_ = 0;
+  int64_t num_fused_ = 0;
+};
+
+}  // namespace runtime
+}  // namespace matxscript
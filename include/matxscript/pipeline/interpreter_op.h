@@ -102,6 +102,20 @@ class InterpreterOp : public OpKernel {
 
   String GetHumanName(bool with_debug_info) const;
 
+  // the output only depends on the inputs and the op has no side effects,
+  // so the graph optimizer may fold or deduplicate the call
+  bool IsPure() const;
+  // whether the op may build a new list, set or dict per call, e.g. list + list,
+  // so two calls must not share one result. input_type_codes has the type code of each
+  // input, kRuntimeUnknown if it is only known when the session runs
+  bool MayMakeContainer(const std::vector<int32_t>& input_type_codes) const;
+  // cheap enough to be fused with its neighbours into one graph node,
+  // calls into user ops and the parallel ops keep their own nodes
+  bool IsFusible() const;
+  int GetOpCode() const {
+    return opcode_;
+  }
+
  public:
   RTValue Process(PyArgs inputs) const override;
 
@@ -25,6 +25,7 @@
 #include <vector>
 
 #include <matxscript/pipeline/op_kernel.h>
+#include <matxscript/pipeline/op_metrics.h>
 #include <matxscript/runtime/bytes_hash.h>
 #include <matxscript/runtime/logging.h>
 #include <matxscript/runtime/runtime_value.h>
@@ -131,6 +132,8 @@ struct Node {
   std::vector<NodeOutput> outputs;
   std::vector<NodeEntryPtr> holder;
   String name;
+  // filled by TXSession when the run nodes are built
+  OpMetricsPtr metrics = nullptr;
 
   Node() {
     op = nullptr;
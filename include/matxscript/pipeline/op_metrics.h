@@ -0,0 +1,88 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#pragma once
+
+#include <atomic>
+#include <memory>
+#include <mutex>
+#include <vector>
+
+#include <matxscript/runtime/container.h>
+#include <matxscript/runtime/latency_histogram.h>
+
+namespace matxscript {
+namespace runtime {
+
+struct OpMetrics {
+  String instance;
+  String op;
+  String op_cls;
+  std::atomic<uint64_t> errors{0};
+  LatencyHistogram latency;
+
+  OpMetrics(String instance, String op, String op_cls)
+      : instance(std::move(instance)), op(std::move(op)), op_cls(std::move(op_cls)) {
+  }
+};
+
+using OpMetricsPtr = std::shared_ptr<OpMetrics>;
+
+/**
+ * Always-on counters of a TXSession: per-op calls, errors and latency,
+ * and the time tasks wait in the scheduling pool and the compute pool.
+ */
+class TXSessionMetrics {
+ public:
+  explicit TXSessionMetrics(String session_name)
+      : session_name_(std::move(session_name)),
+        scheduling_wait_(std::make_shared<LatencyHistogram>()),
+        compute_wait_(std::make_shared<LatencyHistogram>()) {
+  }
+
+  // the same op instance is registered only once, nodes calling it share the counters
+  OpMetricsPtr Register(const String& instance, const String& op, const String& op_cls);
+
+  // drop the ops registered by the last trace
+  void ClearOps();
+
+  const std::shared_ptr<LatencyHistogram>& SchedulingWait() const {
+    return scheduling_wait_;
+  }
+
+  const std::shared_ptr<LatencyHistogram>& ComputeWait() const {
+    return compute_wait_;
+  }
+
+  Dict Snapshot() const;
+
+  String ToPrometheus() const;
+
+  void Reset();
+
+ private:
+  String session_name_;
+  mutable std::mutex mutex_;
+  std::vector<OpMetricsPtr> ops_;
+  std::shared_ptr<LatencyHistogram> scheduling_wait_;
+  std::shared_ptr<LatencyHistogram> compute_wait_;
+};
+
+}  // namespace runtime
+}  // namespace matxscript
@@ -67,6 +67,19 @@ MATX_DLL inline rapidjson::Document ToJsonStruct(const Any& value) {
   return doc;
 }
 
+/******************************************************************************
+ * binary struct, msgpack with the large NDArrays and bytes in a data file
+ * which is memory-mapped when loading. The NDArrays are views into the mapping,
+ * the bytes are copied out of it and str is kept in the msgpack spec.
+ * The other nodes not supported by msgpack are like this:
+ * {
+ *    "__matx_struct_t__": "UserData",
+ *    "v": {...},
+ * }
+ *****************************************************************************/
+MATX_DLL String ToBinaryStruct(const Any& value, String* data, int64_t min_data_size = 4096);
+MATX_DLL RTValue FromBinaryStruct(const string_view& packed, const String& data_path);
+
 MATX_DLL String Serialize(const Any& value);
 MATX_DLL RTValue DeSerialize(const string_view& str);
 
@@ -20,6 +20,7 @@
 #pragma once
 
 #include <memory>
+#include <vector>
 
 #include <matxscript/pipeline/op_kernel.h>
 #include <matxscript/runtime/threadpool/i_thread_pool.h>
@@ -42,6 +43,8 @@ class ThreadPoolOp : public OpKernel {
 
  private:
   bool lock_free_ = false;
+  bool work_stealing_ = false;
+  std::vector<int> cpu_ids_;
   int32_t thread_nums_ = false;
   Unicode thread_name_;
   std::shared_ptr<internal::IThreadPool> pool_ = nullptr;
@@ -21,14 +21,19 @@
 
 #include <unistd.h>
 
+#include <functional>
 #include <map>
 #include <memory>
 #include <mutex>
+#include <unordered_set>
+#include <vector>
 
 #include <matxscript/pipeline/constant_op.h>
 #include <matxscript/pipeline/graph.h>
+#include <matxscript/pipeline/graph_optimizer.h>
 #include <matxscript/pipeline/jit_object.h>
 #include <matxscript/pipeline/op_kernel.h>
+#include <matxscript/pipeline/op_metrics.h>
 #include <matxscript/pipeline/signature_constants.h>
 #include <matxscript/pipeline/userdata_scoped_cache.h>
 #include <matxscript/pipeline/variable_op.h>
@@ -45,13 +50,22 @@ struct TXSessionOptions {
   bool share_scheduling_pool = false;
   bool share_compute_pool = false;
   bool enable_graph_parallel = false;
+  // when graph parallel is enabled, start each node as soon as its own inputs are ready
+  // instead of running the graph level by level
+  bool enable_dataflow_scheduling = false;
   bool enable_scheduling_pool = true;
   bool enable_device_op_parallel = false;
   bool enable_compute_pool = true;
   int32_t compute_pool_thread_nums = 8;
   int32_t scheduling_pool_thread_nums = 2;
+  // threads of the run_async pool, 0 for disabled
+  int32_t async_run_thread_nums = 0;
   int32_t min_task_size_one_thread = 1;
   int32_t max_task_size_one_thread = 1;
+  // use work stealing pools for scheduling and compute, their idle workers sleep
+  bool enable_work_stealing_pool = false;
+  // the work stealing workers are pinned to these cpus, empty for no pinning
+  std::vector<int> pool_cpu_ids;
 };
 
 struct TXSessionStepStat {
@@ -78,11 +92,17 @@ struct TXSession {
   virtual ~TXSession() = default;
 
  public:
+  // the spec is saved as msgpack instead of json if the name ends with ".msgpack"
   void Save(string_view folder, string_view name) const;
   static std::unique_ptr<TXSession> Load(string_view folder,
                                          string_view name,
                                          int device = -1,
                                          string_view version = "");
+  static Dict ReadSpec(string_view folder, string_view name);
+  static std::unique_ptr<TXSession> LoadFromSpec(string_view folder,
+                                                 Dict generic_session,
+                                                 int device = -1,
+                                                 string_view version = "");
 
   // After fork, the child process should call this function once
   void AtForkBefore();
@@ -97,9 +117,24 @@ struct TXSession {
     return Trace(std::vector<const Symbol*>{output});
   }
 
+  /**
+   * fold constants, merge common subexpressions, fuse InterpreterOps and drop dead nodes
+   * in the traced graph, the optimized graph is used by Run and Save
+   * @param options the passes to run
+   * @return the node numbers before and after and the nodes changed by each pass
+   */
+  Dict OptimizeGraph(const GraphOptimizeOptions& options = GraphOptimizeOptions());
+
   void SetSchedulingThreads(int32_t num = 2, bool share = false);
   void SetOpParallelismThreads(int32_t num = 2, bool share = false);
   void SetOpComputeThreads(int32_t num = 8, bool share = false);
+  void SetDataflowScheduling(bool enable = true);
+  bool GetDataflowScheduling() const;
+  // rebuild the scheduling and compute pools as work stealing pools or lock based pools
+  void SetWorkStealingPool(bool enable = true, std::vector<int> cpu_ids = {});
+  bool GetWorkStealingPool() const;
+  void SetAsyncRunThreads(int32_t num = 2);
+  int64_t GetAsyncRunThreads();
 
   int64_t GetSchedulingThreads();
   int64_t GetOpParallelismThreads();
@@ -108,6 +143,11 @@ struct TXSession {
   internal::IThreadPool* GetComputeThreadPool();
   ThreadPoolExecutor* GetComputeThreadPoolExecutor();
 
+  // per-op calls, errors and latency, and the queue wait of the thread pools
+  const std::shared_ptr<TXSessionMetrics>& GetMetrics() const {
+    return metrics_;
+  }
+
   /**
    * just multi-run by last trace
    * @param node
@@ -120,6 +160,17 @@ struct TXSession {
   std::vector<std::pair<std::string, RTValue>> Run(
       const std::unordered_map<std::string, RTValue>& feed_dict, TXSessionRunMeta* meta) const;
 
+  using RunCallback = std::function<void(std::vector<std::pair<std::string, RTValue>> result,
+                                          std::exception_ptr except_ptr)>;
+
+  /**
+   * Run on the async run pool and return immediately,
+   * callback is invoked by the worker thread with the result or the exception
+   * @param feed_dict
+   * @param callback
+   */
+  void RunAsync(std::unordered_map<std::string, RTValue> feed_dict, RunCallback callback) const;
+
   /**
    * Each task thread will execute a session run at once
    * @param feed_dict
@@ -180,6 +231,14 @@ struct TXSession {
 
   std::vector<std::string> InputNames() const;
 
+  /**
+   * get the outputs computed from any of the given feed names
+   * @param input_names feed names
+   * @return output names, the same as the keys returned by Run
+   */
+  std::vector<std::string> OutputsDependingOn(
+      const std::unordered_set<std::string>& input_names) const;
+
   List GetOpInstanceName() const;
   void GetOpInstanceNameDfs(const OpKernelPtr& ops, List& op_instance_names) const;
 
@@ -188,6 +247,19 @@ struct TXSession {
  private:
   class TXSessionRunnable;
   class TXSessionWarmupRunnable;
+  class TXSessionDataflowRunnable;
+  class TXSessionAsyncRunnable;
+  struct DataflowNode {
+    NodePtr node;
+    // number of non-variable producers of this node
+    int32_t num_deps = 0;
+    // first slot of this node's outputs
+    int32_t output_slot = 0;
+    // slot of each input, -1 means the input comes from feed_dict
+    std::vector<int32_t> input_slots;
+    std::vector<int32_t> successors;
+  };
+  struct DataflowRunState;
   static TXSessionStepStat MakeSessionStepStat(const NodePtr& op);
   void RunImpl(const std::unordered_map<std::string, RTValue>& feed_dict,
                std::vector<std::pair<std::string, RTValue>>& result,
@@ -197,11 +269,22 @@ struct TXSession {
                           std::vector<std::pair<std::string, RTValue>>& result,
                           TXSessionRunMeta* meta = nullptr) const;
 
+  void RunImplDataflow(const std::unordered_map<std::string, RTValue>& feed_dict,
+                       std::vector<std::pair<std::string, RTValue>>& result,
+                       TXSessionRunMeta* meta = nullptr) const;
+
   void SetOutput(const std::unordered_map<std::string, RTValue>& feed_dict,
                  const ska::flat_hash_map<string_view, RTValue>& datapack,
                  std::vector<std::pair<std::string, RTValue>>& output) const;
 
+  std::shared_ptr<internal::IThreadPool> MakeThreadPool(int32_t num, const char* name) const;
+  std::shared_ptr<internal::IThreadPool> MakeSharedThreadPool(int32_t num,
+                                                              const char* name,
+                                                              string_view op_name);
+
+  void BuildOutputs(const std::vector<String>& output_keys);
   void BuildRunNodes();
+  void BuildDataflowNodes();
   void BuildOutputKeys();
 
   void DFSCopyOp(OpKernelPtr& op);
@@ -219,6 +302,9 @@ struct TXSession {
   std::shared_ptr<Graph> graph_;
   std::vector<NodePtr> serial_nodes_;
   std::vector<std::vector<NodePtr>> parallel_nodes_;
+  std::vector<DataflowNode> dataflow_nodes_;
+  std::vector<int32_t> dataflow_sources_;
+  size_t dataflow_slot_size_ = 0;
   size_t datapack_element_size_;
   std::vector<NodeEntryPtr> outputs_;
   std::vector<std::string> output_keys_;
@@ -228,8 +314,11 @@ struct TXSession {
   std::shared_ptr<internal::IThreadPool> scheduling_pool_ = nullptr;
   std::shared_ptr<ThreadPoolExecutor> scheduling_pool_executor_;
   Attributes attributes_;
+  std::shared_ptr<TXSessionMetrics> metrics_;
   std::shared_ptr<internal::IThreadPool> compute_pool_ = nullptr;
   std::shared_ptr<ThreadPoolExecutor> compute_pool_executor_;
+  // declared last, pending async runs are finished before the session is destroyed
+  std::shared_ptr<internal::IThreadPool> async_run_pool_ = nullptr;
 
   friend class Graph;
 };
@@ -311,6 +311,14 @@ namespace cedar {
       _size  = static_cast <int> (size_);
       _no_delete = true;
     }
+    void detach_array () { // copy an array given by set_array, so that it can be updated
+      if (! _array || ! _no_delete) return;
+      node* p = static_cast <node*> (std::malloc (sizeof (node) * _size));
+      if (! p) _err (__FILE__, __LINE__, "memory allocation failed\n");
+      std::memcpy (p, _array, sizeof (node) * _size);
+      _array = p;
+      _no_delete = false;
+    }
     const void* array () const { return _array; }
     void clear (const bool reuse = true) {
       if (_array && ! _no_delete) std::free (_array); _array = 0;
@@ -0,0 +1,101 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+
+#include <matxscript/runtime/container/string.h>
+#include <matxscript/runtime/logging.h>
+
+namespace matxscript {
+namespace runtime {
+
+/**
+ * A precompiled double array trie file which is mapped read-only.
+ *
+ * The file is a 64 bytes header followed by the cedar node array, so it is used in place:
+ * the pages are mapped with MAP_SHARED and live in the page cache, all the processes and
+ * sessions which open the same file share them instead of each building a private trie.
+ * In one process, opening an unchanged file again returns the same mapping.
+ *
+ * The node array is written in the byte order of the host, Open checks the header and
+ * refuses a file built with another node layout.
+ */
+class MappedTrieFile {
+ public:
+  static constexpr uint32_t kVersion = 1;
+  static constexpr size_t kHeaderSize = 64;
+
+  // whether the file starts with the magic of a mapped trie file
+  static bool IsMappedTrieFile(const String& path);
+  static std::shared_ptr<const MappedTrieFile> Open(const String& path);
+  // write the node array of a cedar trie
+  static void Save(
+      const String& path, const void* nodes, size_t num_nodes, size_t node_size, size_t num_keys);
+  template <class CedarTrie>
+  static void Save(const String& path, const CedarTrie& trie) {
+    Save(path, trie.array(), trie.size(), trie.unit_size(), trie.num_keys());
+  }
+
+  // let a cedar trie use the node array in place, call detach_array before updating it
+  template <class CedarTrie>
+  void Attach(CedarTrie* trie) const {
+    MXCHECK_EQ(node_size_, trie->unit_size())
+        << "[MappedTrieFile] the node size of " << path_ << " does not match the trie";
+    trie->set_array(const_cast<void*>(nodes()), num_nodes_);
+  }
+
+ public:
+  ~MappedTrieFile();
+  MappedTrieFile(const MappedTrieFile&) = delete;
+  MappedTrieFile& operator=(const MappedTrieFile&) = delete;
+
+  // the node array, it must never be written
+  const void* nodes() const noexcept {
+    return static_cast<const char*>(data_) + kHeaderSize;
+  }
+  size_t num_nodes() const noexcept {
+    return num_nodes_;
+  }
+  size_t node_size() const noexcept {
+    return node_size_;
+  }
+  size_t num_keys() const noexcept {
+    return num_keys_;
+  }
+  const String& path() const noexcept {
+    return path_;
+  }
+
+ private:
+  MappedTrieFile() = default;
+
+  String path_;
+  void* data_ = nullptr;
+  size_t size_ = 0;
+  size_t num_nodes_ = 0;
+  size_t node_size_ = 0;
+  size_t num_keys_ = 0;
+};
+
+}  // namespace runtime
+}  // namespace matxscript
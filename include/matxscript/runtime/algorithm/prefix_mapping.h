@@ -24,6 +24,7 @@
 #include <set>
 
 #include <matxscript/runtime/algorithm/cedar.h>
+#include <matxscript/runtime/algorithm/mapped_trie.h>
 #include <matxscript/runtime/container/string.h>
 #include <matxscript/runtime/runtime_port.h>
 
@@ -40,6 +41,11 @@ class PrefixMapping {
 #endif
  public:
   explicit PrefixMapping(const std::map<String, int>& dic);
+  // use the trie of a mapped trie file in place, it is shared and never copied
+  explicit PrefixMapping(std::shared_ptr<const MappedTrieFile> file);
+
+  // write the trie as a mapped trie file
+  void Save(const String& path) const;
 
   // Finds the longest string in dic, which is a prefix of `w`.
   // Returns the UTF8 byte length of matched string.
@@ -48,6 +54,7 @@ class PrefixMapping {
   int PrefixSearch(const char* w, size_t w_len, int* val) const;
 
  private:
+  std::shared_ptr<const MappedTrieFile> mapped_file_;
   std::unique_ptr<cedar_t> trie_;
 };
 
@@ -20,6 +20,7 @@
 #pragma once
 
 #include "cedar.h"
+#include "mapped_trie.h"
 
 #include <initializer_list>
 #include <map>
@@ -73,7 +74,8 @@ class TrieNode : public Object {
   List prefix_search_all(const string_view& w, int64_t pos = 0) const;
   List prefix_search_all(const unicode_view& w, int64_t pos = 0) const;
   List prefix_search_all(const Any& w, int64_t pos = 0) const;
-  int save(const unicode_view& file_path) const;
+  // a mapped file is used in place by load and shared by all the tries which load it
+  int save(const unicode_view& file_path, bool mapped = false) const;
   int load(const unicode_view& file_path) const;
 
   static constexpr const uint32_t _type_index = TypeIndex::kRuntimeTrie;
@@ -81,6 +83,8 @@ class TrieNode : public Object {
   MATXSCRIPT_DECLARE_FINAL_OBJECT_INFO(TrieNode, Object);
 
  private:
+  // the file whose nodes trie_ reads in place, it is dropped by the first update
+  mutable std::shared_ptr<const MappedTrieFile> mapped_file_;
   std::unique_ptr<cedar_t> trie_;
   friend class Trie;
   friend class TrieNodeTrait;
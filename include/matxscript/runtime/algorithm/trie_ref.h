@@ -78,7 +78,7 @@ class Trie : public ObjectRef {
   List prefix_search_all(const string_view& w, int64_t pos = 0) const;
   List prefix_search_all(const unicode_view& w, int64_t pos = 0) const;
   List prefix_search_all(const Any& w, int64_t pos = 0) const;
-  int save(const unicode_view& file_path) const;
+  int save(const unicode_view& file_path, bool mapped = false) const;
   int load(const unicode_view& file_path) const;
 };
 
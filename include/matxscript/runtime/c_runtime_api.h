@@ -294,6 +294,41 @@ MATX_DLL int MATXScriptRuntimeMakeString(const char* buffer, size_t size, MATXSc
  */
 MATX_DLL int MATXScriptRuntimeMakeUnicode(const char* buffer, size_t size, MATXScriptAny* ret_val);
 
+/**
+ * \brief Make a Native Str from fixed-width code units, like the PEP 393 str data
+ *
+ * \param data The code units
+ * \param size The number of code units
+ * \param kind The width of a code unit in bytes, 1, 2 or 4
+ * \param ret_val The return value.
+ *
+ * \return 0 when success, -1 when failure happens
+ */
+MATX_DLL int MATXScriptRuntimeMakeUnicodeFromKind(const void* data,
+                                                  size_t size,
+                                                  int kind,
+                                                  MATXScriptAny* ret_val);
+
+/**
+ * \brief Make a Native StringBatch, the items are copied into one contiguous buffer
+ *
+ * \param items The utf-8 bytes or the code units of the items
+ * \param sizes The byte sizes or the code unit counts of the items
+ * \param kinds The unicode kind of each item, nullptr if all items are utf-8 bytes.
+ *        Items of kind 1, 2 or 4 are code units and are encoded into the buffer.
+ * \param num Number of items.
+ * \param is_unicode Whether the items are str or bytes.
+ * \param ret_val The return value.
+ *
+ * \return 0 when success, -1 when failure happens
+ */
+MATX_DLL int MATXScriptRuntimeMakeStringBatch(const char* const* items,
+                                              const size_t* sizes,
+                                              const int* kinds,
+                                              int64_t num,
+                                              int is_unicode,
+                                              MATXScriptAny* ret_val);
+
 /**
  * \brief
  *
@@ -0,0 +1,251 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#pragma once
+
+#include <algorithm>
+#include <array>
+#include <functional>
+#include <vector>
+
+#include <matxscript/runtime/container/ndarray.h>
+#include <matxscript/runtime/container/ndarray_helper.h>
+#include <matxscript/runtime/runtime_port.h>
+
+#if defined(__clang__)
+#define MATX_ELEMENTWISE_VECTORIZE _Pragma("clang loop vectorize(enable) interleave(enable)")
+#elif defined(__GNUC__)
+#define MATX_ELEMENTWISE_VECTORIZE _Pragma("GCC ivdep")
+#else
+#define MATX_ELEMENTWISE_VECTORIZE
+#endif
+
+namespace matxscript {
+namespace runtime {
+namespace elementwise {
+
+// tensors smaller than this are never split across the compute pool
+static constexpr int64_t kParallelMinElements = 1 << 16;
+static constexpr int64_t kParallelMinChunk = 1 << 14;
+
+/**
+ * The loop nest of an elementwise op over N operands, the strides are in elements.
+ * Dims of size 1 are dropped and adjacent dims which are contiguous in every operand
+ * are merged, so a contiguous (or broadcast scalar) operand becomes a single flat loop.
+ */
+template <int N>
+struct LoopNest {
+  std::vector<int64_t> shape;
+  std::vector<std::array<int64_t, N>> strides;
+  int64_t numel = 1;
+
+  LoopNest(const int64_t* full_shape, int ndim, const std::array<const int64_t*, N>& full_strides) {
+    for (int d = 0; d < ndim; ++d) {
+      numel *= full_shape[d];
+      if (full_shape[d] == 1) {
+        continue;
+      }
+      std::array<int64_t, N> st;
+      for (int k = 0; k < N; ++k) {
+        st[k] = full_strides[k][d];
+      }
+      if (!shape.empty()) {
+        bool mergeable = true;
+        for (int k = 0; k < N; ++k) {
+          if (strides.back()[k] != st[k] * full_shape[d]) {
+            mergeable = false;
+            break;
+          }
+        }
+        if (mergeable) {
+          shape.back() *= full_shape[d];
+          strides.back() = st;
+          continue;
+        }
+      }
+      shape.push_back(full_shape[d]);
+      strides.push_back(st);
+    }
+    if (shape.empty()) {
+      shape.push_back(1);
+      strides.emplace_back();
+      strides.back().fill(0);
+    }
+  }
+
+  const std::array<int64_t, N>& InnerStrides() const {
+    return strides.back();
+  }
+};
+
+// split [0, total) into num_tasks ranges, run them on the compute pool of the current thread
+void ParallelRange(int64_t total,
+                   int64_t num_tasks,
+                   const std::function<void(int64_t, int64_t)>& range_func);
+
+// the number of tasks a loop over numel elements is split into
+int64_t NumTasks(int64_t numel);
+
+template <int N, typename InnerFunc>
+void RunRows(const LoopNest<N>& nest, int64_t row_begin, int64_t row_end, const InnerFunc& inner) {
+  int outer_dim = static_cast<int>(nest.shape.size()) - 1;
+  int64_t inner_len = nest.shape.back();
+  std::vector<int64_t> index(outer_dim, 0);
+  std::array<int64_t, N> offsets;
+  offsets.fill(0);
+  int64_t rem = row_begin;
+  for (int d = outer_dim - 1; d >= 0; --d) {
+    index[d] = rem % nest.shape[d];
+    rem /= nest.shape[d];
+    for (int k = 0; k < N; ++k) {
+      offsets[k] += index[d] * nest.strides[d][k];
+    }
+  }
+  for (int64_t row = row_begin; row < row_end; ++row) {
+    inner(offsets, inner_len);
+    for (int d = outer_dim - 1; d >= 0; --d) {
+      for (int k = 0; k < N; ++k) {
+        offsets[k] += nest.strides[d][k];
+      }
+      if (++index[d] < nest.shape[d]) {
+        break;
+      }
+      for (int k = 0; k < N; ++k) {
+        offsets[k] -= nest.strides[d][k] * nest.shape[d];
+      }
+      index[d] = 0;
+    }
+  }
+}
+
+/**
+ * Call inner(offsets, n) for every inner loop of the nest, the large ones are split
+ * across the compute pool: a flat loop by elements, the others by rows.
+ * work is the number of elements read by the whole loop when it is not numel,
+ * e.g. a reduction reads numel * axis_len.
+ */
+template <int N, typename InnerFunc>
+void Run(const LoopNest<N>& nest, const InnerFunc& inner, int64_t work = -1) {
+  if (nest.numel == 0) {
+    return;
+  }
+  int64_t inner_len = nest.shape.back();
+  int64_t rows = nest.numel / inner_len;
+  int64_t num_tasks = NumTasks(work < 0 ? nest.numel : work);
+  if (num_tasks <= 1) {
+    RunRows<N>(nest, 0, rows, inner);
+  } else if (nest.shape.size() == 1) {
+    auto& st = nest.InnerStrides();
+    ParallelRange(inner_len, num_tasks, [&](int64_t begin, int64_t end) {
+      std::array<int64_t, N> offsets;
+      for (int k = 0; k < N; ++k) {
+        offsets[k] = begin * st[k];
+      }
+      inner(offsets, end - begin);
+    });
+  } else {
+    ParallelRange(rows, std::min(num_tasks, rows), [&](int64_t begin, int64_t end) {
+      RunRows<N>(nest, begin, end, inner);
+    });
+  }
+}
+
+/******************************************************************************
+ * inner loops, the unit stride cases are written separately to be vectorized
+ *****************************************************************************/
+
+template <typename OP, typename DType, typename LDType, typename RDType>
+MATXSCRIPT_ALWAYS_INLINE void BinaryInner(
+    DType* dst, const LDType* l, const RDType* r, int64_t n, int64_t ds, int64_t ls, int64_t rs) {
+  if (ds == 1 && ls == 1 && rs == 1) {
+    MATX_ELEMENTWISE_VECTORIZE
+    for (int64_t i = 0; i < n; ++i) {
+      OP::Map(l[i], r[i], dst + i);
+    }
+  } else if (ds == 1 && ls == 1 && rs == 0) {
+    const RDType rv = *r;
+    MATX_ELEMENTWISE_VECTORIZE
+    for (int64_t i = 0; i < n; ++i) {
+      OP::Map(l[i], rv, dst + i);
+    }
+  } else if (ds == 1 && ls == 0 && rs == 1) {
+    const LDType lv = *l;
+    MATX_ELEMENTWISE_VECTORIZE
+    for (int64_t i = 0; i < n; ++i) {
+      OP::Map(lv, r[i], dst + i);
+    }
+  } else {
+    for (int64_t i = 0; i < n; ++i) {
+      OP::Map(l[i * ls], r[i * rs], dst + i * ds);
+    }
+  }
+}
+
+template <typename OP, typename DType, typename LDType, typename SType>
+MATXSCRIPT_ALWAYS_INLINE void ScalarInner(
+    DType* dst, const LDType* l, const SType s, int64_t n, int64_t ds, int64_t ls) {
+  if (ds == 1 && ls == 1) {
+    MATX_ELEMENTWISE_VECTORIZE
+    for (int64_t i = 0; i < n; ++i) {
+      OP::Map(l[i], s, dst + i);
+    }
+  } else {
+    for (int64_t i = 0; i < n; ++i) {
+      OP::Map(l[i * ls], s, dst + i * ds);
+    }
+  }
+}
+
+template <typename DType, typename SType, typename FUNC>
+MATXSCRIPT_ALWAYS_INLINE void UnaryInner(
+    DType* dst, const SType* src, int64_t n, int64_t ds, int64_t ss, const FUNC& func) {
+  if (ds == 1 && ss == 1) {
+    MATX_ELEMENTWISE_VECTORIZE
+    for (int64_t i = 0; i < n; ++i) {
+      dst[i] = func(src[i]);
+    }
+  } else {
+    for (int64_t i = 0; i < n; ++i) {
+      dst[i * ds] = func(src[i * ss]);
+    }
+  }
+}
+
+template <typename T>
+MATXSCRIPT_ALWAYS_INLINE T* DataPtr(const NDArray& nd) {
+  return reinterpret_cast<T*>(static_cast<char*>(nd->data) + nd->byte_offset);
+}
+
+// the strides of nd when it is broadcast to shape
+std::vector<int64_t> BroadcastStrides(const std::vector<int64_t>& shape, const NDArray& nd);
+
+// make the destination of an op, or check the one given by the caller
+NDArray PrepareOutput(const std::vector<int64_t>& shape,
+                      const DataType& dtype,
+                      const DLDevice& device,
+                      const NDArray* out);
+
+// the destination may be the input itself, but must not partially overlap it
+void CheckNoPartialOverlap(const NDArray& dst,
+                           const NDArray& src,
+                           const std::vector<int64_t>& src_strides);
+
+}  // namespace elementwise
+}  // namespace runtime
+}  // namespace matxscript
@@ -21,6 +21,7 @@
 
 #include <unordered_map>
 
+#include <matxscript/runtime/container/dict_ref.h>
 #include <matxscript/runtime/container/ndarray.h>
 #include <matxscript/runtime/runtime_value.h>
 
@@ -51,23 +52,73 @@ class NDArrayHelper {
   static Unicode GetDeviceStr(const DLDevice& device);
 };
 
+namespace internal {
+struct IThreadPool;
+}  // namespace internal
+
+/**
+ * While the scope is alive, the large elementwise ops of the current thread are split
+ * across the pool, which must run LockBasedRunnable tasks. TXSession installs its
+ * compute pool when it runs an op.
+ */
+class NDArrayComputePoolScope {
+ public:
+  explicit NDArrayComputePoolScope(internal::IThreadPool* pool);
+  ~NDArrayComputePoolScope();
+
+  static internal::IThreadPool* Current();
+
+ private:
+  internal::IThreadPool* prev_;
+};
+
+// the elementwise ops write into out when it is given, which must have the result shape and dtype
 class NDArrayOperate {
  public:
-  static NDArray Add(const NDArray& lhs, const NDArray& rhs);
-  static NDArray Add(const NDArray& lhs, int64_t num);
-  static NDArray Add(const NDArray& lhs, double num);
+  static NDArray Add(const NDArray& lhs, const NDArray& rhs, const NDArray* out = nullptr);
+  static NDArray Add(const NDArray& lhs, int64_t num, const NDArray* out = nullptr);
+  static NDArray Add(const NDArray& lhs, double num, const NDArray* out = nullptr);
+
+  static NDArray Mul(const NDArray& lhs, const NDArray& rhs, const NDArray* out = nullptr);
+  static NDArray Mul(const NDArray& lhs, int64_t num, const NDArray* out = nullptr);
+  static NDArray Mul(const NDArray& lhs, double num, const NDArray* out = nullptr);
+
+  static NDArray Sub(const NDArray& lhs, const NDArray& rhs, const NDArray* out = nullptr);
+  static NDArray Sub(int64_t num, const NDArray& rhs, const NDArray* out = nullptr);
+  static NDArray Sub(double num, const NDArray& lhs, const NDArray* out = nullptr);
 
-  static NDArray Mul(const NDArray& lhs, const NDArray& rhs);
-  static NDArray Mul(const NDArray& lhs, int64_t num);
-  static NDArray Mul(const NDArray& lhs, double num);
+  static NDArray Div(const NDArray& lhs, const NDArray& rhs, const NDArray* out = nullptr);
+  static NDArray Div(double num, const NDArray& rhs, const NDArray* out = nullptr);
+  static NDArray Div(const NDArray& lhs, double num, const NDArray* out = nullptr);
 
-  static NDArray Sub(const NDArray& lhs, const NDArray& rhs);
-  static NDArray Sub(int64_t num, const NDArray& rhs);
-  static NDArray Sub(double num, const NDArray& lhs);
+  // axis is None or int, a reduction to a single element returns a number
+  static RTValue Sum(const NDArray& nd, const Any& axis, bool keepdims = false);
+  static RTValue Mean(const NDArray& nd, const Any& axis, bool keepdims = false);
+  static RTValue Max(const NDArray& nd, const Any& axis, bool keepdims = false);
+  static RTValue Min(const NDArray& nd, const Any& axis, bool keepdims = false);
+  static RTValue ArgMax(const NDArray& nd, const Any& axis, bool keepdims = false);
+  static RTValue ArgMin(const NDArray& nd, const Any& axis, bool keepdims = false);
 
-  static NDArray Div(const NDArray& lhs, const NDArray& rhs);
-  static NDArray Div(double num, const NDArray& rhs);
-  static NDArray Div(const NDArray& lhs, double num);
+  // the ints are computed in float32 like Div
+  static NDArray Exp(const NDArray& nd, const NDArray* out = nullptr);
+  static NDArray Log(const NDArray& nd, const NDArray* out = nullptr);
+  static NDArray Sqrt(const NDArray& nd, const NDArray* out = nullptr);
+  static NDArray Abs(const NDArray& nd, const NDArray* out = nullptr);
+  static NDArray Clip(const NDArray& nd,
+                      const Any& lo,
+                      const Any& hi,
+                      const NDArray* out = nullptr);
+  static NDArray Where(const Any& cond, const Any& x, const Any& y);
+  // x * scale + shift converted to dtype, ints are rounded and saturated
+  static NDArray CastScale(const NDArray& nd,
+                           const DataType& dtype,
+                           double scale,
+                           double shift,
+                           const NDArray* out = nullptr);
+  // evaluate an elementwise expression over the operands in one pass, see ndarray_math.cc
+  static NDArray Evaluate(const string_view& expr,
+                          const Dict& operands,
+                          const NDArray* out = nullptr);
 
   static NDArray Rand(const std::vector<int64_t>& shape);
   static NDArray Concatenate(const Any& seq, int64_t axis = 0);
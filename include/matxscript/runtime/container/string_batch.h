@@ -0,0 +1,108 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#pragma once
+
+#include <memory>
+#include <vector>
+
+#include <matxscript/runtime/container/itertor_ref.h>
+#include <matxscript/runtime/container/list_ref.h>
+#include <matxscript/runtime/container/ndarray.h>
+#include <matxscript/runtime/container/string_view.h>
+#include <matxscript/runtime/container/user_data_ref.h>
+#include <matxscript/runtime/runtime_value.h>
+
+namespace matxscript {
+namespace runtime {
+
+/**
+ * A columnar batch of str or bytes, laid out like an Arrow large_string array:
+ * all items are stored back to back in one utf-8 buffer and item i is
+ * data[offsets[i]:offsets[i + 1]], offsets has size() + 1 entries and starts with 0.
+ *
+ * The items are only boxed into String/Unicode when they are read one by one,
+ * ops which understand the batch read the views directly.
+ * It is exposed to python and script as the native class "StringBatch".
+ */
+class StringBatch : public std::enable_shared_from_this<StringBatch> {
+ public:
+  static constexpr const char* kClassName = "StringBatch";
+
+ public:
+  explicit StringBatch(bool is_unicode = true) : is_unicode_(is_unicode), offsets_{0} {
+  }
+  // the offsets are checked and rebased to start with 0
+  StringBatch(string_view data, const int64_t* offsets, int64_t num, bool is_unicode);
+  // items with a kind of 1, 2 or 4 are code units like a PEP 393 str, they are utf-8 encoded
+  // into the buffer, items without a kind or of kind ascii are utf-8 bytes
+  StringBatch(const char* const* items,
+              const size_t* sizes,
+              int64_t num,
+              bool is_unicode,
+              const int* kinds = nullptr);
+  ~StringBatch() = default;
+
+  // all items must be str or all bytes, an empty list makes a str batch
+  static StringBatch FromList(const List& items);
+
+ public:
+  int64_t size() const noexcept {
+    return static_cast<int64_t>(offsets_.size()) - 1;
+  }
+  bool is_unicode() const noexcept {
+    return is_unicode_;
+  }
+  int64_t nbytes() const noexcept {
+    return offsets_.back();
+  }
+  // the utf-8 bytes of item i, i is not checked
+  string_view view(int64_t i) const noexcept {
+    return string_view(data_.data() + offsets_[i], offsets_[i + 1] - offsets_[i]);
+  }
+
+  // python style index, returns a str or bytes
+  RTValue get_item(int64_t i) const;
+  StringBatch get_slice(int64_t start, int64_t end) const;
+  bool contains(const Any& item) const;
+
+  void reserve(int64_t num, int64_t nbytes);
+  void push_back(string_view item);
+  void pop_back();
+  void clear();
+
+  List to_list() const;
+  // the Arrow buffers, a uint8 data array and an int64 offsets array
+  NDArray data() const;
+  NDArray offsets() const;
+  Iterator iter() const;
+
+ public:
+  // the batch of a StringBatch native object, nullptr for other values
+  static StringBatch* FromAny(const Any& value);
+  static UserDataRef MakeUserData(StringBatch batch);
+
+ private:
+  bool is_unicode_;
+  std::vector<char> data_;
+  std::vector<int64_t> offsets_;
+};
+
+}  // namespace runtime
+}  // namespace matxscript
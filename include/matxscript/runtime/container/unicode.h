@@ -45,6 +45,8 @@ class Unicode {
 
  public:
   // data holder
+  // TODO: compact 1/2/4-byte (PEP 393 style) storage. The code units are always 4 bytes now,
+  // unicodelib/unicode_kind.h only speeds up the conversions from and to narrower buffers.
   using ContainerType = string_core<Py_UCS4>;
   using self_view = unicode_view;
   using size_type = self_view::size_type;
@@ -309,8 +309,9 @@ Unicode kernel_builtins_chr(int64_t i);
 // json
 RTValue kernel_json_load(PyArgs args);
 RTValue kernel_json_loads(PyArgs args);
-// RTValue kernel_json_dump(PyArgs args);
+void kernel_json_dump(PyArgs args);
 Unicode kernel_json_dumps(PyArgs args);
+Iterator kernel_json_lines(PyArgs args);
 
 // file
 File kernel_file_open(PyArgs args);
@@ -318,12 +319,30 @@ void kernel_file_close(const File& f);
 
 // ndarray global method
 NDArray kernel_nd_module_add(const Any& lhs, const Any& rhs);
+NDArray kernel_nd_module_add(const Any& lhs, const Any& rhs, const Any& out);
 NDArray kernel_nd_module_sub(const Any& lhs, const Any& rhs);
+NDArray kernel_nd_module_sub(const Any& lhs, const Any& rhs, const Any& out);
 NDArray kernel_nd_module_div(const Any& lhs, const Any& rhs);
+NDArray kernel_nd_module_div(const Any& lhs, const Any& rhs, const Any& out);
 NDArray kernel_nd_module_mul(const Any& lhs, const Any& rhs);
+NDArray kernel_nd_module_mul(const Any& lhs, const Any& rhs, const Any& out);
 NDArray kernel_nd_module_rand(const Any& view);
 NDArray kernel_nd_module_concatenate(PyArgs args);
 NDArray kernel_nd_module_stack(PyArgs args);
+RTValue kernel_nd_module_sum(PyArgs args);
+RTValue kernel_nd_module_mean(PyArgs args);
+RTValue kernel_nd_module_max(PyArgs args);
+RTValue kernel_nd_module_min(PyArgs args);
+RTValue kernel_nd_module_argmax(PyArgs args);
+RTValue kernel_nd_module_argmin(PyArgs args);
+NDArray kernel_nd_module_exp(PyArgs args);
+NDArray kernel_nd_module_log(PyArgs args);
+NDArray kernel_nd_module_sqrt(PyArgs args);
+NDArray kernel_nd_module_abs(PyArgs args);
+NDArray kernel_nd_module_clip(PyArgs args);
+NDArray kernel_nd_module_where(PyArgs args);
+NDArray kernel_nd_module_cast_scale(PyArgs args);
+NDArray kernel_nd_module_evaluate(PyArgs args);
 
 void kernel_list_module_sort(PyArgs args);
 void kernel_list_module_nth_element(PyArgs args);
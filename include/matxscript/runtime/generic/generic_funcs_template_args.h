@@ -102,7 +102,9 @@ MATXSCRIPT_KERNEL_OBJECT_UNBOUND_FUNC(RTValue, kernel_object_prefix_search);
 // json
 MATXSCRIPT_KERNEL_GLOBAL_FUNC(RTValue, kernel_json_load);
 MATXSCRIPT_KERNEL_GLOBAL_FUNC(RTValue, kernel_json_loads);
+MATXSCRIPT_KERNEL_GLOBAL_FUNC(void, kernel_json_dump);
 MATXSCRIPT_KERNEL_GLOBAL_FUNC(Unicode, kernel_json_dumps);
+MATXSCRIPT_KERNEL_GLOBAL_FUNC(Iterator, kernel_json_lines);
 
 // file
 MATXSCRIPT_KERNEL_GLOBAL_FUNC(File, kernel_file_open);
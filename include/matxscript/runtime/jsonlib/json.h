@@ -20,6 +20,7 @@
 #pragma once
 
 #include <matxscript/runtime/container/file_ref.h>
+#include <matxscript/runtime/container/itertor_ref.h>
 #include <matxscript/runtime/container/unicode.h>
 #include <matxscript/runtime/runtime_value.h>
 
@@ -30,8 +31,14 @@ RTValue json_load(const File& fp);
 
 RTValue json_loads(string_view s);
 
-// TODO(wuxian): Need a file class that supports write operations
-// RTValue json_dump(const RTValue& obj, const File& fp, int indent = -1, bool ensure_ascii = true);
+// parse the code points directly, without encoding them to utf-8 first
+RTValue json_loads(unicode_view s);
+
+// iterate the values of a json-lines file, the blank lines are skipped
+Iterator json_lines(string_view path);
+
+// File only supports reading by now, so the value is written to a path
+void json_dump(const Any& obj, string_view path, int indent = -1, bool ensure_ascii = true);
 
 Unicode json_dumps(const Any& obj, int indent = -1, bool ensure_ascii = true);
 
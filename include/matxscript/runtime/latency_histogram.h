@@ -0,0 +1,75 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#pragma once
+
+#include <atomic>
+#include <cstdint>
+#include <sstream>
+
+#include <matxscript/runtime/container.h>
+#include <matxscript/runtime/env_time.h>
+
+namespace matxscript {
+namespace runtime {
+
+/**
+ * A lock-free latency histogram with fixed buckets, the bounds are in microseconds.
+ * Observe is cheap enough to be always on, readers may see a slightly torn snapshot.
+ */
+class LatencyHistogram {
+ public:
+  static constexpr int kNumBounds = 16;
+  static const uint64_t kBucketBounds[kNumBounds];
+
+  LatencyHistogram() {
+    Reset();
+  }
+
+  void Observe(uint64_t micros) noexcept;
+
+  void ObserveSince(uint64_t start_nanos) noexcept {
+    uint64_t now = EnvTime::Default()->NowNanos();
+    Observe(now > start_nanos ? (now - start_nanos) / EnvTime::kMicrosToNanos : 0);
+  }
+
+  void Reset() noexcept;
+
+  uint64_t Count() const noexcept {
+    return count_.load(std::memory_order_relaxed);
+  }
+
+  uint64_t SumMicros() const noexcept {
+    return sum_.load(std::memory_order_relaxed);
+  }
+
+  // {"count": n, "sum_us": n, "buckets": [(le_us, cumulative_count), ..., (-1, count)]}
+  Dict ToDict() const;
+
+  // write the "_bucket", "_sum" and "_count" series of a prometheus histogram
+  void WritePrometheus(std::ostream& os, const string_view& name, const string_view& labels) const;
+
+ private:
+  std::atomic<uint64_t> buckets_[kNumBounds + 1];
+  std::atomic<uint64_t> count_;
+  std::atomic<uint64_t> sum_;
+};
+
+}  // namespace runtime
+}  // namespace matxscript
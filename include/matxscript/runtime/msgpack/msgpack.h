@@ -19,6 +19,8 @@
  */
 #pragma once
 
+#include <memory>
+
 #include <matxscript/runtime/container/string.h>
 #include <matxscript/runtime/container/string_view.h>
 #include <matxscript/runtime/runtime_value.h>
@@ -29,8 +31,86 @@ namespace serialization {
 
 RTValue msgpack_loads(const string_view& s);
 
+/**
+ * zero_copy: s is copied once into a private 64-byte aligned buffer and the NDArray values
+ * whose data is aligned to their element size are views into it, instead of a copy per value.
+ * The views keep the buffer alive and share it with each other, but never with s.
+ * bytes and str values are always copied, a String can not refer to a part of another buffer.
+ */
+RTValue msgpack_loads(const String& s, bool zero_copy);
+
 String msgpack_dumps(const Any& obj);
 
+struct BasicMessagePacker;
+struct unpack_context;
+
+/**
+ * Pack a stream of records one by one, the output of each pack call is appended to the stream.
+ * The packing buffer is reused by all records.
+ *
+ * By default each record is the same as msgpack_dumps.
+ * With align_ndarray the NDArray data is padded to be 64-byte aligned in the stream, which
+ * lets MessageStreamUnpacker return views. The padded NDArray is a different ext type, so
+ * this stream can only be read by MessageStreamUnpacker and msgpack_loads of this version.
+ */
+class MessageStreamPacker {
+ public:
+  explicit MessageStreamPacker(bool align_ndarray = false);
+  ~MessageStreamPacker();
+
+  String pack(const Any& obj);
+  // the number of bytes packed so far
+  int64_t tell() const noexcept {
+    return offset_;
+  }
+
+ private:
+  std::unique_ptr<BasicMessagePacker> packer_;
+  int64_t offset_ = 0;
+};
+
+/**
+ * Unpack a stream of records fed in chunks of any size.
+ *
+ * The data is buffered in 64-byte aligned chunks which keep the stream alignment, so with
+ * zero_copy the aligned NDArray values are views into the chunk they were read from. A chunk
+ * is freed when it is consumed and no view refers to it anymore.
+ *
+ * An incomplete record is parsed once, the parse resumes where it stopped when more data
+ * is fed.
+ */
+class MessageStreamUnpacker {
+ public:
+  explicit MessageStreamUnpacker(bool zero_copy = true);
+  ~MessageStreamUnpacker();
+
+  void feed(string_view data);
+  // unpack the next record, false if the buffered data does not hold a whole record
+  bool next(RTValue* record);
+  // the number of bytes fed but not unpacked
+  int64_t buffered() const noexcept {
+    return static_cast<int64_t>(tail_ - head_);
+  }
+
+ private:
+  void reset_context();
+
+  bool zero_copy_;
+  // the parse state of the pending record
+  std::unique_ptr<unpack_context> ctx_;
+  // the bytes of the pending record which are parsed
+  size_t parsed_ = 0;
+  // the owner of the views, only set while parsing
+  std::shared_ptr<void> owner_;
+  std::shared_ptr<char> chunk_;
+  char* base_ = nullptr;
+  size_t capacity_ = 0;
+  size_t head_ = 0;
+  size_t tail_ = 0;
+  // the stream offset of head_
+  int64_t offset_ = 0;
+};
+
 }  // namespace serialization
 }  // namespace runtime
 }  // namespace matxscript
@@ -20,7 +20,9 @@
 #pragma once
 
 #include <matxscript/runtime/container.h>
+#include <matxscript/runtime/latency_histogram.h>
 #include <matxscript/runtime/threadpool/i_thread_pool.h>
+#include <matxscript/runtime/threadpool/work_stealing_thread_pool.h>
 
 #include <memory>
 #include <unordered_set>
@@ -61,6 +63,11 @@ class ThreadPoolExecutor {
 
   RTValue Submit(PyArgs args);
 
+  // record how long the enqueued tasks wait before a worker picks them up
+  void SetQueueWaitHistogram(std::shared_ptr<LatencyHistogram> hist) {
+    wait_hist_ = std::move(hist);
+  }
+
  private:
   void ParallelForImpl(const UserDataRef& op,
                        const Any* inputs_begin,
@@ -74,8 +81,11 @@ class ThreadPoolExecutor {
   bool lock_free_ = true;
   int thread_num_ = 0;
   std::shared_ptr<internal::IThreadPool> pool_ = nullptr;
+  // not null when pool_ is a work stealing pool, nested calls enqueue their tasks to it
+  internal::WorkStealingThreadPool* steal_pool_ = nullptr;
   std::atomic<size_t> serial_{0};
   std::unordered_set<std::thread::id> pool_thread_ids_;
+  std::shared_ptr<LatencyHistogram> wait_hist_ = nullptr;
 };
 
 }  // namespace runtime
@@ -0,0 +1,102 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#pragma once
+
+#include <atomic>
+#include <condition_variable>
+#include <deque>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <vector>
+
+#ifdef _WIN32
+#include <windows.h>
+typedef DWORD pid_t;
+#else
+#include <unistd.h>
+#endif
+
+#include <matxscript/runtime/threadpool/i_thread_pool.h>
+
+namespace matxscript {
+namespace runtime {
+namespace internal {
+
+/**
+ * A thread pool with one task deque per worker.
+ *
+ * A worker runs the newest task of its own deque and steals the oldest task of the others
+ * when it is empty. Tasks enqueued by a worker go to its own deque, other tasks are spread
+ * over the deques by seq. An idle worker spins for spin_rounds rounds and then parks on a
+ * condition variable, so idle pools cost no CPU.
+ *
+ * When cpu_ids is not empty, worker i is pinned to cpu_ids[i % cpu_ids.size()] (linux only).
+ */
+class WorkStealingThreadPool : public IThreadPool {
+ public:
+  static constexpr int64_t kDefaultSpinRounds = 2048;
+
+  WorkStealingThreadPool(size_t threads,
+                         const std::string& name,
+                         std::vector<int> cpu_ids = {},
+                         int64_t spin_rounds = kDefaultSpinRounds);
+  ~WorkStealingThreadPool() override;
+
+  void Enqueue(IRunnablePtr& runner, size_t seq) override;
+
+  void EnqueueBulk(std::vector<IRunnablePtr>& runners) override;
+
+  size_t GetThreadsNum() const override;
+  std::vector<std::thread::id> GetThreadIds() const override;
+
+  // run one queued task on the calling thread, returns false if there is none.
+  // a worker waiting for the tasks it enqueued uses it to help instead of blocking.
+  bool RunPendingTask();
+
+ private:
+  struct TaskDeque {
+    std::mutex mutex;
+    std::deque<IRunnablePtr> tasks;
+  };
+
+  void Push(size_t index, IRunnablePtr& runner);
+  bool Take(size_t index, IRunnablePtr* task);
+  void Notify();
+  static void ThreadEntry(WorkStealingThreadPool* pool, size_t index, const std::string& name);
+
+ private:
+  std::vector<std::unique_ptr<TaskDeque>> queues_;
+  std::vector<std::thread> workers_;
+  std::vector<int> cpu_ids_;
+  int64_t spin_rounds_;
+  // the number of queued tasks, it may be -1 for a moment
+  std::atomic<int64_t> pending_{0};
+  std::atomic<int32_t> parked_{0};
+  std::atomic<bool> stop_{false};
+  std::mutex park_mutex_;
+  std::condition_variable park_cond_;
+  pid_t belong_to_pid_;
+};
+
+}  // namespace internal
+}  // namespace runtime
+}  // namespace matxscript
@@ -0,0 +1,102 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+#include <cstring>
+
+namespace matxscript {
+namespace runtime {
+
+/**
+ * The code unit width needed by a run of code points, like PEP 393.
+ * Unicode always stores 4-byte code units, the kind only selects the fast paths
+ * which convert from and to narrower buffers without a per-char decode.
+ */
+enum UnicodeKind : int {
+  kUnicodeKindASCII = 0,
+  kUnicodeKind1Byte = 1,
+  kUnicodeKind2Byte = 2,
+  kUnicodeKind4Byte = 4,
+};
+
+// the OR of all units, the loop has no branch and is vectorized by the compiler
+template <typename T>
+inline uint32_t UnicodeOrReduce(const T* s, size_t len) noexcept {
+  uint32_t r = 0;
+  for (size_t i = 0; i < len; ++i) {
+    r |= static_cast<uint32_t>(s[i]);
+  }
+  return r;
+}
+
+inline UnicodeKind UnicodeKindOfOrReduce(uint32_t r) noexcept {
+  if (r < 0x80) {
+    return kUnicodeKindASCII;
+  }
+  if (r < 0x100) {
+    return kUnicodeKind1Byte;
+  }
+  if (r < 0x10000) {
+    return kUnicodeKind2Byte;
+  }
+  return kUnicodeKind4Byte;
+}
+
+// the bounds are powers of two, so the OR of the units has the same kind as their max
+inline UnicodeKind UnicodeKindOf(const char32_t* s, size_t len) noexcept {
+  return UnicodeKindOfOrReduce(UnicodeOrReduce(reinterpret_cast<const uint32_t*>(s), len));
+}
+
+// copy narrow code units, e.g. ascii bytes or a latin-1/ucs2 buffer, into 4-byte units
+template <typename T>
+inline void UnicodeWidenCopy(const T* src, size_t len, char32_t* dst) noexcept {
+  for (size_t i = 0; i < len; ++i) {
+    dst[i] = static_cast<char32_t>(src[i]);
+  }
+}
+
+// the number of leading ascii bytes, 8 bytes are checked at once
+inline size_t UnicodeAsciiPrefixSize(const unsigned char* src, size_t len) noexcept {
+  size_t i = 0;
+  for (; i + 8 <= len; i += 8) {
+    uint64_t word;
+    std::memcpy(&word, src + i, 8);
+    if (word & 0x8080808080808080ULL) {
+      break;
+    }
+  }
+  while (i < len && src[i] < 0x80) {
+    ++i;
+  }
+  return i;
+}
+
+// the caller checks that all units fit into T
+template <typename T>
+inline void UnicodeNarrowCopy(const char32_t* src, size_t len, T* dst) noexcept {
+  for (size_t i = 0; i < len; ++i) {
+    dst[i] = static_cast<T>(src[i]);
+  }
+}
+
+}  // namespace runtime
+}  // namespace matxscript
@@ -47,6 +47,10 @@ inline bool py_unicode_isalpha(unicode_view input) noexcept {
 }
 
 inline bool py_unicode_isspace(Py_UCS4 c) noexcept {
+  if (c < 128) {
+    // \t \n \v \f \r, \x1c-\x1f and space, same as _Py_ascii_whitespace
+    return c == ' ' || (c >= 0x09 && c <= 0x0D) || (c >= 0x1C && c <= 0x1F);
+  }
   return _PyUnicode_IsWhitespace(c);
 }
 
@@ -19,10 +19,15 @@
  */
 #pragma once
 
+#include <atomic>
+#include <condition_variable>
 #include <memory>
+#include <mutex>
 #include <string>
 #include <thread>
 #include <unordered_map>
+#include <unordered_set>
+#include <vector>
 
 #include <matxscript/pipeline/tx_session.h>
 #include <matxscript/runtime/runtime_value.h>
@@ -32,6 +37,43 @@ namespace matxscript {
 namespace runtime {
 namespace server {
 
+struct BatchingOptions {
+  // the max number of samples merged into one session run, batching is disabled when <= 1
+  int64_t max_batch_size = 1;
+  // how long a worker waits for more requests after it dequeued the first one
+  int64_t max_wait_us = 0;
+  // the batch sizes the model is served with (see matx.pipeline.SaveMeta),
+  // max_batch_size is clipped to the largest of them when it is not empty
+  std::vector<int64_t> allowed_batch_sizes;
+  // the outputs split by request, when empty they are the outputs computed from the
+  // batched inputs, see TXSession::OutputsDependingOn
+  std::vector<std::string> batched_outputs;
+
+  /**
+   * read allowed_batch_sizes from the meta.pb.txt written by matx.pipeline.SaveMeta
+   * @param folder model folder
+   * @return allowed batch sizes, empty if the meta file is not found
+   */
+  static std::vector<int64_t> ReadAllowedBatchSizes(string_view folder);
+};
+
+struct ServerStats {
+  struct Replica {
+    // the number of requests served and session runs made by the replica,
+    // they differ when requests are batched
+    int64_t num_requests = 0;
+    int64_t num_runs = 0;
+    // time spent in session runs, utilization is busy_us / uptime_us
+    uint64_t busy_us = 0;
+    double utilization = 0.0;
+  };
+  // the requests waiting for a free replica
+  int64_t queue_depth = 0;
+  // time since start()
+  uint64_t uptime_us = 0;
+  std::vector<Replica> replicas;
+};
+
 class SimpleMPMCServer {
   class Runnable {
    public:
@@ -47,11 +89,21 @@ class SimpleMPMCServer {
       }
     }
     void SetDone() {
-      finish_ = true;
+      {
+        std::lock_guard<std::mutex> lock(mutex_);
+        finish_ = true;
+      }
+      cond_.notify_all();
     }
     bool Done() const {
+      std::lock_guard<std::mutex> lock(mutex_);
       return finish_;
     }
+    // block the caller until a worker calls SetDone
+    void Wait() const {
+      std::unique_lock<std::mutex> lock(mutex_);
+      cond_.wait(lock, [this]() { return finish_; });
+    }
 
     bool HasException() const {
       return throw_exception_;
@@ -61,8 +113,26 @@ class SimpleMPMCServer {
       return except_ptr_;
     }
 
+    const std::unordered_map<std::string, RTValue>* Inputs() const {
+      return inputs;
+    }
+
+    void SetOutputs(std::vector<std::pair<std::string, RTValue>> result) {
+      *outputs = std::move(result);
+    }
+
+    void SetException(std::exception_ptr except_ptr) {
+      throw_exception_ = true;
+      except_ptr_ = std::move(except_ptr);
+    }
+
+    virtual void SetRunTimeCost(uint64_t time_cost_us) {
+    }
+
    private:
-    volatile bool finish_ = false;
+    mutable std::mutex mutex_;
+    mutable std::condition_variable cond_;
+    bool finish_ = false;
     const std::unordered_map<std::string, RTValue>* inputs;
     std::vector<std::pair<std::string, RTValue>>* outputs;
 
@@ -71,6 +141,12 @@ class SimpleMPMCServer {
   };
   using RunnablePtr = std::shared_ptr<Runnable>;
 
+  struct ReplicaCounter {
+    std::atomic<int64_t> num_requests{0};
+    std::atomic<int64_t> num_runs{0};
+    std::atomic<uint64_t> busy_us{0};
+  };
+
   struct RunnableWithTimeCost : public Runnable {
     RunnableWithTimeCost(const std::unordered_map<std::string, RTValue>* inputs,
                          std::vector<std::pair<std::string, RTValue>>* outputs)
@@ -84,11 +160,26 @@ class SimpleMPMCServer {
       auto end = EnvTime::Default()->NowMicros();
       time_cost = end - begin;
     }
+
+    void SetRunTimeCost(uint64_t time_cost_us) override {
+      time_cost = time_cost_us;
+    }
   };
 
  public:
   explicit SimpleMPMCServer(std::vector<std::shared_ptr<TXSession>> handlers,
                             std::string name_prefix);
+  /**
+   * Batching server: each worker merges the queued feed dicts into one batched session run
+   * and scatters the results back to the callers.
+   * List, Tuple and NDArray inputs are concatenated along the first dimension,
+   * other inputs must be equal to be merged.
+   * The batched outputs (see BatchingOptions::batched_outputs) are split by request,
+   * the others are returned to every request as is.
+   */
+  explicit SimpleMPMCServer(std::vector<std::shared_ptr<TXSession>> handlers,
+                            std::string name_prefix,
+                            BatchingOptions batching_options);
   ~SimpleMPMCServer() {
     stop();
   }
@@ -104,8 +195,25 @@ class SimpleMPMCServer {
       uint64_t* enqueue_tc_us,
       uint64_t* real_run_tc_us);
 
+  // the number of requests waiting in the queue
+  int64_t queue_depth() const {
+    return queue_depth_.load(std::memory_order_relaxed);
+  }
+
+  ServerStats stats() const;
+
  protected:
-  static void ThreadEntry(SimpleMPMCServer* pool, TXSession* sess_ptr, const std::string& name);
+  static void ThreadEntry(SimpleMPMCServer* pool, size_t replica, const std::string& name);
+  static void BatchingThreadEntry(SimpleMPMCServer* pool, size_t replica, const std::string& name);
+  static void RunBatch(const TXSession* sess_ptr,
+                       std::vector<RunnablePtr>& batch,
+                       const std::unordered_set<std::string>& batched_outputs);
+
+  // push a task and wake up an idle worker
+  void Submit(RunnablePtr task);
+  // pop a task, idle workers sleep on a condition variable until a task is submitted,
+  // the server is stopped or deadline_us(0 means no deadline) is reached
+  bool WaitTask(RunnablePtr& task, uint64_t deadline_us = 0);
 
  private:
   // need to keep track of threads so we can join them
@@ -113,9 +221,16 @@ class SimpleMPMCServer {
   std::vector<std::shared_ptr<TXSession>> handlers_;
   // the task queue
   ::matxscript::runtime::MPMCBoundedQueue<RunnablePtr> tasks_;
+  std::atomic<int64_t> queue_depth_{0};
+  std::atomic<int64_t> num_idle_workers_{0};
+  std::mutex idle_mutex_;
+  std::condition_variable idle_cond_;
   // stop flag
-  bool stop_ = false;
+  std::atomic<bool> stop_{false};
   std::string name_;
+  BatchingOptions batching_options_;
+  std::vector<std::unique_ptr<ReplicaCounter>> counters_;
+  uint64_t start_time_us_ = 0;
 };
 
 }  // namespace server
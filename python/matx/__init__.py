@@ -17,6 +17,7 @@
 # specific language governing permissions and limitations
 # under the License.
 # pylint: disable=redefined-builtin, wildcard-import
+import sys as _sys
 from . import _hooks
 from . import runtime
 from .contrib import cpp_extension
@@ -26,9 +27,7 @@ from . import pipeline
 from .toolchain import ToolChain
 from . import extension
 from .runtime import msgpack_loads, msgpack_dumps
-from . import text
-from . import vision
-from . import tools
+from .runtime import json_dump, json_lines
 
 
 # APIs
@@ -140,6 +139,7 @@ from .native import make_native_object
 from .native import make_native_function
 from .native import call_native_function
 from .native import load_native
+from .native import StringBatch
 
 # matx.pypi
 from . import pypi
@@ -159,6 +159,47 @@ from .typing import *
 
 from .pipeline.ops import DeviceOp as Device
 
+# matx.text, matx.vision and matx.tools load their op libraries when imported,
+# so they are imported on first access instead of with matx.
+_LAZY_SUBMODULES = ("text", "vision", "tools")
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        import importlib
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+
+def _load_text_ops():
+    from .text._dso_loader import load_text_ops_lib
+    load_text_ops_lib()
+
+
+def _load_vision_ops():
+    from .vision import base
+
+
+def _text_ops_loaded():
+    # the loader module is looked up without importing it, importing it loads the lib
+    dso_loader = _sys.modules.get(__name__ + ".text._dso_loader")
+    return dso_loader is not None and dso_loader._TEXT_OPS_LIB_LOADER_STATE
+
+
+def _vision_ops_loaded():
+    return (__name__ + ".vision.base") in _sys.modules
+
+
+# the native classes used by a loaded model pull in their op libraries
+pipeline.PluginLoader.register_prefix("text_", _load_text_ops, _text_ops_loaded)
+pipeline.PluginLoader.register_prefix("Vision", _load_vision_ops, _vision_ops_loaded)
+
+if _sys.version_info < (3, 7):
+    # module __getattr__ is not supported
+    from . import text
+    from . import vision
+    from . import tools
+
 
 # compiling api
 
@@ -356,8 +397,12 @@ def script_embedded_class(code, is_path=False):
     return toolchain.script_embedded_class(code, is_path)
 
 
-def save(jit_module, folder, force_override=False):
-    return pipeline.save(jit_module, folder, force_override)
+def prebuild(compiling_objs, num_workers=None, wait=True):
+    return toolchain.prebuild(compiling_objs, num_workers, wait)
+
+
+def save(jit_module, folder, force_override=False, binary=False):
+    return pipeline.save(jit_module, folder, force_override, binary)
 
 
 def load(folder, device):
@@ -24,6 +24,7 @@
 #include <matxscript/runtime/c_runtime_api.h>
 
 #include <unordered_map>
+#include <vector>
 
 static int PyObjectToMATXScriptAny(PyObject* arg_0, MATXScriptAny* value);
 static int PyObjectToMATXScriptList(PyObject* arg_0, MATXScriptAny* value);
@@ -154,6 +155,32 @@ static PyObject* PyObjectMATXScriptPackedFuncBase_repr(PyObject* self0) {
       "PackedFuncBase(handle: %p, is_global: %d)", self->handle, self->is_global);
 }
 
+/******************************************************************************
+ * Native calls run without the GIL, it is reacquired by
+ * PythonClosureMATXScriptPackedCFunc when a python callback is invoked.
+ *****************************************************************************/
+
+static inline int MATXScriptFuncCallWithoutGIL(MATXScriptFunctionHandle func,
+                                               MATXScriptAny* args,
+                                               int num_args,
+                                               MATXScriptAny* ret_val) {
+  PyThreadState* thread_state = PyEval_SaveThread();
+  int ret = MATXScriptFuncCall_PYTHON_C_API(func, args, num_args, ret_val);
+  PyEval_RestoreThread(thread_state);
+  return ret;
+}
+
+static inline int MATXScriptPipelineOpKernelCallWithoutGIL(void* op_kernel_ptr,
+                                                           MATXScriptAny* args,
+                                                           int num_args,
+                                                           int move_mode,
+                                                           MATXScriptAny* ret_val) {
+  PyThreadState* thread_state = PyEval_SaveThread();
+  int ret = MATXScriptPipelineOpKernelCall(op_kernel_ptr, args, num_args, move_mode, ret_val);
+  PyEval_RestoreThread(thread_state);
+  return ret;
+}
+
 PyObject* PyObjectMATXScriptPackedFuncBase_call(PyObject* self0, PyObject* args, PyObject* kwargs) {
   PyObjectMATXScriptPackedFuncBase* self = (PyObjectMATXScriptPackedFuncBase*)(self0);
   Py_ssize_t size = PyTuple_GET_SIZE(args);
@@ -169,7 +196,7 @@ PyObject* PyObjectMATXScriptPackedFuncBase_call(PyObject* self0, PyObject* args,
   }
 
   MATXScriptAny ret_val;
-  if (0 != MATXScriptFuncCall_PYTHON_C_API(self->handle, item_buffer, success_args, &ret_val)) {
+  if (0 != MATXScriptFuncCallWithoutGIL(self->handle, item_buffer, success_args, &ret_val)) {
     PyErr_SetString(PyExc_TypeError, MATXScriptAPIGetLastError());
     goto FREE_ARGS;
   }
@@ -343,7 +370,7 @@ PyObject* PyObjectMATXScriptObjectBase___init_handle_by_constructor__(PyObject*
   }
 
   MATXScriptAny ret_val;
-  if (0 != MATXScriptFuncCall_PYTHON_C_API(func_addr, item_buffer, size - 1, &ret_val)) {
+  if (0 != MATXScriptFuncCallWithoutGIL(func_addr, item_buffer, size - 1, &ret_val)) {
     PyErr_SetString(PyExc_TypeError, MATXScriptAPIGetLastError());
     goto FREE_ARGS;
   }
@@ -690,9 +717,16 @@ static int PyObjectToMATXScriptAny(PyObject* arg_0, MATXScriptAny* value) {
       return -1;
     }
   } else if (PyUnicode_Check(arg_0)) {
-    Py_ssize_t len;
-    const char* bytes = PyUnicode_AsUTF8AndSize(arg_0, &len);
-    if (MATXScriptRuntimeMakeUnicode(bytes, size_t(len), value)) {
+    // widen the compact str data directly, without building and caching its utf-8 copy
+#if PY_VERSION_HEX < 0x030C0000
+    if (PyUnicode_READY(arg_0)) {
+      return -1;
+    }
+#endif
+    if (MATXScriptRuntimeMakeUnicodeFromKind(PyUnicode_DATA(arg_0),
+                                             size_t(PyUnicode_GET_LENGTH(arg_0)),
+                                             PyUnicode_KIND(arg_0),
+                                             value)) {
       PyErr_SetString(PyExc_TypeError, "failed to convert python str to matx runtime str");
       return -1;
     }
@@ -1156,7 +1190,8 @@ static PyObject* matx_script_api_op_kernel_call(PyObject* self, PyObject* args)
   }
 
   MATXScriptAny ret_val;
-  if (0 != MATXScriptPipelineOpKernelCall(op_kernel_ptr, item_buffer, success_args, 1, &ret_val)) {
+  if (0 != MATXScriptPipelineOpKernelCallWithoutGIL(
+               op_kernel_ptr, item_buffer, success_args, 1, &ret_val)) {
     PyErr_SetString(PyExc_TypeError, MATXScriptAPIGetLastError());
     goto RETURN_FLAG;
   }
@@ -1224,10 +1259,10 @@ static PyObject* matx_script_api_make_any(PyObject* self, PyObject* args) {
   return obj;
 }
 
-static int PythonClosureMATXScriptPackedCFunc(MATXScriptAny* args,
-                                              int num_args,
-                                              MATXScriptValueHandle ret,
-                                              void* resource_handle) {
+static int PythonClosureMATXScriptPackedCFuncImpl(MATXScriptAny* args,
+                                                  int num_args,
+                                                  MATXScriptValueHandle ret,
+                                                  void* resource_handle) {
   PyObject* py_func = (PyObject*)resource_handle;
   PyObject* py_args = PyTuple_New(num_args);
   if (!py_args) {
@@ -1268,9 +1303,26 @@ static int PythonClosureMATXScriptPackedCFunc(MATXScriptAny* args,
   return MATXScriptCFuncSetReturn(ret, &c_ret, 1);
 }
 
+static int PythonClosureMATXScriptPackedCFunc(MATXScriptAny* args,
+                                              int num_args,
+                                              MATXScriptValueHandle ret,
+                                              void* resource_handle) {
+  // the caller may be a native worker thread or a thread which has released the GIL
+  PyGILState_STATE gil_state = PyGILState_Ensure();
+  int result = PythonClosureMATXScriptPackedCFuncImpl(args, num_args, ret, resource_handle);
+  PyGILState_Release(gil_state);
+  return result;
+}
+
 static void PythonClosureMATXScriptPackedCFuncFinalizer(void* resource_handle) {
+  if (!Py_IsInitialized()) {
+    // the interpreter has been finalized, nothing to release
+    return;
+  }
   PyObject* py_func = (PyObject*)resource_handle;
+  PyGILState_STATE gil_state = PyGILState_Ensure();
   Py_DECREF(py_func);
+  PyGILState_Release(gil_state);
 }
 
 static PyObject* matx_script_api_convert_to_packed_func(PyObject* self, PyObject* py_func) {
@@ -1311,6 +1363,57 @@ static PyObject* matx_script_api_to_runtime_object(PyObject* self, PyObject* py_
   return matx_script_api_return_switch_impl(&c_ret);
 }
 
+// pack a list or tuple of str/bytes into a StringBatch without making a runtime object per item
+static PyObject* matx_script_api_make_string_batch(PyObject* self, PyObject* py_obj) {
+  PyObject* seq = PySequence_Fast(py_obj, "expect a list or tuple of str or bytes");
+  if (seq == NULL) {
+    return NULL;
+  }
+  Py_ssize_t size = PySequence_Fast_GET_SIZE(seq);
+  PyObject** py_items = PySequence_Fast_ITEMS(seq);
+  int is_unicode = size == 0 || PyUnicode_Check(py_items[0]);
+  std::vector<const char*> items(size);
+  std::vector<size_t> sizes(size);
+  std::vector<int> kinds(is_unicode ? size : 0);
+  MATXScriptAny c_ret;
+  for (Py_ssize_t i = 0; i < size; ++i) {
+    PyObject* item = py_items[i];
+    if (is_unicode && PyUnicode_Check(item)) {
+      // pass the PEP 393 code units, they are utf-8 encoded straight into the batch buffer
+      // and no utf-8 copy is cached in the str
+#if PY_VERSION_HEX < 0x030C0000
+      if (PyUnicode_READY(item)) {
+        goto ERROR_FLAG;
+      }
+#endif
+      items[i] = (const char*)PyUnicode_DATA(item);
+      sizes[i] = size_t(PyUnicode_GET_LENGTH(item));
+      kinds[i] = PyUnicode_IS_ASCII(item) ? 0 : int(PyUnicode_KIND(item));
+    } else if (!is_unicode && PyBytes_Check(item)) {
+      items[i] = PyBytes_AS_STRING(item);
+      sizes[i] = size_t(PyBytes_GET_SIZE(item));
+    } else {
+      PyErr_SetString(PyExc_TypeError, "StringBatch items must be all str or all bytes");
+      goto ERROR_FLAG;
+    }
+  }
+  if (0 != MATXScriptRuntimeMakeStringBatch(items.data(),
+                                            sizes.data(),
+                                            is_unicode ? kinds.data() : NULL,
+                                            size,
+                                            is_unicode,
+                                            &c_ret)) {
+    PyErr_SetString(PyExc_TypeError, MATXScriptAPIGetLastError());
+    goto ERROR_FLAG;
+  }
+  Py_DECREF(seq);
+  return matx_script_api_return_switch_impl(&c_ret);
+
+ERROR_FLAG:
+  Py_DECREF(seq);
+  return NULL;
+}
+
 static void dlpack_capsule_destructor(PyObject* data) {
   DLManagedTensor* dlm_tensor = (DLManagedTensor*)PyCapsule_GetPointer(data, "dltensor");
   if (dlm_tensor) {
@@ -1386,6 +1489,7 @@ static PyMethodDef MATXScriptAPIMethods[] = {
     {"release_object_handle", matx_script_api_release_object_handle, METH_O, ""},
     {"convert_to_packed_func", matx_script_api_convert_to_packed_func, METH_O, ""},
     {"to_runtime_object", matx_script_api_to_runtime_object, METH_O, ""},
+    {"make_string_batch", matx_script_api_make_string_batch, METH_O, ""},
     {"_to_dlpack", matx_script_api_to_dlpack, METH_O, ""},
     {"_from_dlpack", matx_script_api_from_dlpack, METH_O, ""},
     {NULL, NULL, 0, NULL} /* Sentinel */
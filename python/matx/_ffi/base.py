@@ -386,6 +386,22 @@ def get_last_ffi_error():
         The error object based on the err_msg
     """
     c_err_msg = py_str(_LIB.MATXScriptAPIGetLastError())
+    return get_ffi_error(c_err_msg)
+
+
+def get_ffi_error(c_err_msg):
+    """Create error object given a C API error message.
+
+    Parameters
+    ----------
+    c_err_msg : str
+        The error message from the C side
+
+    Returns
+    -------
+    err : object
+        The error object based on the err_msg
+    """
     py_err_msg, err_type = c2pyerror(c_err_msg)
     if err_type is not None and err_type.startswith("matx.error."):
         err_type = err_type[11:]
@@ -28,3 +28,4 @@ from . import ndk
 from . import tar
 from . import util
 from . import cpp_extension
+from . import compile_cache
@@ -128,6 +128,33 @@ def create_shared(output, objects, options=None, cc="g++"):
         raise ValueError("Unsupported platform")
 
 
+def create_object(output, source, options=None, cc="g++"):
+    """Compile a source file to a position independent object file.
+
+    Parameters
+    ----------
+    output : str
+        The target object file.
+
+    source : str
+        The source file.
+
+    options : List[str]
+        The list of additional options string.
+
+    cc : Optional[str]
+        The compiler command.
+    """
+    if (
+        sys.platform == "darwin"
+        or sys.platform.startswith("linux")
+        or sys.platform.startswith("freebsd")
+    ):
+        _linux_compile(output, [source], options, cc)
+    else:
+        raise ValueError("Unsupported platform")
+
+
 def create_executable(output, objects, options=None, cc="g++"):
     """Create executable binary.
 
@@ -272,6 +299,8 @@ def _linux_compile(output, objects, options, compile_cmd="g++", compile_shared=F
             cmd += ["-undefined", "dynamic_lookup"]
     elif output.endswith(".obj"):
         cmd += ["-c"]
+    elif output.endswith(".o"):
+        cmd += ["-c", "-fPIC"]
     cmd += ["-o", output]
     if isinstance(objects, str):
         cmd += [objects]
@@ -0,0 +1,275 @@
+# Copyright 2022 ByteDance Ltd. and/or its affiliates.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Content addressed cache of compiled shared libraries"""
+import functools
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+
+from .util import filelock
+
+
+@functools.lru_cache(maxsize=None)
+def compiler_identity(cc):
+    """Get the identity of a compiler, two compilers with the same identity
+    are expected to produce the same library.
+
+    Parameters
+    ----------
+    cc : str
+        The compiler command.
+
+    Returns
+    -------
+    identity : str
+        The resolved compiler path and its version message.
+    """
+    cc_path = shutil.which(cc) or cc
+    try:
+        proc = subprocess.Popen([cc_path, "--version"],
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT)
+        (out, _) = proc.communicate()
+        version = out.decode("utf-8", errors="replace")
+    except OSError:
+        version = ""
+    return os.path.realpath(cc_path) + "\n" + version
+
+
+def make_key(source, options, cc, extra=""):
+    """Make the cache key of a compilation.
+
+    Parameters
+    ----------
+    source : str
+        The generated c++ source code.
+
+    options : List[str]
+        The compiler flags.
+
+    cc : str
+        The compiler command.
+
+    extra : str
+        Other things the result depends on, e.g. the version of libmatx.
+
+    Returns
+    -------
+    key : str
+        The hex digest of the inputs.
+    """
+    sha = hashlib.sha256()
+    for item in (source, "\0".join(options), compiler_identity(cc), extra):
+        sha.update(item.encode("utf-8"))
+        sha.update(b"\0")
+    return sha.hexdigest()
+
+
+class CompileCache(object):
+    """A directory of compiled libraries addressed by the hash of their inputs.
+
+    Entries are evicted in least recently used order once the total size of
+    the cache directory exceeds max_size. The total is kept in a size file
+    updated by every store, the directory is only scanned when the file is
+    missing or the total goes over max_size. The read only directories are
+    searched after the cache directory and are never written, so they can be
+    shared by many hosts, e.g. on NFS or baked into an image.
+
+    Parameters
+    ----------
+    cache_dir : str
+        The writable cache directory, None means only read only directories are used.
+
+    max_size : int
+        The max total size of the cache directory in bytes, non-positive means no limit.
+
+    read_only_dirs : List[str]
+        The shared cache directories.
+
+    suffix : str
+        The file suffix of the entries, e.g. ".o" for a cache of object files.
+    """
+
+    def __init__(self, cache_dir, max_size=0, read_only_dirs=(), suffix=".so"):
+        self.cache_dir = os.path.abspath(cache_dir) if cache_dir else None
+        self.max_size = max_size
+        self.read_only_dirs = [os.path.abspath(d) for d in read_only_dirs if d]
+        self.suffix = suffix
+
+    def _entry_path(self, root, key):
+        return os.path.join(root, key[:2], key + self.suffix)
+
+    def lookup(self, key):
+        """Find a cached library.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+
+        Returns
+        -------
+        path : Optional[str]
+            The path of the cached library, None if not found.
+        """
+        if self.cache_dir:
+            path = self._entry_path(self.cache_dir, key)
+            if os.path.isfile(path):
+                try:
+                    # the mtime records the last use for eviction
+                    os.utime(path)
+                except OSError:
+                    pass
+                return path
+        for root in self.read_only_dirs:
+            path = self._entry_path(root, key)
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def fetch(self, key, output):
+        """Copy a cached library to output.
+
+        Returns
+        -------
+        hit : bool
+            Whether the key is found.
+        """
+        path = self.lookup(key)
+        if path is None:
+            return False
+        _atomic_copy(path, output)
+        return True
+
+    def store(self, key, lib_path):
+        """Add a compiled library to the cache directory and evict old entries.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+
+        lib_path : str
+            The compiled library.
+        """
+        if not self.cache_dir:
+            return
+        path = self._entry_path(self.cache_dir, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = 0
+        _atomic_copy(lib_path, path)
+        if self.max_size > 0:
+            self._add_size(os.path.getsize(path) - old_size)
+
+    def _size_path(self):
+        return os.path.join(self.cache_dir, "size")
+
+    def _read_size(self):
+        try:
+            with open(self._size_path()) as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _write_size(self, total_size):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp_")
+        with os.fdopen(fd, "w") as f:
+            f.write(str(total_size))
+        os.replace(tmp_path, self._size_path())
+
+    def _add_size(self, delta):
+        with filelock(os.path.join(self.cache_dir, "evict")):
+            total_size = self._read_size()
+            if total_size is None:
+                total_size = sum(size for _, size, _ in self.entries())
+            else:
+                total_size += delta
+            if total_size > self.max_size:
+                # the running total may be off, e.g. after entries were removed by hand
+                total_size = self._evict(self.max_size)
+            self._write_size(total_size)
+
+    def entries(self):
+        """List the entries of the cache directory.
+
+        Returns
+        -------
+        entries : List[Tuple[float, int, str]]
+            (last use time, size, path) of each entry.
+        """
+        result = []
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return result
+        for sub_dir in os.listdir(self.cache_dir):
+            sub_path = os.path.join(self.cache_dir, sub_dir)
+            if not os.path.isdir(sub_path):
+                continue
+            for name in os.listdir(sub_path):
+                if not name.endswith(self.suffix):
+                    continue
+                path = os.path.join(sub_path, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                result.append((st.st_mtime, st.st_size, path))
+        return result
+
+    def evict(self, max_size):
+        """Remove the least recently used entries until the cache directory fits in max_size.
+
+        Parameters
+        ----------
+        max_size : int
+            The max total size in bytes.
+        """
+        with filelock(os.path.join(self.cache_dir, "evict")):
+            self._write_size(self._evict(max_size))
+
+    def _evict(self, max_size):
+        entries = sorted(self.entries())
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total_size <= max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+        return total_size
+
+
+def _atomic_copy(src, dst):
+    dst_dir = os.path.dirname(os.path.abspath(dst))
+    fd, tmp_path = tempfile.mkstemp(dir=dst_dir, prefix=".tmp_")
+    os.close(fd)
+    try:
+        shutil.copyfile(src, tmp_path)
+        os.chmod(tmp_path, 0o755)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -31,3 +31,20 @@ try:
     os.makedirs(MATX_USER_DIR, exist_ok=True)
 except:
     print('[WARNING] User directory created failed: ', MATX_USER_DIR, file=sys.stderr)
+
+# compiled libraries are shared by all the processes through the compile cache
+MATX_COMPILE_CACHE_DIR = os.environ.get('MATX_COMPILE_CACHE_DIR',
+                                        os.path.join(MATX_USER_DIR, 'compile_cache'))
+# the total size of the libraries and the object files in the cache directory
+MATX_COMPILE_CACHE_SIZE_MB = int(os.environ.get('MATX_COMPILE_CACHE_SIZE_MB', '4096'))
+# read only cache directories, separated by os.pathsep
+MATX_COMPILE_CACHE_READONLY_DIRS = [
+    d for d in os.environ.get('MATX_COMPILE_CACHE_READONLY_DIRS', '').split(os.pathsep) if d
+]
+
+# when > 1, generated modules are split into up to this many translation units which are
+# compiled in parallel. The calls across units can not be inlined without LTO, so the
+# compiled code may be slower, splitting is only done when it is set explicitly.
+MATX_COMPILE_JOBS = int(os.environ.get('MATX_COMPILE_JOBS', '1'))
+# the min size in bytes of the generated functions in one translation unit
+MATX_COMPILE_UNIT_SIZE = int(os.environ.get('MATX_COMPILE_UNIT_SIZE', str(64 * 1024)))
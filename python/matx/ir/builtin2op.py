@@ -310,6 +310,20 @@ _register_python_builtin("{}.runtime.ndarray.mul".format("matx"), "nd_module_mul
 _register_python_builtin("{}.runtime.ndarray.rand".format("matx"), "nd_module_rand")
 _register_python_builtin("{}.runtime.ndarray.concatenate".format("matx"), "nd_module_concatenate")
 _register_python_builtin("{}.runtime.ndarray.stack".format("matx"), "nd_module_stack")
+_register_python_builtin("{}.runtime.ndarray.sum".format("matx"), "nd_module_sum")
+_register_python_builtin("{}.runtime.ndarray.mean".format("matx"), "nd_module_mean")
+_register_python_builtin("{}.runtime.ndarray.max".format("matx"), "nd_module_max")
+_register_python_builtin("{}.runtime.ndarray.min".format("matx"), "nd_module_min")
+_register_python_builtin("{}.runtime.ndarray.argmax".format("matx"), "nd_module_argmax")
+_register_python_builtin("{}.runtime.ndarray.argmin".format("matx"), "nd_module_argmin")
+_register_python_builtin("{}.runtime.ndarray.exp".format("matx"), "nd_module_exp")
+_register_python_builtin("{}.runtime.ndarray.log".format("matx"), "nd_module_log")
+_register_python_builtin("{}.runtime.ndarray.sqrt".format("matx"), "nd_module_sqrt")
+_register_python_builtin("{}.runtime.ndarray.abs".format("matx"), "nd_module_abs")
+_register_python_builtin("{}.runtime.ndarray.clip".format("matx"), "nd_module_clip")
+_register_python_builtin("{}.runtime.ndarray.where".format("matx"), "nd_module_where")
+_register_python_builtin("{}.runtime.ndarray.cast_scale".format("matx"), "nd_module_cast_scale")
+_register_python_builtin("{}.runtime.ndarray.evaluate".format("matx"), "nd_module_evaluate")
 
 # TODO: support heapq
 _register_python_builtin("{}.list_sort".format("matx"), "list_module_sort")
@@ -383,6 +397,8 @@ _register_op("{}.pstarmap".format(_module_name_), _ir_op.matx_pstarmap)
 _register_op("{}.apply_async".format(_module_name_), _ir_op.matx_apply_async)
 _register_python_builtin("{}.runtime.picke.serialize".format(_module_name_), "pickle_serialize")
 _register_python_builtin("{}.runtime.picke.deserialize".format(_module_name_), "pickle_deserialize")
+_register_python_builtin("{}.runtime.jsonlib.json_dump".format(_module_name_), "json_dump")
+_register_python_builtin("{}.runtime.jsonlib.json_lines".format(_module_name_), "json_lines")
 
 
 def register_pypi_extension():
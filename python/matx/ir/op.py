@@ -2390,6 +2390,18 @@ def json_dumps(span, obj, indent=None, ensure_ascii=True):
     return hlo_call_intrin(_type.UnicodeType(), func_name, span, obj, indent, ensure_ascii)
 
 
+def json_dump(span, obj, path, indent=None, ensure_ascii=True):
+    func_name = 'ir.json_dump'
+    if indent is None:
+        indent = -1
+    return hlo_call_intrin(_type.VoidType(), func_name, span, obj, path, indent, ensure_ascii)
+
+
+def json_lines(span, path):
+    func_name = 'ir.json_lines'
+    return hlo_call_intrin(_type.IteratorType(_type.ObjectType()), func_name, span, path)
+
+
 def object_pop(span, container_expr, *args, **kwargs):
     func_name = _builtin_func_name(container_expr, "pop")
     container_type = container_expr.checked_type
@@ -2992,24 +3004,32 @@ def builtins_exception(span, exc_cls_name, *args, **kwargs):
     return call_extern(_type.ExceptionType(exc_cls_name), "MAKE_PY_" + exc_cls_name, span, *args)
 
 
-def nd_module_add(span, lhs, rhs):
+def nd_module_add(span, lhs, rhs, out=None):
     func_name = "ir.nd_module_add"
-    return hlo_call_intrin(_type.DynTensorType(), func_name, span, lhs, rhs)
+    if out is None:
+        return hlo_call_intrin(_type.DynTensorType(), func_name, span, lhs, rhs)
+    return hlo_call_intrin(_type.DynTensorType(), func_name, span, lhs, rhs, out)
 
 
-def nd_module_sub(span, lhs, rhs):
+def nd_module_sub(span, lhs, rhs, out=None):
     func_name = "ir.nd_module_sub"
-    return hlo_call_intrin(_type.DynTensorType(), func_name, span, lhs, rhs)
+    if out is None:
+        return hlo_call_intrin(_type.DynTensorType(), func_name, span, lhs, rhs)
+    return hlo_call_intrin(_type.DynTensorType(), func_name, span, lhs, rhs, out)
 
 
-def nd_module_div(span, lhs, rhs):
+def nd_module_div(span, lhs, rhs, out=None):
     func_name = "ir.nd_module_div"
-    return hlo_call_intrin(_type.DynTensorType(), func_name, span, lhs, rhs)
+    if out is None:
+        return hlo_call_intrin(_type.DynTensorType(), func_name, span, lhs, rhs)
+    return hlo_call_intrin(_type.DynTensorType(), func_name, span, lhs, rhs, out)
 
 
-def nd_module_mul(span, lhs, rhs):
+def nd_module_mul(span, lhs, rhs, out=None):
     func_name = "ir.nd_module_mul"
-    return hlo_call_intrin(_type.DynTensorType(), func_name, span, lhs, rhs)
+    if out is None:
+        return hlo_call_intrin(_type.DynTensorType(), func_name, span, lhs, rhs)
+    return hlo_call_intrin(_type.DynTensorType(), func_name, span, lhs, rhs, out)
 
 
 def nd_module_rand(span, shape):
@@ -3027,6 +3047,92 @@ def nd_module_stack(span, seq, *args):
     return hlo_call_intrin(_type.DynTensorType(), func_name, span, seq, *args)
 
 
+def _nd_module_reduce(func_name, span, nd, axis, keepdims):
+    if axis is None:
+        axis = NoneExpr()
+    if not isinstance(keepdims, BaseExpr):
+        keepdims = const(keepdims, "bool")
+    return hlo_call_intrin(_type.ObjectType(), func_name, span, nd, axis, keepdims)
+
+
+def nd_module_sum(span, nd, axis=None, keepdims=False):
+    return _nd_module_reduce("ir.nd_module_sum", span, nd, axis, keepdims)
+
+
+def nd_module_mean(span, nd, axis=None, keepdims=False):
+    return _nd_module_reduce("ir.nd_module_mean", span, nd, axis, keepdims)
+
+
+def nd_module_max(span, nd, axis=None, keepdims=False):
+    return _nd_module_reduce("ir.nd_module_max", span, nd, axis, keepdims)
+
+
+def nd_module_min(span, nd, axis=None, keepdims=False):
+    return _nd_module_reduce("ir.nd_module_min", span, nd, axis, keepdims)
+
+
+def nd_module_argmax(span, nd, axis=None, keepdims=False):
+    return _nd_module_reduce("ir.nd_module_argmax", span, nd, axis, keepdims)
+
+
+def nd_module_argmin(span, nd, axis=None, keepdims=False):
+    return _nd_module_reduce("ir.nd_module_argmin", span, nd, axis, keepdims)
+
+
+def _nd_module_unary(func_name, span, nd, out):
+    if out is None:
+        return hlo_call_intrin(_type.DynTensorType(), func_name, span, nd)
+    return hlo_call_intrin(_type.DynTensorType(), func_name, span, nd, out)
+
+
+def nd_module_exp(span, nd, out=None):
+    return _nd_module_unary("ir.nd_module_exp", span, nd, out)
+
+
+def nd_module_log(span, nd, out=None):
+    return _nd_module_unary("ir.nd_module_log", span, nd, out)
+
+
+def nd_module_sqrt(span, nd, out=None):
+    return _nd_module_unary("ir.nd_module_sqrt", span, nd, out)
+
+
+def nd_module_abs(span, nd, out=None):
+    return _nd_module_unary("ir.nd_module_abs", span, nd, out)
+
+
+def nd_module_clip(span, nd, lo=None, hi=None, out=None):
+    func_name = "ir.nd_module_clip"
+    lo = NoneExpr() if lo is None else lo
+    hi = NoneExpr() if hi is None else hi
+    if out is None:
+        return hlo_call_intrin(_type.DynTensorType(), func_name, span, nd, lo, hi)
+    return hlo_call_intrin(_type.DynTensorType(), func_name, span, nd, lo, hi, out)
+
+
+def nd_module_where(span, cond, x, y):
+    func_name = "ir.nd_module_where"
+    return hlo_call_intrin(_type.DynTensorType(), func_name, span, cond, x, y)
+
+
+def nd_module_cast_scale(span, nd, dtype, scale=1.0, shift=0.0, out=None):
+    func_name = "ir.nd_module_cast_scale"
+    if not isinstance(scale, BaseExpr):
+        scale = const(scale, "float64")
+    if not isinstance(shift, BaseExpr):
+        shift = const(shift, "float64")
+    if out is None:
+        return hlo_call_intrin(_type.DynTensorType(), func_name, span, nd, dtype, scale, shift)
+    return hlo_call_intrin(_type.DynTensorType(), func_name, span, nd, dtype, scale, shift, out)
+
+
+def nd_module_evaluate(span, expr, operands, out=None):
+    func_name = "ir.nd_module_evaluate"
+    if out is None:
+        return hlo_call_intrin(_type.DynTensorType(), func_name, span, expr, operands)
+    return hlo_call_intrin(_type.DynTensorType(), func_name, span, expr, operands, out)
+
+
 def list_module_sort(span, seq, *args):
     func_name = "ir.list_module_sort"
     return hlo_call_intrin(_type.VoidType(), func_name, span, seq, *args)
@@ -26,6 +26,7 @@ from ._native_object import load_native_object
 from ._native_func import NativeFunction
 from ._native_func import make_native_function
 from ._native_func import load_native_function
+from ._string_batch import StringBatch
 from . import _ffi_api
 
 _cur_module = sys.modules[__name__]
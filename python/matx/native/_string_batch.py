@@ -0,0 +1,92 @@
+# Copyright 2022 ByteDance Ltd. and/or its affiliates.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from .._ffi._selector import matx_script_api
+from ..runtime import UserData
+from ._native_object import NativeClass
+from ._native_object import set_class_method
+from . import _ffi_api
+
+# the methods registered by the runtime, see src/runtime/container/string_batch.cc
+_StringBatchBase = type("StringBatch", (NativeClass,), {})
+set_class_method(_StringBatchBase)
+
+
+class StringBatch(_StringBatchBase):
+    """A columnar batch of str or bytes.
+
+    All items are stored back to back in one utf-8 buffer plus an int64 offsets array,
+    the same layout as an Arrow large_string/large_binary array. Passing a batch into an op
+    costs one copy of the bytes instead of one runtime object per item, and ops such as
+    WordPieceTokenizer read and write it without boxing the items.
+
+    Args:
+        items (List[str] or List[bytes] or Tuple, optional): all str or all bytes.
+        is_unicode (bool, optional): the item type of an empty batch, True for str.
+
+    Examples:
+
+        >>> import matx
+        >>> batch = matx.StringBatch(["hello", "world"])
+        >>> len(batch), batch[1], batch.to_list()
+        (2, 'world', ['hello', 'world'])
+    """
+
+    def __init__(self, items=(), is_unicode=True):
+        self.cls_name = "StringBatch"
+        if isinstance(items, UserData):
+            # a batch returned by an op
+            self.ud_ref = items
+        elif isinstance(items, (list, tuple)):
+            if len(items) == 0:
+                self.ud_ref = _ffi_api.CreateNativeObject(self.cls_name.encode(), is_unicode)
+            else:
+                self.ud_ref = matx_script_api.make_string_batch(items)
+        else:
+            raise TypeError("expect a list or tuple of str or bytes, but get %s" % type(items))
+
+    @staticmethod
+    def from_buffers(data, offsets, is_unicode=True):
+        """Make a batch from Arrow style buffers, item i is data[offsets[i]:offsets[i + 1]].
+
+        Args:
+            data (bytes): the utf-8 bytes of all items.
+            offsets (matx.NDArray or List[int]): size + 1 int64 offsets, they may start
+                after 0 like the offsets of a sliced Arrow array.
+            is_unicode (bool, optional): whether the items are str or bytes.
+
+        Returns:
+            StringBatch
+        """
+        ud_ref = _ffi_api.CreateNativeObject(b"StringBatch", data, offsets, is_unicode)
+        return StringBatch(ud_ref)
+
+    def buffers(self):
+        """The Arrow buffers of the batch, a uint8 data NDArray and an int64 offsets NDArray."""
+        return self.data(), self.offsets()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            assert index.step is None or index.step == 1, "StringBatch slice step must be 1"
+            start = 0 if index.start is None else index.start
+            stop = len(self) if index.stop is None else index.stop
+            return StringBatch(_StringBatchBase.__getslice__(self, start, stop))
+        return _StringBatchBase.__getitem__(self, index)
+
+    def __repr__(self):
+        return "StringBatch(%r)" % (self.to_list(),)
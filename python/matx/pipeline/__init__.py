@@ -32,6 +32,8 @@ from ..contrib.statistic import counter
 from .module import JITModule
 from .module import Module
 from .module import load_module, LoadModule
+from .module import default_spec_name
+from .server import Server
 from . import ops
 from . import warmup
 from ._base import TXObject
@@ -183,7 +185,7 @@ def trace(func, *args, **kwargs):
 Trace = trace
 
 
-def save(jit_module, folder, force_override=False):
+def save(jit_module, folder, force_override=False, binary=False):
     """Save a Module to folder
 
     Parameters
@@ -196,11 +198,19 @@ def save(jit_module, folder, force_override=False):
 
     force_override : bool
 
+    binary : bool
+        save the spec as model.spec.msgpack, the large NDArray and bytes constants
+        are saved in model.spec.data which is memory-mapped when loading.
+        Only the NDArrays are loaded without a copy and share the page cache between
+        processes. The bytes constants, e.g. vocab tables, are copied out of the mapping,
+        so every process holds a private copy of them.
+        The spec of the other format in folder is removed
+
     Returns
     -------
 
     """
-    name = "model.spec.json"
+    name = "model.spec.msgpack" if binary else "model.spec.json"
     if (force_override
             and os.path.exists(folder)
             and folder.rstrip("/\\") not in ("/", ".", "..", "*")):
@@ -227,7 +237,8 @@ def SaveMeta(folder, model_name, allowed_batch_sizes):
 
 
 def load(folder, device):
-    """Load a matx model from folder
+    """Load a matx model from folder, it fails if both model.spec.msgpack and
+    model.spec.json exist
 
     Parameters
     ----------
@@ -243,8 +254,7 @@ def load(folder, device):
         The executable module
 
     """
-    name = "model.spec.json"
-    return load_module(os.path.abspath(folder), name, device)
+    return load_module(os.path.abspath(folder), default_spec_name(folder), device)
 
 
 Load = load
@@ -281,7 +291,29 @@ def BuildSimpleGraph(op, signatures, num_output):
 _MATX_GLOBAL_PLUGINS_ = list()
 
 
-def load_ops(lib_paths):
+def _load_op_lib(op_dll):
+    lib_pp = os.path.abspath(os.path.dirname(op_dll))
+    cwd = os.getcwd()
+    if lib_pp != "":
+        os.chdir(lib_pp)
+    lib = ctypes.CDLL(op_dll, ctypes.RTLD_GLOBAL)
+    os.chdir(cwd)
+    _MATX_GLOBAL_PLUGINS_.append(lib)
+
+
+def _make_lazy_op_creator_function(op_class_name, loader):
+    creator = make_op_creator_function(op_class_name)
+
+    def lazy_creator(**kwargs):
+        loader()
+        return creator(**kwargs)
+
+    lazy_creator.__name__ = creator.__name__
+    lazy_creator.__doc__ = creator.__doc__
+    return lazy_creator
+
+
+def load_ops(lib_paths, op_names=None):
     """Load extend ops from dynamic lib and register to matx
 
     Parameters
@@ -289,6 +321,10 @@ def load_ops(lib_paths):
     lib_paths : str
         dynamic lib absolute path
 
+    op_names : List[str], optional
+        The op class names in the libs. If given, the libs are loaded on the
+        first use of one of the ops, e.g. when a model using them is loaded.
+
     Returns
     -------
     """
@@ -301,14 +337,23 @@ def load_ops(lib_paths):
     else:
         raise Exception(
             "expect library filepath or filepath list, but receive %s" % lib_paths.__class__)
+    if op_names is not None:
+        pending_paths = list(lib_paths)
+
+        def _lazy_loader():
+            # a lib is dropped only once it is loaded, a failed load is retried on the next use
+            while pending_paths:
+                _load_op_lib(pending_paths[0])
+                pending_paths.pop(0)
+
+        for __op_cls_name in op_names:
+            PluginLoader.register(__op_cls_name, _lazy_loader)
+            if getattr(ops, __op_cls_name, None) is None:
+                __func = _make_lazy_op_creator_function(__op_cls_name, _lazy_loader)
+                setattr(ops, __op_cls_name, __func)
+        return
     for op_dll in lib_paths:
-        lib_pp = os.path.abspath(os.path.dirname(op_dll))
-        cwd = os.getcwd()
-        if lib_pp != "":
-            os.chdir(lib_pp)
-        lib = ctypes.CDLL(op_dll, ctypes.RTLD_GLOBAL)
-        os.chdir(cwd)
-        _MATX_GLOBAL_PLUGINS_.append(lib)
+        _load_op_lib(op_dll)
     for __op_cls_name in _ffi_api.ListAllOpNames():
         if getattr(ops, __op_cls_name, None) is None:
             __func = make_op_creator_function(__op_cls_name)
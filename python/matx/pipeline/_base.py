@@ -25,6 +25,7 @@ import warnings
 from . import _ffi_api
 from .._ffi import libinfo
 from .._ffi import void_p_to_runtime
+from ..runtime import to_runtime_object
 from ._atfork_register import register_session_at_fork, unregister_session_at_fork
 
 
@@ -76,6 +77,29 @@ class TXSession:
     def disable_op_parallelism(self):
         return _ffi_api.TXSessionSetOpParallelismThreads(self.__c_handle, -1)
 
+    def set_dataflow_scheduling(self, enable=True):
+        return _ffi_api.TXSessionSetDataflowScheduling(self.__c_handle, enable)
+
+    def get_dataflow_scheduling(self):
+        return _ffi_api.TXSessionGetDataflowScheduling(self.__c_handle)
+
+    def set_work_stealing_pool(self, enable=True, cpu_ids=None):
+        if cpu_ids is not None:
+            cpu_ids = to_runtime_object(list(cpu_ids))
+        return _ffi_api.TXSessionSetWorkStealingPool(self.__c_handle, enable, cpu_ids)
+
+    def get_work_stealing_pool(self):
+        return _ffi_api.TXSessionGetWorkStealingPool(self.__c_handle)
+
+    def set_async_run_threads(self, thread_num=2):
+        return _ffi_api.TXSessionSetAsyncRunThreads(self.__c_handle, thread_num)
+
+    def get_async_run_threads(self):
+        return _ffi_api.TXSessionGetAsyncRunThreads(self.__c_handle)
+
+    def disable_async_run_threads(self):
+        return _ffi_api.TXSessionSetAsyncRunThreads(self.__c_handle, -1)
+
     def set_pmap_threads(self, thread_num=8, share=False):
         return _ffi_api.TXSessionSetOpComputeThreads(self.__c_handle, thread_num, share)
 
@@ -19,6 +19,8 @@
 
 class PluginLoader(object):
     registrations = dict()
+    prefix_registrations = dict()
+    prefix_states = dict()
 
     @staticmethod
     def lookup(op_name):
@@ -37,6 +39,9 @@ class PluginLoader(object):
         """
         if op_name in PluginLoader.registrations:
             return PluginLoader.registrations[op_name]
+        for prefix, func in PluginLoader.prefix_registrations.items():
+            if op_name.startswith(prefix):
+                return func
         return None
 
     @staticmethod
@@ -56,3 +61,58 @@ class PluginLoader(object):
 
         """
         PluginLoader.registrations[op_name] = func
+
+    @staticmethod
+    def register_prefix(prefix, func, is_loaded=None):
+        """Register a loader for all the ops whose names start with prefix,
+        e.g. the native classes in a bundled op library.
+
+        Parameters
+        ----------
+        prefix : str
+            op class name prefix
+
+        func : callable
+            op plugin's so loader function
+
+        is_loaded : callable, optional
+            returns True if the library is already loaded, e.g. by importing its module
+
+        Returns
+        -------
+
+        """
+        PluginLoader.prefix_registrations[prefix] = func
+        if is_loaded is not None:
+            PluginLoader.prefix_states[prefix] = is_loaded
+
+    @staticmethod
+    def loaded_prefixes():
+        """Get the prefixes whose libraries are loaded in this process
+
+        Returns
+        -------
+        prefixes : List[str]
+            the prefixes, they are saved with a model and loaded again with it
+
+        """
+        return sorted(prefix for prefix, is_loaded in PluginLoader.prefix_states.items()
+                      if is_loaded())
+
+    @staticmethod
+    def load_all_prefixes():
+        """Load the libraries of all the registered prefixes
+
+        Returns
+        -------
+        loaded : bool
+            False if all of them were loaded already
+
+        """
+        loaded = False
+        for prefix, func in PluginLoader.prefix_registrations.items():
+            is_loaded = PluginLoader.prefix_states.get(prefix)
+            if is_loaded is None or not is_loaded():
+                func()
+                loaded = True
+        return loaded
@@ -19,11 +19,16 @@
 from __future__ import absolute_import as _abs
 import os
 import json
+import asyncio
 import sys
 import warnings
 from .._ffi.base import string_types
+from .._ffi.base import get_ffi_error
 from .._ffi.error import trans_exception_from_c_to_py
+from .._ffi.error import trans_exception
 from .._ffi import void_p_to_runtime
+from .._ffi import to_packed_func
+from ..env import MATX_DEV_MODE
 from . import _ffi_api
 from .symbol import Variable
 from .symbol import Symbol
@@ -203,6 +208,46 @@ class JITModule(Module):
     def disable_op_parallelism(self):
         return self._tx_sess.disable_op_parallelism()
 
+    def set_dataflow_scheduling(self, enable=True):
+        """Switch the op parallelism mode to dataflow scheduling, each op starts as soon as
+        its own inputs are ready instead of waiting for the whole previous level.
+        It only takes effect when op parallelism is enabled.
+
+        Parameters
+        ----------
+        enable : bool
+            Enable or disable dataflow scheduling
+
+        Returns
+        -------
+
+        """
+        return self._tx_sess.set_dataflow_scheduling(enable)
+
+    def get_dataflow_scheduling(self):
+        return self._tx_sess.get_dataflow_scheduling()
+
+    def set_work_stealing_pool(self, enable=True, cpu_ids=None):
+        """Use work stealing thread pools for op parallelism and pmap. Each worker has
+        its own task deque and steals from the others when it is empty, idle workers spin
+        shortly and then sleep, so idle sessions do not burn CPU.
+
+        Parameters
+        ----------
+        enable : bool
+            Use work stealing pools, or the default lock based pools when False
+        cpu_ids : List[int], optional
+            Pin the i-th worker of each pool to cpu_ids[i % len(cpu_ids)] (linux only)
+
+        Returns
+        -------
+
+        """
+        return self._tx_sess.set_work_stealing_pool(enable, cpu_ids)
+
+    def get_work_stealing_pool(self):
+        return self._tx_sess.get_work_stealing_pool()
+
     def set_apply_async_threads(self, thread_num=2, share=False):
         return self._tx_sess.set_apply_async_threads(thread_num=thread_num, share=share)
 
@@ -221,6 +266,15 @@ class JITModule(Module):
     def disable_pmap_threads(self):
         return self._tx_sess.disable_pmap_threads()
 
+    def set_async_run_threads(self, thread_num=2):
+        return self._tx_sess.set_async_run_threads(thread_num=thread_num)
+
+    def get_async_run_threads(self):
+        return self._tx_sess.get_async_run_threads()
+
+    def disable_async_run_threads(self):
+        return self._tx_sess.disable_async_run_threads()
+
     def Trace(self, sym):
         warnings.warn("The function JITModule.Trace is deprecated.", DeprecationWarning)
         return self.trace(sym)
@@ -255,6 +309,34 @@ class JITModule(Module):
         self._trace_py_module(sym_list)
         _ffi_api.TXSessionTrace(self._tx_sess.c_handle, *sym_handle_list)
 
+    def optimize(self, fold_constants=True, eliminate_common_subexpr=True,
+                 fuse_interpreter_ops=True):
+        """Optimize the traced graph in place, the optimized graph is used by run and save.
+
+        Only pure builtin operations (arithmetic, compare, len, getitem...) are folded
+        and merged, ops and script functions are kept as they are.
+
+        Parameters
+        ----------
+        fold_constants : bool
+            compute the operations whose inputs are all constants at optimize time
+
+        eliminate_common_subexpr : bool
+            merge the same operation on the same inputs into one node
+
+        fuse_interpreter_ops : bool
+            run a chain of builtin operations as one node
+
+        Returns
+        -------
+        stats : dict
+            the node number before and after, and the number of folded, merged and fused nodes
+        """
+        return _ffi_api.TXSessionOptimizeGraph(self._tx_sess.c_handle,
+                                               fold_constants,
+                                               eliminate_common_subexpr,
+                                               fuse_interpreter_ops)
+
     def Save(self, folder, name="model.spec.json"):
         warnings.warn("The function JITModule.Save is deprecated.", DeprecationWarning)
         return self.save(folder, name)
@@ -268,14 +350,22 @@ class JITModule(Module):
             model path
 
         name : str
-            default, model.spec.json
+            default, model.spec.json. The spec is saved as msgpack if name ends with ".msgpack"
 
         Returns
         -------
 
         """
+        from ._plugin_loader import PluginLoader
         self._save_py_module()
+        # the op libraries are loaded lazily, record them for loading the model in a new process
+        self.set_sess_attr("plugins", PluginLoader.loaded_prefixes())
         _ffi_api.TXSessionSave(self._tx_sess.c_handle, folder, name)
+        # a spec of the other format left in the folder is stale, remove it so load is not ambiguous
+        for stale_name in _other_format_spec_files(name):
+            stale_path = os.path.join(folder, stale_name)
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
         self._save_code_stat_info(folder)
 
     def Run(self, feed_dict):
@@ -317,6 +407,68 @@ class JITModule(Module):
             e = type(e)(*e.args)
             raise e from None
 
+    def run_async(self, feed_dict, loop=None):
+        """Execute Pipeline on the native async run pool and return an awaitable future.
+        The calling thread is not blocked, the future is completed from the worker thread
+        through loop.call_soon_threadsafe. If the async run pool is not enabled,
+        a pool with the default number of threads is created.
+
+        Parameters
+        ----------
+        feed_dict : dict, matx.Dict
+            The input feed dict
+
+        loop : asyncio.AbstractEventLoop, optional
+            The event loop which owns the future, default is the running loop
+
+        Returns
+        -------
+        future : asyncio.Future
+            The future of the output data
+
+        """
+        assert isinstance(feed_dict, dict), "feed_dict type error"
+        if loop is None:
+            loop = asyncio.get_running_loop()
+        if self._tx_sess.get_async_run_threads() == 0:
+            self._tx_sess.set_async_run_threads()
+        feed_dict_v2 = dict()
+        for k, v in feed_dict.items():
+            k = k.encode()
+            feed_dict_v2[k] = v
+        future = loop.create_future()
+
+        def _set_result(result, error_message):
+            if future.done():
+                return
+            if error_message is not None:
+                try:
+                    e = get_ffi_error(error_message)
+                    if not MATX_DEV_MODE:
+                        e, _ = trans_exception(e, use_cc_stacktrace=False)
+                except BaseException as trans_e:
+                    e = trans_e
+                future.set_exception(e)
+            elif len(result) == 1:
+                future.set_result(result[0])
+            else:
+                future.set_result(tuple([obj for obj in result]))
+
+        def _on_done(result, error_message):
+            try:
+                loop.call_soon_threadsafe(_set_result, result, error_message)
+            except RuntimeError:
+                # the event loop is closed
+                pass
+
+        fn_run_async = trans_exception_from_c_to_py(_ffi_api.TXSessionRunAsync)
+        try:
+            fn_run_async(self._tx_sess.c_handle, feed_dict_v2, to_packed_func(_on_done))
+        except BaseException as e:
+            e = type(e)(*e.args)
+            raise e from None
+        return future
+
     def warmup(self, feed_dict):
         """Warmup the Pipeline and get output
 
@@ -394,6 +546,35 @@ class JITModule(Module):
             self._tx_sess.c_handle, op_cls, op_name
         )
 
+    def get_metrics(self):
+        """Get a snapshot of the always-on counters of the session
+
+        Returns
+        -------
+        output : dict
+            "ops" holds the calls, errors and latency histogram of every op,
+            "scheduling_wait" and "compute_wait" are the latency histograms of
+            the time tasks wait in the queues of the thread pools. The bounds
+            and the sums of the histograms are in microseconds.
+
+        """
+        return _ffi_api.TXSessionGetMetrics(self._tx_sess.c_handle)
+
+    def get_metrics_prometheus(self):
+        """Export the counters of the session in the Prometheus text format
+
+        Returns
+        -------
+        output : str
+            The metrics text, latencies are in seconds
+
+        """
+        return _ffi_api.TXSessionGetMetricsPrometheus(self._tx_sess.c_handle)
+
+    def reset_metrics(self):
+        """Reset the counters of the session to zero"""
+        _ffi_api.TXSessionResetMetrics(self._tx_sess.c_handle)
+
     def profile(self, feed_dict, warmup_times=10):
         """Execute Pipeline, get step info, generate timeline and show it
 
@@ -472,13 +653,42 @@ class JITModule(Module):
         return result_info
 
 
+def _collect_op_names(root):
+    from .. import runtime
+    names = set()
+    for op_obj in root[b"ops"]:
+        names.add(op_obj[b"op"].decode())
+    # the plugins which were loaded when the model was saved
+    g_attr = root.get(b"g_attr", None) if isinstance(root, runtime.Dict) else None
+    if isinstance(g_attr, runtime.Dict):
+        for prefix in g_attr.get(b"plugins", []):
+            names.add(prefix.decode() if isinstance(prefix, bytes) else prefix)
+    # native objects are pickled into the op attributes
+    pending = [root[b"ops"]]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, runtime.Dict):
+            for key, value in node.items():
+                if key == b"native_class_name" and isinstance(value, (bytes, str)):
+                    names.add(value.decode() if isinstance(value, bytes) else value)
+                else:
+                    pending.append(value)
+        elif isinstance(node, (runtime.List, runtime.Tuple)):
+            pending.extend(node)
+        elif isinstance(node, runtime.UserData):
+            class_name = _ffi_api.NativeObjectClassName(node)
+            if class_name:
+                names.add(class_name)
+    return sorted(names)
+
+
 def LoadModule(folder, name, device):
     warnings.warn("The function matx.pipeline.LoadModule is deprecated.", DeprecationWarning)
     return load_module(folder, name, device)
 
 
 def load_module(folder, name, device):
-    """Load a matx model from folder
+    """Load a matx model from folder, the spec is msgpack if name ends with ".msgpack"
 
     Parameters
     ----------
@@ -496,25 +706,67 @@ def load_module(folder, name, device):
     module : JITModule
         The executable module
     """
-    from .. import runtime
-    from ._plugin_loader import PluginLoader
     assert isinstance(folder, string_types)
     assert isinstance(name, string_types)
     if device is None:
         device = -1
     assert isinstance(device, (int, str))
-    config = os.path.join(folder, name)
-    with open(config, "r") as f:
-        try:
-            content = f.read()
-        except:
-            print("failed to read module config: ", config)
+    from ._plugin_loader import PluginLoader
+    spec = read_spec_and_load_plugins(folder, name)
+    try:
+        handle = _ffi_api.LoadTXSessionFromSpec(folder, spec, device)
+    except Exception as e:
+        # compiled code may create native objects which are not in the spec,
+        # e.g. a model saved before the plugins were recorded, retry with all of them
+        if not _is_unregistered_class_error(e) or not PluginLoader.load_all_prefixes():
             raise
-        root = runtime._ffi_api.pickle_FromJsonStruct(content)
-        for op_obj in root[b"ops"]:
-            op_class_name = op_obj[b"op"].decode()
-            op_loader = PluginLoader.lookup(op_class_name)
-            if op_loader:
-                op_loader()
-    handle = _ffi_api.LoadTXSession(folder, name, device)
+        handle = _ffi_api.LoadTXSessionFromSpec(folder, spec, device)
     return JITModule(handle)
+
+
+# the messages of the native checks failing on an op or native class whose library is not loaded
+_UNREGISTERED_CLASS_MESSAGES = (
+    "Op is not registered :",
+    "Native OP not found:",
+    "NativeOp not found, cls:",
+    "Native class not found:",
+)
+
+
+def _is_unregistered_class_error(e):
+    message = str(e)
+    return any(m in message for m in _UNREGISTERED_CLASS_MESSAGES)
+
+
+def _other_format_spec_files(name):
+    if name.endswith(".msgpack"):
+        return [name[:-len(".msgpack")] + ".json"]
+    if name.endswith(".json"):
+        base = name[:-len(".json")]
+        return [base + ".msgpack", base + ".data"]
+    return []
+
+
+def default_spec_name(folder):
+    # save removes the spec of the other format, so both of them means the folder is broken
+    msgpack_path = os.path.join(folder, "model.spec.msgpack")
+    json_path = os.path.join(folder, "model.spec.json")
+    if not os.path.exists(msgpack_path):
+        return "model.spec.json"
+    if os.path.exists(json_path):
+        raise RuntimeError(
+            "both model.spec.json and model.spec.msgpack are found in %s, "
+            "remove the stale one" % folder)
+    return "model.spec.msgpack"
+
+
+def read_spec_and_load_plugins(folder, name):
+    from ._plugin_loader import PluginLoader
+    # the spec is parsed once, both for looking up the plugins and building the session
+    spec = _ffi_api.ReadTXSessionSpec(folder, name)
+    # only load the plugins used by the ops and native objects of this model
+    for op_class_name in _collect_op_names(spec):
+        op_loader = PluginLoader.lookup(op_class_name)
+        if op_loader:
+            op_loader()
+    return spec
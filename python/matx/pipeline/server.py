@@ -0,0 +1,157 @@
+# Copyright 2022 ByteDance Ltd. and/or its affiliates.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import os
+from .._ffi.base import string_types
+from .._ffi.error import trans_exception_from_c_to_py
+from .._ffi import void_p_to_runtime
+from . import _ffi_api
+from .module import default_spec_name
+from .module import read_spec_and_load_plugins
+
+
+class Server(object):
+    """A serving engine which runs the requests of any number of threads on
+    N replicas of a saved model.
+
+    Every replica is a session loaded from model_dir and is driven by its own worker
+    thread. run blocks the calling thread without holding the GIL until a replica
+    completes the request, so python threads can share one server. Idle workers and
+    waiting callers sleep on condition variables instead of polling.
+
+    The worker threads do not survive a fork, create the server in the process
+    that serves the requests.
+
+    Parameters
+    ----------
+    model_dir : str
+        The folder saved by matx.save
+
+    replicas : int
+        The number of sessions loaded and requests run at the same time
+
+    device : int, str
+        GPU serial numbers, or -1(CPU)
+
+    max_batch_size : int
+        When > 1, a worker merges queued requests into one session run, see
+        the batching server in simple_mpmc_server.h for how inputs are merged.
+        It is clipped to the largest batch size saved by matx.pipeline.SaveMeta
+
+    max_wait_us : int
+        How long a worker waits for more requests to fill a batch
+
+    batched_outputs : List[str], optional
+        The outputs split by request when requests are batched. By default they are
+        the outputs computed from the batched inputs, the others are returned whole
+
+    name : str
+        The prefix of the worker thread names
+
+    Examples
+    --------
+    >>> with matx.pipeline.Server("./my_model", replicas=4) as server:
+    ...     server.run({"text": "hello"})
+    ...     server.stats()["queue_depth"]
+    """
+
+    def __init__(self,
+                 model_dir,
+                 replicas=1,
+                 device=-1,
+                 max_batch_size=1,
+                 max_wait_us=0,
+                 name="Server",
+                 batched_outputs=None):
+        assert isinstance(model_dir, string_types)
+        assert isinstance(replicas, int) and replicas > 0, "replicas must be positive"
+        assert isinstance(device, (int, str))
+        model_dir = os.path.abspath(model_dir)
+        spec = read_spec_and_load_plugins(model_dir, default_spec_name(model_dir))
+        self.__c_handle = _ffi_api.CreateServerHandle(
+            model_dir, spec, device, replicas, max_batch_size, max_wait_us, name,
+            list(batched_outputs or []))
+        self.__native_free_func = _ffi_api.FreeServerHandle
+        self.__backend_handle = void_p_to_runtime(self.__c_handle)
+        self.__closed = False
+
+    def __del__(self):
+        self.__native_free_func(self.__backend_handle)
+
+    def __getstate__(self):
+        raise TypeError("Server is not picklable")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def run(self, feed_dict):
+        """Run a request on the first free replica and wait for the outputs
+
+        Parameters
+        ----------
+        feed_dict : dict, matx.Dict
+            The input feed dict
+
+        Returns
+        -------
+        outputs : Tuple
+            The output data
+
+        """
+        assert isinstance(feed_dict, dict), "feed_dict type error"
+        assert not self.__closed, "the server is closed"
+        feed_dict_v2 = dict()
+        for k, v in feed_dict.items():
+            k = k.encode()
+            feed_dict_v2[k] = v
+        fn_run = trans_exception_from_c_to_py(_ffi_api.ServerRun)
+        try:
+            result = fn_run(self.__c_handle, feed_dict_v2)
+            if len(result) == 1:
+                return result[0]
+            return tuple([obj for obj in result])
+        except BaseException as e:
+            e = type(e)(*e.args)
+            raise e from None
+
+    def stats(self):
+        """Get a snapshot of the counters of the server
+
+        Returns
+        -------
+        output : dict
+            "queue_depth" is the number of requests waiting for a free replica,
+            "uptime_us" is the time since the server started, "replicas" holds the
+            requests, runs, busy_us and utilization(busy_us / uptime_us) of every replica.
+
+        """
+        return _ffi_api.ServerGetStats(self.__c_handle)
+
+    @property
+    def queue_depth(self):
+        """The number of requests waiting for a free replica"""
+        return self.stats()["queue_depth"]
+
+    def close(self):
+        """Finish the queued requests and stop the worker threads"""
+        if not self.__closed:
+            self.__closed = True
+            _ffi_api.ServerStop(self.__c_handle)
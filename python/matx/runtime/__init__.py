@@ -27,6 +27,7 @@ from .module import Module
 
 from .msgpack import dumps as msgpack_dumps
 from .msgpack import loads as msgpack_loads
+from .jsonlib import json_dump, json_lines
 
 # function exposures
 from .container import Array, Map, List, Dict, Set, Tuple
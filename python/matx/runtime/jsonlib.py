@@ -0,0 +1,51 @@
+# Copyright 2022 ByteDance Ltd. and/or its affiliates.
+#
+# Acknowledgement: The structure of the Module is inspired by incubator-tvm.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from . import _ffi_api
+from typing import Any
+
+
+def json_dump(obj: Any, path: str, indent: int = None, ensure_ascii: bool = True) -> None:
+    """Write obj as json to the file at path, like json.dump but without a file object.
+
+    Args:
+        obj (Any): the value to write.
+        path (str): the output file path, it is overwritten.
+        indent (int, optional): pretty print with this indent, the default is compact.
+        ensure_ascii (bool, optional): escape the non-ascii characters.
+    """
+    if indent is None:
+        indent = -1
+    _ffi_api.JsonDump(obj, path, indent, ensure_ascii)
+
+
+def json_lines(path: str) -> Any:
+    """Iterate the json values of a json-lines file, one value per line.
+
+    Blank lines are skipped.
+
+    Args:
+        path (str): the json-lines file path.
+
+    Returns:
+        Iterator
+    """
+    return _ffi_api.JsonLines(path)
@@ -128,6 +128,20 @@ class Module(object):
         """
         return _ffi_api.ModuleGetSource(self, fmt)
 
+    def get_units(self):
+        """Get source code split into translation units, if available.
+
+        Returns
+        -------
+        units : List[str]
+            The source code of each unit, empty if the module is not split.
+        """
+        try:
+            fget = self.get_function("get_units")
+        except AttributeError:
+            return []
+        return list(fget())
+
     @property
     def imported_modules(self):
         """Get imported modules
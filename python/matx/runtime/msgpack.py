@@ -27,5 +27,98 @@ def dumps(o: Any) -> bytes:
     return _ffi_api.msgpack_dumps(o)
 
 
-def loads(b: bytes) -> Any:
+def loads(b: bytes, zero_copy: bool = False) -> Any:
+    """Unpack an object packed by dumps.
+
+    Args:
+        b (bytes): the packed object.
+        zero_copy (bool, optional): copy b once into a private buffer and return the
+            NDArray values as views into it instead of copying each of them. Writing a
+            view never changes b. Only NDArray values are views, bytes and str values are
+            always copied.
+
+    Returns:
+        Any
+    """
+    if zero_copy:
+        return _ffi_api.msgpack_loads(b, True)
     return _ffi_api.msgpack_loads(b)
+
+
+class Packer:
+    """Pack a stream of records one by one.
+
+    By default the records are the same as dumps. With align_ndarray the NDArray data is
+    64-byte aligned in the stream, so Unpacker can return views, but it is a matx specific
+    ext type which can only be read by Unpacker and loads of this version.
+
+    Args:
+        file (file-like, optional): the records are written to file.write if given,
+            else pack returns them.
+        align_ndarray (bool, optional): pad the NDArray data to be aligned in the stream.
+            Defaults to False.
+
+    Examples:
+
+        >>> import io
+        >>> import matx
+        >>> from matx.runtime.msgpack import Packer, Unpacker
+        >>> stream = io.BytesIO()
+        >>> packer = Packer(stream)
+        >>> for i in range(3):
+        ...     packer.pack({"id": i})
+        >>> _ = stream.seek(0)
+        >>> [record["id"] for record in Unpacker(stream)]
+        [0, 1, 2]
+    """
+
+    def __init__(self, file=None, align_ndarray: bool = False) -> None:
+        self._file = file
+        self._handle = _ffi_api.msgpack_StreamPacker(align_ndarray)
+
+    def pack(self, o: Any):
+        data = _ffi_api.msgpack_StreamPackerPack(self._handle, o)
+        if self._file is None:
+            return data
+        self._file.write(data)
+
+
+class Unpacker:
+    """Unpack a stream of records written by Packer or by dumps.
+
+    The data is read from file in read_size chunks, or given by feed.
+
+    Args:
+        file (file-like, optional): the stream is read by file.read.
+        zero_copy (bool, optional): return the aligned NDArray values as views into the
+            buffered stream. The views must not be written.
+        read_size (int, optional): the bytes read from file at a time.
+    """
+
+    def __init__(self, file=None, zero_copy: bool = True, read_size: int = 1024 * 1024) -> None:
+        self._file = file
+        self._read_size = read_size
+        self._handle = _ffi_api.msgpack_StreamUnpacker(zero_copy)
+
+    def feed(self, data: bytes) -> None:
+        _ffi_api.msgpack_StreamUnpackerFeed(self._handle, data)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Any:
+        while True:
+            ok, record = _ffi_api.msgpack_StreamUnpackerNext(self._handle)
+            if ok:
+                return record
+            data = self._file.read(self._read_size) if self._file is not None else b""
+            if not data:
+                if self._file is not None and self.buffered > 0:
+                    raise ValueError("Unpack failed: incomplete input")
+                raise StopIteration
+            self.feed(data)
+
+    @property
+    def buffered(self) -> int:
+        """The number of bytes fed but not unpacked."""
+        return _ffi_api.msgpack_StreamUnpackerBuffered(self._handle)
@@ -43,6 +43,22 @@ __all__ = [
     "rand",
     "concatenate",
     "stack",
+    "sum",
+    "mean",
+    "max",
+    "min",
+    "argmax",
+    "argmin",
+    "exp",
+    "log",
+    "sqrt",
+    "abs",
+    "clip",
+    "where",
+    "cast_scale",
+    "evaluate",
+    "LazyExpr",
+    "lazy",
     "from_numpy",
     "from_dlpack",
 ]
@@ -332,6 +348,36 @@ class NDArray(Object):
     def __len__(self):
         return 0 if self.tensor_handle.contents.ndim <= 0 else self.tensor_handle.contents.shape[0]
 
+    @property
+    def __array_interface__(self):
+        """The numpy array interface of a cpu NDArray.
+        numpy.asarray(nd) shares the memory with nd and keeps nd alive.
+        """
+        contents = self.tensor_handle.contents
+        if contents.device.device_type != 1:
+            raise AttributeError("__array_interface__ is only supported for cpu NDArray")
+        t = DataType(self.dtype())
+        lanes = t.lanes
+        t.lanes = 1
+        elem_dtype = np.dtype(str(t))
+        shape = tuple(contents.shape[i] for i in range(contents.ndim))
+        strides = None
+        if contents.strides:
+            item_bytes = elem_dtype.itemsize * lanes
+            strides = tuple(contents.strides[i] * item_bytes for i in range(contents.ndim))
+        if lanes > 1:
+            shape = shape + (lanes,)
+            if strides is not None:
+                strides = strides + (elem_dtype.itemsize,)
+        data = (contents.data or 0) + contents.byte_offset
+        return {
+            "shape": shape,
+            "typestr": elem_dtype.str,
+            "data": (data, False),
+            "strides": strides,
+            "version": 3,
+        }
+
     # -------------------- [end] methods can be used in script --------------------
 
     # @property
@@ -403,10 +449,16 @@ class NDArray(Object):
         check_call(_LIB.MATXScriptArrayCopyFromBytes(self.tensor_handle, data, nbytes))
         return self
 
-    def asnumpy(self):
+    def asnumpy(self, copy=True):
         """Construct a numpy.ndarray from the current NDArray.
         Note! This method cannot be compiled for use in matx.script
 
+        Args:
+            copy (bool): if False, the numpy.ndarray shares the memory of a cpu NDArray
+
+        Raises:
+            ValueError: copy is False and the NDArray is not on cpu
+
         Returns:
             numpy.ndarray
 
@@ -424,6 +476,11 @@ class NDArray(Object):
             array([[1, 2, 3],
                 [4, 5, 6]], dtype=int32)
         """
+        if not copy:
+            if self.tensor_handle.contents.device.device_type != 1:
+                raise ValueError("asnumpy(copy=False) is only supported for cpu NDArray, "
+                                 "call asnumpy() to copy the data to host")
+            return np.asarray(self)
         t = DataType(self.dtype())
         shape, dtype = tuple(self.shape()), self.dtype()
         if t.lanes > 1:
@@ -437,10 +494,16 @@ class NDArray(Object):
         check_call(_LIB.MATXScriptArrayCopyToBytes(self.tensor_handle, data, nbytes))
         return np_arr
 
-    def numpy(self):
+    def numpy(self, copy=True):
         """Construct a numpy.ndarray from the current NDArray.
         Note! This method cannot be compiled for use in matx.script
 
+        Args:
+            copy (bool): if False, the numpy.ndarray shares the memory of a cpu NDArray
+
+        Raises:
+            ValueError: copy is False and the NDArray is not on cpu
+
         Returns:
             numpy.ndarray
 
@@ -458,7 +521,7 @@ class NDArray(Object):
             array([[1, 2, 3],
                 [4, 5, 6]], dtype=int32)
         """
-        return self.asnumpy()
+        return self.asnumpy(copy=copy)
 
     # def from_array(self, source_array):
     #    if not isinstance(source_array, np.ndarray):
@@ -595,7 +658,7 @@ class NDArray(Object):
             return self._torch()
 
 
-def add(lhs, rhs):
+def add(lhs, rhs, out=None):
     """Supports addition between NDArray and NDArray
        Supports addition between NDArray and numbers
 
@@ -606,6 +669,7 @@ def add(lhs, rhs):
     Args:
         lhs (matx.NDArray or number): Left operand
         rhs (matx.NDArray or number): Right operand
+        out (matx.NDArray, optional): The destination, which must have the result shape and dtype
 
     Returns:
         matx.NDArray
@@ -653,10 +717,12 @@ def add(lhs, rhs):
          [ 2.22683 2.73329 2.75127 ]
         ]
     """
-    return _ffi_api.NDArrayAdd(lhs, rhs)
+    if out is None:
+        return _ffi_api.NDArrayAdd(lhs, rhs)
+    return _ffi_api.NDArrayAdd(lhs, rhs, out)
 
 
-def sub(lhs, rhs):
+def sub(lhs, rhs, out=None):
     """Support subtraction between NDArray and NDArray
        Support subtraction between NDArray and numbers
 
@@ -667,6 +733,7 @@ def sub(lhs, rhs):
     Args:
         lhs (matx.NDArray or number): Left operand
         rhs (matx.NDArray or number): Right operand
+        out (matx.NDArray, optional): The destination, which must have the result shape and dtype
 
     Returns:
         matx.NDArray
@@ -714,10 +781,12 @@ def sub(lhs, rhs):
          [ -1.77317 -1.26671 -1.24873 ]
         ]
     """
-    return _ffi_api.NDArraySub(lhs, rhs)
+    if out is None:
+        return _ffi_api.NDArraySub(lhs, rhs)
+    return _ffi_api.NDArraySub(lhs, rhs, out)
 
 
-def div(lhs, rhs):
+def div(lhs, rhs, out=None):
     """Support division between NDArray and NDArray
        Support division between NDArray and numbers
 
@@ -729,6 +798,7 @@ def div(lhs, rhs):
     Args:
         lhs (matx.NDArray or number): Left operand
         rhs (matx.NDArray or number): Right operand
+        out (matx.NDArray, optional): The destination, which must have the result shape and dtype
 
     Returns:
         matx.NDArray
@@ -776,10 +846,12 @@ def div(lhs, rhs):
          [ 0.113416 0.366647 0.375637 ]
         ]
     """
-    return _ffi_api.NDArrayDiv(lhs, rhs)
+    if out is None:
+        return _ffi_api.NDArrayDiv(lhs, rhs)
+    return _ffi_api.NDArrayDiv(lhs, rhs, out)
 
 
-def mul(lhs, rhs):
+def mul(lhs, rhs, out=None):
     """Support multiplication between NDArray and NDArray
        Support multiplication between NDArray and numbers
 
@@ -790,6 +862,7 @@ def mul(lhs, rhs):
     Args:
         lhs (matx.NDArray or number): Left operand
         rhs (matx.NDArray or number): Right operand
+        out (matx.NDArray, optional): The destination, which must have the result shape and dtype
 
     Returns:
         matx.NDArray
@@ -837,7 +910,9 @@ def mul(lhs, rhs):
          [ 0.453663 1.46659 1.50255 ]
         ]
     """
-    return _ffi_api.NDArrayMul(lhs, rhs)
+    if out is None:
+        return _ffi_api.NDArrayMul(lhs, rhs)
+    return _ffi_api.NDArrayMul(lhs, rhs, out)
 
 
 def rand(shape):
@@ -1024,6 +1099,473 @@ def stack(seq, axes=0):
     return _ffi_api.NDArrayStack(seq, axes)
 
 
+def sum(nd, axis=None, keepdims=False):  # pylint: disable=redefined-builtin
+    """Sum of the elements over the given axis, similar to numpy.sum
+
+    Specific use of the interface: matx.array.sum
+
+    Args:
+        nd (matx.NDArray)
+        axis (int, optional): reduce all the elements when axis is None
+        keepdims (bool, optional): keep the reduced axis with size one
+
+    Returns:
+        number when all the elements are reduced, otherwise matx.NDArray.
+        The sum of int is int64, the sum of float keeps the dtype.
+
+    Examples:
+        >>> import matx
+        >>> nd = matx.NDArray([0, 1, 2, 3, 4, 5], [2, 3], "int32")
+        >>> matx.array.sum(nd)
+        15
+        >>> matx.array.sum(nd, 1)
+        [4, 12]
+    """
+    return _ffi_api.NDArraySum(nd, axis, keepdims)
+
+
+def mean(nd, axis=None, keepdims=False):
+    """Mean of the elements over the given axis, similar to numpy.mean
+
+    Specific use of the interface: matx.array.mean
+
+    Args:
+        nd (matx.NDArray)
+        axis (int, optional): reduce all the elements when axis is None
+        keepdims (bool, optional): keep the reduced axis with size one
+
+    Returns:
+        float when all the elements are reduced, otherwise matx.NDArray.
+        The mean of int is float32 like div.
+
+    Examples:
+        >>> import matx
+        >>> nd = matx.NDArray([0, 1, 2, 3, 4, 5], [2, 3], "float32")
+        >>> matx.array.mean(nd)
+        2.5
+        >>> matx.array.mean(nd, 0)
+        [1.5, 2.5, 3.5]
+    """
+    return _ffi_api.NDArrayMean(nd, axis, keepdims)
+
+
+def max(nd, axis=None, keepdims=False):  # pylint: disable=redefined-builtin
+    """Maximum of the elements over the given axis, similar to numpy.max
+
+    Specific use of the interface: matx.array.max
+
+    Args:
+        nd (matx.NDArray)
+        axis (int, optional): reduce all the elements when axis is None
+        keepdims (bool, optional): keep the reduced axis with size one
+
+    Returns:
+        number when all the elements are reduced, otherwise matx.NDArray
+    """
+    return _ffi_api.NDArrayMax(nd, axis, keepdims)
+
+
+def min(nd, axis=None, keepdims=False):  # pylint: disable=redefined-builtin
+    """Minimum of the elements over the given axis, similar to numpy.min
+
+    Specific use of the interface: matx.array.min
+
+    Args:
+        nd (matx.NDArray)
+        axis (int, optional): reduce all the elements when axis is None
+        keepdims (bool, optional): keep the reduced axis with size one
+
+    Returns:
+        number when all the elements are reduced, otherwise matx.NDArray
+    """
+    return _ffi_api.NDArrayMin(nd, axis, keepdims)
+
+
+def argmax(nd, axis=None, keepdims=False):
+    """Indices of the maximum over the given axis, similar to numpy.argmax
+
+    Specific use of the interface: matx.array.argmax
+
+    Args:
+        nd (matx.NDArray)
+        axis (int, optional): the index in the flattened NDArray when axis is None
+        keepdims (bool, optional): keep the reduced axis with size one
+
+    Returns:
+        int when all the elements are reduced, otherwise int64 matx.NDArray
+
+    Examples:
+        >>> import matx
+        >>> nd = matx.NDArray([0, 5, 2, 3, 4, 1], [2, 3], "int32")
+        >>> matx.array.argmax(nd)
+        1
+        >>> matx.array.argmax(nd, 1)
+        [1, 1]
+    """
+    return _ffi_api.NDArrayArgMax(nd, axis, keepdims)
+
+
+def argmin(nd, axis=None, keepdims=False):
+    """Indices of the minimum over the given axis, similar to numpy.argmin
+
+    Specific use of the interface: matx.array.argmin
+
+    Args:
+        nd (matx.NDArray)
+        axis (int, optional): the index in the flattened NDArray when axis is None
+        keepdims (bool, optional): keep the reduced axis with size one
+
+    Returns:
+        int when all the elements are reduced, otherwise int64 matx.NDArray
+    """
+    return _ffi_api.NDArrayArgMin(nd, axis, keepdims)
+
+
+def exp(nd, out=None):
+    """Elementwise exponential, int NDArray is computed in float32
+
+    Specific use of the interface: matx.array.exp
+
+    Args:
+        nd (matx.NDArray)
+        out (matx.NDArray, optional): The destination, which must have the result shape and dtype
+
+    Returns:
+        matx.NDArray
+    """
+    if out is None:
+        return _ffi_api.NDArrayExp(nd)
+    return _ffi_api.NDArrayExp(nd, out)
+
+
+def log(nd, out=None):
+    """Elementwise natural logarithm, int NDArray is computed in float32
+
+    Specific use of the interface: matx.array.log
+
+    Args:
+        nd (matx.NDArray)
+        out (matx.NDArray, optional): The destination, which must have the result shape and dtype
+
+    Returns:
+        matx.NDArray
+    """
+    if out is None:
+        return _ffi_api.NDArrayLog(nd)
+    return _ffi_api.NDArrayLog(nd, out)
+
+
+def sqrt(nd, out=None):
+    """Elementwise square root, int NDArray is computed in float32
+
+    Specific use of the interface: matx.array.sqrt
+
+    Args:
+        nd (matx.NDArray)
+        out (matx.NDArray, optional): The destination, which must have the result shape and dtype
+
+    Returns:
+        matx.NDArray
+    """
+    if out is None:
+        return _ffi_api.NDArraySqrt(nd)
+    return _ffi_api.NDArraySqrt(nd, out)
+
+
+def abs(nd, out=None):  # pylint: disable=redefined-builtin
+    """Elementwise absolute value, the dtype is kept
+
+    Specific use of the interface: matx.array.abs
+
+    Args:
+        nd (matx.NDArray)
+        out (matx.NDArray, optional): The destination, which must have the result shape and dtype
+
+    Returns:
+        matx.NDArray
+    """
+    if out is None:
+        return _ffi_api.NDArrayAbs(nd)
+    return _ffi_api.NDArrayAbs(nd, out)
+
+
+def clip(nd, lo=None, hi=None, out=None):
+    """Limit the elements to [lo, hi], similar to numpy.clip, the dtype is kept
+
+    Specific use of the interface: matx.array.clip
+
+    Args:
+        nd (matx.NDArray)
+        lo (number, optional): the lower bound, no lower bound when it is None
+        hi (number, optional): the upper bound, no upper bound when it is None
+        out (matx.NDArray, optional): The destination, which must have the result shape and dtype
+
+    Returns:
+        matx.NDArray
+
+    Examples:
+        >>> import matx
+        >>> nd = matx.NDArray([-2, -1, 0, 1, 2], [5], "int32")
+        >>> matx.array.clip(nd, -1, 1)
+        [-1, -1, 0, 1, 1]
+    """
+    if out is None:
+        return _ffi_api.NDArrayClip(nd, lo, hi)
+    return _ffi_api.NDArrayClip(nd, lo, hi, out)
+
+
+def where(cond, x, y):
+    """Choose the elements of x where cond is nonzero, otherwise y, similar to numpy.where
+
+    support broadcasting(https://numpy.org/doc/stable/user/basics.broadcasting.html)
+
+    Specific use of the interface: matx.array.where
+
+    Args:
+        cond (matx.NDArray)
+        x (matx.NDArray or number)
+        y (matx.NDArray or number)
+
+    Returns:
+        matx.NDArray
+
+    Examples:
+        >>> import matx
+        >>> cond = matx.NDArray([1, 0, 1], [3], "int32")
+        >>> x = matx.NDArray([1, 2, 3], [3], "float32")
+        >>> matx.array.where(cond, x, 0.5)
+        [1, 0.5, 3]
+    """
+    return _ffi_api.NDArrayWhere(cond, x, y)
+
+
+def cast_scale(nd, dtype, scale=1.0, shift=0.0, out=None):
+    """Compute nd * scale + shift and convert it to dtype in one pass,
+    int results are rounded to nearest and saturated, similar to cv::Mat::convertTo
+
+    Specific use of the interface: matx.array.cast_scale
+
+    Args:
+        nd (matx.NDArray)
+        dtype (str): the result dtype
+        scale (float, optional)
+        shift (float, optional)
+        out (matx.NDArray, optional): The destination, which must have the result shape and dtype
+
+    Returns:
+        matx.NDArray
+
+    Examples:
+        >>> import matx
+        >>> image = matx.NDArray([0, 128, 255], [3], "uint8")
+        >>> matx.array.cast_scale(image, "float32", 1 / 255.0)
+        [0, 0.501961, 1]
+    """
+    if out is None:
+        return _ffi_api.NDArrayCastScale(nd, dtype, scale, shift)
+    return _ffi_api.NDArrayCastScale(nd, dtype, scale, shift, out)
+
+
+def evaluate(expr, operands, out=None):
+    """Evaluate an elementwise expression over NDArrays in one pass without temporaries
+
+    The expression supports the numbers, the names in operands,
+    + - * / ** < <= > >= == != and exp log sqrt abs tanh min max pow where clip.
+    Every block of the inputs is loaded once and the whole expression is computed
+    on it in cache, the compiled expression is cached.
+    The result is float32, or float64 when any operand is float64.
+
+    support broadcasting(https://numpy.org/doc/stable/user/basics.broadcasting.html)
+
+    Specific use of the interface: matx.array.evaluate
+
+    Args:
+        expr (str)
+        operands (Dict[str, matx.NDArray or number])
+        out (matx.NDArray, optional): The destination, which must have the result shape
+
+    Returns:
+        matx.NDArray
+
+    Examples:
+        >>> import matx
+        >>> x = matx.NDArray([1, 2, 3, 4], [2, 2], "float32")
+        >>> matx.array.evaluate("(x - m) / s", {"x": x, "m": 2.5, "s": 2.0})
+        [
+         [ -0.75 -0.25 ]
+         [ 0.25 0.75 ]
+        ]
+    """
+    if out is None:
+        return _ffi_api.NDArrayEvaluate(expr, operands)
+    return _ffi_api.NDArrayEvaluate(expr, operands, out)
+
+
+_LAZY_BINARY_OPS = ("+", "-", "*", "/", "**", "<", "<=", ">", ">=")
+
+
+class LazyExpr(object):
+    """A lazy elementwise expression over NDArrays and numbers, which is built with
+    the arithmetic operators and computed by matx.array.evaluate in one pass.
+    Note! This class cannot be compiled for use in matx.script, use matx.array.evaluate there.
+
+    Examples:
+        >>> import matx
+        >>> x = matx.array.rand([2, 3])
+        >>> m = matx.array.mean(x)
+        >>> y = ((matx.array.lazy(x) - m) / 0.5).exp().eval()
+    """
+
+    __slots__ = ("_op", "_args")
+
+    def __init__(self, op, args):
+        self._op = op
+        self._args = args
+
+    @staticmethod
+    def _is_operand(value):
+        return isinstance(value, (LazyExpr, NDArray, int, float))
+
+    @staticmethod
+    def _wrap(value):
+        if isinstance(value, LazyExpr):
+            return value
+        if not LazyExpr._is_operand(value):
+            raise TypeError("LazyExpr operand must be NDArray or number, but get {}".format(
+                type(value).__name__))
+        return LazyExpr("ref", (value,))
+
+    def _binary(self, op, other, reflected=False):
+        # let python try the other operand's dunder method, or raise its own TypeError
+        if not LazyExpr._is_operand(other):
+            return NotImplemented
+        other = LazyExpr._wrap(other)
+        if reflected:
+            return LazyExpr(op, (other, self))
+        return LazyExpr(op, (self, other))
+
+    def _call(self, func, *args):
+        return LazyExpr(func, (self,) + tuple(LazyExpr._wrap(arg) for arg in args))
+
+    def _render(self, names, operands):
+        if self._op == "ref":
+            value = self._args[0]
+            if id(value) not in names:
+                name = "v{}".format(len(names))
+                names[id(value)] = name
+                operands[name] = value
+            return names[id(value)]
+        args = [arg._render(names, operands) for arg in self._args]
+        if self._op in _LAZY_BINARY_OPS:
+            return "({} {} {})".format(args[0], self._op, args[1])
+        if self._op == "neg":
+            return "(-{})".format(args[0])
+        return "{}({})".format(self._op, ", ".join(args))
+
+    def expression(self):
+        """The expression string and the operands which are given to matx.array.evaluate"""
+        operands = {}
+        return self._render({}, operands), operands
+
+    def eval(self, out=None):
+        """Compute the expression in one pass
+
+        Args:
+            out (matx.NDArray, optional): The destination, which must have the result shape
+
+        Returns:
+            matx.NDArray
+        """
+        expr, operands = self.expression()
+        return evaluate(expr, operands, out)
+
+    def __add__(self, other):
+        return self._binary("+", other)
+
+    def __radd__(self, other):
+        return self._binary("+", other, True)
+
+    def __sub__(self, other):
+        return self._binary("-", other)
+
+    def __rsub__(self, other):
+        return self._binary("-", other, True)
+
+    def __mul__(self, other):
+        return self._binary("*", other)
+
+    def __rmul__(self, other):
+        return self._binary("*", other, True)
+
+    def __truediv__(self, other):
+        return self._binary("/", other)
+
+    def __rtruediv__(self, other):
+        return self._binary("/", other, True)
+
+    def __pow__(self, other):
+        return self._binary("**", other)
+
+    def __rpow__(self, other):
+        return self._binary("**", other, True)
+
+    def __lt__(self, other):
+        return self._binary("<", other)
+
+    def __le__(self, other):
+        return self._binary("<=", other)
+
+    def __gt__(self, other):
+        return self._binary(">", other)
+
+    def __ge__(self, other):
+        return self._binary(">=", other)
+
+    def __neg__(self):
+        return LazyExpr("neg", (self,))
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return self._call("abs")
+
+    def exp(self):
+        return self._call("exp")
+
+    def log(self):
+        return self._call("log")
+
+    def sqrt(self):
+        return self._call("sqrt")
+
+    def abs(self):
+        return self._call("abs")
+
+    def tanh(self):
+        return self._call("tanh")
+
+    def clip(self, lo, hi):
+        return self._call("clip", lo, hi)
+
+    def where(self, x, y):
+        """x where this expression is nonzero, otherwise y"""
+        return self._call("where", x, y)
+
+
+def lazy(value):
+    """Start a lazy elementwise expression, see LazyExpr.
+    Note! This method cannot be compiled for use in matx.script, use matx.array.evaluate there.
+
+    Args:
+        value (matx.NDArray or number)
+
+    Returns:
+        LazyExpr
+    """
+    return LazyExpr._wrap(value)
+
+
 # def device(dev_type, dev_id=0):
 #    """Constructs the MATX context with the given dev_type dev_id.
 #       Note! This method cannot be compiled for use in matx.script
@@ -1094,7 +1636,7 @@ def stack(seq, axes=0):
 #    return _ffi_api.NDArray(arr, shape, dtype)
 #
 
-def from_numpy(arr, device="cpu"):
+def from_numpy(arr, device="cpu", copy=True):
     """Construct a module method for matx.NDArray from numpy.ndarray.
        Note! This method cannot be compiled for use in matx.script
 
@@ -1102,6 +1644,11 @@ def from_numpy(arr, device="cpu"):
         arr (numpy.ndarray)
         device (MATXScriptDevice, optional
              The device context to create the array)
+        copy (bool, optional): if False, the NDArray wraps the memory of arr through DLPack
+             and keeps arr alive, only cpu device is supported
+
+    Raises:
+        ValueError: copy is False but arr can not be shared
 
     Returns:
         matx.NDArray
@@ -1117,6 +1664,14 @@ def from_numpy(arr, device="cpu"):
          [0.34059181, 0.90339341, 0.72762747]
         ]
     """
+    if not copy:
+        if device != "cpu":
+            raise ValueError("from_numpy without copy only supports cpu device, but get " + device)
+        try:
+            dltensor = arr.__dlpack__()
+        except (AttributeError, BufferError, TypeError) as e:
+            raise ValueError("numpy array can not be shared without copy: " + str(e)) from None
+        return from_dlpack(dltensor)
     return NDArray(
         container.List(), container.List(arr.shape), str(arr.dtype), device
     ).from_numpy(arr)
@@ -120,8 +120,28 @@ class Trie(Object):
         """
         return _ffi_api.Trie_PrefixSearchAll(self, w, pos)
 
-    def save(self, file_path: str):
-        return _ffi_api.Trie_Save(self, file_path)
+    def save(self, file_path: str, mapped: bool = False):
+        """Save the trie to a file
+
+        Args:
+            file_path (str): The file path
+            mapped (bool, optional): Write a mapped trie file. When such a file is loaded,
+                the trie is used in place from a read-only shared mmap, so all the processes
+                and sessions which load it share one copy. The trie is copied into private
+                memory only when it is updated after loading.
+
+        Returns:
+            int: 0 if succeeded
+        """
+        return _ffi_api.Trie_Save(self, file_path, mapped)
 
     def load(self, file_path: str):
+        """Load the trie from a file saved by `save`, a mapped trie file is detected and mapped
+
+        Args:
+            file_path (str): The file path
+
+        Returns:
+            int: 0 if succeeded
+        """
         return _ffi_api.Trie_Load(self, file_path)
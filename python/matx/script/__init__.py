@@ -23,6 +23,8 @@ from . import transforms
 from .. import ir as _ir
 from .parser import MATXScriptParser
 from matx.env import MATX_DEV_MODE
+from matx.env import MATX_COMPILE_JOBS
+from matx.env import MATX_COMPILE_UNIT_SIZE
 
 
 def _passes(sc_ctx: context.ScriptContext):
@@ -96,7 +98,7 @@ def _link_ir_module(sc_ctx: context.ScriptContext):
 
 def _codegen(sc_ctx: context.ScriptContext):
     from .. import _ffi
-    build_module = _ffi.get_global_func("module.build.c")
+    build_module = _ffi.get_global_func("module.build.c_units")
     if sc_ctx.build_type is context.BuildType.FUNCTION:
         fn_ctx: context.FunctionContext = sc_ctx.main_node.context
         sc_ctx.ir_module.add_export_func(fn_ctx.name)
@@ -105,7 +107,7 @@ def _codegen(sc_ctx: context.ScriptContext):
         for name, method in cls_ctx.methods.items():
             if name != '__init__':
                 sc_ctx.ir_module.add_export_func(method.unbound_name)
-    sc_ctx.rt_module = build_module(sc_ctx.ir_module)
+    sc_ctx.rt_module = build_module(sc_ctx.ir_module, MATX_COMPILE_JOBS, MATX_COMPILE_UNIT_SIZE)
     # print(sc_ctx.rt_module.get_source())
 
 
@@ -27,6 +27,3 @@ def load_text_ops_lib():
         return
     _LIB, _LIB_NAME, _LIB_SHA1 = load_lib_by_name("libmatx_text_ops")
     _TEXT_OPS_LIB_LOADER_STATE = True
-
-
-load_text_ops_lib()
@@ -88,6 +88,19 @@ class JiebaImpl(object):
     def lcut_for_search(self, sentence: AnyStr, HMM: bool = True) -> List[AnyStr]:
         return self.jieba.lcut_for_search(sentence, HMM)
 
+    def batch_lcut(self,
+                   sentences: Any,
+                   cut_all: bool = False,
+                   HMM: bool = True,
+                   with_offsets: bool = False) -> Any:
+        return self.jieba.batch_lcut(sentences, cut_all, HMM, with_offsets)
+
+    def batch_lcut_for_search(self,
+                              sentences: Any,
+                              HMM: bool = True,
+                              with_offsets: bool = False) -> Any:
+        return self.jieba.batch_lcut_for_search(sentences, HMM, with_offsets)
+
 
 class Jieba:
 
@@ -126,3 +139,42 @@ class Jieba:
 
     def lcut_for_search(self, sentence: AnyStr, HMM: bool = True) -> List[AnyStr]:
         return self.jieba_op.lcut_for_search(sentence, HMM)
+
+    def batch_lcut(self,
+                   sentences: Any,
+                   cut_all: bool = False,
+                   HMM: bool = True,
+                   with_offsets: bool = False) -> Any:
+        """Segment a batch of sentences in parallel on the compute pool of the session.
+
+        Args:
+            sentences (List[str] or List[bytes] or matx.StringBatch): the sentences, a
+                StringBatch is read without converting each sentence.
+            cut_all (bool, optional): the full mode of `lcut`.
+            HMM (bool, optional): whether to find new words with the HMM model.
+            with_offsets (bool, optional): return the offsets of the words instead of the words.
+
+        Returns:
+            Tuple: the words of all sentences as one matx.StringBatch and a List of the number
+            of words of each sentence. With with_offsets the first item is an int64 NDArray
+            of shape [num_words, 2], the begin and end of each word in its sentence, counted
+            in chars for str and in bytes for bytes.
+        """
+        ret = self.jieba_op.batch_lcut(sentences, cut_all, HMM, with_offsets)
+        return _wrap_batch_result(ret, with_offsets)
+
+    def batch_lcut_for_search(self,
+                              sentences: Any,
+                              HMM: bool = True,
+                              with_offsets: bool = False) -> Any:
+        """The batch version of `lcut_for_search`, see `batch_lcut`."""
+        ret = self.jieba_op.batch_lcut_for_search(sentences, HMM, with_offsets)
+        return _wrap_batch_result(ret, with_offsets)
+
+
+def _wrap_batch_result(ret: Any, with_offsets: bool) -> Tuple[Any, Any]:
+    # the native op returns the words as a raw UserData
+    words, lens = ret
+    if not with_offsets:
+        words = matx.StringBatch(words)
+    return words, lens
@@ -17,7 +17,7 @@
 # specific language governing permissions and limitations
 # under the License.
 import sys
-from typing import List, Tuple, AnyStr, Any
+from typing import List, Tuple, AnyStr, Any, Union
 
 from ..native import make_native_object
 from ._dso_loader import load_text_ops_lib
@@ -52,6 +52,36 @@ class WordPieceTokenizerImpl(object):
     def tokenize_with_meta(self, sentence: List[AnyStr]) -> Tuple[List[AnyStr], List[int]]:
         return self.native_tokenizer.tokenize_with_meta(sentence)
 
+    # the StringBatch versions, the subwords are a StringBatch unless lookup_id is True
+    def tokenize_batch(self, sentence: Any) -> Any:
+        return self.native_tokenizer.tokenize(sentence)
+
+    def tokenize_batch_with_meta(self, sentence: Any) -> Any:
+        return self.native_tokenizer.tokenize_with_meta(sentence)
+
+    def batch_encode(self,
+                     sentences: Any,
+                     sentences_pair: Any = None,
+                     max_length: int = 128,
+                     basic_tokenize: bool = False,
+                     do_lower_case: bool = False,
+                     cls_token: Any = "[CLS]",
+                     sep_token: Any = "[SEP]",
+                     pad_token: Any = "[PAD]") -> Any:
+        return self.native_tokenizer.batch_encode(
+            sentences,
+            sentences_pair,
+            max_length,
+            basic_tokenize,
+            do_lower_case,
+            cls_token,
+            sep_token,
+            pad_token,
+        )
+
+    def save_vocab(self, path: str) -> None:
+        self.native_tokenizer.save_vocab(path)
+
 
 class WordPieceTokenizer:
 
@@ -66,8 +96,77 @@ class WordPieceTokenizer:
         self.tokenizer_impl: WordPieceTokenizerImpl = matx.script(WordPieceTokenizerImpl)(
             vocab_path, lookup_id, unk_token, subwords_prefix, skip_empty, max_bytes_per_token)
 
-    def tokenize(self, sentence: List[AnyStr]) -> List[AnyStr]:
+    # the subwords of a matx.StringBatch are returned as a StringBatch unless lookup_id is True
+    def tokenize(self, sentence: Union[List[AnyStr], "matx.StringBatch"]
+                 ) -> Union[List[AnyStr], "matx.StringBatch"]:
+        if isinstance(sentence, matx.StringBatch):
+            return _wrap_subwords(self.tokenizer_impl.tokenize_batch(sentence))
         return self.tokenizer_impl.tokenize(sentence)
 
-    def tokenizer_with_meta(self, sentence: List[AnyStr]) -> Tuple[List[AnyStr], List[int]]:
+    def tokenizer_with_meta(self, sentence: Union[List[AnyStr], "matx.StringBatch"]
+                            ) -> Tuple[Union[List[AnyStr], "matx.StringBatch"], List[int]]:
+        if isinstance(sentence, matx.StringBatch):
+            subwords, lens = self.tokenizer_impl.tokenize_batch_with_meta(sentence)
+            return _wrap_subwords(subwords), lens
         return self.tokenizer_impl.tokenize_with_meta(sentence)
+
+    def batch_encode(self,
+                     sentences: Any,
+                     sentences_pair: Any = None,
+                     max_length: int = 128,
+                     basic_tokenize: bool = False,
+                     do_lower_case: bool = False,
+                     cls_token: Any = "[CLS]",
+                     sep_token: Any = "[SEP]",
+                     pad_token: Any = "[PAD]") -> Any:
+        """Encode a batch of sentences into padded BERT inputs.
+
+        The sentences are encoded in parallel on the compute pool when running in a session.
+
+        Args:
+            sentences (List[str] or List[List[str]] or matx.StringBatch): the sentences,
+                a str is split on whitespace, or by the BERT basic tokenizer if basic_tokenize
+                is True, a List is taken as pre-split words.
+            sentences_pair (Any, optional): the second sentences of pairs, the same kind as
+                sentences. Defaults to None.
+            max_length (int, optional): the padded length, the sentences are truncated longest
+                first. Defaults to 128.
+            basic_tokenize (bool, optional): split on punctuation and CJK chars too and drop
+                control chars. Defaults to False.
+            do_lower_case (bool, optional): lower the text and strip accents, only with
+                basic_tokenize. Defaults to False.
+            cls_token (Any, optional): prepended to each sentence, None for none.
+            sep_token (Any, optional): appended to each sentence, None for none.
+            pad_token (Any, optional): the padding token, None for id 0.
+
+        Returns:
+            Dict[str, matx.NDArray]: int64 [batch, max_length] input_ids, attention_mask
+            and token_type_ids.
+        """
+        return self.tokenizer_impl.batch_encode(
+            sentences,
+            sentences_pair,
+            max_length,
+            basic_tokenize,
+            do_lower_case,
+            cls_token,
+            sep_token,
+            pad_token)
+
+    def save_vocab(self, path: str) -> None:
+        """Write the vocab as a precompiled trie file.
+
+        Passing the file as vocab_path skips parsing the text vocab, the trie is mapped
+        read-only and shared by all the tokenizers, sessions and processes which load it.
+
+        Args:
+            path (str): the output file path.
+        """
+        self.tokenizer_impl.save_vocab(path)
+
+
+def _wrap_subwords(subwords: Any) -> Any:
+    # the native op returns a StringBatch as a raw UserData
+    if isinstance(subwords, matx.runtime.UserData):
+        return matx.StringBatch(subwords)
+    return subwords
@@ -26,6 +26,12 @@ import inspect
 from typing import Dict, List, Any, Optional
 from ._ffi.base import _LIB_SHA1
 from . import contrib
+from .contrib.compile_cache import CompileCache
+from .contrib.compile_cache import make_key as make_compile_cache_key
+from .env import MATX_COMPILE_CACHE_DIR
+from .env import MATX_COMPILE_CACHE_SIZE_MB
+from .env import MATX_COMPILE_CACHE_READONLY_DIRS
+from .env import MATX_COMPILE_JOBS
 from .script import from_source
 from .script import context
 from .script import embedded_class_ctx
@@ -48,6 +54,21 @@ DISABLE_SCRIPT = os.environ.get('MATX_DISABLE_SCRIPT', '').lower() == 'true'
 DISABLE_GENERATE_CC = os.environ.get('MATX_DISABLE_GENERATE_CC', '').lower() == 'true'
 FLAG_COMPILED_OBJECT = object()
 
+# MATX_COMPILE_CACHE_SIZE_MB is shared by the two caches, the object files are only
+# made when the modules are split into units, so they get the smaller part
+_OBJECT_CACHE_SIZE = MATX_COMPILE_CACHE_SIZE_MB * 1024 * 1024 // 4
+COMPILE_CACHE = CompileCache(
+    MATX_COMPILE_CACHE_DIR if USE_SO_CACHE else None,
+    max_size=MATX_COMPILE_CACHE_SIZE_MB * 1024 * 1024 - _OBJECT_CACHE_SIZE,
+    read_only_dirs=MATX_COMPILE_CACHE_READONLY_DIRS if USE_SO_CACHE else ())
+# object files of the translation units, reused when only some units change
+OBJECT_CACHE = CompileCache(
+    os.path.join(MATX_COMPILE_CACHE_DIR, 'objects') if USE_SO_CACHE else None,
+    max_size=_OBJECT_CACHE_SIZE,
+    read_only_dirs=[os.path.join(d, 'objects')
+                    for d in MATX_COMPILE_CACHE_READONLY_DIRS] if USE_SO_CACHE else (),
+    suffix='.o')
+
 
 class ArgumentValueError(ValueError):
     pass
@@ -279,6 +300,66 @@ def hit_cache(so_path: str):
     return False
 
 
+def export_library(rt_mod, so_path: str, options: List[str], cc: str):
+    """Compile rt_mod to so_path, reuse the library in the compile cache
+    if the generated code, flags and compiler are the same."""
+    from .__init__ import __version__
+    key = make_compile_cache_key(rt_mod.get_source(), options, cc, _LIB_SHA1 + __version__)
+    if COMPILE_CACHE.fetch(key, so_path):
+        # keep the generated code next to the library as export_library does
+        rt_mod.save(so_path[:-2] + 'cc')
+        logging.matx_info("compile cache matched, skip compiling: [{}]".format(so_path))
+        return
+    units = rt_mod.get_units()
+    if len(units) > 1:
+        rt_mod.save(so_path[:-2] + 'cc')
+        export_units(units, so_path, options, cc)
+    else:
+        rt_mod.export_library(so_path, options=options, cc=cc)
+    try:
+        COMPILE_CACHE.store(key, so_path)
+    except OSError as e:
+        logging.warning("failed to save \"{}\" to compile cache: {}".format(so_path, e))
+
+
+def export_units(units: List[str], so_path: str, options: List[str], cc: str):
+    """Compile the translation units in parallel and link them to so_path,
+    the object files of unchanged units are reused from the compile cache."""
+    import concurrent.futures
+    from .__init__ import __version__
+    options = options + ["-I" + path for path in find_include_path()]
+    base_path = so_path[:-3]
+    objects = []
+    compiling = []
+    for i, unit in enumerate(units):
+        unit_path = "{}_unit{}.cc".format(base_path, i)
+        obj_path = "{}_unit{}.o".format(base_path, i)
+        objects.append(obj_path)
+        key = make_compile_cache_key(unit, options, cc, _LIB_SHA1 + __version__)
+        if OBJECT_CACHE.fetch(key, obj_path):
+            continue
+        with open(unit_path, "w") as f:
+            f.write(unit)
+        compiling.append((unit_path, obj_path, key))
+    logging.matx_info("compile {} of {} units: [{}]".format(len(compiling), len(units), so_path))
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, MATX_COMPILE_JOBS)) as executor:
+            futures = [executor.submit(contrib.cc.create_object, obj_path, unit_path, options, cc)
+                       for unit_path, obj_path, _ in compiling]
+            for future, (_, obj_path, key) in zip(futures, compiling):
+                future.result()
+                try:
+                    OBJECT_CACHE.store(key, obj_path)
+                except OSError as e:
+                    logging.warning(
+                        "failed to save \"{}\" to compile cache: {}".format(obj_path, e))
+        contrib.cc.create_shared(so_path, objects, options=options, cc=cc)
+    finally:
+        for path in objects + [unit_path for unit_path, _, _ in compiling]:
+            if os.path.exists(path):
+                os.remove(path)
+
+
 def toolchain_build(sc_ctx: context.ScriptContext, toolchain: ToolChain):
     rt_mod = sc_ctx.rt_module
     main_node_name = sc_ctx.main_node.context.name
@@ -323,7 +404,7 @@ def build_dso(sc_ctx: context.ScriptContext, use_toolchain=False):
         contrib.cc.check_cc_version(sys_cc_path, False)
         if not hit_cache(sopath):
             logging.matx_info("matx compile function/class: [{}:{}]".format(main_node_name, sopath))
-            rt_mod.export_library(sopath, options=cxx11_no_abi_options, cc=sys_cc_path)
+            export_library(rt_mod, sopath, cxx11_no_abi_options, sys_cc_path)
         else:
             logging.matx_info(
                 "info matched, skip compiling: [{}:{}]".format(
@@ -335,10 +416,7 @@ def build_dso(sc_ctx: context.ScriptContext, use_toolchain=False):
                 if not hit_cache(sopath_cxx11):
                     logging.matx_info(
                         "matx compile function/class: [{}:{}]".format(main_node_name, sopath_cxx11))
-                    rt_mod.export_library(
-                        sopath_cxx11,
-                        options=cxx11_with_abi_options,
-                        cc=server_cc_path)
+                    export_library(rt_mod, sopath_cxx11, cxx11_with_abi_options, server_cc_path)
                 else:
                     logging.matx_info(
                         "info matched, skip compiling: [{}:{}]".format(
@@ -358,6 +436,52 @@ def disable_script():
     DISABLE_SCRIPT = True
 
 
+def _prebuild_worker(compiling_obj):
+    sc_ctx = from_source(compiling_obj)
+    build_dso(sc_ctx)
+    return sc_ctx.dso_path
+
+
+def _prebuild_all(compiling_objs, num_workers):
+    import concurrent.futures
+    with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+        return list(executor.map(_prebuild_worker, compiling_objs))
+
+
+def prebuild(compiling_objs, num_workers=None, wait=True):
+    """Compile functions and classes in parallel worker processes, so that the
+    following script calls in this or other processes hit the cache.
+
+    Args:
+        compiling_objs (list): functions or classes to be compiled, they must be picklable,
+            i.e. defined at the top level of a module.
+        num_workers (int): the number of worker processes, default is the number of cpus.
+        wait (bool): block until all of them are compiled. If False, the build runs in
+            the background and a concurrent.futures.Future of the result is returned,
+            so a service can warm the cache while it starts up.
+
+    Returns:
+        list of the dso paths of each object, or a Future of it if wait is False.
+    """
+    import concurrent.futures
+    if DISABLE_SCRIPT or len(compiling_objs) == 0:
+        if wait:
+            return []
+        future = concurrent.futures.Future()
+        future.set_result([])
+        return future
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    num_workers = max(1, min(num_workers, len(compiling_objs)))
+    if wait:
+        return _prebuild_all(compiling_objs, num_workers)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1,
+                                                     thread_name_prefix="matx_prebuild")
+    future = executor.submit(_prebuild_all, list(compiling_objs), num_workers)
+    executor.shutdown(wait=False)
+    return future
+
+
 def script(compiling_obj, *, share=False, toolchain=None, bundle_args=None):
     """Entry function for compiling. Given a python object including function,
     simple class, compile it to a matx4 object which mostly
@@ -33,11 +33,13 @@ from .conv2d_op import Conv2dOp, SharpenOp, EmbossOp, EdgeDetectOp
 from .crop_op import CenterCropOp, CropOp
 from .cvt_color_op import CvtColorOp
 from .flip_op import FlipOp
+from .fused_transform_op import FusedTransformOp
 from .gamma_contrast_op import GammaContrastOp
 from .gauss_noise_op import GaussNoiseOp
 from .gaussian_blur_op import GaussianBlurOp
 from .hist_equalize_op import HistEqualizeOp
 from .imdecode_op import ImdecodeOp, ImdecodeRandomCropOp, ImdecodeNoExceptionOp, ImdecodeNoExceptionRandomCropOp
+from .imdecode_op import ImdecodeResizeOp
 from .imencode_op import ImencodeOp, ImencodeNoExceptionOp
 from .invert_op import InvertOp
 from .laplacian_blur_op import LaplacianBlurOp
@@ -83,6 +85,7 @@ __all__ = [
     "CropOp",
     "CvtColorOp",
     "FlipOp",
+    "FusedTransformOp",
     "GammaContrastOp",
     "GaussNoiseOp",
     "GaussianBlurOp",
@@ -91,6 +94,7 @@ __all__ = [
     "ImdecodeRandomCropOp",
     "ImdecodeNoExceptionOp",
     "ImdecodeNoExceptionRandomCropOp",
+    "ImdecodeResizeOp",
     "ImencodeOp",
     "ImencodeNoExceptionOp",
     "InvertOp",
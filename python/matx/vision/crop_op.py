@@ -44,7 +44,8 @@ class _CenterCropOpImpl:
 
     def __call__(self,
                  images: List[matx.runtime.NDArray],
-                 sync: int = ASYNC) -> List[matx.runtime.NDArray]:
+                 sync: int = ASYNC,
+                 out: Any = None) -> List[matx.runtime.NDArray]:
         batch_size = len(images)
         x = matx.List()
         x.reserve(batch_size)
@@ -59,7 +60,9 @@ class _CenterCropOpImpl:
             y_: int = (shape_[0] - self.height) // 2
             x.append(x_)
             y.append(y_)
-        return self.op.process(images, x, y, width, height, sync)
+        if out is None:
+            return self.op.process(images, x, y, width, height, sync)
+        return self.op.process(images, x, y, width, height, sync, out)
 
 
 class CenterCropOp:
@@ -78,7 +81,8 @@ class CenterCropOp:
 
     def __call__(self,
                  images: List[matx.runtime.NDArray],
-                 sync: int = ASYNC) -> List[matx.runtime.NDArray]:
+                 sync: int = ASYNC,
+                 out: Any = None) -> List[matx.runtime.NDArray]:
         """ CenterCrop images
 
         Args:
@@ -88,6 +92,9 @@ class CenterCropOp:
                                     SYNC -- If device is GPU, the whole calculation will be blocked until this operation is finished.
                                     SYNC_CPU -- If device is GPU, the whole calculation will be blocked until this operation is finished, and the corresponding CPU array would be created and returned.
                                   Defaults to ASYNC.
+            out (Any, optional): preallocated cpu outputs, a list of NDArray or a batch NDArray such as a NHWC tensor,
+                                 whose i-th item must have the shape and dtype of the i-th result. The results are
+                                 written into them instead of new NDArrays. Only supported on cpu. Defaults to None.
 
         Returns:
             List[matx.runtime.NDArray]: center crop images
@@ -111,7 +118,7 @@ class CenterCropOp:
                               size=(224, 224))
         >>> ret = op(nds)
         """
-        return self.op_impl(images, sync)
+        return self.op_impl(images, sync, out)
 
 
 class _CropOpImpl:
@@ -132,8 +139,11 @@ class _CropOpImpl:
                  y: List[int],
                  width: List[int],
                  height: List[int],
-                 sync: int = ASYNC) -> List[matx.runtime.NDArray]:
-        return self.op.process(images, x, y, width, height, sync)
+                 sync: int = ASYNC,
+                 out: Any = None) -> List[matx.runtime.NDArray]:
+        if out is None:
+            return self.op.process(images, x, y, width, height, sync)
+        return self.op.process(images, x, y, width, height, sync, out)
 
 
 class CropOp:
@@ -154,7 +164,8 @@ class CropOp:
                  y: List[int],
                  width: List[int],
                  height: List[int],
-                 sync: int = ASYNC) -> List[matx.runtime.NDArray]:
+                 sync: int = ASYNC,
+                 out: Any = None) -> List[matx.runtime.NDArray]:
         """ Crop images
 
         Args:
@@ -168,6 +179,9 @@ class CropOp:
                                     SYNC -- If device is GPU, the whole calculation will be blocked until this operation is finished.
                                     SYNC_CPU -- If device is GPU, the whole calculation will be blocked until this operation is finished, and the corresponding CPU array would be created and returned.
                                   Defaults to ASYNC.
+            out (Any, optional): preallocated cpu outputs, a list of NDArray or a batch NDArray such as a NHWC tensor,
+                                 whose i-th item must have the shape and dtype of the i-th result. The results are
+                                 written into them instead of new NDArrays. Only supported on cpu. Defaults to None.
 
         Returns:
             List[matx.runtime.NDArray]: crop images
@@ -193,4 +207,4 @@ class CropOp:
         >>> op = CropOp(device=device)
         >>> ret = op(nds, x, y, widths, heights)
         """
-        return self.op_impl(images, x, y, width, height, sync)
+        return self.op_impl(images, x, y, width, height, sync, out)
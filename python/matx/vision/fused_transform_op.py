@@ -0,0 +1,115 @@
+# Copyright 2022 ByteDance Ltd. and/or its affiliates.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from typing import List, Any
+from .constants._sync_mode import ASYNC
+from .opencv._cv_interpolation_flags import INTER_LINEAR
+from ..native import make_native_object
+
+import sys
+matx = sys.modules['matx']
+
+
+class _FusedTransformOpImpl:
+    """ Impl: crop, resize, normalize, cast and transpose images in one pass """
+
+    def __init__(self,
+                 device: Any,
+                 alpha: List[float],
+                 beta: List[float],
+                 dtype: str = "",
+                 layout: str = "HWC",
+                 interp: str = INTER_LINEAR) -> None:
+        self.op: matx.NativeObject = make_native_object(
+            "VisionFusedTransformGeneralOp", alpha, beta, dtype, layout, interp, device())
+
+    def __call__(self,
+                 images: List[matx.runtime.NDArray],
+                 pre_crop: List[List[int]],
+                 sizes: List[List[int]],
+                 post_crop: List[List[int]],
+                 stack: bool = False,
+                 sync: int = ASYNC) -> Any:
+        return self.op.process(images, pre_crop, sizes, post_crop, stack, sync)
+
+
+class FusedTransformOp:
+    """ Crop, resize, normalize, cast and transpose images on cpu, the image is only written
+    by the resize and by one final pass into the output layout.
+    """
+
+    def __init__(self,
+                 device: Any,
+                 alpha: List[float] = [],
+                 beta: List[float] = [],
+                 dtype: str = "",
+                 layout: str = "HWC",
+                 interp: str = INTER_LINEAR) -> None:
+        """ Initialize FusedTransformOp
+
+        Args:
+            device (Any) : the matx device used for the operation, only cpu is supported.
+            alpha (List[float], optional) : per channel scale, the output is image * alpha + beta. Empty means 1, a single value is used for every channel.
+            beta (List[float], optional) : per channel shift, must have the size of alpha.
+            dtype (str, optional) : output data type, the input data type by default.
+            layout (str, optional) : output layout of each image, HWC or CHW. HWC by default.
+            interp (str, optional) : interpolation method of the resize, INTER_LINEAR by default.
+        """
+        self.op: _FusedTransformOpImpl = matx.script(_FusedTransformOpImpl)(
+            device, alpha, beta, dtype, layout, interp)
+
+    def __call__(self,
+                 images: List[matx.runtime.NDArray],
+                 pre_crop: List[List[int]] = [],
+                 sizes: List[List[int]] = [],
+                 post_crop: List[List[int]] = [],
+                 stack: bool = False,
+                 sync: int = ASYNC) -> Any:
+        """
+
+        Args:
+            images (List[matx.runtime.NDArray]): input images, uint8 or float32 in HWC.
+            pre_crop (List[List[int]], optional): the (x, y, width, height) cropped from each image first.
+                                                  An empty list means no crop.
+            sizes (List[List[int]], optional): the (h, w) each image is resized to after pre_crop.
+                                               An empty list means no resize.
+            post_crop (List[List[int]], optional): the (x, y, width, height) cropped from each image after the resize.
+                                                   An empty list means no crop.
+            stack (bool, optional): write the images into one batch NDArray, NHWC or NCHW by the layout.
+                                    The output images must have the same size. Defaults to False.
+            sync (int, optional): sync mode after calculating the output. when device is cpu, the param makes no difference.
+                                  Defaults to ASYNC.
+
+        Returns:
+            List[matx.runtime.NDArray] or matx.runtime.NDArray if stack is True
+
+        Examples:
+
+        >>> import cv2
+        >>> import matx
+        >>> from matx.vision import FusedTransformOp
+        >>> # Get origin_image.jpeg from https://github.com/bytedance/matxscript/tree/main/test/data/origin_image.jpeg
+        >>> image = cv2.imread("./origin_image.jpeg")
+        >>> nds = [matx.array.from_numpy(image) for _ in range(2)]
+        >>> op = FusedTransformOp(matx.Device("cpu"), [1 / 255.0] * 3, [0.0] * 3, "float32", "CHW")
+        >>> ret = op(nds, sizes=[[256, 256]] * 2, post_crop=[[16, 16, 224, 224]] * 2, stack=True)
+        >>> ret.shape()
+        [2, 3, 224, 224]
+        """
+        return self.op(images, pre_crop, sizes, post_crop, stack, sync)
@@ -19,6 +19,8 @@
 
 from typing import List, Any, Tuple
 from .constants._sync_mode import ASYNC
+from .constants._resize_mode import RESIZE_DEFAULT
+from .opencv._cv_interpolation_flags import INTER_LINEAR
 from ..native import make_native_object
 
 import sys
@@ -32,8 +34,12 @@ class _ImdecodeOpImpl:
         self.op: matx.NativeObject = make_native_object(
             "VisionImdecodeGeneralOp", fmt, pool_size, device())
 
-    def __call__(self, images: List[bytes], sync: int = ASYNC) -> List[matx.runtime.NDArray]:
-        return self.op.process(images, sync)
+    def __call__(self, images: List[bytes],
+                 sync: int = ASYNC,
+                 out: Any = None) -> List[matx.runtime.NDArray]:
+        if out is None:
+            return self.op.process(images, sync)
+        return self.op.process(images, sync, out)
 
 
 class ImdecodeOp:
@@ -50,7 +56,9 @@ class ImdecodeOp:
         self.op: _ImdecodeOpImpl = matx.script(
             _ImdecodeOpImpl)(device, fmt, pool_size)
 
-    def __call__(self, images: List[bytes], sync: int = ASYNC) -> List[matx.runtime.NDArray]:
+    def __call__(self, images: List[bytes],
+                 sync: int = ASYNC,
+                 out: Any = None) -> List[matx.runtime.NDArray]:
         """
 
         Args:
@@ -60,6 +68,9 @@ class ImdecodeOp:
                                     SYNC -- If device is GPU, the whole calculation will bolcking util the compute is completed.
                                     SYNC_CPU -- If device is GPU, the whole calculation will bolcking util the compute is completed, then copying the CUDA data to CPU.
                                   Defaults to ASYNC.
+            out (Any, optional): preallocated cpu outputs, a list of NDArray or a batch NDArray such as a NHWC tensor,
+                                 whose i-th item must have the shape and dtype of the i-th result. The results are
+                                 written into them instead of new NDArrays. Only supported on cpu. Defaults to None.
 
         Returns:
             List[matx.runtime.NDArray]: decoded images
@@ -78,7 +89,85 @@ class ImdecodeOp:
         >>> r[0].shape()
         [360, 640, 3]
         """
-        return self.op(images, sync)
+        return self.op(images, sync, out)
+
+
+class _ImdecodeResizeOpImpl:
+    """ Decode binary image at a reduced resolution and resize impl """
+
+    def __init__(self,
+                 device: Any,
+                 fmt: str,
+                 size: Tuple[int, int],
+                 mode: str = RESIZE_DEFAULT,
+                 interp: str = INTER_LINEAR) -> None:
+        self.op: matx.NativeObject = make_native_object(
+            "VisionImdecodeResizeGeneralOp", fmt, size[0], size[1], mode, interp, device())
+
+    def __call__(self, images: List[bytes],
+                 sync: int = ASYNC,
+                 out: Any = None) -> List[matx.runtime.NDArray]:
+        if out is None:
+            return self.op.process(images, sync)
+        return self.op.process(images, sync, out)
+
+
+class ImdecodeResizeOp:
+    """ Decode binary image and resize it, jpeg images are decoded at a reduced resolution when possible """
+
+    def __init__(self,
+                 device: Any,
+                 fmt: str,
+                 size: Tuple[int, int],
+                 mode: str = RESIZE_DEFAULT,
+                 interp: str = INTER_LINEAR) -> None:
+        """ Initialize ImdecodeResizeOp
+
+        Args:
+            device (matx.Device): device used for the operation, only cpu is supported
+            fmt (str): the color type for output image, support "RGB" and "BGR"
+            size (Tuple[int, int]): output size (h, w) for all images.
+            mode (str, optional) : resize mode like ResizeOp, could be chosen from RESIZE_DEFAULT, RESIZE_NOT_LARGER, and RESIZE_NOT_SMALLER.
+                                   RESIZE_DEFAULT by default.
+            interp (str, optional) : interpolation method of the resize after decoding, INTER_LINEAR by default.
+        """
+        if len(size) != 2:
+            assert False, "The target size for ImdecodeResizeOp should be 2."
+        self.op: _ImdecodeResizeOpImpl = matx.script(
+            _ImdecodeResizeOpImpl)(device, fmt, size, mode, interp)
+
+    def __call__(self, images: List[bytes],
+                 sync: int = ASYNC,
+                 out: Any = None) -> List[matx.runtime.NDArray]:
+        """ A jpeg image is decoded with the largest DCT scaling of 1/2, 1/4 or 1/8 whose output still covers
+        the target size, and then resized to the target size. Other images are decoded at full resolution.
+
+        Args:
+            images (List[bytes]): list of binary images
+            sync (int, optional): sync mode after calculating the output. when device is cpu, the param makes no difference.
+                                  Defaults to ASYNC.
+            out (Any, optional): preallocated cpu outputs, a list of NDArray or a batch NDArray such as a NHWC tensor,
+                                 whose i-th item must have the shape and dtype of the i-th result. The results are
+                                 written into them instead of new NDArrays. Only supported on cpu. Defaults to None.
+
+        Returns:
+            List[matx.runtime.NDArray]: decoded and resized images
+
+        Examples:
+
+        >>> import matx
+        >>> from matx.vision import ImdecodeResizeOp
+        >>> # Get origin_image.jpeg from https://github.com/bytedance/matxscript/tree/main/test/data/origin_image.jpeg
+        >>> fd = open("./origin_image.jpeg", "rb")
+        >>> content = fd.read()
+        >>> fd.close()
+        >>> device = matx.Device("cpu")
+        >>> decode_op = ImdecodeResizeOp(device, "BGR", (80, 80))
+        >>> r = decode_op([content])
+        >>> r[0].shape()
+        [80, 80, 3]
+        """
+        return self.op(images, sync, out)
 
 
 class _ImdecodeRandomCropOpImpl:
@@ -150,8 +239,11 @@ class _ImdecodeNoExceptionOpImpl:
             "VisionImdecodeNoExceptionGeneralOp", fmt, pool_size, device())
 
     def __call__(self, images: List[bytes],
-                 sync: int = ASYNC) -> Tuple[List[matx.runtime.NDArray], List[int]]:
-        return self.op.process(images, sync)
+                 sync: int = ASYNC,
+                 out: Any = None) -> Tuple[List[matx.runtime.NDArray], List[int]]:
+        if out is None:
+            return self.op.process(images, sync)
+        return self.op.process(images, sync, out)
 
 
 class ImdecodeNoExceptionOp:
@@ -169,7 +261,8 @@ class ImdecodeNoExceptionOp:
             device, fmt, pool_size)
 
     def __call__(self, images: List[bytes],
-                 sync: int = ASYNC) -> Tuple[List[matx.runtime.NDArray], List[int]]:
+                 sync: int = ASYNC,
+                 out: Any = None) -> Tuple[List[matx.runtime.NDArray], List[int]]:
         """
 
         Args:
@@ -179,13 +272,16 @@ class ImdecodeNoExceptionOp:
                                     SYNC -- If device is GPU, the whole calculation will bolcking util the compute is completed.
                                     SYNC_CPU -- If device is GPU, the whole calculation will bolcking util the compute is completed, then copying the CUDA data to CPU.
                                   Defaults to ASYNC.
+            out (Any, optional): preallocated cpu outputs, a list of NDArray or a batch NDArray such as a NHWC tensor,
+                                 whose i-th item must have the shape and dtype of the i-th result. The results are
+                                 written into them instead of new NDArrays. Only supported on cpu. Defaults to None.
 
         Returns:
             List[matx.runtime.NDArray]: decoded images
             List[int]: 1 means operation is successful, otherwise 0
 
         """
-        return self.op(images, sync)
+        return self.op(images, sync, out)
 
 
 class _ImdecodeNoExceptionRandomCropOpImpl:
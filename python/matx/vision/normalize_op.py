@@ -40,8 +40,11 @@ class _NormalizeOpImpl:
 
     def __call__(self,
                  images: List[matx.runtime.NDArray],
-                 sync: int = ASYNC) -> List[matx.runtime.NDArray]:
-        return self.op.process(images, sync)
+                 sync: int = ASYNC,
+                 out: Any = None) -> List[matx.runtime.NDArray]:
+        if out is None:
+            return self.op.process(images, sync)
+        return self.op.process(images, sync, out)
 
 
 class NormalizeOp:
@@ -74,7 +77,8 @@ class NormalizeOp:
 
     def __call__(self,
                  images: List[matx.runtime.NDArray],
-                 sync: int = ASYNC) -> List[matx.runtime.NDArray]:
+                 sync: int = ASYNC,
+                 out: Any = None) -> List[matx.runtime.NDArray]:
         """ Normalize images with mean and std, and cast the image data type to target type.
 
         Args:
@@ -84,6 +88,9 @@ class NormalizeOp:
                                     SYNC -- If device is GPU, the whole calculation will be blocked until this operation is finished.
                                     SYNC_CPU -- If device is GPU, the whole calculation will be blocked until this operation is finished, and the corresponding CPU array would be created and returned.
                                   Defaults to ASYNC.
+            out (Any, optional): preallocated cpu outputs, a list of NDArray or a batch NDArray such as a NHWC tensor,
+                                 whose i-th item must have the shape and dtype of the i-th result. The results are
+                                 written into them instead of new NDArrays. Only supported on cpu. Defaults to None.
         Returns:
             List[matx.runtime.NDArray]: converted images
 
@@ -107,7 +114,7 @@ class NormalizeOp:
         >>> op = NormalizeOp(device, mean, std)
         >>> ret = op(nds)
         """
-        return self.op_impl(images, sync)
+        return self.op_impl(images, sync, out)
 
 
 class _TransposeNormalizeOpImpl:
@@ -50,7 +50,8 @@ class _ResizeOpImpl:
     def __call__(self,
                  images: List[matx.runtime.NDArray],
                  size: List[Tuple[int, int]] = [],
-                 sync: int = ASYNC) -> List[matx.runtime.NDArray]:
+                 sync: int = ASYNC,
+                 out: Any = None) -> List[matx.runtime.NDArray]:
         batch_size: int = len(images)
         use_unique_size: bool = self.use_unique_size
         if len(size) > 0:
@@ -109,7 +110,9 @@ class _ResizeOpImpl:
             desired_height.append(cur_height)
             desired_width.append(cur_width)
 
-        return self.op.process(images, desired_height, desired_width, self.interp, sync)
+        if out is None:
+            return self.op.process(images, desired_height, desired_width, self.interp, sync)
+        return self.op.process(images, desired_height, desired_width, self.interp, sync, out)
 
 
 class ResizeOp:
@@ -149,7 +152,8 @@ class ResizeOp:
     def __call__(self,
                  images: List[matx.runtime.NDArray],
                  size: List[Tuple[int, int]] = [],
-                 sync: int = ASYNC) -> List[matx.runtime.NDArray]:
+                 sync: int = ASYNC,
+                 out: Any = None) -> List[matx.runtime.NDArray]:
         """ Resize input images.
 
         Args:
@@ -161,6 +165,9 @@ class ResizeOp:
                                     SYNC -- If device is GPU, the whole calculation will be blocked until this operation is finished.
                                     SYNC_CPU -- If device is GPU, the whole calculation will be blocked until this operation is finished, and the corresponding CPU array would be created and returned.
                                   Defaults to ASYNC.
+            out (Any, optional): preallocated cpu outputs, a list of NDArray or a batch NDArray such as a NHWC tensor,
+                                 whose i-th item must have the shape and dtype of the i-th result. The results are
+                                 written into them instead of new NDArrays. Only supported on cpu. Defaults to None.
 
         Example:
 
@@ -180,4 +187,4 @@ class ResizeOp:
         >>> op = ResizeOp(device, size=(224, 224), mode=matx.vision.RESIZE_NOT_SMALLER)
         >>> ret = op(nds)
         """
-        return self.op_impl(images, size, sync)
+        return self.op_impl(images, size, sync, out)
@@ -41,6 +41,7 @@ from .crop import CenterCrop, CenterCropImpl, RandomCrop, RandomCropImpl
 from .cvt_color import CvtColor, CvtColorImpl
 from .resize import Resize, ResizeImpl, RandomResizedCrop, RandomResizedCropImpl
 from .warp import RandomRotation, RandomRotationImpl, RandomAffine, RandomAffineImpl, RandomPerspective, RandomPerspectiveImpl
+from .fused import fuse_transforms
 
 from .. import ASYNC, SYNC
 import torch
@@ -83,7 +84,7 @@ __all__ = [
 
 
 class Compose(object):
-    def __init__(self, device_id: int, transforms: List[Any]) -> None:
+    def __init__(self, device_id: int, transforms: List[Any], fuse: bool = False) -> None:
         self.default_device_id: int = device_id
         self.transforms: List[Any] = []
         self.device_str: Dict[int, str] = {}
@@ -105,6 +106,9 @@ class Compose(object):
                 else:
                     op_sync = op.sync()
             self.transforms = [op(op_device, op_device_str, op_sync)] + self.transforms
+        if fuse:
+            # run the chains of cpu crop, resize, normalize and layout transforms in one pass
+            self.transforms = fuse_transforms(self.transforms)
 
     def _create_device_str(self, device_id: int) -> str:
         if device_id in self.device_str:
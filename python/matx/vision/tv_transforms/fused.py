@@ -0,0 +1,246 @@
+# Copyright 2022 ByteDance Ltd. and/or its affiliates.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from typing import Any, Tuple, List
+import sys
+matx = sys.modules['matx']
+from .. import NHWC, NCHW, RESIZE_NOT_LARGER, RESIZE_NOT_SMALLER, INTER_LINEAR, FusedTransformOp
+
+from .crop import CenterCropImpl
+from .resize import ResizeImpl
+from .normalize import NormalizeImpl
+from .convert_dtype import ConvertImageDtypeImpl
+from .stack import StackImpl
+from .transpose import TransposeImpl
+from .to_tensor import ToTensorImpl
+
+
+def _resize_size(h: int, w: int, size: Tuple[int, int], max_size: int, mode: str) -> List[int]:
+    # the same size as ResizeOp
+    th, tw = size
+    ratio = w / h
+    width_scale = tw / w
+    height_scale = th / h
+    if mode == RESIZE_NOT_LARGER:
+        if width_scale < height_scale:
+            th = int(h * width_scale)
+        elif width_scale > height_scale:
+            tw = int(w * height_scale)
+    elif mode == RESIZE_NOT_SMALLER:
+        if width_scale > height_scale:
+            th = int(h * width_scale)
+        elif width_scale < height_scale:
+            tw = int(w * height_scale)
+        if ratio > 1.0 and 0 < max_size < tw:
+            tw = max_size
+            th = int(max_size / ratio)
+        elif ratio < 1.0 and 0 < max_size < th:
+            th = max_size
+            tw = int(max_size * ratio)
+    return [max(th, 1), max(tw, 1)]
+
+
+class FusedImpl:
+    """ Runs a chain of cpu transforms: CenterCrop, Resize, CenterCrop, then Normalize and
+    ConvertImageDtype, then Stack, Transpose or ToTensor, as one FusedTransformOp. Each of the
+    parts is optional.
+    """
+
+    def __init__(self, transforms: List[Any]) -> None:
+        self.transforms: List[Any] = transforms
+        self.pre_crop: Any = None
+        self.resize: Any = None
+        self.post_crop: Any = None
+        self.stack: bool = False
+        layout = "HWC"
+        alpha: List[float] = []
+        beta: List[float] = []
+        dtype = ""
+        channels = 0
+        for t in transforms:
+            if isinstance(t, CenterCropImpl):
+                if self.resize is None:
+                    self.pre_crop = t
+                else:
+                    self.post_crop = t
+            elif isinstance(t, ResizeImpl):
+                self.resize = t
+            elif isinstance(t, (NormalizeImpl, ConvertImageDtypeImpl)):
+                t_alpha, t_beta, dtype = _affine_params(t)
+                if isinstance(t, NormalizeImpl):
+                    channels = len(t_alpha)
+                if not alpha:
+                    alpha, beta = t_alpha, t_beta
+                else:
+                    n = max(len(alpha), len(t_alpha))
+                    alpha, beta = _broadcast(alpha, n), _broadcast(beta, n)
+                    t_alpha, t_beta = _broadcast(t_alpha, n), _broadcast(t_beta, n)
+                    beta = [a * b + c for a, b, c in zip(t_alpha, beta, t_beta)]
+                    alpha = [a * b for a, b in zip(t_alpha, alpha)]
+            elif isinstance(t, StackImpl):
+                self.stack = True
+            elif isinstance(t, (TransposeImpl, ToTensorImpl)):
+                self.stack = True
+                layout = "CHW"
+        # the channels required by Normalize, 0 for any
+        self.channels: int = channels
+        interp = INTER_LINEAR if self.resize is None else self.resize.interpolation_mode
+        self.op: FusedTransformOp = FusedTransformOp(
+            matx.Device("cpu"), alpha, beta, dtype, layout, interp)
+        self.name: str = "Fused"
+
+    def _can_fuse(self, imgs: List[matx.NDArray]) -> bool:
+        # the images of a batch must have the same channels, e.g. a mix of gray and rgb
+        # images is left to the unfused transforms
+        expected = self.channels
+        for img in imgs:
+            if img.dtype() not in ("uint8", "float32"):
+                return False
+            shape = img.shape()
+            if len(shape) < 2 or len(shape) > 3:
+                return False
+            channels = 1 if len(shape) == 2 else shape[2]
+            if expected == 0:
+                expected = channels
+            if channels != expected:
+                return False
+        return True
+
+    def _crop_params(self, t: Any, h: int, w: int) -> Any:
+        if t.get_pad_params(h, w)[2]:
+            return None
+        y, x, th, tw = t.get_crop_params(h, w)
+        return [x, y, tw, th]
+
+    def __call__(self, imgs: List[matx.NDArray], apply_index: List[int] = []) -> Any:
+        assert len(apply_index) == 0, "apply_index is not supported by fused transforms."
+        if not self._can_fuse(imgs):
+            return self._fallback(imgs)
+        pre_crop, sizes, post_crop = [], [], []
+        for img in imgs:
+            h, w = img.shape()[:2]
+            if self.pre_crop is not None:
+                rect = self._crop_params(self.pre_crop, h, w)
+                if rect is None:
+                    return self._fallback(imgs)
+                pre_crop.append(rect)
+                w, h = rect[2], rect[3]
+            if self.resize is not None:
+                h, w = _resize_size(h, w, self.resize.size, self.resize.max_size,
+                                    self.resize.resize_mode)
+                sizes.append([h, w])
+            if self.post_crop is not None:
+                rect = self._crop_params(self.post_crop, h, w)
+                if rect is None:
+                    return self._fallback(imgs)
+                post_crop.append(rect)
+        return self.op(imgs, pre_crop, sizes, post_crop, self.stack)
+
+    def _fallback(self, imgs: Any) -> Any:
+        # e.g. a center crop larger than the image needs a padding
+        for t in self.transforms:
+            imgs = t(imgs, [])
+        return imgs
+
+    def __repr__(self) -> str:
+        format_string = self.name + '('
+        for t in self.transforms:
+            format_string += '\n'
+            format_string += '        {0}'.format(t)
+        format_string += '\n    )'
+        return format_string
+
+
+def _affine_params(t: Any) -> Tuple[List[float], List[float], str]:
+    # NormalizeOp computes image * alpha + beta with alpha = global_scale / std
+    # and beta = -mean * global_scale / std
+    if isinstance(t, NormalizeImpl):
+        alpha = [1.0 / s for s in t.std]
+        beta = [-m / s for m, s in zip(t.mean, t.std)]
+        return alpha, beta, "float32"
+    # ConvertImageDtype scales every channel, FusedTransformOp broadcasts a single scale to
+    # the channels of the input
+    return [t.global_scale], [0.0], t.dtype
+
+
+def _broadcast(values: List[float], n: int) -> List[float]:
+    if len(values) == 1:
+        return values * n
+    return values
+
+
+def _is_cpu(t: Any) -> bool:
+    return getattr(t, "device_str", None) == "cpu"
+
+
+def _match_fusible(transforms: List[Any], start: int) -> int:
+    # the end of the longest fusible run from start, the stages must keep this order:
+    # CenterCrop, Resize, CenterCrop, Normalize/ConvertImageDtype..., Stack, Transpose/ToTensor
+    stage = 0
+    channels = -1
+    affine_dtype = ""
+    i = start
+    while i < len(transforms):
+        t = transforms[i]
+        if not _is_cpu(t):
+            break
+        if isinstance(t, CenterCropImpl) and stage in (0, 2):
+            stage += 1
+        elif isinstance(t, ResizeImpl) and stage <= 1:
+            stage = 2
+        elif isinstance(t, (NormalizeImpl, ConvertImageDtypeImpl)) and stage <= 4:
+            t_alpha, _, t_dtype = _affine_params(t)
+            # only the last stage may round or saturate
+            if affine_dtype not in ("", "float32"):
+                break
+            if isinstance(t, NormalizeImpl):
+                if channels >= 0 and channels != len(t_alpha):
+                    break
+                channels = len(t_alpha)
+            affine_dtype = t_dtype
+            stage = 4
+        elif isinstance(t, StackImpl) and stage <= 4:
+            stage = 5
+        elif isinstance(t, TransposeImpl) and stage == 5:
+            if t.src_fmt != NHWC or t.dst_fmt != NCHW:
+                break
+            i += 1
+            break
+        elif isinstance(t, ToTensorImpl) and stage <= 4:
+            i += 1
+            break
+        else:
+            break
+        i += 1
+    return i
+
+
+def fuse_transforms(transforms: List[Any]) -> List[Any]:
+    """ Replace the runs of fusible cpu transforms in a Compose by FusedImpl """
+    fused = []
+    i = 0
+    while i < len(transforms):
+        end = _match_fusible(transforms, i)
+        if end - i >= 2:
+            fused.append(FusedImpl(transforms[i:end]))
+            i = end
+        else:
+            fused.append(transforms[i])
+            i += 1
+    return fused
@@ -18,6 +18,8 @@
  * under the License.
  */
 
+#include <matxscript/runtime/container/opaque_object.h>
+#include <matxscript/runtime/container/tuple_ref.h>
 #include <matxscript/runtime/msgpack/msgpack.h>
 #include <matxscript/runtime/registry.h>
 
@@ -30,16 +32,98 @@ MATXSCRIPT_REGISTER_GLOBAL("runtime.msgpack_dumps").set_body([](PyArgs args) ->
 });
 
 MATXSCRIPT_REGISTER_GLOBAL("runtime.msgpack_loads").set_body([](PyArgs args) -> RTValue {
-  MXCHECK(args.size() == 1) << "[runtime.msgpack.loads] Expect 1 arguments but get " << args.size();
+  MXCHECK(args.size() == 1 || args.size() == 2)
+      << "[runtime.msgpack.loads] Expect 1 or 2 arguments but get " << args.size();
+  bool zero_copy = args.size() == 2 && args[1].As<bool>();
   if (args[0].Is<string_view>()) {
+    if (zero_copy) {
+      return serialization::msgpack_loads(args[0].As<String>(), true);
+    }
     return serialization::msgpack_loads(args[0].AsNoCheck<string_view>());
   } else if (args[0].Is<unicode_view>()) {
-    return serialization::msgpack_loads(UTF8Encode(args[0].AsNoCheck<unicode_view>()));
+    return serialization::msgpack_loads(UTF8Encode(args[0].AsNoCheck<unicode_view>()), zero_copy);
   } else {
     MXTHROW << "[runtime.msgpack.loads] Expect bytes or str but get " << args[0].type_name();
   }
   return None;
 });
 
+/******************************************************************************
+ * stream packer and unpacker, held by an OpaqueObject
+ *****************************************************************************/
+
+static constexpr int64_t kMsgpackStreamPackerTag = 101;
+static constexpr int64_t kMsgpackStreamUnpackerTag = 102;
+
+template <typename T>
+static T* GetMsgpackStream(const Any& handle, int64_t tag, const char* name) {
+  MXCHECK(handle.type_code() == TypeIndex::kRuntimeOpaqueObject)
+      << "[" << name << "] Expect OpaqueObject but get " << handle.type_name();
+  auto obj = handle.AsNoCheck<OpaqueObject>();
+  MXCHECK(obj.GetTag() == tag) << "[" << name << "] invalid handle";
+  return static_cast<T*>(obj.GetOpaquePtr());
+}
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.msgpack_StreamPacker").set_body([](PyArgs args) -> RTValue {
+  MXCHECK(args.size() == 1) << "[runtime.msgpack.StreamPacker] Expect 1 arguments but get "
+                            << args.size();
+  auto* packer = new serialization::MessageStreamPacker(args[0].As<bool>());
+  OpaqueObject handle;
+  handle.update(kMsgpackStreamPackerTag, packer, [](void* self) {
+    delete static_cast<serialization::MessageStreamPacker*>(self);
+  });
+  return handle;
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.msgpack_StreamPackerPack").set_body([](PyArgs args) -> RTValue {
+  MXCHECK(args.size() == 2) << "[runtime.msgpack.StreamPacker.pack] Expect 2 arguments but get "
+                            << args.size();
+  auto* packer = GetMsgpackStream<serialization::MessageStreamPacker>(
+      args[0], kMsgpackStreamPackerTag, "runtime.msgpack.StreamPacker.pack");
+  return packer->pack(args[1]);
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.msgpack_StreamUnpacker").set_body([](PyArgs args) -> RTValue {
+  MXCHECK(args.size() == 1) << "[runtime.msgpack.StreamUnpacker] Expect 1 arguments but get "
+                            << args.size();
+  auto* unpacker = new serialization::MessageStreamUnpacker(args[0].As<bool>());
+  OpaqueObject handle;
+  handle.update(kMsgpackStreamUnpackerTag, unpacker, [](void* self) {
+    delete static_cast<serialization::MessageStreamUnpacker*>(self);
+  });
+  return handle;
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.msgpack_StreamUnpackerFeed")
+    .set_body([](PyArgs args) -> RTValue {
+      MXCHECK(args.size() == 2)
+          << "[runtime.msgpack.StreamUnpacker.feed] Expect 2 arguments but get " << args.size();
+      auto* unpacker = GetMsgpackStream<serialization::MessageStreamUnpacker>(
+          args[0], kMsgpackStreamUnpackerTag, "runtime.msgpack.StreamUnpacker.feed");
+      unpacker->feed(args[1].As<string_view>());
+      return None;
+    });
+
+// returns (True, record) or (False, None) if more data is needed
+MATXSCRIPT_REGISTER_GLOBAL("runtime.msgpack_StreamUnpackerNext")
+    .set_body([](PyArgs args) -> RTValue {
+      MXCHECK(args.size() == 1)
+          << "[runtime.msgpack.StreamUnpacker.next] Expect 1 arguments but get " << args.size();
+      auto* unpacker = GetMsgpackStream<serialization::MessageStreamUnpacker>(
+          args[0], kMsgpackStreamUnpackerTag, "runtime.msgpack.StreamUnpacker.next");
+      RTValue record;
+      bool ok = unpacker->next(&record);
+      return Tuple::dynamic(ok, std::move(record));
+    });
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.msgpack_StreamUnpackerBuffered")
+    .set_body([](PyArgs args) -> RTValue {
+      MXCHECK(args.size() == 1)
+          << "[runtime.msgpack.StreamUnpacker.buffered] Expect 1 arguments but get " << args.size();
+      auto* unpacker = GetMsgpackStream<serialization::MessageStreamUnpacker>(
+          args[0], kMsgpackStreamUnpackerTag, "runtime.msgpack.StreamUnpacker.buffered");
+      return unpacker->buffered();
+    });
+
 }  // namespace runtime
 }  // namespace matxscript
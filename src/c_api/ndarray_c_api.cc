@@ -106,18 +106,30 @@ MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArrayAsType").set_body([](PyArgs args) ->
 });
 
 MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArrayAdd").set_body([](PyArgs args) -> RTValue {
+  if (args.size() == 3) {
+    return kernel_nd_module_add(args[0].As<RTView>(), args[1].As<RTView>(), args[2].As<RTView>());
+  }
   return kernel_nd_module_add(args[0].As<RTView>(), args[1].As<RTView>());
 });
 
 MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArraySub").set_body([](PyArgs args) -> RTValue {
+  if (args.size() == 3) {
+    return kernel_nd_module_sub(args[0].As<RTView>(), args[1].As<RTView>(), args[2].As<RTView>());
+  }
   return kernel_nd_module_sub(args[0].As<RTView>(), args[1].As<RTView>());
 });
 
 MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArrayDiv").set_body([](PyArgs args) -> RTValue {
+  if (args.size() == 3) {
+    return kernel_nd_module_div(args[0].As<RTView>(), args[1].As<RTView>(), args[2].As<RTView>());
+  }
   return kernel_nd_module_div(args[0].As<RTView>(), args[1].As<RTView>());
 });
 
 MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArrayMul").set_body([](PyArgs args) -> RTValue {
+  if (args.size() == 3) {
+    return kernel_nd_module_mul(args[0].As<RTView>(), args[1].As<RTView>(), args[2].As<RTView>());
+  }
   return kernel_nd_module_mul(args[0].As<RTView>(), args[1].As<RTView>());
 });
 
@@ -133,6 +145,62 @@ MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArrayStack").set_body([](PyArgs args) -> R
   return NDArrayOperate::Stack(args[0].As<RTValue>(), args[1].As<int64_t>());
 });
 
+MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArraySum").set_body([](PyArgs args) -> RTValue {
+  return kernel_nd_module_sum(args);
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArrayMean").set_body([](PyArgs args) -> RTValue {
+  return kernel_nd_module_mean(args);
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArrayMax").set_body([](PyArgs args) -> RTValue {
+  return kernel_nd_module_max(args);
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArrayMin").set_body([](PyArgs args) -> RTValue {
+  return kernel_nd_module_min(args);
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArrayArgMax").set_body([](PyArgs args) -> RTValue {
+  return kernel_nd_module_argmax(args);
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArrayArgMin").set_body([](PyArgs args) -> RTValue {
+  return kernel_nd_module_argmin(args);
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArrayExp").set_body([](PyArgs args) -> RTValue {
+  return kernel_nd_module_exp(args);
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArrayLog").set_body([](PyArgs args) -> RTValue {
+  return kernel_nd_module_log(args);
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArraySqrt").set_body([](PyArgs args) -> RTValue {
+  return kernel_nd_module_sqrt(args);
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArrayAbs").set_body([](PyArgs args) -> RTValue {
+  return kernel_nd_module_abs(args);
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArrayClip").set_body([](PyArgs args) -> RTValue {
+  return kernel_nd_module_clip(args);
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArrayWhere").set_body([](PyArgs args) -> RTValue {
+  return kernel_nd_module_where(args);
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArrayCastScale").set_body([](PyArgs args) -> RTValue {
+  return kernel_nd_module_cast_scale(args);
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArrayEvaluate").set_body([](PyArgs args) -> RTValue {
+  return kernel_nd_module_evaluate(args);
+});
+
 MATXSCRIPT_REGISTER_GLOBAL("runtime.NDArrayCopyToBytes").set_body([](PyArgs args) -> RTValue {
   void* to = reinterpret_cast<void*>(args[0].As<int64_t>());
   auto view = args[1].AsObjectView<NDArray>();
@@ -26,8 +26,10 @@
 #include <matxscript/pipeline/symbolic_executor.h>
 #include <matxscript/pipeline/tx_session.h>
 #include <matxscript/runtime/at_fork.h>
+#include <matxscript/runtime/container/native_object_private.h>
 #include <matxscript/runtime/container/ndarray_helper.h>
 #include <matxscript/runtime/registry.h>
+#include <matxscript/server/simple_mpmc_server.h>
 
 namespace matxscript {
 namespace runtime {
@@ -179,6 +181,17 @@ MATXSCRIPT_REGISTER_GLOBAL("pipeline.OpHandleGetName").set_body([](PyArgs args)
   return String(op_ptr->GetName()).decode();
 });
 
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.NativeObjectClassName").set_body([](PyArgs args) -> RTValue {
+  MXCHECK_EQ(args.size(), 1) << "[NativeObjectClassName] Expect 1 arguments but get "
+                             << args.size();
+  UserDataRef ud = args[0].As<UserDataRef>();
+  if (ud->ud_ptr->type_2_71828182846() != UserDataStructType::kNativeData) {
+    return None;
+  }
+  auto* nud_ptr = static_cast<NativeObject*>(ud->ud_ptr);
+  return nud_ptr->native_class_name_.decode();
+});
+
 MATXSCRIPT_REGISTER_GLOBAL("pipeline.OpKernelProcess").set_body([](PyArgs args) -> RTValue {
   MXCHECK_GE(args.size(), 1) << "[OpKernelProcess] Expect 1 or more arguments but get "
                              << args.size();
@@ -321,6 +334,18 @@ MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionTrace").set_body([](PyArgs args) -
   return None;
 });
 
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionOptimizeGraph").set_body([](PyArgs args) -> RTValue {
+  MXCHECK_EQ(args.size(), 4) << "[TXSessionOptimizeGraph] Expect 4 arguments but get "
+                             << args.size();
+  void* handle = args[0].As<void*>();
+  auto sess = static_cast<TXSession*>(handle);
+  GraphOptimizeOptions options;
+  options.fold_constants = args[1].As<bool>();
+  options.eliminate_common_subexpr = args[2].As<bool>();
+  options.fuse_interpreter_ops = args[3].As<bool>();
+  return sess->OptimizeGraph(options);
+});
+
 MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionSetSchedulingThreads")
     .set_body([](PyArgs args) -> RTValue {
       MXCHECK(args.size() >= 1 || args.size() <= 3)
@@ -391,6 +416,69 @@ MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionGetOpParallelismThreads")
       return sess ? sess->GetOpParallelismThreads() : 0;
     });
 
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionSetDataflowScheduling")
+    .set_body([](PyArgs args) -> RTValue {
+      MXCHECK_EQ(args.size(), 2) << "[TXSessionSetDataflowScheduling] Expect 2 arguments but get "
+                                 << args.size();
+      void* handle = args[0].As<void*>();
+      auto sess = static_cast<TXSession*>(handle);
+      sess->SetDataflowScheduling(args[1].As<bool>());
+      return None;
+    });
+
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionSetWorkStealingPool")
+    .set_body([](PyArgs args) -> RTValue {
+      MXCHECK(args.size() == 2 || args.size() == 3)
+          << "[TXSessionSetWorkStealingPool] Expect 2 or 3 arguments but get " << args.size();
+      void* handle = args[0].As<void*>();
+      auto sess = static_cast<TXSession*>(handle);
+      std::vector<int> cpu_ids;
+      if (args.size() == 3 && !args[2].is_nullptr()) {
+        for (auto& cpu_id : args[2].As<List>()) {
+          cpu_ids.push_back(cpu_id.As<int64_t>());
+        }
+      }
+      sess->SetWorkStealingPool(args[1].As<bool>(), std::move(cpu_ids));
+      return None;
+    });
+
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionGetWorkStealingPool")
+    .set_body([](PyArgs args) -> RTValue {
+      MXCHECK_EQ(args.size(), 1) << "[TXSessionGetWorkStealingPool] Expect 1 arguments but get "
+                                 << args.size();
+      void* handle = args[0].As<void*>();
+      auto sess = static_cast<TXSession*>(handle);
+      return sess ? sess->GetWorkStealingPool() : false;
+    });
+
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionGetDataflowScheduling")
+    .set_body([](PyArgs args) -> RTValue {
+      MXCHECK_EQ(args.size(), 1) << "[TXSessionGetDataflowScheduling] Expect 1 arguments but get "
+                                 << args.size();
+      void* handle = args[0].As<void*>();
+      auto sess = static_cast<TXSession*>(handle);
+      return sess ? sess->GetDataflowScheduling() : false;
+    });
+
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionSetAsyncRunThreads")
+    .set_body([](PyArgs args) -> RTValue {
+      MXCHECK_EQ(args.size(), 2) << "[TXSessionSetAsyncRunThreads] Expect 2 arguments but get "
+                                 << args.size();
+      void* handle = args[0].As<void*>();
+      auto sess = static_cast<TXSession*>(handle);
+      sess->SetAsyncRunThreads(args[1].As<int64_t>());
+      return None;
+    });
+
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionGetAsyncRunThreads")
+    .set_body([](PyArgs args) -> RTValue {
+      MXCHECK_EQ(args.size(), 1) << "[TXSessionGetAsyncRunThreads] Expect 1 arguments but get "
+                                 << args.size();
+      void* handle = args[0].As<void*>();
+      auto sess = static_cast<TXSession*>(handle);
+      return sess ? sess->GetAsyncRunThreads() : 0;
+    });
+
 MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionSetOpComputeThreads")
     .set_body([](PyArgs args) -> RTValue {
       MXCHECK(args.size() >= 1 || args.size() <= 3)
@@ -456,6 +544,40 @@ MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionRun").set_body([](PyArgs args) ->
   return result_v2;
 });
 
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionRunAsync").set_body([](PyArgs args) -> RTValue {
+  MXCHECK_EQ(args.size(), 3) << "[TXSessionRunAsync] Expect 3 arguments but get " << args.size();
+  void* handle = args[0].As<void*>();
+  auto sess = static_cast<TXSession*>(handle);
+  Dict feed_dict = args[1].As<Dict>();
+  std::unordered_map<std::string, RTValue> feed_dict_v2;
+  for (auto kv : feed_dict.items()) {
+    feed_dict_v2.emplace(kv.first.As<String>(), kv.second);
+  }
+  // callback(outputs, error_message), the error message is None on success
+  NativeFunction callback = args[2].As<NativeFunction>();
+  sess->RunAsync(std::move(feed_dict_v2),
+                 [callback](std::vector<std::pair<std::string, RTValue>> result,
+                            std::exception_ptr except_ptr) {
+                   RTValue error_message = None;
+                   List result_v2;
+                   if (except_ptr) {
+                     try {
+                       std::rethrow_exception(except_ptr);
+                     } catch (const std::exception& e) {
+                       error_message = String(e.what()).decode();
+                     } catch (...) {
+                       error_message = Unicode(U"unknown exception");
+                     }
+                   } else {
+                     for (auto& item : result) {
+                       result_v2.append(std::move(item.second));
+                     }
+                   }
+                   callback({RTView(result_v2), RTView(error_message)});
+                 });
+  return None;
+});
+
 MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionRunWithMeta").set_body([](PyArgs args) -> RTValue {
   MXCHECK_GE(args.size(), 2) << "[TXSessionRunWithMeta] Expect 2 arguments but get " << args.size();
   void* handle = args[0].As<void*>();
@@ -506,6 +628,31 @@ MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionGetNestedOpAttributesByName")
       }
     });
 
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionGetMetrics").set_body([](PyArgs args) -> RTValue {
+  MXCHECK_EQ(args.size(), 1) << "[TXSessionGetMetrics] Expect 1 arguments but get " << args.size();
+  void* handle = args[0].As<void*>();
+  auto sess = static_cast<TXSession*>(handle);
+  return sess->GetMetrics()->Snapshot();
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionGetMetricsPrometheus")
+    .set_body([](PyArgs args) -> RTValue {
+      MXCHECK_EQ(args.size(), 1) << "[TXSessionGetMetricsPrometheus] Expect 1 arguments but get "
+                                 << args.size();
+      void* handle = args[0].As<void*>();
+      auto sess = static_cast<TXSession*>(handle);
+      return sess->GetMetrics()->ToPrometheus().decode();
+    });
+
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionResetMetrics").set_body([](PyArgs args) -> RTValue {
+  MXCHECK_EQ(args.size(), 1) << "[TXSessionResetMetrics] Expect 1 arguments but get "
+                             << args.size();
+  void* handle = args[0].As<void*>();
+  auto sess = static_cast<TXSession*>(handle);
+  sess->GetMetrics()->Reset();
+  return None;
+});
+
 MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionWarmup").set_body([](PyArgs args) -> RTValue {
   MXCHECK_GE(args.size(), 2) << "[TXSessionWarmup] Expect 2 arguments but get " << args.size();
   void* handle = args[0].As<void*>();
@@ -523,37 +670,140 @@ MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionWarmup").set_body([](PyArgs args)
   return result_v2;
 });
 
-MATXSCRIPT_REGISTER_GLOBAL("pipeline.LoadTXSession").set_body([](PyArgs args) -> RTValue {
-  MXCHECK_EQ(args.size(), 3) << "[LoadTXSession] Expect 3 arguments but get " << args.size();
-  Unicode folder = args[0].As<Unicode>();
-  Unicode name = args[1].As<Unicode>();
+static int64_t ParseLoadDevice(const Any& device_arg) {
   int64_t device = -1;
-  switch (args[2].type_code()) {
+  switch (device_arg.type_code()) {
     case TypeIndex::kRuntimeUnicode: {
-      auto ctx = NDArrayHelper::GetDevice(args[2].AsNoCheck<Unicode>());
+      auto ctx = NDArrayHelper::GetDevice(device_arg.AsNoCheck<Unicode>());
       MXCHECK(ctx.device_type == kDLCPU || ctx.device_type == kDLCUDA);
       if (ctx.device_type == kDLCUDA) {
         device = ctx.device_id;
       }
     } break;
     case TypeIndex::kRuntimeString: {
-      auto ctx = NDArrayHelper::GetDevice(args[2].AsNoCheck<String>().decode());
+      auto ctx = NDArrayHelper::GetDevice(device_arg.AsNoCheck<String>().decode());
       MXCHECK(ctx.device_type == kDLCPU || ctx.device_type == kDLCUDA);
       if (ctx.device_type == kDLCUDA) {
         device = ctx.device_id;
       }
     } break;
     case TypeIndex::kRuntimeInteger: {
-      device = args[2].AsNoCheck<int64_t>();
+      device = device_arg.AsNoCheck<int64_t>();
     } break;
     default: {
-      MXTHROW << "expect device is int or str type, but get " << args[2];
+      MXTHROW << "expect device is int or str type, but get " << device_arg;
     } break;
   }
+  return device;
+}
+
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.LoadTXSession").set_body([](PyArgs args) -> RTValue {
+  MXCHECK_EQ(args.size(), 3) << "[LoadTXSession] Expect 3 arguments but get " << args.size();
+  Unicode folder = args[0].As<Unicode>();
+  Unicode name = args[1].As<Unicode>();
+  int64_t device = ParseLoadDevice(args[2]);
   std::unique_ptr<TXSession> ptr = TXSession::Load(folder.encode(), name.encode(), device);
   return ptr.release();
 });
 
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.ReadTXSessionSpec").set_body([](PyArgs args) -> RTValue {
+  MXCHECK_EQ(args.size(), 2) << "[ReadTXSessionSpec] Expect 2 arguments but get " << args.size();
+  Unicode folder = args[0].As<Unicode>();
+  Unicode name = args[1].As<Unicode>();
+  return TXSession::ReadSpec(folder.encode(), name.encode());
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.LoadTXSessionFromSpec").set_body([](PyArgs args) -> RTValue {
+  MXCHECK_EQ(args.size(), 3) << "[LoadTXSessionFromSpec] Expect 3 arguments but get "
+                             << args.size();
+  Unicode folder = args[0].As<Unicode>();
+  Dict spec = args[1].As<Dict>();
+  int64_t device = ParseLoadDevice(args[2]);
+  std::unique_ptr<TXSession> ptr = TXSession::LoadFromSpec(folder.encode(), spec, device);
+  return ptr.release();
+});
+
+/*********************************************************************
+ * Server
+ *********************************************************************/
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.CreateServerHandle").set_body([](PyArgs args) -> RTValue {
+  MXCHECK_EQ(args.size(), 8) << "[CreateServerHandle] Expect 8 arguments but get " << args.size();
+  Unicode folder = args[0].As<Unicode>();
+  Dict spec = args[1].As<Dict>();
+  int64_t device = ParseLoadDevice(args[2]);
+  int64_t replicas = args[3].As<int64_t>();
+  MXCHECK_GT(replicas, 0) << "[CreateServerHandle] replicas must be positive";
+  server::BatchingOptions options;
+  options.max_batch_size = args[4].As<int64_t>();
+  options.max_wait_us = args[5].As<int64_t>();
+  if (options.max_batch_size > 1) {
+    options.allowed_batch_sizes = server::BatchingOptions::ReadAllowedBatchSizes(folder.encode());
+  }
+  for (auto& output_name : args[7].As<List>()) {
+    options.batched_outputs.push_back(output_name.As<Unicode>().encode());
+  }
+  std::vector<std::shared_ptr<TXSession>> handlers;
+  for (int64_t i = 0; i < replicas; ++i) {
+    handlers.emplace_back(TXSession::LoadFromSpec(folder.encode(), spec, device));
+  }
+  auto* srv = new server::SimpleMPMCServer(
+      std::move(handlers), args[6].As<Unicode>().encode(), std::move(options));
+  srv->start();
+  return srv;
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.FreeServerHandle").set_body([](PyArgs args) -> RTValue {
+  MXCHECK_EQ(args.size(), 1) << "[FreeServerHandle] Expect 1 arguments but get " << args.size();
+  void* handle = args[0].As<void*>();
+  delete static_cast<server::SimpleMPMCServer*>(handle);
+  return None;
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.ServerStop").set_body([](PyArgs args) -> RTValue {
+  MXCHECK_EQ(args.size(), 1) << "[ServerStop] Expect 1 arguments but get " << args.size();
+  void* handle = args[0].As<void*>();
+  static_cast<server::SimpleMPMCServer*>(handle)->stop();
+  return None;
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.ServerRun").set_body([](PyArgs args) -> RTValue {
+  MXCHECK_EQ(args.size(), 2) << "[ServerRun] Expect 2 arguments but get " << args.size();
+  void* handle = args[0].As<void*>();
+  auto srv = static_cast<server::SimpleMPMCServer*>(handle);
+  Dict feed_dict = args[1].As<Dict>();
+  std::unordered_map<std::string, RTValue> feed_dict_v2;
+  for (auto kv : feed_dict.items()) {
+    feed_dict_v2.emplace(kv.first.As<String>(), kv.second);
+  }
+  auto result = srv->process(feed_dict_v2);
+  List result_v2;
+  for (auto& item : result) {
+    result_v2.append(std::move(item.second));
+  }
+  return result_v2;
+});
+
+MATXSCRIPT_REGISTER_GLOBAL("pipeline.ServerGetStats").set_body([](PyArgs args) -> RTValue {
+  MXCHECK_EQ(args.size(), 1) << "[ServerGetStats] Expect 1 arguments but get " << args.size();
+  void* handle = args[0].As<void*>();
+  auto stats = static_cast<server::SimpleMPMCServer*>(handle)->stats();
+  List replicas;
+  replicas.reserve(stats.replicas.size());
+  for (auto& replica : stats.replicas) {
+    Dict replica_d;
+    replica_d[U"requests"] = replica.num_requests;
+    replica_d[U"runs"] = replica.num_runs;
+    replica_d[U"busy_us"] = static_cast<int64_t>(replica.busy_us);
+    replica_d[U"utilization"] = replica.utilization;
+    replicas.push_back(std::move(replica_d));
+  }
+  Dict d;
+  d[U"queue_depth"] = stats.queue_depth;
+  d[U"uptime_us"] = static_cast<int64_t>(stats.uptime_us);
+  d[U"replicas"] = std::move(replicas);
+  return d;
+});
+
 MATXSCRIPT_REGISTER_GLOBAL("pipeline.TXSessionGetAttr").set_body([](PyArgs args) -> RTValue {
   MXCHECK_GE(args.size(), 2) << "[TXSessionRun] Expect 2 arguments but get " << args.size();
   void* handle = args[0].As<void*>();
@@ -117,12 +117,14 @@ MATXSCRIPT_REGISTER_GLOBAL("runtime.Trie_PrefixSearchAll").set_body([](PyArgs ar
 });
 
 MATXSCRIPT_REGISTER_GLOBAL("runtime.Trie_Save").set_body([](PyArgs args) -> RTValue {
-  MXCHECK_EQ(args.size(), 2) << "[runtime.Trie_Save] Expect 2 arguments but get " << args.size();
+  MXCHECK(args.size() == 2 || args.size() == 3)
+      << "[runtime.Trie_Save] Expect 2 or 3 arguments but get " << args.size();
   MXCHECK(args[0].IsObjectRef<Trie>())
       << "[runtime.Trie_Save] Expect arguments[0] is Trie, but get: "
       << TypeIndex2Str(args[0].type_code());
   auto* trie_node = args[0].ptr<TrieNode>();
-  return trie_node->save(args[1].As<Unicode>());
+  bool mapped = args.size() == 3 && args[2].As<int64_t>() != 0;
+  return trie_node->save(args[1].As<Unicode>(), mapped);
 });
 
 MATXSCRIPT_REGISTER_GLOBAL("runtime.Trie_Load").set_body([](PyArgs args) -> RTValue {
@@ -25,10 +25,14 @@
  */
 #include "codegen_c_host.h"
 
+#include <algorithm>
+#include <functional>
+#include <sstream>
 #include <string>
 #include <vector>
 
 #include <matxscript/ir/module.h>
+#include <matxscript/runtime/bytes_hash.h>
 #include <matxscript/runtime/container.h>
 #include <matxscript/runtime/func_registry_names_io.h>
 #include <matxscript/runtime/function_name_rules.h>
@@ -50,16 +54,28 @@ CodeGenCHost::CodeGenCHost() {
   module_name_ = GetUniqueName("__matx_module_ctx");
 }
 
+static String ModuleCtxDeclaration(bool is_definition) {
+  std::stringstream os;
+  os << "extern \"C\" void* " << symbol::library_module_ctx;
+  if (is_definition) {
+    os << " = NULL";
+  }
+  os << ";\n\n";
+  return os.str();
+}
+
 void CodeGenCHost::Init(bool output_ssa, bool emit_asserts) {
   emit_asserts_ = emit_asserts;
   declared_globals_.clear();
   decl_stream << "#include \"matxscript/runtime/codegen_all_includes.h\"\n";
   decl_stream << "#include <math.h>\n";
   decl_stream << "\nusing namespace ::matxscript::runtime;\n";
-  decl_stream << "extern \"C\" void* " << symbol::library_module_ctx << " = NULL;\n\n";
+  decl_stream << ModuleCtxDeclaration(true);
   decl_stream << "extern \"C\" MATX_DLL MATXScriptFuncRegistry " << symbol::library_func_registry
               << ";\n\n";
   CodeGenC::Init(output_ssa);
+  unit_chunks_.clear();
+  BeginUnitChunk(UnitChunkKind::kShared);
 }
 
 void CodeGenCHost::InitTypeRegistry(const ClassStmt& cls_stmt) {
@@ -69,11 +85,15 @@ void CodeGenCHost::InitTypeRegistry(const ClassStmt& cls_stmt) {
 }
 
 void CodeGenCHost::BeginAnonymousNamespace() {
+  BeginUnitChunk(UnitChunkKind::kNamespaceBegin);
   this->stream << "namespace {\n";
+  BeginUnitChunk(UnitChunkKind::kShared);
 }
 
 void CodeGenCHost::EndAnonymousNamespace() {
+  BeginUnitChunk(UnitChunkKind::kNamespaceEnd);
   this->stream << "\n} // namespace\n\n";
+  BeginUnitChunk(UnitChunkKind::kShared);
 }
 
 void CodeGenCHost::AddUserStructDeclaration(const ClassStmt& cls_stmt) {
@@ -368,7 +388,8 @@ void CodeGenCHost::DefineUserStruct(const ClassStmt& cls_stmt,
   this->PrintIndent(this->stream);
   this->stream << "};\n\n";
 
-  // static var
+  // static var, defined only once when split into units
+  BeginUnitChunk(UnitChunkKind::kPrimary);
   this->PrintIndent(this->stream);
   this->stream << "// flags for convert check\n";
   this->PrintIndent(this->stream);
@@ -398,6 +419,7 @@ void CodeGenCHost::DefineUserStruct(const ClassStmt& cls_stmt,
                  << symbol::library_func_registry << class_name << ", \"" << class_name << "\");\n";
   }
   this->stream << "\n";
+  BeginUnitChunk(UnitChunkKind::kShared);
 
   // define user class view
   auto class_view_name = FunctionNameRules::get_class_view_name(class_name);
@@ -1539,6 +1561,87 @@ void CodeGenCHost::GenerateClosuresNames(const std::vector<String>& func_names)
   stream << "\n} // extern C\n\n";
 }
 
+void CodeGenCHost::BeginUnitChunk(UnitChunkKind kind, const String& name) {
+  unit_chunks_.push_back(UnitChunk{static_cast<size_t>(stream.tellp()), kind, name});
+}
+
+std::vector<String> CodeGenCHost::FinishUnits(int64_t num_units, int64_t min_unit_size) {
+  std::string decl = decl_stream.str();
+  std::string code = stream.str();
+  std::vector<std::pair<const UnitChunk*, string_view>> chunks;
+  int64_t num_distributed = 0;
+  int64_t distributed_size = 0;
+  std::string shared_code = decl;
+  for (size_t i = 0; i < unit_chunks_.size(); ++i) {
+    size_t begin = unit_chunks_[i].begin;
+    size_t end = i + 1 < unit_chunks_.size() ? unit_chunks_[i + 1].begin : code.size();
+    string_view text(code.data() + begin, end - begin);
+    auto kind = unit_chunks_[i].kind;
+    if (kind == UnitChunkKind::kDistributed) {
+      ++num_distributed;
+      distributed_size += text.size();
+    } else if (kind == UnitChunkKind::kShared) {
+      shared_code.append(text.data(), text.size());
+    }
+    chunks.emplace_back(&unit_chunks_[i], text);
+  }
+  num_units = std::min(num_units, num_distributed);
+  if (min_unit_size > 0) {
+    num_units = std::min(num_units, distributed_size / min_unit_size);
+  }
+  if (num_units <= 1) {
+    return {Finish()};
+  }
+
+  // The units share the declarations, so the functions can not have internal linkage.
+  // The namespace is named after the declarations to keep it unique in a process
+  // and stable when only function bodies change.
+  std::stringstream ns_os;
+  ns_os << "__matx_module_" << std::hex << std::hash<std::string>()(shared_code);
+  auto ns_name = ns_os.str();
+  auto ns_begin = "namespace __attribute__((visibility(\"hidden\"))) " + ns_name + " {\n";
+  auto ns_end = "\n} // namespace " + ns_name + "\nusing namespace " + ns_name + ";\n\n";
+
+  auto ctx_def = ModuleCtxDeclaration(true);
+  auto ctx_decl = ModuleCtxDeclaration(false);
+  auto ctx_pos = decl.find(ctx_def.data(), 0, ctx_def.size());
+  MXCHECK(ctx_pos != std::string::npos) << "[FinishUnits] module ctx definition not found";
+  std::string secondary_decl = decl;
+  secondary_decl.replace(ctx_pos, ctx_def.size(), ctx_decl.data(), ctx_decl.size());
+
+  std::vector<String> units;
+  for (int64_t unit_id = 0; unit_id < num_units; ++unit_id) {
+    std::string unit = unit_id == 0 ? decl : secondary_decl;
+    for (auto& chunk : chunks) {
+      switch (chunk.first->kind) {
+        case UnitChunkKind::kShared: {
+          unit.append(chunk.second.data(), chunk.second.size());
+        } break;
+        case UnitChunkKind::kPrimary: {
+          if (unit_id == 0) {
+            unit.append(chunk.second.data(), chunk.second.size());
+          }
+        } break;
+        case UnitChunkKind::kDistributed: {
+          auto& name = chunk.first->name;
+          size_t hash = runtime::BytesHash(name.data(), name.size());
+          if (static_cast<int64_t>(hash % static_cast<size_t>(num_units)) == unit_id) {
+            unit.append(chunk.second.data(), chunk.second.size());
+          }
+        } break;
+        case UnitChunkKind::kNamespaceBegin: {
+          unit.append(ns_begin);
+        } break;
+        case UnitChunkKind::kNamespaceEnd: {
+          unit.append(ns_end);
+        } break;
+      }
+    }
+    units.emplace_back(std::move(unit));
+  }
+  return units;
+}
+
 void CodeGenCHost::GenerateCrtSystemLib() {
   stream << "static const MATXModule _matx_system_lib = {\n"
          << "    &_matx_func_registry,\n"
@@ -1624,7 +1727,7 @@ static BaseFunc RunOptimizations(BaseFunc func) {
   return func;
 }
 
-runtime::Module BuildCHost(IRModule mod) {
+runtime::Module BuildCHostUnits(IRModule mod, int64_t num_units, int64_t min_unit_size) {
   using ::matxscript::runtime::FunctionRegistry;
 
   // TODO: clean code
@@ -1735,12 +1838,19 @@ runtime::Module BuildCHost(IRModule mod) {
   }
 
   // Add User Data init wrapper function define
+  cg.BeginUnitChunk(CodeGenCHost::UnitChunkKind::kPrimary);
   for (auto& cls : mod_classes) {
     auto init_func = FindInitFunc(cls);
     cg.DefineUserStructInitFunc(cls, init_func);
   }
 
+  // the generators of yield functions are templates used across functions
+  bool can_split_units = true;
   for (auto fn : mod_functions) {
+    if (YieldDetector().GetYields(fn).size() > 0) {
+      can_split_units = false;
+    }
+    cg.BeginUnitChunk(CodeGenCHost::UnitChunkKind::kDistributed, fn->GetGlobalName());
     cg.AddFunction(fn);
     cg.PrintPackedFunctionMacro(fn);
     if (fn->CaptureSessionHandle()) {
@@ -1754,6 +1864,10 @@ runtime::Module BuildCHost(IRModule mod) {
   for (auto cls : mod_classes) {
     for (auto stmt : cls->body) {
       auto fn = Downcast<BaseFunc>(stmt);
+      if (YieldDetector().GetYields(fn).size() > 0) {
+        can_split_units = false;
+      }
+      cg.BeginUnitChunk(CodeGenCHost::UnitChunkKind::kDistributed, fn->GetGlobalName());
       cg.AddFunction(fn);
 
       auto f = GetUnboundFunction(Downcast<Function>(fn));
@@ -1788,6 +1902,7 @@ runtime::Module BuildCHost(IRModule mod) {
 
   cg.EndAnonymousNamespace();
 
+  cg.BeginUnitChunk(CodeGenCHost::UnitChunkKind::kPrimary);
   for (auto& cls_mem : class_func_names) {
     cg.GenerateFuncRegistry(cls_mem.second, cls_mem.first);
   }
@@ -1797,7 +1912,20 @@ runtime::Module BuildCHost(IRModule mod) {
   // cg.GenerateCrtSystemLib();
 
   String code = cg.Finish();
-  return CSourceModuleCreate(code, "c");
+  Array<StringRef> units;
+  if (can_split_units && num_units > 1) {
+    auto unit_codes = cg.FinishUnits(num_units, min_unit_size);
+    if (unit_codes.size() > 1) {
+      for (auto& unit_code : unit_codes) {
+        units.push_back(unit_code);
+      }
+    }
+  }
+  return CSourceModuleCreate(code, "c", "", {}, units);
+}
+
+runtime::Module BuildCHost(IRModule mod) {
+  return BuildCHostUnits(std::move(mod), 1, 0);
 }
 
 runtime::Module BuildEembeddedCHost(String code) {
@@ -1805,6 +1933,7 @@ runtime::Module BuildEembeddedCHost(String code) {
 }
 
 MATXSCRIPT_REGISTER_GLOBAL("module.build.c").set_body_typed(BuildCHost);
+MATXSCRIPT_REGISTER_GLOBAL("module.build.c_units").set_body_typed(BuildCHostUnits);
 MATXSCRIPT_REGISTER_GLOBAL("embedded.build.c").set_body_typed(BuildEembeddedCHost);
 
 }  // namespace codegen
@@ -30,6 +30,7 @@
 
 #include <set>
 #include <string>
+#include <utility>
 #include <vector>
 
 #include <matxscript/ir/expr.h>
@@ -38,6 +39,16 @@ namespace matxscript {
 namespace codegen {
 
 class CodeGenCHost final : public CodeGenC {
+ public:
+  /*! \brief Which translation units a chunk of the generated code goes to. */
+  enum class UnitChunkKind : int {
+    kShared = 0,          // declarations, needed by every unit
+    kPrimary = 1,         // definitions that must appear exactly once, e.g. static members
+    kDistributed = 2,     // function definitions, spread across units
+    kNamespaceBegin = 3,  // the opening of the module namespace
+    kNamespaceEnd = 4,    // the closing of the module namespace
+  };
+
  public:
   CodeGenCHost();
   void Init(bool output_ssa, bool emit_asserts);
@@ -104,6 +115,23 @@ class CodeGenCHost final : public CodeGenC {
   /*! \brief Generate C runtime SystemLib entry point. */
   void GenerateCrtSystemLib();
 
+  /*!
+   * \brief The code generated from now on belongs to a new chunk of the given kind.
+   * \param kind the kind of the chunk
+   * \param name the function defined in a distributed chunk, its unit is picked by the name
+   */
+  void BeginUnitChunk(UnitChunkKind kind, const String& name = "");
+
+  /*!
+   * \brief Split the generated code into translation units which can be compiled separately.
+   * Each distributed chunk goes to the unit picked by a hash of its function name, so adding,
+   * removing or editing a function only changes the unit holding it.
+   * \param num_units the max number of units
+   * \param min_unit_size the min size in bytes of the distributed code of each unit
+   * \return the source code of each unit, the first one holds the primary chunks
+   */
+  std::vector<String> FinishUnits(int64_t num_units, int64_t min_unit_size);
+
  private:
   String module_name_;
   /* \brief tracks declared global variables which live despite GetUniqueName */
@@ -112,6 +140,13 @@ class CodeGenCHost final : public CodeGenC {
   std::vector<String> function_names_;
   /*! \brief whether to emit asserts in the resulting C code */
   bool emit_asserts_;
+  struct UnitChunk {
+    size_t begin;
+    UnitChunkKind kind;
+    String name;
+  };
+  /*! \brief the start offset in stream, the kind and the function name of each code chunk */
+  std::vector<UnitChunk> unit_chunks_;
 
   /*!
    * \brief Print ternary conditional operator implementing binary `op`
@@ -167,12 +167,14 @@ runtime::Module SourceModuleCreate(runtime::String code, runtime::String fmt);
  * \param fmt The code format.
  * \param symbol The symbol that the c source module represents.
  * \param const_vars. The constant variables that the c source module needs.
+ * \param units The same code split into translation units, empty if not split.
  * \return The created module.
  */
 runtime::Module CSourceModuleCreate(const runtime::String& code,
                                     const runtime::String& fmt,
                                     const runtime::String& symbol = "",
-                                    const ir::Array<ir::StringRef>& const_vars = {});
+                                    const ir::Array<ir::StringRef>& const_vars = {},
+                                    const ir::Array<ir::StringRef>& units = {});
 
 }  // namespace codegen
 }  // namespace matxscript
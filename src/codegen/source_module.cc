@@ -27,6 +27,7 @@
  */
 #include "codegen_source_base.h"
 
+#include <matxscript/runtime/container/list_ref.h>
 #include <matxscript/runtime/container/ndarray.h>
 #include <matxscript/runtime/file_util.h>
 #include <matxscript/runtime/registry.h>
@@ -72,8 +73,9 @@ class CSourceModuleNode : public runtime::ModuleNode {
   CSourceModuleNode(const String& code,
                     const String& fmt,
                     const String& symbol,
-                    const Array<StringRef>& const_vars)
-      : code_(code), fmt_(fmt), symbol_(symbol), const_vars_(const_vars) {
+                    const Array<StringRef>& const_vars,
+                    const Array<StringRef>& units)
+      : code_(code), fmt_(fmt), symbol_(symbol), const_vars_(const_vars), units_(units) {
   }
   const char* type_key() const {
     return "c";
@@ -85,6 +87,14 @@ class CSourceModuleNode : public runtime::ModuleNode {
     } else if (name == "get_const_vars") {
       return NativeFunction(
           [sptr_to_self, this](PyArgs args) -> RTValue { return this->const_vars_; });
+    } else if (name == "get_units") {
+      return NativeFunction([sptr_to_self, this](PyArgs args) -> RTValue {
+        List units;
+        for (auto& unit : this->units_) {
+          units.push_back(String(unit.view()).decode());
+        }
+        return units;
+      });
     } else {
       return NativeFunction(nullptr);
     }
@@ -110,13 +120,15 @@ class CSourceModuleNode : public runtime::ModuleNode {
   String fmt_;
   String symbol_;
   Array<StringRef> const_vars_;
+  Array<StringRef> units_;
 };
 
 runtime::Module CSourceModuleCreate(const String& code,
                                     const String& fmt,
                                     const String& symbol,
-                                    const Array<StringRef>& const_vars) {
-  auto n = make_object<CSourceModuleNode>(code, fmt, symbol, const_vars);
+                                    const Array<StringRef>& const_vars,
+                                    const Array<StringRef>& units) {
+  auto n = make_object<CSourceModuleNode>(code, fmt, symbol, const_vars, units);
   return runtime::Module(n);
 }
 
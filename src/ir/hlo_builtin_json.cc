@@ -35,10 +35,18 @@ MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(json, loads)
     .set_num_inputs(1)
     .add_argument("args", "*args", "");
 
+MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(json, dump)
+    .set_num_inputs(1)
+    .add_argument("args", "*args", "");
+
 MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(json, dumps)
     .set_num_inputs(1)
     .add_argument("args", "*args", "");
 
+MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(json, lines)
+    .set_num_inputs(1)
+    .add_argument("args", "*args", "");
+
 }  // namespace builtin
 }  // namespace ir
 }  // namespace matxscript
@@ -156,23 +156,31 @@ MATXSCRIPT_IR_DEFINE_HLO_METHOD(ndarray, as_type, as_type)
 
 MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_add)
     .set_num_inputs(2)
+    .set_num_inputs_max(3)
     .add_argument("lhs", "any_view", "")
-    .add_argument("rhs", "any_view", "");
+    .add_argument("rhs", "any_view", "")
+    .add_argument("out", "any_view", "");
 
 MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_sub)
     .set_num_inputs(2)
+    .set_num_inputs_max(3)
     .add_argument("lhs", "any_view", "")
-    .add_argument("rhs", "any_view", "");
+    .add_argument("rhs", "any_view", "")
+    .add_argument("out", "any_view", "");
 
 MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_div)
     .set_num_inputs(2)
+    .set_num_inputs_max(3)
     .add_argument("lhs", "any_view", "")
-    .add_argument("rhs", "any_view", "");
+    .add_argument("rhs", "any_view", "")
+    .add_argument("out", "any_view", "");
 
 MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_mul)
     .set_num_inputs(2)
+    .set_num_inputs_max(3)
     .add_argument("lhs", "any_view", "")
-    .add_argument("rhs", "any_view", "");
+    .add_argument("rhs", "any_view", "")
+    .add_argument("out", "any_view", "");
 
 MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_rand)
     .set_num_inputs(1)
@@ -187,6 +195,62 @@ MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_stack)
     .set_num_inputs(1)
     .add_argument("args", "*args", "");
 
+MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_sum)
+    .set_num_inputs(1)
+    .add_argument("args", "*args", "");
+
+MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_mean)
+    .set_num_inputs(1)
+    .add_argument("args", "*args", "");
+
+MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_max)
+    .set_num_inputs(1)
+    .add_argument("args", "*args", "");
+
+MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_min)
+    .set_num_inputs(1)
+    .add_argument("args", "*args", "");
+
+MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_argmax)
+    .set_num_inputs(1)
+    .add_argument("args", "*args", "");
+
+MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_argmin)
+    .set_num_inputs(1)
+    .add_argument("args", "*args", "");
+
+MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_exp)
+    .set_num_inputs(1)
+    .add_argument("args", "*args", "");
+
+MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_log)
+    .set_num_inputs(1)
+    .add_argument("args", "*args", "");
+
+MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_sqrt)
+    .set_num_inputs(1)
+    .add_argument("args", "*args", "");
+
+MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_abs)
+    .set_num_inputs(1)
+    .add_argument("args", "*args", "");
+
+MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_clip)
+    .set_num_inputs(1)
+    .add_argument("args", "*args", "");
+
+MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_where)
+    .set_num_inputs(1)
+    .add_argument("args", "*args", "");
+
+MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_cast_scale)
+    .set_num_inputs(1)
+    .add_argument("args", "*args", "");
+
+MATXSCRIPT_IR_DEFINE_HLO_MODULE_FUNC(nd, module_evaluate)
+    .set_num_inputs(1)
+    .add_argument("args", "*args", "");
+
 static runtime::RTValue TryFusedNDArrayGetItem(BaseExpr container, BaseExpr index) {
   if (auto* call_node = container.as<CallNode>()) {
     if (call_node->op.same_as(ndarray___getitem__())) {
@@ -52,8 +52,10 @@ MATXSCRIPT_IR_DEFINE_HLO_METHOD(trie, prefix_search_all, prefix_search_all)
 
 MATXSCRIPT_IR_DEFINE_HLO_METHOD(trie, save, save)
     .set_num_inputs(2)
+    .set_num_inputs_max(3)
     .add_argument("self", "matx.Trie", "")
-    .add_argument("file_path", "unicode_view", "");
+    .add_argument("file_path", "unicode_view", "")
+    .add_argument("mapped", "bool", "");
 
 MATXSCRIPT_IR_DEFINE_HLO_METHOD(trie, load, load)
     .set_num_inputs(2)
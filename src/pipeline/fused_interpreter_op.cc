@@ -0,0 +1,87 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#include <matxscript/pipeline/fused_interpreter_op.h>
+
+#include <algorithm>
+
+namespace matxscript {
+namespace runtime {
+
+MATX_REGISTER_NATIVE_OP(FusedInterpreterOp).SetThreadSafety(false);
+
+void FusedInterpreterOp::Init() {
+  auto op_names = GetAttr<List>("ops");
+  auto op_args = GetAttr<List>("args");
+  MXCHECK(!op_names.empty() && op_names.size() == op_args.size())
+      << "[FusedInterpreterOp] ops and args must be non-empty and have the same size";
+  ops_.clear();
+  args_.clear();
+  max_num_args_ = 0;
+  for (int64_t i = 0; i < op_names.size(); ++i) {
+    auto op_name = op_names[i].As<Unicode>().encode();
+    auto op_ptr = GetOpImpl("InterpreterOp", op_name);
+    MXCHECK(op_ptr != nullptr) << "op not found, class: InterpreterOp, name: " << op_name;
+    ops_.push_back(static_cast<const InterpreterOp*>(op_ptr.get()));
+    std::vector<int64_t> args;
+    for (auto& arg : op_args[i].AsObjectRef<List>()) {
+      auto arg_i = arg.As<int64_t>();
+      MXCHECK(arg_i >= -i) << "[FusedInterpreterOp] op " << i << " uses the result of op "
+                           << (-arg_i - 1) << " which is not computed yet";
+      args.push_back(arg_i);
+    }
+    max_num_args_ = std::max(max_num_args_, args.size());
+    args_.push_back(std::move(args));
+  }
+}
+
+String FusedInterpreterOp::GetHumanName(bool with_debug_info) const {
+  String name = "fused(";
+  for (size_t i = 0; i < ops_.size(); ++i) {
+    if (i > 0) {
+      name.append(", ");
+    }
+    name.append(ops_[i]->GetHumanName(with_debug_info));
+  }
+  name.append(")");
+  return name;
+}
+
+RTValue FusedInterpreterOp::Process(PyArgs inputs) const {
+  std::vector<RTValue> results(ops_.size());
+  std::vector<RTView> op_feed;
+  op_feed.reserve(max_num_args_);
+  for (size_t i = 0; i < ops_.size(); ++i) {
+    op_feed.clear();
+    for (auto arg : args_[i]) {
+      if (arg >= 0) {
+        MXCHECK(arg < inputs.size()) << "[FusedInterpreterOp] Expect at least " << arg + 1
+                                     << " arguments but get " << inputs.size();
+        op_feed.emplace_back(inputs[arg]);
+      } else {
+        op_feed.emplace_back(results[-arg - 1]);
+      }
+    }
+    results[i] = ops_[i]->Process(PyArgs(op_feed.data(), op_feed.size()));
+  }
+  return std::move(results.back());
+}
+
+}  // namespace runtime
+}  // namespace matxscript
@@ -0,0 +1,358 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#include <matxscript/pipeline/graph_optimizer.h>
+
+#include <cstring>
+#include <unordered_set>
+
+#include <matxscript/pipeline/attributes.h>
+#include <matxscript/pipeline/interpreter_op.h>
+#include <matxscript/pipeline/tx_session.h>
+#include <matxscript/runtime/logging.h>
+
+namespace matxscript {
+namespace runtime {
+
+namespace {
+
+bool IsConstantNode(const NodePtr& node) {
+  return node->op->ClassName() == "ConstantOp" && node->outputs.size() == 1;
+}
+
+const InterpreterOp* AsInterpreterOp(const NodePtr& node) {
+  if (node->op->ClassName() != "InterpreterOp" || node->outputs.size() != 1) {
+    return nullptr;
+  }
+  return static_cast<const InterpreterOp*>(node->op.get());
+}
+
+bool IsPureNode(const NodePtr& node) {
+  auto* op = AsInterpreterOp(node);
+  return op && op->IsPure();
+}
+
+bool IsFusibleNode(const NodePtr& node) {
+  auto* op = AsInterpreterOp(node);
+  return op && op->IsFusible();
+}
+
+// a folded value may be shared by all requests, so it must not be mutable
+bool IsImmutableValue(const RTValue& value) {
+  switch (value.type_code()) {
+    case TypeIndex::kRuntimeNullptr:
+    case TypeIndex::kRuntimeInteger:
+    case TypeIndex::kRuntimeFloat:
+    case TypeIndex::kRuntimeString:
+    case TypeIndex::kRuntimeUnicode: {
+      return true;
+    } break;
+    default: {
+      return false;
+    } break;
+  }
+}
+
+RTValue GetConstantValue(const NodePtr& node) {
+  return node->op->Process(PyArgs());
+}
+
+// the type codes of the constant inputs, the others are only known when the session runs
+std::vector<int32_t> GetInputTypeCodes(const NodePtr& node) {
+  std::vector<int32_t> type_codes;
+  type_codes.reserve(node->inputs.size());
+  for (auto& entry : node->inputs) {
+    if (IsConstantNode(entry->node)) {
+      type_codes.push_back(GetConstantValue(entry->node).type_code());
+    } else {
+      type_codes.push_back(TypeIndex::kRuntimeUnknown);
+    }
+  }
+  return type_codes;
+}
+
+// the signature of the value computed by the node, false if the node can not be merged
+bool GetNodeSignature(const NodePtr& node, String* sig) {
+  if (IsConstantNode(node)) {
+    RTValue value = GetConstantValue(node);
+    sig->append("C").append(std::to_string(value.type_code())).append(":");
+    switch (value.type_code()) {
+      case TypeIndex::kRuntimeNullptr: {
+      } break;
+      case TypeIndex::kRuntimeInteger: {
+        sig->append(std::to_string(value.As<int64_t>()));
+      } break;
+      case TypeIndex::kRuntimeFloat: {
+        // compare the bits, 0.0 and -0.0 are different constants
+        double d = value.As<double>();
+        uint64_t bits = 0;
+        std::memcpy(&bits, &d, sizeof(bits));
+        sig->append(std::to_string(bits));
+      } break;
+      case TypeIndex::kRuntimeString: {
+        sig->append(value.As<string_view>());
+      } break;
+      case TypeIndex::kRuntimeUnicode: {
+        sig->append(UnicodeHelper::Encode(value.As<unicode_view>()));
+      } break;
+      default: {
+        return false;
+      } break;
+    }
+    return true;
+  }
+  if (IsPureNode(node)) {
+    auto* op = static_cast<const InterpreterOp*>(node->op.get());
+    // a merged result is shared by the consumers of both nodes, like a folded value
+    // it must not be a mutable container which one of them may change
+    if (op->MayMakeContainer(GetInputTypeCodes(node))) {
+      return false;
+    }
+    sig->append("I").append(std::to_string(op->GetOpCode())).append("(");
+    for (auto& entry : node->inputs) {
+      sig->append(entry->key).append(",");
+    }
+    sig->append(")");
+    return true;
+  }
+  return false;
+}
+
+// the nodes reachable from the outputs
+std::unordered_set<const Node*> GetLiveNodes(const std::vector<NodePtr>& nodes,
+                                             const std::vector<String>& output_keys) {
+  std::unordered_set<String> keys(output_keys.begin(), output_keys.end());
+  std::unordered_set<const Node*> live;
+  // consumers come after their producers
+  for (auto itr = nodes.rbegin(); itr != nodes.rend(); ++itr) {
+    auto& node = *itr;
+    bool is_live = false;
+    for (auto& output : node->outputs) {
+      is_live |= keys.count(output.source->key) > 0;
+    }
+    if (!is_live) {
+      continue;
+    }
+    live.insert(node.get());
+    for (auto& entry : node->inputs) {
+      keys.insert(entry->key);
+    }
+  }
+  return live;
+}
+
+}  // namespace
+
+std::vector<NodePtr> GraphOptimizer::Run(const std::vector<NodePtr>& nodes,
+                                         std::vector<String>* output_keys) {
+  if (options_.fold_constants) {
+    FoldConstants(nodes);
+  }
+  if (options_.eliminate_common_subexpr) {
+    EliminateCommonSubexpr(nodes, output_keys);
+  }
+  if (options_.fuse_interpreter_ops) {
+    FuseInterpreterOps(nodes, *output_keys);
+  }
+  // dead-node elimination: the caller only keeps the nodes reachable from the outputs
+  std::unordered_map<String, NodePtr> key2node;
+  for (auto& node : nodes) {
+    for (auto& output : node->outputs) {
+      key2node.emplace(output.source->key, node);
+    }
+  }
+  std::vector<NodePtr> output_nodes;
+  std::unordered_set<NodePtr> visited;
+  for (auto& key : *output_keys) {
+    auto itr = key2node.find(key);
+    MXCHECK(itr != key2node.end()) << "[GraphOptimizer] output " << key << " not found";
+    for (auto& output : itr->second->outputs) {
+      if (output.source->key == key) {
+        output.source->exported = true;
+      }
+    }
+    if (visited.insert(itr->second).second) {
+      output_nodes.push_back(itr->second);
+    }
+  }
+  return output_nodes;
+}
+
+void GraphOptimizer::FoldConstants(const std::vector<NodePtr>& nodes) {
+  // the nodes are sorted, a folded node is seen as a constant by its consumers
+  for (auto& node : nodes) {
+    if (!IsPureNode(node)) {
+      continue;
+    }
+    std::vector<RTValue> values;
+    values.reserve(node->inputs.size());
+    for (auto& entry : node->inputs) {
+      if (!IsConstantNode(entry->node)) {
+        break;
+      }
+      values.push_back(GetConstantValue(entry->node));
+    }
+    if (values.size() != node->inputs.size()) {
+      continue;
+    }
+    std::vector<RTView> op_feed(values.begin(), values.end());
+    RTValue result;
+    try {
+      result = node->op->Process(PyArgs(op_feed.data(), op_feed.size()));
+    } catch (...) {
+      // keep the node, the same error is raised when the session runs
+      continue;
+    }
+    if (!IsImmutableValue(result)) {
+      continue;
+    }
+    Attributes attrs;
+    attrs.SetAttr("data", result);
+    node->op = sess_->CreateOp("ConstantOp", attrs.ToDict());
+    node->inputs.clear();
+    ++num_folded_;
+  }
+}
+
+void GraphOptimizer::EliminateCommonSubexpr(const std::vector<NodePtr>& nodes,
+                                            std::vector<String>* output_keys) {
+  std::unordered_map<String, NodePtr> sig2node;
+  // the output key of a merged node -> the node which computes the same value
+  std::unordered_map<String, NodePtr> merged;
+  for (auto& node : nodes) {
+    // the producers are visited first, so the inputs only need one redirection
+    for (auto& entry : node->inputs) {
+      auto itr = merged.find(entry->key);
+      if (itr != merged.end()) {
+        entry->node = itr->second;
+        entry->index = 0;
+        entry->key = itr->second->outputs[0].source->key;
+      }
+    }
+    String sig;
+    if (!GetNodeSignature(node, &sig)) {
+      continue;
+    }
+    auto result = sig2node.emplace(std::move(sig), node);
+    if (result.second) {
+      continue;
+    }
+    auto& kept = result.first->second;
+    if (node->outputs[0].source->exported) {
+      kept->outputs[0].source->exported = true;
+    }
+    merged.emplace(node->outputs[0].source->key, kept);
+    ++num_merged_;
+  }
+  for (auto& key : *output_keys) {
+    auto itr = merged.find(key);
+    if (itr != merged.end()) {
+      key = itr->second->outputs[0].source->key;
+    }
+  }
+}
+
+void GraphOptimizer::FuseInterpreterOps(const std::vector<NodePtr>& nodes,
+                                        const std::vector<String>& output_keys) {
+  // the nodes merged or disconnected by the other passes are ignored
+  auto live = GetLiveNodes(nodes, output_keys);
+  // the only consumer of each output, nullptr if it is used by more than one node
+  std::unordered_map<String, Node*> consumers;
+  for (auto& node : nodes) {
+    if (live.count(node.get()) == 0) {
+      continue;
+    }
+    for (auto& entry : node->inputs) {
+      auto result = consumers.emplace(entry->key, node.get());
+      if (!result.second && result.first->second != node.get()) {
+        result.first->second = nullptr;
+      }
+    }
+  }
+  std::unordered_set<String> exported(output_keys.begin(), output_keys.end());
+
+  // a node joins the group of its only consumer, the root of a group is the node whose
+  // result leaves the group, visit the consumers first to know their groups
+  std::unordered_map<Node*, Node*> roots;
+  for (auto itr = nodes.rbegin(); itr != nodes.rend(); ++itr) {
+    auto& node = *itr;
+    if (live.count(node.get()) == 0 || !IsFusibleNode(node)) {
+      continue;
+    }
+    Node* root = node.get();
+    auto& key = node->outputs[0].source->key;
+    auto consumer_itr = consumers.find(key);
+    if (!node->outputs[0].source->exported && exported.count(key) == 0 &&
+        consumer_itr != consumers.end() && consumer_itr->second != nullptr) {
+      auto root_itr = roots.find(consumer_itr->second);
+      if (root_itr != roots.end()) {
+        root = root_itr->second;
+      }
+    }
+    roots.emplace(node.get(), root);
+  }
+  std::unordered_map<Node*, std::vector<NodePtr>> groups;
+  for (auto& node : nodes) {
+    auto itr = roots.find(node.get());
+    if (itr != roots.end()) {
+      groups[itr->second].push_back(node);
+    }
+  }
+
+  for (auto& group_kv : groups) {
+    auto& members = group_kv.second;
+    if (members.size() < 2) {
+      continue;
+    }
+    auto& root = members.back();
+    MXCHECK(root.get() == group_kv.first) << "[GraphOptimizer] internal error";
+    std::unordered_map<Node*, int64_t> steps;
+    std::unordered_map<String, int64_t> input_index;
+    std::vector<NodeEntryPtr> inputs;
+    List op_names;
+    List op_args;
+    for (auto& member : members) {
+      List args;
+      for (auto& entry : member->inputs) {
+        auto step_itr = steps.find(entry->node.get());
+        if (step_itr != steps.end()) {
+          args.push_back(-step_itr->second - 1);
+          continue;
+        }
+        auto result = input_index.emplace(entry->key, static_cast<int64_t>(inputs.size()));
+        if (result.second) {
+          inputs.push_back(std::make_shared<NodeEntry>(entry->node, entry->index, entry->key));
+        }
+        args.push_back(result.first->second);
+      }
+      steps.emplace(member.get(), static_cast<int64_t>(steps.size()));
+      op_names.push_back(member->op->GetName().decode());
+      op_args.push_back(std::move(args));
+    }
+    Attributes attrs;
+    attrs.SetAttr("ops", std::move(op_names));
+    attrs.SetAttr("args", std::move(op_args));
+    root->op = sess_->CreateOp("FusedInterpreterOp", attrs.ToDict());
+    root->inputs = std::move(inputs);
+    num_fused_ += members.size() - 1;
+  }
+}
+
+}  // namespace runtime
+}  // namespace matxscript
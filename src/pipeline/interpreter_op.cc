@@ -349,6 +349,93 @@ String InterpreterOp::GetHumanName(bool with_debug_info) const {
   }
 }
 
+bool InterpreterOp::IsPure() const {
+  switch (static_cast<OpCode>(opcode_)) {
+    case OpCode::__add__:
+    case OpCode::__sub__:
+    case OpCode::__mul__:
+    case OpCode::__floordiv__:
+    case OpCode::__truediv__:
+    case OpCode::__abs__:
+    case OpCode::__index__:
+    case OpCode::__gt__:
+    case OpCode::__ge__:
+    case OpCode::__lt__:
+    case OpCode::__le__:
+    case OpCode::__eq__:
+    case OpCode::__ne__:
+    case OpCode::__bool__:
+    case OpCode::__len__:
+    case OpCode::__contains__:
+    case OpCode::__getitem__:
+    case OpCode::__getslice__: {
+      return true;
+    } break;
+    default: {
+      return false;
+    } break;
+  }
+}
+
+static bool IsScalarTypeCode(int32_t type_code) {
+  switch (type_code) {
+    case TypeIndex::kRuntimeNullptr:
+    case TypeIndex::kRuntimeInteger:
+    case TypeIndex::kRuntimeFloat:
+    case TypeIndex::kRuntimeString:
+    case TypeIndex::kRuntimeUnicode: {
+      return true;
+    } break;
+    default: {
+      return false;
+    } break;
+  }
+}
+
+bool InterpreterOp::MayMakeContainer(const std::vector<int32_t>& input_type_codes) const {
+  switch (static_cast<OpCode>(opcode_)) {
+    case OpCode::__add__:
+    case OpCode::__sub__: {
+      // list + 1 or set - "a" raises, so a scalar operand means a scalar result
+      for (auto type_code : input_type_codes) {
+        if (IsScalarTypeCode(type_code)) {
+          return false;
+        }
+      }
+      return true;
+    } break;
+    case OpCode::__mul__: {
+      // list * 2 is a new list, but nothing but a number is multiplied by a float or a str
+      for (auto type_code : input_type_codes) {
+        if (type_code != TypeIndex::kRuntimeInteger && IsScalarTypeCode(type_code)) {
+          return false;
+        }
+      }
+      return true;
+    } break;
+    case OpCode::__getslice__: {
+      return input_type_codes.empty() || !IsScalarTypeCode(input_type_codes[0]);
+    } break;
+    default: {
+      return false;
+    } break;
+  }
+}
+
+bool InterpreterOp::IsFusible() const {
+  switch (static_cast<OpCode>(opcode_)) {
+    case OpCode::__call__:
+    case OpCode::ParallelMap:
+    case OpCode::ParallelStarMap:
+    case OpCode::ApplyAsync: {
+      return false;
+    } break;
+    default: {
+      return opcode_ >= int(OpCode::OP_CODE_BEGIN) && opcode_ < int(OpCode::OP_CODE_END);
+    } break;
+  }
+}
+
 RTValue InterpreterOp::Process(PyArgs inputs) const {
   if (opcode_ < int(OpCode::OP_CODE_BEGIN) || opcode_ >= int(OpCode::OP_CODE_END)) {
     MXTHROW << "[InterpreterOp::Process] unknown op_code: " << opcode_;
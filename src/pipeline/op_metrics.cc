@@ -0,0 +1,147 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#include <matxscript/pipeline/op_metrics.h>
+
+#include <sstream>
+
+namespace matxscript {
+namespace runtime {
+
+namespace {
+
+String EscapeLabelValue(const string_view& value) {
+  String escaped;
+  escaped.reserve(value.size());
+  for (auto c : value) {
+    switch (c) {
+      case '\\': {
+        escaped.append("\\\\");
+      } break;
+      case '"': {
+        escaped.append("\\\"");
+      } break;
+      case '\n': {
+        escaped.append("\\n");
+      } break;
+      default: {
+        escaped.push_back(c);
+      } break;
+    }
+  }
+  return escaped;
+}
+
+}  // namespace
+
+OpMetricsPtr TXSessionMetrics::Register(const String& instance,
+                                        const String& op,
+                                        const String& op_cls) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  for (auto& m : ops_) {
+    if (m->instance == instance && m->op_cls == op_cls) {
+      return m;
+    }
+  }
+  ops_.push_back(std::make_shared<OpMetrics>(instance, op, op_cls));
+  return ops_.back();
+}
+
+void TXSessionMetrics::ClearOps() {
+  std::lock_guard<std::mutex> lock(mutex_);
+  ops_.clear();
+}
+
+Dict TXSessionMetrics::Snapshot() const {
+  List ops;
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    ops.reserve(ops_.size());
+    for (auto& m : ops_) {
+      Dict op_d;
+      op_d[U"instance"] = StringHelper::Decode(m->instance);
+      op_d[U"op"] = StringHelper::Decode(m->op);
+      op_d[U"op_cls"] = StringHelper::Decode(m->op_cls);
+      op_d[U"calls"] = static_cast<int64_t>(m->latency.Count());
+      op_d[U"errors"] = static_cast<int64_t>(m->errors.load(std::memory_order_relaxed));
+      op_d[U"latency"] = m->latency.ToDict();
+      ops.push_back(std::move(op_d));
+    }
+  }
+  Dict d;
+  d[U"session"] = StringHelper::Decode(session_name_);
+  d[U"ops"] = std::move(ops);
+  d[U"scheduling_wait"] = scheduling_wait_->ToDict();
+  d[U"compute_wait"] = compute_wait_->ToDict();
+  return d;
+}
+
+String TXSessionMetrics::ToPrometheus() const {
+  std::ostringstream os;
+  String sess_label = "session=\"" + EscapeLabelValue(session_name_) + "\"";
+  std::vector<std::pair<OpMetricsPtr, String>> ops;
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    ops.reserve(ops_.size());
+    for (auto& m : ops_) {
+      ops.emplace_back(m,
+                       sess_label + ",instance=\"" + EscapeLabelValue(m->instance) + "\",op=\"" +
+                           EscapeLabelValue(m->op) + "\",op_cls=\"" +
+                           EscapeLabelValue(m->op_cls) + "\"");
+    }
+  }
+  os << "# HELP matx_op_calls_total Number of op calls.\n";
+  os << "# TYPE matx_op_calls_total counter\n";
+  for (auto& item : ops) {
+    os << "matx_op_calls_total{" << item.second << "} " << item.first->latency.Count() << "\n";
+  }
+  os << "# HELP matx_op_errors_total Number of op calls which raised an exception.\n";
+  os << "# TYPE matx_op_errors_total counter\n";
+  for (auto& item : ops) {
+    os << "matx_op_errors_total{" << item.second << "} "
+       << item.first->errors.load(std::memory_order_relaxed) << "\n";
+  }
+  os << "# HELP matx_op_latency_seconds Latency of op calls.\n";
+  os << "# TYPE matx_op_latency_seconds histogram\n";
+  for (auto& item : ops) {
+    item.first->latency.WritePrometheus(os, "matx_op_latency_seconds", item.second);
+  }
+  os << "# HELP matx_pool_queue_wait_seconds Time tasks wait in the queue of a thread pool.\n";
+  os << "# TYPE matx_pool_queue_wait_seconds histogram\n";
+  scheduling_wait_->WritePrometheus(
+      os, "matx_pool_queue_wait_seconds", sess_label + ",pool=\"scheduling\"");
+  compute_wait_->WritePrometheus(
+      os, "matx_pool_queue_wait_seconds", sess_label + ",pool=\"compute\"");
+  return String(os.str());
+}
+
+void TXSessionMetrics::Reset() {
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    for (auto& m : ops_) {
+      m->errors.store(0, std::memory_order_relaxed);
+      m->latency.Reset();
+    }
+  }
+  scheduling_wait_->Reset();
+  compute_wait_->Reset();
+}
+
+}  // namespace runtime
+}  // namespace matxscript
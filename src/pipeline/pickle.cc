@@ -19,12 +19,20 @@
  */
 #include <matxscript/pipeline/pickle.h>
 
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+#include <cstring>
+#include <memory>
 #include <unordered_map>
 
 #include <matxscript/runtime/container_private.h>
 #include <matxscript/runtime/generic/generic_constructor_funcs.h>
 #include <matxscript/runtime/json_util.h>
 #include <matxscript/runtime/logging.h>
+#include <matxscript/runtime/msgpack/msgpack.h>
 #include <matxscript/runtime/registry.h>
 
 namespace matxscript {
@@ -658,6 +666,314 @@ void ToJsonStruct(const Any& rtv,
   json_val.AddMember("v", json_val_v, allocator);
 }
 
+/******************************************************************************
+ * binary struct, msgpack with the large NDArrays and bytes in a data file
+ *****************************************************************************/
+namespace {
+
+constexpr const char* BINARY_STRUCT_TYPE_KEY = "__matx_struct_t__";
+constexpr const char* BINARY_STRUCT_VALUE_KEY = "v";
+constexpr size_t BINARY_STRUCT_DATA_ALIGNMENT = 64;
+
+class MappedFile {
+ public:
+  explicit MappedFile(const String& path) {
+    int fd = open(path.c_str(), O_RDONLY);
+    MXCHECK(fd >= 0) << "open " << path << " failed!";
+    struct stat st;
+    if (fstat(fd, &st) != 0) {
+      close(fd);
+      MXTHROW << "stat " << path << " failed!";
+    }
+    size_ = st.st_size;
+    if (size_ > 0) {
+      // private and writable, so the pages are shared by processes until one writes them
+      data_ = mmap(nullptr, size_, PROT_READ | PROT_WRITE, MAP_PRIVATE, fd, 0);
+    }
+    close(fd);
+    MXCHECK(data_ != MAP_FAILED) << "mmap " << path << " failed!";
+  }
+  ~MappedFile() {
+    if (data_ != nullptr && data_ != MAP_FAILED) {
+      munmap(data_, size_);
+    }
+  }
+  MappedFile(const MappedFile&) = delete;
+  MappedFile& operator=(const MappedFile&) = delete;
+
+  char* Data(int64_t offset, int64_t size) const {
+    MXCHECK(offset >= 0 && size >= 0 && offset + size <= static_cast<int64_t>(size_))
+        << "[FromBinaryStruct] data out of range, offset: " << offset << ", size: " << size;
+    return static_cast<char*>(data_) + offset;
+  }
+
+ private:
+  void* data_ = nullptr;
+  size_t size_ = 0;
+};
+
+struct MappedTensorContext {
+  std::shared_ptr<MappedFile> file;
+  DLManagedTensor tensor;
+};
+
+void MappedTensorDeleter(DLManagedTensor* self) {
+  delete static_cast<MappedTensorContext*>(self->manager_ctx);
+}
+
+NDArray MakeMappedNDArray(const std::shared_ptr<MappedFile>& file,
+                          int64_t offset,
+                          int64_t nbytes,
+                          std::vector<int64_t> shape,
+                          DLDataType dtype) {
+  auto* ctx = new MappedTensorContext{file, {}};
+  auto& dl_tensor = ctx->tensor.dl_tensor;
+  dl_tensor.data = file->Data(offset, nbytes);
+  dl_tensor.device = DLDevice{kDLCPU, 0};
+  dl_tensor.ndim = static_cast<int>(shape.size());
+  dl_tensor.dtype = dtype;
+  dl_tensor.shape = shape.data();
+  dl_tensor.strides = nullptr;
+  dl_tensor.byte_offset = 0;
+  ctx->tensor.manager_ctx = ctx;
+  ctx->tensor.deleter = MappedTensorDeleter;
+  // the shape is copied into the container
+  return NDArray::FromDLPack(&ctx->tensor);
+}
+
+Dict MakeBinaryStructNode(const char* type, RTValue value) {
+  Dict node;
+  node[String(BINARY_STRUCT_TYPE_KEY)] = String(type);
+  node[String(BINARY_STRUCT_VALUE_KEY)] = std::move(value);
+  return node;
+}
+
+class BinaryStructWriter {
+ public:
+  BinaryStructWriter(String* data, int64_t min_data_size)
+      : data_(data), min_data_size_(min_data_size) {
+  }
+
+  RTValue Convert(const Any& rtv) {
+    switch (rtv.type_code()) {
+      case TypeIndex::kRuntimeString: {
+        auto s = rtv.AsNoCheck<string_view>();
+        if (static_cast<int64_t>(s.size()) < min_data_size_) {
+          return RTValue(rtv);
+        }
+        Dict ref;
+        ref["offset"] = Append(s.data(), s.size());
+        ref["nbytes"] = static_cast<int64_t>(s.size());
+        return MakeBinaryStructNode("String", std::move(ref));
+      } break;
+      case TypeIndex::kRuntimeNDArray: {
+        auto arr = rtv.AsObjectRefNoCheck<NDArray>();
+        MXCHECK(arr.IsContiguous()) << "only contiguous ndarray supports serialization.";
+        int64_t nbytes = GetDataSize(*arr.operator->());
+        if (nbytes < min_data_size_) {
+          return RTValue(rtv);
+        }
+        Dict ref;
+        ref["dtype"] = arr.DTypeUnicode().encode();
+        List shape;
+        for (int64_t dim : arr.Shape()) {
+          shape.push_back(dim);
+        }
+        ref["shape"] = std::move(shape);
+        ref["offset"] = Reserve(nbytes);
+        ref["nbytes"] = nbytes;
+        arr.CopyToBytes(const_cast<char*>(data_->data()) + ref["offset"].As<int64_t>(), nbytes);
+        return MakeBinaryStructNode("NDArray", std::move(ref));
+      } break;
+      case TypeIndex::kRuntimeUserData: {
+        auto ud = rtv.AsObjectRefNoCheck<UserDataRef>();
+        MXCHECK(ud->ud_ptr->type_2_71828182846() == UserDataStructType::kNativeData)
+            << "[Class: " << ud->ud_ptr->ClassName_2_71828182846()
+            << "] does not support serialization. Please check whether it is used in the __init__ function of an op or as a constant symbol of the pipeline!!!";
+        auto* nud_ptr = dynamic_cast<NativeObject*>(ud->ud_ptr);
+        MXCHECK(nud_ptr->is_native_op_)
+            << "[Class: " << ud->ud_ptr->ClassName_2_71828182846()
+            << "] does not support serialization. Please check whether it is used in the __init__ function of an op or as a constant symbol of the pipeline!!!";
+        Dict fields;
+        fields["tag"] = static_cast<int64_t>(ud->tag);
+        fields["var_num"] = static_cast<int64_t>(ud->var_num);
+        fields["is_jit_object"] = nud_ptr->is_jit_object_;
+        fields["native_class_name"] = nud_ptr->native_class_name_;
+        fields["native_instance_name"] = nud_ptr->native_instance_name_;
+        return MakeBinaryStructNode("UserData", std::move(fields));
+      } break;
+      case TypeIndex::kRuntimeOpaqueHandle: {
+        auto user_ptr = reinterpret_cast<std::uintptr_t>(rtv.AsNoCheck<void*>());
+        return MakeBinaryStructNode("OpaqueHandle", static_cast<int64_t>(user_ptr));
+      } break;
+      case TypeIndex::kRuntimeList: {
+        List ret;
+        auto vl = rtv.AsObjectRefNoCheck<List>();
+        ret.reserve(vl.size());
+        for (auto& item : vl) {
+          ret.push_back(Convert(item));
+        }
+        return ret;
+      } break;
+      case TypeIndex::kRuntimeTuple: {
+        List ret;
+        auto vl = rtv.AsObjectRefNoCheck<Tuple>();
+        ret.reserve(vl.size());
+        for (auto& item : vl) {
+          ret.push_back(Convert(item));
+        }
+        return MakeBinaryStructNode("Tuple", std::move(ret));
+      } break;
+      case TypeIndex::kRuntimeSet: {
+        Set ret;
+        for (auto& item : rtv.AsObjectRefNoCheck<Set>()) {
+          ret.emplace(Convert(item));
+        }
+        return ret;
+      } break;
+      case TypeIndex::kRuntimeDict: {
+        Dict ret;
+        for (auto item : rtv.AsObjectRefNoCheck<Dict>().items()) {
+          ret.set_item(Convert(item.first), Convert(item.second));
+        }
+        return ret;
+      } break;
+      case TypeIndex::kRuntimeNullptr:
+      case TypeIndex::kRuntimeInteger:
+      case TypeIndex::kRuntimeFloat:
+      case TypeIndex::kRuntimeUnicode: {
+        return RTValue(rtv);
+      } break;
+      default: {
+        MXTHROW << "[ToBinaryStruct] unsupported runtime value type: " << rtv.type_name();
+      } break;
+    }
+    return None;
+  }
+
+ private:
+  int64_t Reserve(size_t size) {
+    size_t offset = (data_->size() + BINARY_STRUCT_DATA_ALIGNMENT - 1) /
+                    BINARY_STRUCT_DATA_ALIGNMENT * BINARY_STRUCT_DATA_ALIGNMENT;
+    data_->resize(offset + size);
+    return static_cast<int64_t>(offset);
+  }
+
+  int64_t Append(const char* bytes, size_t size) {
+    int64_t offset = Reserve(size);
+    std::memcpy(const_cast<char*>(data_->data()) + offset, bytes, size);
+    return offset;
+  }
+
+ private:
+  String* data_;
+  int64_t min_data_size_;
+};
+
+class BinaryStructReader {
+ public:
+  explicit BinaryStructReader(String data_path) : data_path_(std::move(data_path)) {
+  }
+
+  RTValue Convert(const Any& rtv) {
+    switch (rtv.type_code()) {
+      case TypeIndex::kRuntimeList: {
+        List ret;
+        auto vl = rtv.AsObjectRefNoCheck<List>();
+        ret.reserve(vl.size());
+        for (auto& item : vl) {
+          ret.push_back(Convert(item));
+        }
+        return ret;
+      } break;
+      case TypeIndex::kRuntimeSet: {
+        Set ret;
+        for (auto& item : rtv.AsObjectRefNoCheck<Set>()) {
+          ret.emplace(Convert(item));
+        }
+        return ret;
+      } break;
+      case TypeIndex::kRuntimeDict: {
+        auto vd = rtv.AsObjectRefNoCheck<Dict>();
+        if (vd.contains(BINARY_STRUCT_TYPE_KEY)) {
+          return ConvertNode(vd.get_item(BINARY_STRUCT_TYPE_KEY).As<String>(),
+                             vd.get_item(BINARY_STRUCT_VALUE_KEY));
+        }
+        Dict ret;
+        for (auto item : vd.items()) {
+          ret.set_item(Convert(item.first), Convert(item.second));
+        }
+        return ret;
+      } break;
+      default: {
+        return RTValue(rtv);
+      } break;
+    }
+  }
+
+ private:
+  RTValue ConvertNode(const String& type, const RTValue& value) {
+    if (type == "Tuple") {
+      auto items = Convert(value).As<List>();
+      return Tuple(items.begin(), items.end());
+    } else if (type == "UserData") {
+      auto fields = value.AsObjectRef<Dict>();
+      NativeObject* nud_ptr = new NativeObject();
+      nud_ptr->is_jit_object_ = fields.get_item("is_jit_object").As<bool>();
+      nud_ptr->is_native_op_ = true;
+      nud_ptr->native_class_name_ = fields.get_item("native_class_name").As<String>();
+      nud_ptr->native_instance_name_ = fields.get_item("native_instance_name").As<String>();
+      return UserDataRef(fields.get_item("tag").As<int64_t>(),
+                         fields.get_item("var_num").As<int64_t>(),
+                         reinterpret_cast<void*>(nud_ptr),
+                         default_userdata_deleter);
+    } else if (type == "OpaqueHandle") {
+      return RTValue(reinterpret_cast<void*>(static_cast<std::uintptr_t>(value.As<int64_t>())));
+    } else if (type == "String") {
+      auto ref = value.AsObjectRef<Dict>();
+      auto nbytes = ref.get_item("nbytes").As<int64_t>();
+      // String owns its buffer, so unlike an NDArray the bytes are copied out of the mapping
+      return String(File()->Data(ref.get_item("offset").As<int64_t>(), nbytes), nbytes);
+    } else if (type == "NDArray") {
+      auto ref = value.AsObjectRef<Dict>();
+      std::vector<int64_t> shape;
+      for (auto& dim : ref.get_item("shape").AsObjectRef<List>()) {
+        shape.push_back(dim.As<int64_t>());
+      }
+      return MakeMappedNDArray(File(),
+                               ref.get_item("offset").As<int64_t>(),
+                               ref.get_item("nbytes").As<int64_t>(),
+                               std::move(shape),
+                               String2DLDataType(ref.get_item("dtype").As<String>()));
+    }
+    MXTHROW << "[FromBinaryStruct] unsupported node type: " << type;
+    return None;
+  }
+
+  const std::shared_ptr<MappedFile>& File() {
+    if (!file_) {
+      file_ = std::make_shared<MappedFile>(data_path_);
+    }
+    return file_;
+  }
+
+ private:
+  String data_path_;
+  std::shared_ptr<MappedFile> file_;
+};
+
+}  // namespace
+
+String ToBinaryStruct(const Any& value, String* data, int64_t min_data_size) {
+  BinaryStructWriter writer(data, min_data_size);
+  return serialization::msgpack_dumps(writer.Convert(value));
+}
+
+RTValue FromBinaryStruct(const string_view& packed, const String& data_path) {
+  BinaryStructReader reader(data_path);
+  return reader.Convert(serialization::msgpack_loads(packed));
+}
+
 static constexpr const char* MATX4_SERIALIZE_VERSION = "v1.0";
 
 String Serialize(const Any& value) {
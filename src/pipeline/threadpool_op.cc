@@ -22,6 +22,7 @@
 #include <matxscript/runtime/logging.h>
 #include <matxscript/runtime/threadpool/lock_based_thread_pool.h>
 #include <matxscript/runtime/threadpool/lock_free_thread_pool.h>
+#include <matxscript/runtime/threadpool/work_stealing_thread_pool.h>
 
 namespace matxscript {
 namespace runtime {
@@ -36,10 +37,20 @@ void ThreadPoolOp::AtForkAfterInParentOrChild() {
 
 void ThreadPoolOp::Init() {
   lock_free_ = GetAttr<bool>("lock_free");
+  work_stealing_ = GetAttr<bool>("work_stealing", false);
   thread_nums_ = GetAttr<int32_t>("thread_nums");
   thread_name_ = GetAttr<Unicode>("thread_name");
+  cpu_ids_.clear();
+  if (HasAttr("cpu_ids")) {
+    for (auto& cpu_id : GetAttr<List>("cpu_ids")) {
+      cpu_ids_.push_back(cpu_id.As<int64_t>());
+    }
+  }
   auto thread_name = thread_name_.encode();
-  if (lock_free_) {
+  if (work_stealing_) {
+    pool_ = std::make_shared<internal::WorkStealingThreadPool>(
+        thread_nums_, std::string(thread_name.data(), thread_name.size()), cpu_ids_);
+  } else if (lock_free_) {
     pool_ = std::make_shared<internal::SPSCLockFreeThreadPool>(
         thread_nums_, std::string(thread_name.data(), thread_name.size()));
   } else {
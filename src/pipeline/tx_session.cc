@@ -19,6 +19,11 @@
  */
 #include <matxscript/pipeline/tx_session.h>
 
+#include <unistd.h>
+#include <algorithm>
+#include <atomic>
+#include <cstdio>
+#include <condition_variable>
 #include <exception>
 #include <fstream>
 #include <memory>
@@ -26,6 +31,7 @@
 #include <thread>
 #include <unordered_set>
 
+#include <matxscript/pipeline/fused_interpreter_op.h>
 #include <matxscript/pipeline/interpreter_op.h>
 #include <matxscript/pipeline/jit_object.h>
 #include <matxscript/pipeline/jit_op.h>
@@ -41,6 +47,7 @@
 #include <matxscript/runtime/logging.h>
 #include <matxscript/runtime/profiling_helper.h>
 #include <matxscript/runtime/threadpool/lock_based_thread_pool.h>
+#include <matxscript/runtime/threadpool/work_stealing_thread_pool.h>
 
 #include <matxscript/runtime/future_wrap.h>
 #include <matxscript/runtime/generic/generic_constructor_funcs.h>
@@ -53,6 +60,35 @@ static const char ThreadPoolOpClassName[] = "ThreadPoolOp";
 static const char ComputeThreadPoolOpName[] = "ThreadPoolOp_compute_pool_0";
 static const char ScheduleThreadPoolOpName[] = "ThreadPoolOp_scheduling_pool_0";
 
+// the shared pools of each kind are cached under their own names, so a session never
+// gets a cached pool of the other kind
+static String SharedPoolOpName(string_view base, bool work_stealing) {
+  return work_stealing ? String(base) + "_work_stealing" : String(base);
+}
+
+// the binary spec keeps the large constants in a data file next to it
+static bool IsBinarySpec(string_view name) {
+  return name.size() >= 8 && name.substr(name.size() - 8) == ".msgpack";
+}
+
+static String BinarySpecDataPath(string_view config_path) {
+  return String(config_path.substr(0, config_path.size() - 8)) + ".data";
+}
+
+// write a new file and rename it, the old data file may still be mapped by other processes
+static void SaveBinaryToFileByRename(string_view path, string_view data) {
+  std::string target(path.data(), path.size());
+  std::string tmp_path = target + ".tmp." + std::to_string(getpid());
+  FILE* fp = std::fopen(tmp_path.c_str(), "wb");
+  MXCHECK(fp != nullptr) << "[TXSession] open " << tmp_path << " failed!";
+  bool ok = data.empty() || std::fwrite(data.data(), data.size(), 1, fp) == 1;
+  ok = (std::fclose(fp) == 0) && ok;
+  if (!ok || std::rename(tmp_path.c_str(), target.c_str()) != 0) {
+    std::remove(tmp_path.c_str());
+    MXTHROW << "[TXSession] write " << target << " failed!";
+  }
+}
+
 static TXSessionOptions TXSessionOptionsReadFromDict(const Dict& config) {
   TXSessionOptions sess_opts;
   sess_opts.name = config["name"].As<String>();
@@ -63,6 +99,12 @@ static TXSessionOptions TXSessionOptionsReadFromDict(const Dict& config) {
   } else if (config.contains(U"enable_graph_parallel")) {
     sess_opts.enable_graph_parallel = config[U"enable_graph_parallel"].As<bool>();
   }
+  // parse dataflow scheduling flag
+  if (config.contains("enable_dataflow_scheduling")) {
+    sess_opts.enable_dataflow_scheduling = config["enable_dataflow_scheduling"].As<bool>();
+  } else if (config.contains(U"enable_dataflow_scheduling")) {
+    sess_opts.enable_dataflow_scheduling = config[U"enable_dataflow_scheduling"].As<bool>();
+  }
   // parse scheduling pool config
   if (config.contains("enable_scheduling_pool")) {
     sess_opts.enable_scheduling_pool = config["enable_scheduling_pool"].As<bool>();
@@ -111,6 +153,18 @@ static TXSessionOptions TXSessionOptionsReadFromDict(const Dict& config) {
       sess_opts.compute_pool_thread_nums = 8;
     }
   }
+  // parse async run pool config
+  if (config.contains("async_run_thread_nums")) {
+    sess_opts.async_run_thread_nums = config["async_run_thread_nums"].As<int32_t>();
+  } else if (config.contains(U"async_run_thread_nums")) {
+    sess_opts.async_run_thread_nums = config[U"async_run_thread_nums"].As<int32_t>();
+  }
+  // the pool cpu ids are host specific and are not saved
+  if (config.contains("enable_work_stealing_pool")) {
+    sess_opts.enable_work_stealing_pool = config["enable_work_stealing_pool"].As<bool>();
+  } else if (config.contains(U"enable_work_stealing_pool")) {
+    sess_opts.enable_work_stealing_pool = config[U"enable_work_stealing_pool"].As<bool>();
+  }
   return sess_opts;
 }
 
@@ -122,16 +176,20 @@ static void TXSessionOptionsWriteToDict(const TXSessionOptions& opt, Dict& confi
   config["share_compute_pool"] = opt.share_compute_pool;
   config["share_scheduling_pool"] = opt.share_scheduling_pool;
   config["enable_graph_parallel"] = opt.enable_graph_parallel;
+  config["enable_dataflow_scheduling"] = opt.enable_dataflow_scheduling;
   config["enable_scheduling_pool"] = opt.enable_scheduling_pool;
   config["scheduling_pool_thread_nums"] = opt.scheduling_pool_thread_nums;
   config["enable_compute_pool"] = opt.enable_compute_pool;
   config["compute_pool_thread_nums"] = opt.compute_pool_thread_nums;
+  config["async_run_thread_nums"] = opt.async_run_thread_nums;
+  config["enable_work_stealing_pool"] = opt.enable_work_stealing_pool;
 }
 
 TXSessionOptions DEFAULT_SESSION_OPTIONS;
 
 TXSession::TXSession(TXSessionOptions opt) {
   this->options_ = std::move(opt);
+  metrics_ = std::make_shared<TXSessionMetrics>(this->options_.name);
   datapack_element_size_ = 0;
   graph_ = nullptr;
   ud_cache_ = std::make_shared<UserDataScopedCache>(this->options_.name);
@@ -160,6 +218,9 @@ TXSession::TXSession(TXSessionOptions opt) {
         options_.compute_pool_thread_nums > 0 ? options_.compute_pool_thread_nums : 8,
         options_.share_compute_pool);
   }
+  if (this->options_.async_run_thread_nums > 0) {
+    SetAsyncRunThreads(options_.async_run_thread_nums);
+  }
 }
 
 int64_t TXSession::GetSchedulingThreads() {
@@ -171,7 +232,8 @@ int64_t TXSession::GetSchedulingThreads() {
 
 void TXSession::SetSchedulingThreads(int32_t num, bool share) {
   options_.share_scheduling_pool = share;
-  ud_cache_->Remove(ThreadPoolOpClassName, ScheduleThreadPoolOpName);
+  this->Remove(ThreadPoolOpClassName, SharedPoolOpName(ScheduleThreadPoolOpName, false));
+  this->Remove(ThreadPoolOpClassName, SharedPoolOpName(ScheduleThreadPoolOpName, true));
   if (num >= 0) {
     options_.enable_scheduling_pool = true;
     if (num == 0) {
@@ -183,16 +245,10 @@ void TXSession::SetSchedulingThreads(int32_t num, bool share) {
     MXCHECK_LT(options_.scheduling_pool_thread_nums, 256);
     if (options_.share_scheduling_pool) {
       // use thread_pool_op
-      Dict attrs;
-      attrs["lock_free"] = false;
-      attrs["thread_nums"] = options_.scheduling_pool_thread_nums;
-      attrs["thread_name"] = Unicode(U"matx.schedule");
-      auto op = this->CreateOp(ThreadPoolOpClassName, attrs, ScheduleThreadPoolOpName);
-      auto pool_op = std::dynamic_pointer_cast<ThreadPoolOp>(op);
-      scheduling_pool_ = pool_op->GetPool();
+      scheduling_pool_ = MakeSharedThreadPool(
+          options_.scheduling_pool_thread_nums, "matx.schedule", ScheduleThreadPoolOpName);
     } else {
-      scheduling_pool_ = std::make_shared<internal::LockBasedThreadPool>(
-          options_.scheduling_pool_thread_nums, "matx.schedule");
+      scheduling_pool_ = MakeThreadPool(options_.scheduling_pool_thread_nums, "matx.schedule");
     }
     scheduling_pool_executor_ = std::make_shared<ThreadPoolExecutor>(scheduling_pool_, false);
   } else {
@@ -208,6 +264,77 @@ void TXSession::SetOpParallelismThreads(int32_t num, bool share) {
   options_.enable_graph_parallel = options_.enable_scheduling_pool;
 }
 
+void TXSession::SetDataflowScheduling(bool enable) {
+  options_.enable_dataflow_scheduling = enable;
+}
+
+bool TXSession::GetDataflowScheduling() const {
+  return options_.enable_dataflow_scheduling;
+}
+
+std::shared_ptr<internal::IThreadPool> TXSession::MakeThreadPool(int32_t num,
+                                                                 const char* name) const {
+  if (options_.enable_work_stealing_pool) {
+    return std::make_shared<internal::WorkStealingThreadPool>(num, name, options_.pool_cpu_ids);
+  }
+  return std::make_shared<internal::LockBasedThreadPool>(num, name);
+}
+
+std::shared_ptr<internal::IThreadPool> TXSession::MakeSharedThreadPool(int32_t num,
+                                                                       const char* name,
+                                                                       string_view op_name) {
+  Dict attrs;
+  attrs["lock_free"] = false;
+  attrs["thread_nums"] = num;
+  attrs["thread_name"] = String(name).decode();
+  if (options_.enable_work_stealing_pool) {
+    attrs["work_stealing"] = true;
+    List cpu_ids;
+    for (auto cpu_id : options_.pool_cpu_ids) {
+      cpu_ids.push_back(cpu_id);
+    }
+    attrs["cpu_ids"] = std::move(cpu_ids);
+  }
+  auto op = this->CreateOp(ThreadPoolOpClassName,
+                           attrs,
+                           SharedPoolOpName(op_name, options_.enable_work_stealing_pool));
+  auto pool_op = std::dynamic_pointer_cast<ThreadPoolOp>(op);
+  return pool_op->GetPool();
+}
+
+void TXSession::SetWorkStealingPool(bool enable, std::vector<int> cpu_ids) {
+  options_.enable_work_stealing_pool = enable;
+  options_.pool_cpu_ids = std::move(cpu_ids);
+  if (options_.enable_scheduling_pool) {
+    SetSchedulingThreads(options_.scheduling_pool_thread_nums, options_.share_scheduling_pool);
+  }
+  if (options_.enable_compute_pool) {
+    SetOpComputeThreads(options_.compute_pool_thread_nums, options_.share_compute_pool);
+  }
+}
+
+bool TXSession::GetWorkStealingPool() const {
+  return options_.enable_work_stealing_pool;
+}
+
+void TXSession::SetAsyncRunThreads(int32_t num) {
+  if (num > 0) {
+    MXCHECK_LT(num, 256);
+    options_.async_run_thread_nums = num;
+    async_run_pool_ = std::make_shared<internal::LockBasedThreadPool>(num, "matx.async_run");
+  } else {
+    options_.async_run_thread_nums = 0;
+    async_run_pool_ = nullptr;
+  }
+}
+
+int64_t TXSession::GetAsyncRunThreads() {
+  if (async_run_pool_) {
+    return async_run_pool_->GetThreadsNum();
+  }
+  return 0;
+}
+
 int64_t TXSession::GetOpParallelismThreads() {
   if (scheduling_pool_) {
     return scheduling_pool_->GetThreadsNum();
@@ -216,7 +343,8 @@ int64_t TXSession::GetOpParallelismThreads() {
 }
 
 void TXSession::SetOpComputeThreads(int32_t num, bool share) {
-  ud_cache_->Remove(ThreadPoolOpClassName, ComputeThreadPoolOpName);
+  this->Remove(ThreadPoolOpClassName, SharedPoolOpName(ComputeThreadPoolOpName, false));
+  this->Remove(ThreadPoolOpClassName, SharedPoolOpName(ComputeThreadPoolOpName, true));
   options_.share_compute_pool = share;
   if (num >= 0) {
     options_.enable_compute_pool = true;
@@ -229,18 +357,13 @@ void TXSession::SetOpComputeThreads(int32_t num, bool share) {
     MXCHECK_LT(options_.compute_pool_thread_nums, 256);
     if (options_.share_compute_pool) {
       // use thread_pool_op
-      Dict attrs;
-      attrs["lock_free"] = false;
-      attrs["thread_nums"] = options_.compute_pool_thread_nums;
-      attrs["thread_name"] = Unicode(U"matx.compute");
-      auto op = this->CreateOp(ThreadPoolOpClassName, attrs, ComputeThreadPoolOpName);
-      auto pool_op = std::dynamic_pointer_cast<ThreadPoolOp>(op);
-      compute_pool_ = pool_op->GetPool();
+      compute_pool_ = MakeSharedThreadPool(
+          options_.compute_pool_thread_nums, "matx.compute", ComputeThreadPoolOpName);
     } else {
-      compute_pool_ = std::make_shared<internal::LockBasedThreadPool>(
-          options_.compute_pool_thread_nums, "matx.compute");
+      compute_pool_ = MakeThreadPool(options_.compute_pool_thread_nums, "matx.compute");
     }
     compute_pool_executor_ = std::make_shared<ThreadPoolExecutor>(compute_pool_, false);
+    compute_pool_executor_->SetQueueWaitHistogram(metrics_->ComputeWait());
   } else {
     options_.enable_compute_pool = false;
     options_.compute_pool_thread_nums = -1;
@@ -434,6 +557,15 @@ void TXSession::Trace(const std::vector<const Symbol*>& outputs) {
   this->graph_ = Graph::FromGenericList(this, graph->ToGenericList());
 
   // rebuild output
+  std::vector<String> output_keys;
+  for (auto& raw_entry : entry_outputs) {
+    output_keys.push_back(raw_entry->key);
+  }
+  BuildOutputs(output_keys);
+  BuildRunNodes();
+}
+
+void TXSession::BuildOutputs(const std::vector<String>& output_keys) {
   std::unordered_map<std::string, NodeEntryPtr> name2entry;
   for (auto& node : this->graph_->get_topo_nodes()) {
     for (auto& entry : node->outputs) {
@@ -443,11 +575,52 @@ void TXSession::Trace(const std::vector<const Symbol*>& outputs) {
     }
   }
   this->outputs_.clear();
-  for (auto& raw_entry : entry_outputs) {
-    MXCHECK(name2entry.find(raw_entry->key) != name2entry.end());
-    this->outputs_.push_back(name2entry[raw_entry->key]);
+  for (auto& key : output_keys) {
+    MXCHECK(name2entry.find(key) != name2entry.end());
+    this->outputs_.push_back(name2entry[key]);
   }
+}
+
+Dict TXSession::OptimizeGraph(const GraphOptimizeOptions& options) {
+  MXCHECK(graph_) << "forget trace? optimize must after trace!!!";
+  int64_t num_nodes_before = graph_->get_topo_nodes().size();
+  // rewrite a copy, the current graph is kept if a pass fails
+  auto graph = Graph::FromGenericList(this, graph_->ToGenericList());
+  std::vector<String> output_keys;
+  for (auto& entry : outputs_) {
+    output_keys.push_back(entry->key);
+  }
+  GraphOptimizer optimizer(this, options);
+  auto output_nodes = optimizer.Run(graph->get_topo_nodes(), &output_keys);
+  auto optimized = std::make_shared<Graph>(output_nodes);
+  this->graph_ = Graph::FromGenericList(this, optimized->ToGenericList());
+  BuildOutputs(output_keys);
   BuildRunNodes();
+
+  Dict stats;
+  stats[U"nodes_before"] = num_nodes_before;
+  stats[U"nodes_after"] = static_cast<int64_t>(graph_->get_topo_nodes().size());
+  stats[U"folded"] = optimizer.NumFolded();
+  stats[U"merged"] = optimizer.NumMerged();
+  stats[U"fused"] = optimizer.NumFused();
+  return stats;
+}
+
+static String GetNodeHumanName(const NodePtr& node, bool with_debug_info) {
+  auto* op = node->op.get();
+  if (op->ClassName() == "JitOp") {
+    return static_cast<const JitOp*>(op)->GetHumanName(with_debug_info);
+  } else if (op->ClassName() == "InterpreterOp") {
+    return static_cast<const InterpreterOp*>(op)->GetHumanName(with_debug_info);
+  } else if (op->ClassName() == "FusedInterpreterOp") {
+    return static_cast<const FusedInterpreterOp*>(op)->GetHumanName(with_debug_info);
+  } else if (op->ClassName() == "VariableOp") {
+    return "Input: " + node->name;
+  } else if (op->ClassName() == "ConstantOp") {
+    return "GetConstant";
+  } else {
+    return op->name_;
+  }
 }
 
 void TXSession::BuildRunNodes() {
@@ -465,6 +638,14 @@ void TXSession::BuildRunNodes() {
     datapack_element_size_ += node->outputs.size();
   }
 
+  metrics_->ClearOps();
+  for (auto& node : serial_nodes_) {
+    if (!node->IsVariable()) {
+      node->metrics = metrics_->Register(
+          node->op->name_, GetNodeHumanName(node, false), node->op->class_name_);
+    }
+  }
+
   std::unordered_set<NodePtr> finish_nodes;
   finish_nodes.reserve(serial_nodes_.size());
 
@@ -509,6 +690,55 @@ void TXSession::BuildRunNodes() {
       parallel_nodes_.push_back(std::move(run_nodes));
     }
   }
+  BuildDataflowNodes();
+}
+
+void TXSession::BuildDataflowNodes() {
+  // assign one slot per node output and record the producer -> consumer edges
+  dataflow_nodes_.clear();
+  dataflow_sources_.clear();
+  dataflow_slot_size_ = 0;
+  ska::flat_hash_map<string_view, int32_t> slot_index;
+  ska::flat_hash_map<const Node*, int32_t> node_index;
+  slot_index.reserve(datapack_element_size_);
+  node_index.reserve(serial_nodes_.size());
+  for (auto& node : serial_nodes_) {
+    if (node->IsVariable()) {
+      continue;
+    }
+    DataflowNode df_node;
+    df_node.node = node;
+    df_node.output_slot = static_cast<int32_t>(dataflow_slot_size_);
+    for (auto& output : node->outputs) {
+      slot_index.emplace(output.source->key.view(), static_cast<int32_t>(dataflow_slot_size_));
+      ++dataflow_slot_size_;
+    }
+    node_index.emplace(node.get(), static_cast<int32_t>(dataflow_nodes_.size()));
+    dataflow_nodes_.push_back(std::move(df_node));
+  }
+  for (size_t i = 0; i < dataflow_nodes_.size(); ++i) {
+    auto& df_node = dataflow_nodes_[i];
+    ska::flat_hash_set<int32_t> producers;
+    df_node.input_slots.reserve(df_node.node->inputs.size());
+    for (auto& entry : df_node.node->inputs) {
+      if (entry->node->IsVariable()) {
+        df_node.input_slots.push_back(-1);
+        continue;
+      }
+      auto slot_itr = slot_index.find(entry->key.view());
+      MXCHECK(slot_itr != slot_index.end()) << entry->key << " not found in graph";
+      df_node.input_slots.push_back(slot_itr->second);
+      auto node_itr = node_index.find(entry->node.get());
+      MXCHECK(node_itr != node_index.end()) << "compute graph is bad for dependence loss";
+      if (producers.emplace(node_itr->second).second) {
+        dataflow_nodes_[node_itr->second].successors.push_back(static_cast<int32_t>(i));
+      }
+    }
+    df_node.num_deps = static_cast<int32_t>(producers.size());
+    if (df_node.num_deps == 0) {
+      dataflow_sources_.push_back(static_cast<int32_t>(i));
+    }
+  }
 }
 
 void TXSession::BuildOutputKeys() {
@@ -547,7 +777,11 @@ std::vector<std::pair<std::string, RTValue>> TXSession::Run(
   MXCHECK(graph_) << "forget trace? run must after trace!!!";
   std::vector<std::pair<std::string, RTValue>> result;
   if (options_.enable_graph_parallel && options_.enable_scheduling_pool && scheduling_pool_) {
-    RunImplMultiThread(feed_dict, result);
+    if (options_.enable_dataflow_scheduling) {
+      RunImplDataflow(feed_dict, result);
+    } else {
+      RunImplMultiThread(feed_dict, result);
+    }
   } else {
     RunImpl(feed_dict, result);
   }
@@ -563,37 +797,74 @@ std::vector<std::pair<std::string, RTValue>> TXSession::Run(
     meta->step_stats.reserve(serial_nodes_.size());
   }
   if (options_.enable_graph_parallel && options_.enable_scheduling_pool && scheduling_pool_) {
-    RunImplMultiThread(feed_dict, result, meta);
+    if (options_.enable_dataflow_scheduling) {
+      RunImplDataflow(feed_dict, result, meta);
+    } else {
+      RunImplMultiThread(feed_dict, result, meta);
+    }
   } else {
     RunImpl(feed_dict, result, meta);
   }
   return result;
 }
 
-static int TXSessionRunOneNode(const NodePtr& node,
-                               const std::unordered_map<std::string, RTValue>& feed_dict,
-                               const ska::flat_hash_map<string_view, RTValue>& datapack,
-                               ska::flat_hash_map<string_view, RTValue>* output_dict,
-                               TXSessionStepStat* step_stat) {
-  if (node->IsVariable()) {
-    return 1;
+class TXSession::TXSessionAsyncRunnable : public internal::LockBasedRunnable {
+ public:
+  TXSessionAsyncRunnable(const TXSession* sess,
+                         std::unordered_map<std::string, RTValue> feed_dict,
+                         RunCallback callback)
+      : sess_(sess), feed_dict_(std::move(feed_dict)), callback_(std::move(callback)) {
   }
-  ProfilingHelper prof_helper(step_stat ? &(step_stat->time_line) : nullptr);
-  std::vector<RTView> op_feed;
-  op_feed.reserve(node->inputs.size());
-  for (auto& entry : node->inputs) {
-    auto& node_input = entry->node;
-    if (node_input->IsVariable()) {
-      auto itr = feed_dict.find(entry->key);
-      MXCHECK(itr != feed_dict.end()) << "[" << entry->key << "] feed value not found!!!";
-      op_feed.emplace_back(itr->second);
-    } else {
-      auto itr = datapack.find(entry->key.view());
-      MXCHECK(itr != datapack.end()) << entry->key << " not found in datapack";
-      op_feed.emplace_back(itr->second);
+
+ protected:
+  void RunImpl() override {
+    std::vector<std::pair<std::string, RTValue>> result;
+    std::exception_ptr except_ptr = nullptr;
+    try {
+      result = sess_->Run(feed_dict_);
+    } catch (...) {
+      except_ptr = std::current_exception();
     }
+    // release the inputs before notifying the caller
+    feed_dict_.clear();
+    callback_(std::move(result), std::move(except_ptr));
+  }
+
+ private:
+  const TXSession* sess_;
+  std::unordered_map<std::string, RTValue> feed_dict_;
+  RunCallback callback_;
+};
+
+void TXSession::RunAsync(std::unordered_map<std::string, RTValue> feed_dict,
+                         RunCallback callback) const {
+  MXCHECK(graph_) << "forget trace? run must after trace!!!";
+  MXCHECK(async_run_pool_) << "async run pool is not enabled, please call SetAsyncRunThreads first";
+  internal::IRunnablePtr task =
+      std::make_shared<TXSessionAsyncRunnable>(this, std::move(feed_dict), std::move(callback));
+  async_run_pool_->Enqueue(task, 0);
+}
+
+static RTValue TXSessionProcessNode(const NodePtr& node,
+                                   const std::vector<RTView>& op_feed,
+                                   TXSessionStepStat* step_stat) {
+  // large NDArray elementwise ops in the op are split across the compute pool
+  auto* sess = node->op->belong_to_;
+  NDArrayComputePoolScope pool_scope(sess ? sess->GetComputeThreadPool() : nullptr);
+  RTValue rets;
+  if (node->metrics) {
+    uint64_t start = EnvTime::Default()->NowNanos();
+    try {
+      rets = node->op->Process(PyArgs(op_feed.data(), op_feed.size()));
+    } catch (...) {
+      node->metrics->errors.fetch_add(1, std::memory_order_relaxed);
+      node->metrics->latency.ObserveSince(start);
+      throw;
+    }
+    node->metrics->latency.ObserveSince(start);
+  } else {
+    rets = node->op->Process(PyArgs(op_feed.data(), op_feed.size()));
   }
-  RTValue rets = node->op->Process(PyArgs(op_feed.data(), op_feed.size()));
   if (step_stat) {
     step_stat->inputs = Tuple(op_feed.data(), op_feed.data() + op_feed.size());
     step_stat->output = rets;
@@ -628,6 +899,33 @@ static int TXSessionRunOneNode(const NodePtr& node,
       }
     }
   }
+  return rets;
+}
+
+static int TXSessionRunOneNode(const NodePtr& node,
+                               const std::unordered_map<std::string, RTValue>& feed_dict,
+                               const ska::flat_hash_map<string_view, RTValue>& datapack,
+                               ska::flat_hash_map<string_view, RTValue>* output_dict,
+                               TXSessionStepStat* step_stat) {
+  if (node->IsVariable()) {
+    return 1;
+  }
+  ProfilingHelper prof_helper(step_stat ? &(step_stat->time_line) : nullptr);
+  std::vector<RTView> op_feed;
+  op_feed.reserve(node->inputs.size());
+  for (auto& entry : node->inputs) {
+    auto& node_input = entry->node;
+    if (node_input->IsVariable()) {
+      auto itr = feed_dict.find(entry->key);
+      MXCHECK(itr != feed_dict.end()) << "[" << entry->key << "] feed value not found!!!";
+      op_feed.emplace_back(itr->second);
+    } else {
+      auto itr = datapack.find(entry->key.view());
+      MXCHECK(itr != datapack.end()) << entry->key << " not found in datapack";
+      op_feed.emplace_back(itr->second);
+    }
+  }
+  RTValue rets = TXSessionProcessNode(node, op_feed, step_stat);
   if (node->outputs.size() > 1) {
     MXCHECK(rets.IsObjectRef<Tuple>()) << "expect tuple outputs, but get: " << rets.type_name();
     Tuple adt_tuple = rets.MoveToObjectRefNoCheck<Tuple>();
@@ -709,18 +1007,7 @@ Dict TXSession::GetNestedOpAttributes(const OpKernel* op) {
 TXSessionStepStat TXSession::MakeSessionStepStat(const NodePtr& node) {
   auto* op = node->op.get();
   TXSessionStepStat stat;
-  if (op->ClassName() == "JitOp") {
-    stat.op = static_cast<const JitOp*>(op)->GetHumanName(true);
-  } else if (op->ClassName() == "InterpreterOp") {
-    stat.op = static_cast<const InterpreterOp*>(op)->GetHumanName(true);
-  } else if (op->ClassName() == "VariableOp") {
-    stat.op = "Input: " + node->name;
-  } else if (op->ClassName() == "ConstantOp") {
-    stat.op = "GetConstant";
-  } else {
-    stat.op = op->name_;
-  }
-  // stat.op = op->name_;
+  stat.op = GetNodeHumanName(node, true);
   stat.op_cls = op->class_name_;
   stat.attributes = TXSession::GetNestedOpAttributes(op);
   return stat;
@@ -796,6 +1083,37 @@ std::vector<std::string> TXSession::InputNames() const {
   return result;
 }
 
+std::vector<std::string> TXSession::OutputsDependingOn(
+    const std::unordered_set<std::string>& input_names) const {
+  MXCHECK(graph_) << "forget trace? run must after trace!!!";
+  // serial_nodes_ is in topological order, so the producers are visited first
+  ska::flat_hash_set<string_view> tainted;
+  auto is_tainted = [&](const NodeEntryPtr& entry) {
+    if (entry->node->IsVariable()) {
+      return input_names.count(std::string(entry->key.data(), entry->key.size())) > 0;
+    }
+    return tainted.count(entry->key.view()) > 0;
+  };
+  for (auto& node : serial_nodes_) {
+    if (node->IsVariable()) {
+      continue;
+    }
+    if (std::any_of(node->inputs.begin(), node->inputs.end(), is_tainted)) {
+      for (auto& output : node->outputs) {
+        tainted.emplace(output.source->key.view());
+      }
+    }
+  }
+  std::vector<std::string> result;
+  bool use_sig = output_keys_.size() == outputs_.size();
+  for (size_t i = 0; i < outputs_.size(); ++i) {
+    if (is_tainted(outputs_[i])) {
+      result.push_back(use_sig ? output_keys_[i] : std::to_string(i));
+    }
+  }
+  return result;
+}
+
 void TXSession::GetOpInstanceNameDfs(const OpKernelPtr& op, List& op_instance_names) const {
   for (const auto& sub_op : op->sub_ops_) {
     GetOpInstanceNameDfs(sub_op, op_instance_names);
@@ -910,7 +1228,15 @@ class TXSession::TXSessionRunnable : public internal::LockBasedRunnable {
     }
   }
 
+  // only the runnables which go to the scheduling pool record the queue wait
+  void MarkEnqueued() {
+    enqueue_nanos_ = EnvTime::Default()->NowNanos();
+  }
+
   void RunImpl() override {
+    if (enqueue_nanos_) {
+      sess_->metrics_->SchedulingWait()->ObserveSince(enqueue_nanos_);
+    }
     // follow main thread stream
     auto stream = sess_->device_api_->GetSharedCurrentThreadStream(device_);
     if (stream.get() != stream_.get()) {
@@ -945,6 +1271,7 @@ class TXSession::TXSessionRunnable : public internal::LockBasedRunnable {
   MATXScriptDevice device_;
   std::shared_ptr<void> stream_;
   const TXSession* sess_;
+  uint64_t enqueue_nanos_ = 0;
 };
 
 void TXSession::RunImplMultiThread(const std::unordered_map<std::string, RTValue>& feed_dict,
@@ -1004,6 +1331,9 @@ void TXSession::RunImplMultiThread(const std::unordered_map<std::string, RTValue
                                                           &output_dicts[i],
                                                           step_stats,
                                                           this);
+        if (i + 1 < runables_num) {
+          runner->MarkEnqueued();
+        }
         runnables.push_back(std::dynamic_pointer_cast<internal::IRunnable>(runner));
         if (step_stats) {
           step_stats += real_step;
@@ -1044,6 +1374,184 @@ void TXSession::RunImplMultiThread(const std::unordered_map<std::string, RTValue
   SetOutput(feed_dict, datapack, output);
 }
 
+struct TXSession::DataflowRunState {
+  const TXSession* sess = nullptr;
+  const std::unordered_map<std::string, RTValue>* feed_dict = nullptr;
+  TXSessionStepStat* step_stats = nullptr;
+  std::vector<RTValue> slots;
+  std::unique_ptr<std::atomic<int32_t>[]> pending;
+  std::atomic<bool> aborted{false};
+  std::exception_ptr eptr;
+  // number of running task chains, guarded by mutex
+  size_t inflight = 0;
+  std::mutex mutex;
+  std::condition_variable cond;
+  MATXScriptDevice device;
+  std::shared_ptr<void> stream;
+};
+
+class TXSession::TXSessionDataflowRunnable : public internal::LockBasedRunnable {
+ public:
+  TXSessionDataflowRunnable(std::shared_ptr<DataflowRunState> state, int32_t node_idx)
+      : state_(std::move(state)),
+        node_idx_(node_idx),
+        enqueue_nanos_(EnvTime::Default()->NowNanos()) {
+  }
+
+  void RunImpl() override {
+    state_->sess->metrics_->SchedulingWait()->ObserveSince(enqueue_nanos_);
+    // follow main thread stream
+    auto* dev_api = state_->sess->device_api_;
+    auto stream = dev_api->GetSharedCurrentThreadStream(state_->device);
+    if (stream.get() != state_->stream.get()) {
+      dev_api->SetCurrentThreadStream(state_->device, state_->stream);
+    }
+    Execute(state_, node_idx_);
+  }
+
+  /**
+   * Run the node, then release its successors. The first successor which becomes ready
+   * is executed by the current thread, the others are dispatched to the scheduling pool.
+   */
+  static void Execute(const std::shared_ptr<DataflowRunState>& state, int32_t node_idx) {
+    auto& df_nodes = state->sess->dataflow_nodes_;
+    int32_t next_idx = node_idx;
+    while (next_idx >= 0) {
+      int32_t cur_idx = next_idx;
+      next_idx = -1;
+      if (!state->aborted.load(std::memory_order_acquire)) {
+        try {
+          RunNode(state.get(), cur_idx);
+          std::vector<internal::IRunnablePtr> ready_tasks;
+          for (auto succ_idx : df_nodes[cur_idx].successors) {
+            if (state->pending[succ_idx].fetch_sub(1, std::memory_order_acq_rel) != 1) {
+              continue;
+            }
+            if (next_idx < 0) {
+              next_idx = succ_idx;
+            } else {
+              ready_tasks.emplace_back(std::make_shared<TXSessionDataflowRunnable>(state, succ_idx));
+            }
+          }
+          if (!ready_tasks.empty()) {
+            {
+              std::lock_guard<std::mutex> lock(state->mutex);
+              state->inflight += ready_tasks.size();
+            }
+            state->sess->scheduling_pool_->EnqueueBulk(ready_tasks);
+          }
+        } catch (...) {
+          std::lock_guard<std::mutex> lock(state->mutex);
+          if (!state->eptr) {
+            state->eptr = std::current_exception();
+          }
+          state->aborted.store(true, std::memory_order_release);
+          next_idx = -1;
+        }
+      }
+    }
+    std::lock_guard<std::mutex> lock(state->mutex);
+    if (--state->inflight == 0) {
+      state->cond.notify_all();
+    }
+  }
+
+ private:
+  static void RunNode(DataflowRunState* state, int32_t node_idx) {
+    auto& df_node = state->sess->dataflow_nodes_[node_idx];
+    auto& node = df_node.node;
+    TXSessionStepStat* step_stat = state->step_stats ? state->step_stats + node_idx : nullptr;
+    ProfilingHelper prof_helper(step_stat ? &(step_stat->time_line) : nullptr);
+    std::vector<RTView> op_feed;
+    op_feed.reserve(node->inputs.size());
+    for (size_t i = 0; i < node->inputs.size(); ++i) {
+      auto slot = df_node.input_slots[i];
+      if (slot < 0) {
+        auto& entry = node->inputs[i];
+        auto itr = state->feed_dict->find(entry->key);
+        MXCHECK(itr != state->feed_dict->end()) << "[" << entry->key << "] feed value not found!!!";
+        op_feed.emplace_back(itr->second);
+      } else {
+        op_feed.emplace_back(state->slots[slot]);
+      }
+    }
+    RTValue rets = TXSessionProcessNode(node, op_feed, step_stat);
+    RTValue* outputs = state->slots.data() + df_node.output_slot;
+    if (node->outputs.size() > 1) {
+      MXCHECK(rets.IsObjectRef<Tuple>()) << "expect tuple outputs, but get: " << rets.type_name();
+      Tuple adt_tuple = rets.MoveToObjectRefNoCheck<Tuple>();
+      MXCHECK(adt_tuple.size() == node->outputs.size());
+      for (size_t e = 0; e < node->outputs.size(); ++e) {
+        outputs[e] = std::move(adt_tuple[e]);
+      }
+    } else {
+      MXCHECK(!node->outputs.empty());
+      outputs[0] = std::move(rets);
+    }
+  }
+
+ private:
+  std::shared_ptr<DataflowRunState> state_;
+  int32_t node_idx_;
+  uint64_t enqueue_nanos_;
+};
+
+void TXSession::RunImplDataflow(const std::unordered_map<std::string, RTValue>& feed_dict,
+                                std::vector<std::pair<std::string, RTValue>>& output,
+                                TXSessionRunMeta* meta) const {
+  ska::flat_hash_map<string_view, RTValue> datapack;
+  if (!dataflow_nodes_.empty()) {
+    auto state = std::make_shared<DataflowRunState>();
+    state->sess = this;
+    state->feed_dict = &feed_dict;
+    if (meta) {
+      size_t last_idx = meta->step_stats.size();
+      for (auto& df_node : dataflow_nodes_) {
+        meta->step_stats.emplace_back(TXSession::MakeSessionStepStat(df_node.node));
+      }
+      state->step_stats = meta->step_stats.data() + last_idx;
+    }
+    state->slots.resize(dataflow_slot_size_);
+    state->pending.reset(new std::atomic<int32_t>[dataflow_nodes_.size()]);
+    for (size_t i = 0; i < dataflow_nodes_.size(); ++i) {
+      state->pending[i].store(dataflow_nodes_[i].num_deps, std::memory_order_relaxed);
+    }
+    state->device.device_type = device_type_;
+    state->device.device_id = device_;
+    state->stream = device_api_->GetSharedCurrentThreadStream(state->device);
+    state->inflight = dataflow_sources_.size();
+
+    // the main thread runs the first source node, the others go to the scheduling pool
+    std::vector<internal::IRunnablePtr> runnables;
+    runnables.reserve(dataflow_sources_.size());
+    for (size_t i = 1; i < dataflow_sources_.size(); ++i) {
+      runnables.emplace_back(
+          std::make_shared<TXSessionDataflowRunnable>(state, dataflow_sources_[i]));
+    }
+    if (!runnables.empty()) {
+      scheduling_pool_->EnqueueBulk(runnables);
+    }
+    TXSessionDataflowRunnable::Execute(state, dataflow_sources_[0]);
+    {
+      std::unique_lock<std::mutex> lock(state->mutex);
+      state->cond.wait(lock, [&state] { return state->inflight == 0; });
+    }
+    if (state->eptr) {
+      std::rethrow_exception(state->eptr);
+    }
+    datapack.reserve(datapack_element_size_);
+    for (auto& df_node : dataflow_nodes_) {
+      auto& node_outputs = df_node.node->outputs;
+      for (size_t e = 0; e < node_outputs.size(); ++e) {
+        datapack.emplace(node_outputs[e].source->key.view(),
+                         std::move(state->slots[df_node.output_slot + e]));
+      }
+    }
+  }
+  // make output
+  SetOutput(feed_dict, datapack, output);
+}
+
 void TXSession::DFSSaveOp(OpKernelPtr op,
                           string_view folder,
                           ska::flat_hash_set<const OpKernel*>& visited,
@@ -1108,9 +1616,6 @@ void TXSession::Save(string_view folder, string_view name) const {
   // session attribute
   generic_session["g_attr"] = attributes_.ToDict();
 
-  // pickle session
-  rapidjson::Document sess_config = pickle::ToJsonStruct(RTView(generic_session));
-  auto ss_conf = JsonUtil::ToString(&sess_config, true);
   std::string config_path;
   if (folder.empty()) {
     config_path = "./" + std::string(name.data(), name.size());
@@ -1118,31 +1623,58 @@ void TXSession::Save(string_view folder, string_view name) const {
     config_path =
         std::string(folder.data(), folder.size()) + "/" + std::string(name.data(), name.size());
   }
+
+  // pickle session
+  if (IsBinarySpec(name)) {
+    String data;
+    auto ss_conf = pickle::ToBinaryStruct(RTView(generic_session), &data);
+    // the data file first, a spec is never read with a data file older than itself
+    SaveBinaryToFileByRename(BinarySpecDataPath(config_path), data);
+    SaveBinaryToFileByRename(config_path, ss_conf);
+    return;
+  }
+  rapidjson::Document sess_config = pickle::ToJsonStruct(RTView(generic_session));
+  auto ss_conf = JsonUtil::ToString(&sess_config, true);
   std::ofstream fc(config_path);
   MXCHECK(!fc.fail()) << "open " << config_path << " failed!";
   fc << ss_conf;
   fc.close();
 }
 
-std::unique_ptr<TXSession> TXSession::Load(string_view folder,
-                                           string_view name,
-                                           int device,
-                                           string_view version) {
-  String folder_fix;
-  String config_path;
+static String FixFolder(string_view folder) {
   if (folder.empty()) {
-    folder_fix = "./";
-  } else {
-    if (folder.back() == '/') {
-      folder_fix = folder;
-    } else {
-      folder_fix = String(folder) + "/";
-    }
+    return "./";
+  }
+  if (folder.back() == '/') {
+    return String(folder);
+  }
+  return String(folder) + "/";
+}
+
+Dict TXSession::ReadSpec(string_view folder, string_view name) {
+  String config_path = FixFolder(folder) + String(name);
+  if (IsBinarySpec(name)) {
+    std::string content;
+    FileUtil::LoadBinaryFromFile(config_path, &content);
+    return pickle::FromBinaryStruct(content, BinarySpecDataPath(config_path)).As<Dict>();
   }
-  config_path = folder_fix + String(name);
   rapidjson::Document config;
   MXCHECK(JsonUtil::FromFile(config_path, config));
-  Dict generic_session = pickle::FromJsonStruct(config).As<Dict>();
+  return pickle::FromJsonStruct(config).As<Dict>();
+}
+
+std::unique_ptr<TXSession> TXSession::Load(string_view folder,
+                                           string_view name,
+                                           int device,
+                                           string_view version) {
+  return LoadFromSpec(folder, ReadSpec(folder, name), device, version);
+}
+
+std::unique_ptr<TXSession> TXSession::LoadFromSpec(string_view folder,
+                                                   Dict generic_session,
+                                                   int device,
+                                                   string_view version) {
+  String folder_fix = FixFolder(folder);
 
   TXSessionOptions sess_opts = TXSessionOptionsReadFromDict(generic_session);
   sess_opts.name = sess_opts.name + "_" + version;
@@ -1216,7 +1748,8 @@ void TXSession::AtForkBefore() {
   // will be corrupt. So we close these threads before fork.
   if (scheduling_pool_) {
     if (options_.share_scheduling_pool) {
-      auto op = this->FindOp(ThreadPoolOpClassName, ScheduleThreadPoolOpName);
+      auto op_name = SharedPoolOpName(ScheduleThreadPoolOpName, options_.enable_work_stealing_pool);
+      auto op = this->FindOp(ThreadPoolOpClassName, op_name);
       if (op) {
         auto pool_op = std::dynamic_pointer_cast<ThreadPoolOp>(op);
         pool_op->AtForkBefore();
@@ -1227,7 +1760,8 @@ void TXSession::AtForkBefore() {
   }
   if (compute_pool_) {
     if (options_.share_compute_pool) {
-      auto op = this->FindOp(ThreadPoolOpClassName, ComputeThreadPoolOpName);
+      auto op_name = SharedPoolOpName(ComputeThreadPoolOpName, options_.enable_work_stealing_pool);
+      auto op = this->FindOp(ThreadPoolOpClassName, op_name);
       if (op) {
         auto pool_op = std::dynamic_pointer_cast<ThreadPoolOp>(op);
         pool_op->AtForkBefore();
@@ -1236,6 +1770,8 @@ void TXSession::AtForkBefore() {
     compute_pool_ = nullptr;
     compute_pool_executor_ = nullptr;
   }
+  // the pending async runs are finished by the pool before its threads are joined
+  async_run_pool_ = nullptr;
 }
 
 void TXSession::AtForkAfterInParentOrChild() {
@@ -1244,31 +1780,36 @@ void TXSession::AtForkAfterInParentOrChild() {
   // is corrupt. So reinitialize the thread pool here in order to prevent segfaults.
   if (options_.scheduling_pool_thread_nums > 0) {
     if (options_.share_scheduling_pool) {
-      auto op = this->FindOp(ThreadPoolOpClassName, ScheduleThreadPoolOpName);
+      auto op_name = SharedPoolOpName(ScheduleThreadPoolOpName, options_.enable_work_stealing_pool);
+      auto op = this->FindOp(ThreadPoolOpClassName, op_name);
       if (op) {
         auto pool_op = std::dynamic_pointer_cast<ThreadPoolOp>(op);
         pool_op->AtForkAfterInParentOrChild();
         scheduling_pool_ = pool_op->GetPool();
       }
     } else {
-      scheduling_pool_ = std::make_shared<internal::LockBasedThreadPool>(
-          options_.scheduling_pool_thread_nums, "matx.schedule");
+      scheduling_pool_ = MakeThreadPool(options_.scheduling_pool_thread_nums, "matx.schedule");
     }
     scheduling_pool_executor_ = std::make_shared<ThreadPoolExecutor>(scheduling_pool_, false);
   }
   if (options_.compute_pool_thread_nums > 0) {
     if (options_.share_compute_pool) {
-      auto op = this->FindOp(ThreadPoolOpClassName, ComputeThreadPoolOpName);
+      auto op_name = SharedPoolOpName(ComputeThreadPoolOpName, options_.enable_work_stealing_pool);
+      auto op = this->FindOp(ThreadPoolOpClassName, op_name);
       if (op) {
         auto pool_op = std::dynamic_pointer_cast<ThreadPoolOp>(op);
         pool_op->AtForkAfterInParentOrChild();
         compute_pool_ = pool_op->GetPool();
       }
     } else {
-      compute_pool_ = std::make_shared<internal::LockBasedThreadPool>(
-          options_.compute_pool_thread_nums, "matx.compute");
+      compute_pool_ = MakeThreadPool(options_.compute_pool_thread_nums, "matx.compute");
     }
     compute_pool_executor_ = std::make_shared<ThreadPoolExecutor>(compute_pool_, false);
+    compute_pool_executor_->SetQueueWaitHistogram(metrics_->ComputeWait());
+  }
+  if (options_.async_run_thread_nums > 0) {
+    async_run_pool_ = std::make_shared<internal::LockBasedThreadPool>(
+        options_.async_run_thread_nums, "matx.async_run");
   }
 }
 
@@ -0,0 +1,178 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#include <matxscript/runtime/algorithm/mapped_trie.h>
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#include <cstdio>
+#include <cstring>
+#include <mutex>
+#include <string>
+#include <unordered_map>
+
+#include <matxscript/runtime/logging.h>
+
+namespace matxscript {
+namespace runtime {
+
+namespace {
+
+constexpr char kMagic[8] = {'M', 'X', 'D', 'A', 'T', 'R', 'I', 'E'};
+
+struct MappedTrieHeader {
+  char magic[8];
+  uint32_t version;
+  uint32_t node_size;
+  uint64_t num_nodes;
+  uint64_t num_keys;
+  char reserved[32];
+};
+static_assert(sizeof(MappedTrieHeader) == MappedTrieFile::kHeaderSize,
+              "the header of a mapped trie file must be 64 bytes");
+
+// the file identity, a rewritten file is mapped again
+std::string MakeCacheKey(const String& path, const struct stat& st) {
+  char buf[128];
+  snprintf(buf,
+           sizeof(buf),
+           ":%llu:%llu:%lld:%lld",
+           (unsigned long long)st.st_dev,
+           (unsigned long long)st.st_ino,
+           (long long)st.st_size,
+           (long long)st.st_mtime);
+  return std::string(path.data(), path.size()) + buf;
+}
+
+struct MappedTrieCache {
+  std::mutex mutex;
+  std::unordered_map<std::string, std::weak_ptr<const MappedTrieFile>> files;
+};
+
+MappedTrieCache& GetMappedTrieCache() {
+  static MappedTrieCache cache;
+  return cache;
+}
+
+}  // namespace
+
+constexpr uint32_t MappedTrieFile::kVersion;
+constexpr size_t MappedTrieFile::kHeaderSize;
+
+bool MappedTrieFile::IsMappedTrieFile(const String& path) {
+  FILE* fp = std::fopen(path.c_str(), "rb");
+  if (!fp) {
+    return false;
+  }
+  char magic[sizeof(kMagic)];
+  bool ok = std::fread(magic, 1, sizeof(magic), fp) == sizeof(magic) &&
+            std::memcmp(magic, kMagic, sizeof(kMagic)) == 0;
+  std::fclose(fp);
+  return ok;
+}
+
+std::shared_ptr<const MappedTrieFile> MappedTrieFile::Open(const String& path) {
+  int fd = open(path.c_str(), O_RDONLY);
+  MXCHECK(fd >= 0) << "[MappedTrieFile] open " << path << " failed!";
+  struct stat st;
+  if (fstat(fd, &st) != 0) {
+    close(fd);
+    MXTHROW << "[MappedTrieFile] stat " << path << " failed!";
+  }
+  auto key = MakeCacheKey(path, st);
+  auto& cache = GetMappedTrieCache();
+  std::lock_guard<std::mutex> lock(cache.mutex);
+  auto it = cache.files.find(key);
+  if (it != cache.files.end()) {
+    if (auto file = it->second.lock()) {
+      close(fd);
+      return file;
+    }
+  }
+
+  size_t size = st.st_size;
+  if (size < kHeaderSize) {
+    close(fd);
+    MXTHROW << "[MappedTrieFile] " << path << " is too small to be a mapped trie file";
+  }
+  void* data = mmap(nullptr, size, PROT_READ, MAP_SHARED, fd, 0);
+  close(fd);
+  MXCHECK(data != MAP_FAILED) << "[MappedTrieFile] mmap " << path << " failed!";
+  std::shared_ptr<MappedTrieFile> file(new MappedTrieFile());
+  file->path_ = path;
+  file->data_ = data;
+  file->size_ = size;
+
+  auto* header = static_cast<const MappedTrieHeader*>(data);
+  MXCHECK(std::memcmp(header->magic, kMagic, sizeof(kMagic)) == 0)
+      << "[MappedTrieFile] " << path << " is not a mapped trie file";
+  MXCHECK_EQ(header->version, kVersion) << "[MappedTrieFile] unsupported version of " << path;
+  MXCHECK(header->node_size > 0) << "[MappedTrieFile] bad header of " << path;
+  MXCHECK_EQ(header->num_nodes * header->node_size, size - kHeaderSize)
+      << "[MappedTrieFile] " << path << " is truncated";
+  file->num_nodes_ = header->num_nodes;
+  file->node_size_ = header->node_size;
+  file->num_keys_ = header->num_keys;
+
+  for (auto iter = cache.files.begin(); iter != cache.files.end();) {
+    if (iter->second.expired()) {
+      iter = cache.files.erase(iter);
+    } else {
+      ++iter;
+    }
+  }
+  cache.files[key] = file;
+  return file;
+}
+
+void MappedTrieFile::Save(
+    const String& path, const void* nodes, size_t num_nodes, size_t node_size, size_t num_keys) {
+  MappedTrieHeader header;
+  std::memset(&header, 0, sizeof(header));
+  std::memcpy(header.magic, kMagic, sizeof(kMagic));
+  header.version = kVersion;
+  header.node_size = static_cast<uint32_t>(node_size);
+  header.num_nodes = num_nodes;
+  header.num_keys = num_keys;
+
+  // write a new file and rename it, the old one may still be mapped by other processes
+  String tmp_path = path + ".tmp." + std::to_string(getpid());
+  FILE* fp = std::fopen(tmp_path.c_str(), "wb");
+  MXCHECK(fp != nullptr) << "[MappedTrieFile] open " << tmp_path << " failed!";
+  bool ok = std::fwrite(&header, sizeof(header), 1, fp) == 1;
+  if (ok && num_nodes > 0) {
+    ok = std::fwrite(nodes, node_size, num_nodes, fp) == num_nodes;
+  }
+  ok = (std::fclose(fp) == 0) && ok;
+  if (!ok || std::rename(tmp_path.c_str(), path.c_str()) != 0) {
+    std::remove(tmp_path.c_str());
+    MXTHROW << "[MappedTrieFile] write " << path << " failed!";
+  }
+}
+
+MappedTrieFile::~MappedTrieFile() {
+  if (data_ != nullptr) {
+    munmap(data_, size_);
+  }
+}
+
+}  // namespace runtime
+}  // namespace matxscript
@@ -45,6 +45,16 @@ PrefixMapping::PrefixMapping(const std::map<String, int>& dic) {
   MXCHECK_EQ(rc, 0) << "build trie failed!!!";
 }
 
+PrefixMapping::PrefixMapping(std::shared_ptr<const MappedTrieFile> file)
+    : mapped_file_(std::move(file)) {
+  trie_ = std::make_unique<cedar_t>();
+  mapped_file_->Attach(trie_.get());
+}
+
+void PrefixMapping::Save(const String& path) const {
+  MappedTrieFile::Save(path, *trie_);
+}
+
 int PrefixMapping::PrefixSearch(const char* w, size_t w_len, int* val) const {
   if (trie_ == nullptr) {
     return 0;
@@ -54,6 +54,10 @@ TrieNode::TrieNode(const std::map<string_view, int64_t>& dic) {
 }
 
 void TrieNode::Update(const string_view& w, int64_t val) {
+  if (mapped_file_) {
+    trie_->detach_array();
+    mapped_file_.reset();
+  }
   trie_->update(w.data(), w.size(), (int32_t)val);
 }
 
@@ -217,12 +221,27 @@ List TrieNode::prefix_search_all(const Any& w, int64_t pos) const {
   }
 }
 
-int TrieNode::save(const unicode_view& file_path) const {
+int TrieNode::save(const unicode_view& file_path, bool mapped) const {
+  if (mapped) {
+    MappedTrieFile::Save(UTF8Encode(file_path), *trie_);
+    return 0;
+  }
   return trie_->save(UTF8Encode(file_path).c_str());
 }
 
 int TrieNode::load(const unicode_view& file_path) const {
-  return trie_->open(UTF8Encode(file_path).c_str());
+  auto path = UTF8Encode(file_path);
+  if (MappedTrieFile::IsMappedTrieFile(path)) {
+    auto file = MappedTrieFile::Open(path);
+    file->Attach(trie_.get());
+    mapped_file_ = std::move(file);
+    return 0;
+  }
+  int rc = trie_->open(path.c_str());
+  if (rc == 0) {
+    mapped_file_.reset();
+  }
+  return rc;
 }
 
 MATXSCRIPT_REGISTER_OBJECT_TYPE(TrieNode);
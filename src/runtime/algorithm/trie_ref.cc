@@ -102,9 +102,9 @@ List Trie::prefix_search_all(const Any& w, int64_t pos) const {
   return d->prefix_search_all(w, pos);
 }
 
-int Trie::save(const unicode_view& file_path) const {
+int Trie::save(const unicode_view& file_path, bool mapped) const {
   MX_CHECK_DPTR(Trie);
-  return d->save(file_path);
+  return d->save(file_path, mapped);
 }
 
 int Trie::load(const unicode_view& file_path) const {
@@ -39,6 +39,7 @@
 #include <matxscript/pipeline/op_kernel.h>
 #include <matxscript/pipeline/tx_session.h>
 #include <matxscript/runtime/c_backend_api.h>
+#include <matxscript/runtime/container/string_batch.h>
 #include <matxscript/runtime/container_private.h>
 #include <matxscript/runtime/device_api.h>
 #include <matxscript/runtime/function.h>
@@ -47,6 +48,7 @@
 #include <matxscript/runtime/regex/regex_ref.h>
 #include <matxscript/runtime/registry.h>
 #include <matxscript/runtime/thread_local.h>
+#include <matxscript/runtime/unicodelib/unicode_kind.h>
 #include "matxscript/ir/_base/string_ref.h"
 
 namespace matxscript {
@@ -464,6 +466,42 @@ int MATXScriptRuntimeMakeUnicode(const char* buffer, size_t size, MATXScriptAny*
   API_END();
 }
 
+int MATXScriptRuntimeMakeUnicodeFromKind(const void* data,
+                                         size_t size,
+                                         int kind,
+                                         MATXScriptAny* ret_val) {
+  API_BEGIN();
+  Unicode::ContainerType unicodes(size, Unicode::ContainerType::NoInit{});
+  switch (kind) {
+    case kUnicodeKind1Byte: {
+      UnicodeWidenCopy(static_cast<const uint8_t*>(data), size, unicodes.data());
+    } break;
+    case kUnicodeKind2Byte: {
+      UnicodeWidenCopy(static_cast<const uint16_t*>(data), size, unicodes.data());
+    } break;
+    case kUnicodeKind4Byte: {
+      UnicodeWidenCopy(static_cast<const uint32_t*>(data), size, unicodes.data());
+    } break;
+    default: {
+      MXTHROW << "ValueError: invalid unicode kind: " << kind;
+    } break;
+  }
+  RTValue(Unicode(std::move(unicodes))).MoveToCHost(ret_val);
+  API_END();
+}
+
+int MATXScriptRuntimeMakeStringBatch(const char* const* items,
+                                     const size_t* sizes,
+                                     const int* kinds,
+                                     int64_t num,
+                                     int is_unicode,
+                                     MATXScriptAny* ret_val) {
+  API_BEGIN();
+  RTValue(StringBatch::MakeUserData(StringBatch(items, sizes, num, is_unicode != 0, kinds)))
+      .MoveToCHost(ret_val);
+  API_END();
+}
+
 int MATXScriptRuntimeUnicodeEncode(MATXScriptAny* arg_value, MATXScriptAny* ret_val) {
   API_BEGIN();
   RTValue(UnicodeHelper::Encode(UnicodeHelper::AsView(arg_value))).MoveToCHost(ret_val);
@@ -0,0 +1,1367 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#include <matxscript/runtime/container/ndarray_helper.h>
+
+#include <cctype>
+#include <cmath>
+#include <cstdlib>
+#include <cstring>
+#include <limits>
+#include <memory>
+#include <mutex>
+#include <type_traits>
+#include <unordered_map>
+
+#include <matxscript/runtime/container/dict_ref.h>
+#include <matxscript/runtime/container/ndarray_elementwise.h>
+#include <matxscript/runtime/utf8_util.h>
+
+namespace matxscript {
+namespace runtime {
+namespace {
+
+template <typename T>
+struct ValueType {
+  using type = T;
+};
+
+template <>
+struct ValueType<Half> {
+  using type = float;
+};
+
+// the accumulator of a sum
+template <typename T>
+struct SumType {
+  using type = typename std::conditional<std::is_integral<T>::value, int64_t, double>::type;
+};
+
+// the float type a math function is computed in
+template <typename T>
+struct MathType {
+  using type = typename std::conditional<std::is_same<T, double>::value, double, float>::type;
+};
+
+// the dtype of a float result, the ints are computed in float32 like Div
+DataType FloatDType(const DataType& dt) {
+  if (dt.is_float()) {
+    return dt;
+  }
+  return DataType(String2DLDataType("float32"));
+}
+
+DataType SumDType(const DataType& dt) {
+  if (dt.is_float()) {
+    return dt;
+  }
+  return DataType(String2DLDataType("int64"));
+}
+
+template <typename T>
+RTValue ToRTValue(T v, std::true_type) {
+  return RTValue(static_cast<int64_t>(v));
+}
+
+template <typename T>
+RTValue ToRTValue(T v, std::false_type) {
+  return RTValue(static_cast<double>(v));
+}
+
+template <typename T>
+RTValue ToRTValue(T v) {
+  return ToRTValue(v, std::is_integral<T>());
+}
+
+std::vector<int64_t> StridesOf(const NDArray& nd) {
+  return std::vector<int64_t>(nd.GetStridesPtr(), nd.GetStridesPtr() + nd.GetDim());
+}
+
+// a one-element NDArray holding a number, which broadcasts like a scalar
+NDArray ScalarArray(const Any& num, const DataType& dt, int ndim) {
+  NDArray ret = NDArray::Empty(std::vector<int64_t>(ndim, 1), dt, NDArrayHelper::GetCPUDevice());
+  MATX_NDARRAY_TYPE_SWITCH(dt, DType, {
+    DType* data = elementwise::DataPtr<DType>(ret);
+    if (num.type_code() == TypeIndex::kRuntimeInteger) {
+      *data = static_cast<DType>(num.As<int64_t>());
+    } else {
+      *data = static_cast<DType>(num.As<double>());
+    }
+  });
+  return ret;
+}
+
+bool IsNumber(const Any& v) {
+  return v.type_code() == TypeIndex::kRuntimeInteger || v.type_code() == TypeIndex::kRuntimeFloat;
+}
+
+/******************************************************************************
+ * reductions
+ *****************************************************************************/
+
+struct SumReduce {
+  template <typename A>
+  MATXSCRIPT_ALWAYS_INLINE static A Combine(A acc, A v) {
+    return acc + v;
+  }
+};
+
+// nan wins, like numpy
+struct MaxReduce {
+  template <typename A>
+  MATXSCRIPT_ALWAYS_INLINE static A Combine(A acc, A v) {
+    return (v > acc || v != v) ? v : acc;
+  }
+};
+
+struct MinReduce {
+  template <typename A>
+  MATXSCRIPT_ALWAYS_INLINE static A Combine(A acc, A v) {
+    return (v < acc || v != v) ? v : acc;
+  }
+};
+
+// the first nan or the first max wins, like numpy
+struct ArgMaxCompare {
+  template <typename V>
+  MATXSCRIPT_ALWAYS_INLINE static bool Better(V v, V best) {
+    return v > best || (v != v && best == best);
+  }
+};
+
+struct ArgMinCompare {
+  template <typename V>
+  MATXSCRIPT_ALWAYS_INLINE static bool Better(V v, V best) {
+    return v < best || (v != v && best == best);
+  }
+};
+
+template <typename OP, typename A, typename T>
+MATXSCRIPT_ALWAYS_INLINE A ReduceRange(const T* p, int64_t n, int64_t s, A acc) {
+  if (s == 1) {
+    for (int64_t i = 0; i < n; ++i) {
+      acc = OP::Combine(acc, static_cast<A>(p[i]));
+    }
+  } else {
+    for (int64_t i = 0; i < n; ++i) {
+      acc = OP::Combine(acc, static_cast<A>(p[i * s]));
+    }
+  }
+  return acc;
+}
+
+/**
+ * A reduction over all the elements, the flat loop or the rows are split into
+ * ranges, the partial results are combined in order so the result does not depend
+ * on the number of threads. The ranges given by ParallelRange start at multiples of
+ * ceil(total / num_tasks).
+ */
+struct FullReduceLoop {
+  elementwise::LoopNest<1> nest;
+  int64_t inner_len;
+  int64_t total;
+  int64_t num_tasks;
+  int64_t step;
+  bool flat;
+
+  explicit FullReduceLoop(const NDArray& nd)
+      : nest(nd.GetShapePtr(), nd.GetDim(), {nd.GetStridesPtr()}) {
+    inner_len = nest.shape.back();
+    flat = nest.shape.size() == 1;
+    total = flat ? inner_len : nest.numel / inner_len;
+    num_tasks = std::max<int64_t>(1, std::min(elementwise::NumTasks(nest.numel), total));
+    step = (total + num_tasks - 1) / num_tasks;
+  }
+};
+
+template <typename OP, typename A, typename T>
+A ReduceAll(const NDArray& nd, A init) {
+  FullReduceLoop loop(nd);
+  const T* data = elementwise::DataPtr<T>(nd);
+  int64_t s = loop.nest.InnerStrides()[0];
+  std::vector<A> partials(loop.num_tasks, init);
+  elementwise::ParallelRange(loop.total, loop.num_tasks, [&](int64_t begin, int64_t end) {
+    A acc = init;
+    if (loop.flat) {
+      acc = ReduceRange<OP>(data + begin * s, end - begin, s, acc);
+    } else {
+      elementwise::RunRows<1>(
+          loop.nest, begin, end, [&](const std::array<int64_t, 1>& offsets, int64_t n) {
+            acc = ReduceRange<OP>(data + offsets[0], n, s, acc);
+          });
+    }
+    partials[begin / loop.step] = acc;
+  });
+  A acc = partials[0];
+  for (size_t i = 1; i < partials.size(); ++i) {
+    acc = OP::Combine(acc, partials[i]);
+  }
+  return acc;
+}
+
+template <typename CMP, typename T>
+int64_t ArgReduceAll(const NDArray& nd) {
+  using V = typename ValueType<T>::type;
+  FullReduceLoop loop(nd);
+  const T* data = elementwise::DataPtr<T>(nd);
+  int64_t s = loop.nest.InnerStrides()[0];
+  const V first = static_cast<V>(data[0]);
+  std::vector<std::pair<V, int64_t>> partials(loop.num_tasks, std::make_pair(first, 0));
+  elementwise::ParallelRange(loop.total, loop.num_tasks, [&](int64_t begin, int64_t end) {
+    V best = first;
+    int64_t best_i = 0;
+    auto scan = [&](const T* p, int64_t n, int64_t base) {
+      for (int64_t i = 0; i < n; ++i) {
+        V v = static_cast<V>(p[i * s]);
+        if (CMP::Better(v, best)) {
+          best = v;
+          best_i = base + i;
+        }
+      }
+    };
+    if (loop.flat) {
+      scan(data + begin * s, end - begin, begin);
+    } else {
+      int64_t row = begin;
+      elementwise::RunRows<1>(
+          loop.nest, begin, end, [&](const std::array<int64_t, 1>& offsets, int64_t n) {
+            scan(data + offsets[0], n, row * loop.inner_len);
+            ++row;
+          });
+    }
+    partials[begin / loop.step] = std::make_pair(best, best_i);
+  });
+  auto best = partials[0];
+  for (size_t i = 1; i < partials.size(); ++i) {
+    if (CMP::Better(partials[i].first, best.first)) {
+      best = partials[i];
+    }
+  }
+  return best.second;
+}
+
+// the loop over the result of a reduction along one axis
+struct AxisReduceLoop {
+  std::vector<int64_t> shape;
+  std::vector<int64_t> in_strides;
+  std::vector<int64_t> out_strides;
+  int64_t len;
+  int64_t stride;
+
+  AxisReduceLoop(const NDArray& nd, int axis, const NDArray& ret, bool keepdims) {
+    const int64_t* nd_shape = nd.GetShapePtr();
+    const int64_t* nd_strides = nd.GetStridesPtr();
+    const int64_t* ret_strides = ret.GetStridesPtr();
+    for (int d = 0; d < nd.GetDim(); ++d) {
+      if (d == axis) {
+        continue;
+      }
+      shape.push_back(nd_shape[d]);
+      in_strides.push_back(nd_strides[d]);
+      out_strides.push_back(ret_strides[keepdims || d < axis ? d : d - 1]);
+    }
+    len = nd_shape[axis];
+    stride = nd_strides[axis];
+  }
+
+  elementwise::LoopNest<2> Nest() const {
+    return elementwise::LoopNest<2>(
+        shape.data(), shape.size(), {out_strides.data(), in_strides.data()});
+  }
+};
+
+/**
+ * When the axis is the innermost, every output element is a strided reduction,
+ * otherwise the rows of the input are accumulated into a row buffer, which keeps
+ * the loads contiguous.
+ */
+template <typename OP, typename A, typename DType, typename T>
+void ReduceAxisKernel(
+    const NDArray& nd, const AxisReduceLoop& loop, const NDArray& ret, A init, bool mean) {
+  const T* src = elementwise::DataPtr<T>(nd);
+  DType* dst = elementwise::DataPtr<DType>(ret);
+  auto nest = loop.Nest();
+  auto& st = nest.InnerStrides();
+  const int64_t len = loop.len;
+  const int64_t as = loop.stride;
+  auto write = [mean, len](A acc) -> DType {
+    if (mean) {
+      return static_cast<DType>(static_cast<double>(acc) / static_cast<double>(len));
+    }
+    return static_cast<DType>(acc);
+  };
+  if (st[1] == 0 || std::abs(as) <= std::abs(st[1])) {
+    elementwise::Run<2>(
+        nest,
+        [&](const std::array<int64_t, 2>& offsets, int64_t n) {
+          DType* d = dst + offsets[0];
+          const T* s = src + offsets[1];
+          for (int64_t j = 0; j < n; ++j) {
+            d[j * st[0]] = write(ReduceRange<OP>(s + j * st[1], len, as, init));
+          }
+        },
+        nest.numel * len);
+  } else {
+    elementwise::Run<2>(
+        nest,
+        [&](const std::array<int64_t, 2>& offsets, int64_t n) {
+          static thread_local std::vector<A> row;
+          row.assign(n, init);
+          A* acc = row.data();
+          const T* s = src + offsets[1];
+          const int64_t is = st[1];
+          for (int64_t k = 0; k < len; ++k) {
+            const T* p = s + k * as;
+            if (is == 1) {
+              MATX_ELEMENTWISE_VECTORIZE
+              for (int64_t j = 0; j < n; ++j) {
+                acc[j] = OP::Combine(acc[j], static_cast<A>(p[j]));
+              }
+            } else {
+              for (int64_t j = 0; j < n; ++j) {
+                acc[j] = OP::Combine(acc[j], static_cast<A>(p[j * is]));
+              }
+            }
+          }
+          DType* d = dst + offsets[0];
+          for (int64_t j = 0; j < n; ++j) {
+            d[j * st[0]] = write(acc[j]);
+          }
+        },
+        nest.numel * len);
+  }
+}
+
+template <typename CMP, typename T>
+void ArgReduceAxisKernel(const NDArray& nd, const AxisReduceLoop& loop, const NDArray& ret) {
+  using V = typename ValueType<T>::type;
+  const T* src = elementwise::DataPtr<T>(nd);
+  int64_t* dst = elementwise::DataPtr<int64_t>(ret);
+  auto nest = loop.Nest();
+  auto& st = nest.InnerStrides();
+  const int64_t len = loop.len;
+  const int64_t as = loop.stride;
+  elementwise::Run<2>(
+      nest,
+      [&](const std::array<int64_t, 2>& offsets, int64_t n) {
+        int64_t* d = dst + offsets[0];
+        const T* s = src + offsets[1];
+        for (int64_t j = 0; j < n; ++j) {
+          const T* p = s + j * st[1];
+          V best = static_cast<V>(p[0]);
+          int64_t best_k = 0;
+          for (int64_t k = 1; k < len; ++k) {
+            V v = static_cast<V>(p[k * as]);
+            if (CMP::Better(v, best)) {
+              best = v;
+              best_k = k;
+            }
+          }
+          d[j * st[0]] = best_k;
+        }
+      },
+      nest.numel * len);
+}
+
+// the identity of max, -LowestValue is the identity of min
+template <typename V>
+V LowestValue() {
+  return std::numeric_limits<V>::has_infinity ? -std::numeric_limits<V>::infinity()
+                                              : std::numeric_limits<V>::lowest();
+}
+
+enum class ReduceKind { kSum, kMean, kMax, kMin, kArgMax, kArgMin };
+
+const char* ReduceName(ReduceKind kind) {
+  switch (kind) {
+    case ReduceKind::kSum:
+      return "sum";
+    case ReduceKind::kMean:
+      return "mean";
+    case ReduceKind::kMax:
+      return "max";
+    case ReduceKind::kMin:
+      return "min";
+    case ReduceKind::kArgMax:
+      return "argmax";
+    default:
+      return "argmin";
+  }
+}
+
+DataType ReduceDType(ReduceKind kind, const DataType& dt) {
+  switch (kind) {
+    case ReduceKind::kSum:
+      return SumDType(dt);
+    case ReduceKind::kMean:
+      return FloatDType(dt);
+    case ReduceKind::kArgMax:
+    case ReduceKind::kArgMin:
+      return DataType(String2DLDataType("int64"));
+    default:
+      return dt;
+  }
+}
+
+RTValue ReduceAllValue(const NDArray& nd, ReduceKind kind) {
+  int64_t numel = NDArrayHelper::GetItemNum(nd.GetShapePtr(), nd.GetDim());
+  if (numel == 0) {
+    MXCHECK(kind == ReduceKind::kSum || kind == ReduceKind::kMean)
+        << "matx.array." << ReduceName(kind) << ": zero-size array has no identity";
+    if (kind == ReduceKind::kMean) {
+      return RTValue(std::numeric_limits<double>::quiet_NaN());
+    }
+    return nd.DataType().is_float() ? RTValue(0.0) : RTValue(int64_t(0));
+  }
+  RTValue ret;
+  MATX_NDARRAY_TYPE_SWITCH(nd.DataType(), T, {
+    using A = typename SumType<T>::type;
+    using V = typename ValueType<T>::type;
+    const V first = static_cast<V>(*elementwise::DataPtr<T>(nd));
+    switch (kind) {
+      case ReduceKind::kSum: {
+        ret = ToRTValue(ReduceAll<SumReduce, A, T>(nd, A(0)));
+      } break;
+      case ReduceKind::kMean: {
+        ret = RTValue(static_cast<double>(ReduceAll<SumReduce, A, T>(nd, A(0))) /
+                      static_cast<double>(numel));
+      } break;
+      case ReduceKind::kMax: {
+        ret = ToRTValue(ReduceAll<MaxReduce, V, T>(nd, first));
+      } break;
+      case ReduceKind::kMin: {
+        ret = ToRTValue(ReduceAll<MinReduce, V, T>(nd, first));
+      } break;
+      case ReduceKind::kArgMax: {
+        ret = RTValue(ArgReduceAll<ArgMaxCompare, T>(nd));
+      } break;
+      case ReduceKind::kArgMin: {
+        ret = RTValue(ArgReduceAll<ArgMinCompare, T>(nd));
+      } break;
+    }
+  });
+  return ret;
+}
+
+void ReduceAxis(const NDArray& nd, ReduceKind kind, int axis, const NDArray& ret, bool keepdims) {
+  AxisReduceLoop loop(nd, axis, ret, keepdims);
+  if (loop.len == 0) {
+    MXCHECK(kind == ReduceKind::kSum || kind == ReduceKind::kMean)
+        << "matx.array." << ReduceName(kind) << ": zero-size axis has no identity";
+  }
+  MATX_NDARRAY_TYPE_SWITCH(nd.DataType(), T, {
+    using A = typename SumType<T>::type;
+    using V = typename ValueType<T>::type;
+    switch (kind) {
+      case ReduceKind::kSum: {
+        MATX_NDARRAY_TYPE_SWITCH(ret.DataType(), DType, {
+          ReduceAxisKernel<SumReduce, A, DType, T>(nd, loop, ret, A(0), false);
+        });
+      } break;
+      case ReduceKind::kMean: {
+        MATX_NDARRAY_TYPE_SWITCH(ret.DataType(), DType, {
+          ReduceAxisKernel<SumReduce, A, DType, T>(nd, loop, ret, A(0), true);
+        });
+      } break;
+      case ReduceKind::kMax: {
+        ReduceAxisKernel<MaxReduce, V, T, T>(nd, loop, ret, LowestValue<V>(), false);
+      } break;
+      case ReduceKind::kMin: {
+        ReduceAxisKernel<MinReduce, V, T, T>(nd, loop, ret, -LowestValue<V>(), false);
+      } break;
+      case ReduceKind::kArgMax: {
+        ArgReduceAxisKernel<ArgMaxCompare, T>(nd, loop, ret);
+      } break;
+      case ReduceKind::kArgMin: {
+        ArgReduceAxisKernel<ArgMinCompare, T>(nd, loop, ret);
+      } break;
+    }
+  });
+}
+
+RTValue Reduce(const NDArray& nd, ReduceKind kind, const Any& axis, bool keepdims) {
+  MXCHECK(nd->device.device_type == kDLCPU)
+      << "matx.array." << ReduceName(kind) << ": only cpu NDArray is supported";
+  int ndim = nd.GetDim();
+  DataType dt = ReduceDType(kind, nd.DataType());
+  if (axis.is_nullptr()) {
+    RTValue value = ReduceAllValue(nd, kind);
+    if (!keepdims) {
+      return value;
+    }
+    return ScalarArray(value, dt, ndim);
+  }
+  MXCHECK(axis.type_code() == TypeIndex::kRuntimeInteger)
+      << "matx.array." << ReduceName(kind) << ": axis must be int or None, but get "
+      << axis.type_name();
+  int64_t ax = axis.As<int64_t>();
+  if (ax < 0) {
+    ax += ndim;
+  }
+  MXCHECK(ax >= 0 && ax < ndim) << "matx.array." << ReduceName(kind) << ": axis "
+                                << axis.As<int64_t>() << " is out of bounds for " << ndim
+                                << "-dim NDArray";
+  if (ndim == 1 && !keepdims) {
+    return ReduceAllValue(nd, kind);
+  }
+  std::vector<int64_t> shape = nd.Shape();
+  if (keepdims) {
+    shape[ax] = 1;
+  } else {
+    shape.erase(shape.begin() + ax);
+  }
+  NDArray ret = NDArray::Empty(shape, dt, NDArrayHelper::GetCPUDevice());
+  ReduceAxis(nd, kind, static_cast<int>(ax), ret, keepdims);
+  return ret;
+}
+
+/******************************************************************************
+ * unary math
+ *****************************************************************************/
+
+struct ExpFunc {
+  template <typename V>
+  MATXSCRIPT_ALWAYS_INLINE static V Apply(V x) {
+    return std::exp(x);
+  }
+};
+
+struct LogFunc {
+  template <typename V>
+  MATXSCRIPT_ALWAYS_INLINE static V Apply(V x) {
+    return std::log(x);
+  }
+};
+
+struct SqrtFunc {
+  template <typename V>
+  MATXSCRIPT_ALWAYS_INLINE static V Apply(V x) {
+    return std::sqrt(x);
+  }
+};
+
+template <typename DType, typename SType, typename FUNC>
+void UnaryKernel(const NDArray& dst, const NDArray& src, const FUNC& func) {
+  std::vector<int64_t> src_strides = StridesOf(src);
+  elementwise::LoopNest<2> nest(
+      src.GetShapePtr(), src.GetDim(), {dst.GetStridesPtr(), src_strides.data()});
+  DType* dst_data = elementwise::DataPtr<DType>(dst);
+  const SType* src_data = elementwise::DataPtr<SType>(src);
+  auto& st = nest.InnerStrides();
+  elementwise::Run<2>(nest, [&](const std::array<int64_t, 2>& offsets, int64_t n) {
+    elementwise::UnaryInner<DType, SType>(
+        dst_data + offsets[0], src_data + offsets[1], n, st[0], st[1], func);
+  });
+}
+
+NDArray PrepareUnaryOutput(const NDArray& nd,
+                           const DataType& dt,
+                           const NDArray* out,
+                           const char* func_name) {
+  MXCHECK(nd->device.device_type == kDLCPU) << func_name << ": only cpu NDArray is supported";
+  NDArray ret = elementwise::PrepareOutput(nd.Shape(), dt, NDArrayHelper::GetCPUDevice(), out);
+  elementwise::CheckNoPartialOverlap(ret, nd, StridesOf(nd));
+  return ret;
+}
+
+template <typename FUNC>
+NDArray unary_float(const NDArray& nd, const NDArray* out, const char* func_name) {
+  NDArray ret = PrepareUnaryOutput(nd, FloatDType(nd.DataType()), out, func_name);
+  MATX_NDARRAY_TYPE_SWITCH(ret.DataType(), DType, {
+    using CT = typename MathType<DType>::type;
+    MATX_NDARRAY_TYPE_SWITCH(nd.DataType(), SType, {
+      UnaryKernel<DType, SType>(ret, nd, [](SType x) -> DType {
+        return static_cast<DType>(FUNC::Apply(static_cast<CT>(x)));
+      });
+    });
+  });
+  return ret;
+}
+
+template <typename V>
+V ClipBound(double v, std::true_type) {
+  if (v <= static_cast<double>(std::numeric_limits<V>::lowest())) {
+    return std::numeric_limits<V>::lowest();
+  }
+  if (v >= static_cast<double>(std::numeric_limits<V>::max())) {
+    return std::numeric_limits<V>::max();
+  }
+  return static_cast<V>(v);
+}
+
+template <typename V>
+V ClipBound(double v, std::false_type) {
+  return static_cast<V>(v);
+}
+
+// integer results are rounded to nearest and saturated, like cv::Mat::convertTo
+template <typename DType, typename CT>
+MATXSCRIPT_ALWAYS_INLINE DType SaturateCast(CT v, std::true_type) {
+  if (v != v) {
+    return 0;
+  }
+  v = std::nearbyint(v);
+  if (v <= static_cast<CT>(std::numeric_limits<DType>::lowest())) {
+    return std::numeric_limits<DType>::lowest();
+  }
+  if (v >= static_cast<CT>(std::numeric_limits<DType>::max())) {
+    return std::numeric_limits<DType>::max();
+  }
+  return static_cast<DType>(v);
+}
+
+template <typename DType, typename CT>
+MATXSCRIPT_ALWAYS_INLINE DType SaturateCast(CT v, std::false_type) {
+  return static_cast<DType>(v);
+}
+
+template <typename T>
+struct IsWide {
+  static constexpr bool value =
+      std::is_same<T, double>::value || (std::is_integral<T>::value && sizeof(T) >= 4);
+};
+
+/******************************************************************************
+ * one-pass expression evaluator
+ *
+ * The expression is compiled to a list of instructions, instruction i writes the
+ * register i, which is a block of kExprBlock values. The loop nest over the
+ * broadcast shape is walked block by block, every block of the inputs is loaded
+ * once and the registers stay in cache, so no temporary NDArray is made.
+ *****************************************************************************/
+
+static constexpr int64_t kExprBlock = 256;
+static constexpr int kExprMaxArrays = 15;
+static constexpr size_t kExprCacheSize = 256;
+
+enum class ExprOp : int8_t {
+  kLoad,
+  kConst,
+  kNeg,
+  kAdd,
+  kSub,
+  kMul,
+  kDiv,
+  kPow,
+  kLt,
+  kLe,
+  kGt,
+  kGe,
+  kEq,
+  kNe,
+  kMin,
+  kMax,
+  kExp,
+  kLog,
+  kSqrt,
+  kAbs,
+  kTanh,
+  kWhere,
+};
+
+struct ExprInstr {
+  ExprOp op;
+  int a = -1;
+  int b = -1;
+  int c = -1;
+  // the value of kConst, the operand index of kLoad
+  double value = 0;
+  int operand = -1;
+};
+
+struct ExprProgram {
+  std::vector<ExprInstr> instrs;
+  std::vector<std::string> names;
+};
+
+using ExprProgramPtr = std::shared_ptr<const ExprProgram>;
+
+class ExprParser {
+ public:
+  explicit ExprParser(string_view expr) : s_(expr) {
+  }
+
+  ExprProgramPtr Parse() {
+    ParseCompare();
+    SkipSpace();
+    if (pos_ != s_.size()) {
+      Fail("unexpected character");
+    }
+    return std::make_shared<ExprProgram>(std::move(prog_));
+  }
+
+ private:
+  struct FuncInfo {
+    const char* name;
+    ExprOp op;
+    int num_args;
+  };
+
+  void Fail(const char* msg) const {
+    MXTHROW << "matx.array.evaluate: " << msg << " at position " << pos_ << " of '" << s_ << "'";
+  }
+
+  void SkipSpace() {
+    while (pos_ < s_.size() && std::isspace(static_cast<unsigned char>(s_[pos_]))) {
+      ++pos_;
+    }
+  }
+
+  bool Accept(const char* token) {
+    SkipSpace();
+    size_t len = std::strlen(token);
+    if (s_.size() - pos_ >= len && s_.substr(pos_, len) == string_view(token, len)) {
+      pos_ += len;
+      return true;
+    }
+    return false;
+  }
+
+  void Expect(const char* token) {
+    if (!Accept(token)) {
+      Fail("syntax error");
+    }
+  }
+
+  int Emit(ExprOp op, int a = -1, int b = -1, int c = -1) {
+    ExprInstr ins;
+    ins.op = op;
+    ins.a = a;
+    ins.b = b;
+    ins.c = c;
+    prog_.instrs.push_back(ins);
+    return static_cast<int>(prog_.instrs.size()) - 1;
+  }
+
+  int ParseCompare() {
+    int lhs = ParseAdd();
+    static const std::pair<const char*, ExprOp> cmp_ops[] = {{"<=", ExprOp::kLe},
+                                                             {">=", ExprOp::kGe},
+                                                             {"==", ExprOp::kEq},
+                                                             {"!=", ExprOp::kNe},
+                                                             {"<", ExprOp::kLt},
+                                                             {">", ExprOp::kGt}};
+    for (auto& cmp : cmp_ops) {
+      if (Accept(cmp.first)) {
+        return Emit(cmp.second, lhs, ParseAdd());
+      }
+    }
+    return lhs;
+  }
+
+  int ParseAdd() {
+    int lhs = ParseMul();
+    while (true) {
+      if (Accept("+")) {
+        lhs = Emit(ExprOp::kAdd, lhs, ParseMul());
+      } else if (Accept("-")) {
+        lhs = Emit(ExprOp::kSub, lhs, ParseMul());
+      } else {
+        return lhs;
+      }
+    }
+  }
+
+  int ParseMul() {
+    int lhs = ParseUnary();
+    while (true) {
+      SkipSpace();
+      if (s_.substr(pos_, 2) == "**") {
+        return lhs;
+      }
+      if (Accept("*")) {
+        lhs = Emit(ExprOp::kMul, lhs, ParseUnary());
+      } else if (Accept("/")) {
+        lhs = Emit(ExprOp::kDiv, lhs, ParseUnary());
+      } else {
+        return lhs;
+      }
+    }
+  }
+
+  int ParseUnary() {
+    if (Accept("-")) {
+      return Emit(ExprOp::kNeg, ParseUnary());
+    }
+    if (Accept("+")) {
+      return ParseUnary();
+    }
+    return ParsePower();
+  }
+
+  // ** binds tighter than a unary minus on its left and is right associative
+  int ParsePower() {
+    int base = ParsePrimary();
+    if (Accept("**")) {
+      return Emit(ExprOp::kPow, base, ParseUnary());
+    }
+    return base;
+  }
+
+  int ParsePrimary() {
+    SkipSpace();
+    if (pos_ >= s_.size()) {
+      Fail("unexpected end");
+    }
+    char ch = s_[pos_];
+    if (Accept("(")) {
+      int ret = ParseCompare();
+      Expect(")");
+      return ret;
+    }
+    if (std::isdigit(static_cast<unsigned char>(ch)) || ch == '.') {
+      return ParseNumber();
+    }
+    if (std::isalpha(static_cast<unsigned char>(ch)) || ch == '_') {
+      size_t begin = pos_;
+      while (pos_ < s_.size() &&
+             (std::isalnum(static_cast<unsigned char>(s_[pos_])) || s_[pos_] == '_')) {
+        ++pos_;
+      }
+      std::string name(s_.data() + begin, pos_ - begin);
+      if (Accept("(")) {
+        return ParseCall(name);
+      }
+      return Load(name);
+    }
+    Fail("unexpected character");
+    return -1;
+  }
+
+  int ParseNumber() {
+    std::string num(s_.data() + pos_, s_.size() - pos_);
+    char* end = nullptr;
+    double value = std::strtod(num.c_str(), &end);
+    if (end == num.c_str()) {
+      Fail("invalid number");
+    }
+    pos_ += end - num.c_str();
+    int ret = Emit(ExprOp::kConst);
+    prog_.instrs[ret].value = value;
+    return ret;
+  }
+
+  int ParseCall(const std::string& name) {
+    static const FuncInfo funcs[] = {{"exp", ExprOp::kExp, 1},
+                                     {"log", ExprOp::kLog, 1},
+                                     {"sqrt", ExprOp::kSqrt, 1},
+                                     {"abs", ExprOp::kAbs, 1},
+                                     {"tanh", ExprOp::kTanh, 1},
+                                     {"min", ExprOp::kMin, 2},
+                                     {"max", ExprOp::kMax, 2},
+                                     {"pow", ExprOp::kPow, 2},
+                                     {"where", ExprOp::kWhere, 3},
+                                     {"clip", ExprOp::kMin, 3}};
+    const FuncInfo* func = nullptr;
+    for (auto& f : funcs) {
+      if (name == f.name) {
+        func = &f;
+        break;
+      }
+    }
+    if (func == nullptr) {
+      Fail("unknown function");
+    }
+    int args[3] = {-1, -1, -1};
+    for (int i = 0; i < func->num_args; ++i) {
+      if (i > 0) {
+        Expect(",");
+      }
+      args[i] = ParseCompare();
+    }
+    Expect(")");
+    if (name == "clip") {
+      // clip(x, lo, hi) is min(max(x, lo), hi)
+      return Emit(ExprOp::kMin, Emit(ExprOp::kMax, args[0], args[1]), args[2]);
+    }
+    return Emit(func->op, args[0], args[1], args[2]);
+  }
+
+  int Load(const std::string& name) {
+    auto it = loads_.find(name);
+    if (it != loads_.end()) {
+      return it->second;
+    }
+    int ret = Emit(ExprOp::kLoad);
+    prog_.instrs[ret].operand = static_cast<int>(prog_.names.size());
+    prog_.names.push_back(name);
+    loads_.emplace(name, ret);
+    return ret;
+  }
+
+  string_view s_;
+  size_t pos_ = 0;
+  ExprProgram prog_;
+  std::unordered_map<std::string, int> loads_;
+};
+
+// the compiled programs are cached by the expression
+ExprProgramPtr GetExprProgram(string_view expr) {
+  static std::mutex mutex;
+  static std::unordered_map<std::string, ExprProgramPtr> cache;
+  std::string key(expr.data(), expr.size());
+  {
+    std::lock_guard<std::mutex> lock(mutex);
+    auto it = cache.find(key);
+    if (it != cache.end()) {
+      return it->second;
+    }
+  }
+  ExprProgramPtr prog = ExprParser(expr).Parse();
+  std::lock_guard<std::mutex> lock(mutex);
+  if (cache.size() >= kExprCacheSize) {
+    cache.clear();
+  }
+  cache.emplace(std::move(key), prog);
+  return prog;
+}
+
+template <typename T, typename CT>
+void LoadBlock(const char* data, int64_t stride, int64_t n, CT* dst) {
+  const T* p = reinterpret_cast<const T*>(data);
+  if (stride == 1) {
+    MATX_ELEMENTWISE_VECTORIZE
+    for (int64_t i = 0; i < n; ++i) {
+      dst[i] = static_cast<CT>(p[i]);
+    }
+  } else if (stride == 0) {
+    const CT v = static_cast<CT>(*p);
+    for (int64_t i = 0; i < n; ++i) {
+      dst[i] = v;
+    }
+  } else {
+    for (int64_t i = 0; i < n; ++i) {
+      dst[i] = static_cast<CT>(p[i * stride]);
+    }
+  }
+}
+
+template <typename T, typename CT>
+void StoreBlock(const CT* src, int64_t n, char* data, int64_t stride) {
+  T* p = reinterpret_cast<T*>(data);
+  if (stride == 1) {
+    MATX_ELEMENTWISE_VECTORIZE
+    for (int64_t i = 0; i < n; ++i) {
+      p[i] = static_cast<T>(src[i]);
+    }
+  } else {
+    for (int64_t i = 0; i < n; ++i) {
+      p[i * stride] = static_cast<T>(src[i]);
+    }
+  }
+}
+
+template <typename CT>
+void ExecBlock(const std::vector<ExprInstr>& instrs, CT* regs, int64_t m) {
+  for (size_t i = 0; i < instrs.size(); ++i) {
+    const ExprInstr& ins = instrs[i];
+    CT* d = regs + i * kExprBlock;
+    const CT* a = ins.a >= 0 ? regs + ins.a * kExprBlock : nullptr;
+    const CT* b = ins.b >= 0 ? regs + ins.b * kExprBlock : nullptr;
+    const CT* c = ins.c >= 0 ? regs + ins.c * kExprBlock : nullptr;
+#define MATX_EXPR_LOOP(EXPR)          \
+  {                                   \
+    MATX_ELEMENTWISE_VECTORIZE        \
+    for (int64_t j = 0; j < m; ++j) { \
+      d[j] = (EXPR);                  \
+    }                                 \
+  }                                   \
+  break
+    switch (ins.op) {
+      case ExprOp::kLoad:
+      case ExprOp::kConst:
+        // filled by the caller
+        break;
+      case ExprOp::kNeg:
+        MATX_EXPR_LOOP(-a[j]);
+      case ExprOp::kAdd:
+        MATX_EXPR_LOOP(a[j] + b[j]);
+      case ExprOp::kSub:
+        MATX_EXPR_LOOP(a[j] - b[j]);
+      case ExprOp::kMul:
+        MATX_EXPR_LOOP(a[j] * b[j]);
+      case ExprOp::kDiv:
+        MATX_EXPR_LOOP(a[j] / b[j]);
+      case ExprOp::kPow:
+        MATX_EXPR_LOOP(std::pow(a[j], b[j]));
+      case ExprOp::kLt:
+        MATX_EXPR_LOOP(a[j] < b[j] ? CT(1) : CT(0));
+      case ExprOp::kLe:
+        MATX_EXPR_LOOP(a[j] <= b[j] ? CT(1) : CT(0));
+      case ExprOp::kGt:
+        MATX_EXPR_LOOP(a[j] > b[j] ? CT(1) : CT(0));
+      case ExprOp::kGe:
+        MATX_EXPR_LOOP(a[j] >= b[j] ? CT(1) : CT(0));
+      case ExprOp::kEq:
+        MATX_EXPR_LOOP(a[j] == b[j] ? CT(1) : CT(0));
+      case ExprOp::kNe:
+        MATX_EXPR_LOOP(a[j] != b[j] ? CT(1) : CT(0));
+      case ExprOp::kMin:
+        MATX_EXPR_LOOP(b[j] < a[j] ? b[j] : a[j]);
+      case ExprOp::kMax:
+        MATX_EXPR_LOOP(b[j] > a[j] ? b[j] : a[j]);
+      case ExprOp::kExp:
+        MATX_EXPR_LOOP(std::exp(a[j]));
+      case ExprOp::kLog:
+        MATX_EXPR_LOOP(std::log(a[j]));
+      case ExprOp::kSqrt:
+        MATX_EXPR_LOOP(std::sqrt(a[j]));
+      case ExprOp::kAbs:
+        MATX_EXPR_LOOP(std::abs(a[j]));
+      case ExprOp::kTanh:
+        MATX_EXPR_LOOP(std::tanh(a[j]));
+      case ExprOp::kWhere:
+        MATX_EXPR_LOOP(a[j] != CT(0) ? b[j] : c[j]);
+    }
+#undef MATX_EXPR_LOOP
+  }
+}
+
+struct ExprArray {
+  const char* data;
+  int64_t itemsize;
+  DataType dtype;
+};
+
+template <typename CT>
+void RunProgram(const std::vector<ExprInstr>& instrs,
+                const std::vector<ExprArray>& arrays,
+                const std::vector<int>& load_slots,
+                const elementwise::LoopNest<kExprMaxArrays + 1>& nest,
+                const NDArray& ret) {
+  using LoadFn = void (*)(const char*, int64_t, int64_t, CT*);
+  using StoreFn = void (*)(const CT*, int64_t, char*, int64_t);
+  std::vector<LoadFn> loads(arrays.size(), nullptr);
+  for (size_t k = 0; k < arrays.size(); ++k) {
+    MATX_NDARRAY_TYPE_SWITCH(arrays[k].dtype, T, { loads[k] = &LoadBlock<T, CT>; });
+  }
+  StoreFn store = nullptr;
+  MATX_NDARRAY_TYPE_SWITCH(ret.DataType(), T, { store = &StoreBlock<T, CT>; });
+  char* dst = static_cast<char*>(ret->data) + ret->byte_offset;
+  const int64_t dst_itemsize = ret.DataType().bytes();
+  const int result = static_cast<int>(instrs.size()) - 1;
+  auto& st = nest.InnerStrides();
+  elementwise::Run<kExprMaxArrays + 1>(
+      nest, [&](const std::array<int64_t, kExprMaxArrays + 1>& offsets, int64_t n) {
+        static thread_local std::vector<CT> regs_buffer;
+        regs_buffer.resize(instrs.size() * kExprBlock);
+        CT* regs = regs_buffer.data();
+        int64_t first_m = std::min(n, kExprBlock);
+        for (size_t i = 0; i < instrs.size(); ++i) {
+          if (instrs[i].op == ExprOp::kConst) {
+            std::fill(regs + i * kExprBlock, regs + i * kExprBlock + first_m, instrs[i].value);
+          }
+        }
+        for (int64_t begin = 0; begin < n; begin += kExprBlock) {
+          int64_t m = std::min(n - begin, kExprBlock);
+          for (size_t i = 0; i < instrs.size(); ++i) {
+            if (instrs[i].op == ExprOp::kLoad) {
+              int k = load_slots[i];
+              const ExprArray& arr = arrays[k];
+              loads[k](arr.data + (offsets[k + 1] + begin * st[k + 1]) * arr.itemsize,
+                       st[k + 1],
+                       m,
+                       regs + i * kExprBlock);
+            }
+          }
+          ExecBlock<CT>(instrs, regs, m);
+          store(regs + result * kExprBlock,
+                m,
+                dst + (offsets[0] + begin * st[0]) * dst_itemsize,
+                st[0]);
+        }
+      });
+}
+
+RTValue LookupOperand(const Dict& operands, const std::string& name) {
+  string_view key(name.data(), name.size());
+  Unicode ukey = UTF8Decode(key);
+  if (operands.contains(ukey.view())) {
+    return operands.get_item(ukey.view());
+  }
+  if (operands.contains(key)) {
+    return operands.get_item(key);
+  }
+  MXTHROW << "matx.array.evaluate: operand '" << name << "' is not given";
+  return None;
+}
+
+}  // namespace
+
+/******************************************************************************
+ * reductions and math
+ *****************************************************************************/
+
+RTValue NDArrayOperate::Sum(const NDArray& nd, const Any& axis, bool keepdims) {
+  return Reduce(nd, ReduceKind::kSum, axis, keepdims);
+}
+
+RTValue NDArrayOperate::Mean(const NDArray& nd, const Any& axis, bool keepdims) {
+  return Reduce(nd, ReduceKind::kMean, axis, keepdims);
+}
+
+RTValue NDArrayOperate::Max(const NDArray& nd, const Any& axis, bool keepdims) {
+  return Reduce(nd, ReduceKind::kMax, axis, keepdims);
+}
+
+RTValue NDArrayOperate::Min(const NDArray& nd, const Any& axis, bool keepdims) {
+  return Reduce(nd, ReduceKind::kMin, axis, keepdims);
+}
+
+RTValue NDArrayOperate::ArgMax(const NDArray& nd, const Any& axis, bool keepdims) {
+  return Reduce(nd, ReduceKind::kArgMax, axis, keepdims);
+}
+
+RTValue NDArrayOperate::ArgMin(const NDArray& nd, const Any& axis, bool keepdims) {
+  return Reduce(nd, ReduceKind::kArgMin, axis, keepdims);
+}
+
+NDArray NDArrayOperate::Exp(const NDArray& nd, const NDArray* out) {
+  return unary_float<ExpFunc>(nd, out, "matx.array.exp");
+}
+
+NDArray NDArrayOperate::Log(const NDArray& nd, const NDArray* out) {
+  return unary_float<LogFunc>(nd, out, "matx.array.log");
+}
+
+NDArray NDArrayOperate::Sqrt(const NDArray& nd, const NDArray* out) {
+  return unary_float<SqrtFunc>(nd, out, "matx.array.sqrt");
+}
+
+NDArray NDArrayOperate::Abs(const NDArray& nd, const NDArray* out) {
+  NDArray ret = PrepareUnaryOutput(nd, nd.DataType(), out, "matx.array.abs");
+  MATX_NDARRAY_TYPE_SWITCH(nd.DataType(), DType, {
+    using V = typename ValueType<DType>::type;
+    UnaryKernel<DType, DType>(ret, nd, [](DType x) -> DType {
+      V v = static_cast<V>(x);
+      return static_cast<DType>(v < V(0) ? -v : v);
+    });
+  });
+  return ret;
+}
+
+NDArray NDArrayOperate::Clip(const NDArray& nd, const Any& lo, const Any& hi, const NDArray* out) {
+  MXCHECK(lo.is_nullptr() || IsNumber(lo)) << "matx.array.clip: lo must be number or None";
+  MXCHECK(hi.is_nullptr() || IsNumber(hi)) << "matx.array.clip: hi must be number or None";
+  double lo_v = lo.is_nullptr() ? -std::numeric_limits<double>::infinity() : lo.As<double>();
+  double hi_v = hi.is_nullptr() ? std::numeric_limits<double>::infinity() : hi.As<double>();
+  NDArray ret = PrepareUnaryOutput(nd, nd.DataType(), out, "matx.array.clip");
+  MATX_NDARRAY_TYPE_SWITCH(nd.DataType(), DType, {
+    using V = typename ValueType<DType>::type;
+    const V lo_b = ClipBound<V>(lo_v, std::is_integral<V>());
+    const V hi_b = ClipBound<V>(hi_v, std::is_integral<V>());
+    UnaryKernel<DType, DType>(ret, nd, [lo_b, hi_b](DType x) -> DType {
+      V v = static_cast<V>(x);
+      v = v < lo_b ? lo_b : v;
+      return static_cast<DType>(v > hi_b ? hi_b : v);
+    });
+  });
+  return ret;
+}
+
+NDArray NDArrayOperate::CastScale(
+    const NDArray& nd, const DataType& dtype, double scale, double shift, const NDArray* out) {
+  NDArray ret = PrepareUnaryOutput(nd, dtype, out, "matx.array.cast_scale");
+  MATX_NDARRAY_TYPE_SWITCH(dtype, DType, {
+    MATX_NDARRAY_TYPE_SWITCH(nd.DataType(), SType, {
+      using CT = typename std::
+          conditional<IsWide<DType>::value || IsWide<SType>::value, double, float>::type;
+      const CT scale_c = static_cast<CT>(scale);
+      const CT shift_c = static_cast<CT>(shift);
+      UnaryKernel<DType, SType>(ret, nd, [scale_c, shift_c](SType x) -> DType {
+        return SaturateCast<DType>(static_cast<CT>(x) * scale_c + shift_c,
+                                   std::is_integral<DType>());
+      });
+    });
+  });
+  return ret;
+}
+
+NDArray NDArrayOperate::Where(const Any& cond, const Any& x, const Any& y) {
+  MXCHECK(cond.type_code() == TypeIndex::kRuntimeNDArray)
+      << "matx.array.where: cond must be NDArray, but get " << cond.type_name();
+  MXCHECK(x.type_code() == TypeIndex::kRuntimeNDArray || IsNumber(x))
+      << "matx.array.where: x must be NDArray or number, but get " << x.type_name();
+  MXCHECK(y.type_code() == TypeIndex::kRuntimeNDArray || IsNumber(y))
+      << "matx.array.where: y must be NDArray or number, but get " << y.type_name();
+  NDArray cond_nd = cond.As<NDArray>();
+  MXCHECK(cond_nd->device.device_type == kDLCPU)
+      << "matx.array.where: only cpu NDArray is supported";
+  // the result dtype follows the NDArray operands, the numbers only widen int to float
+  auto number_dtype = [](const Any& num, const DataType* base) -> DataType {
+    if (base == nullptr) {
+      return DataType(
+          String2DLDataType(num.type_code() == TypeIndex::kRuntimeInteger ? "int64" : "float64"));
+    }
+    return num.type_code() == TypeIndex::kRuntimeInteger ? *base
+                                                         : NDArrayHelper::DTypeFromDouble(*base);
+  };
+  DataType dt;
+  if (x.type_code() == TypeIndex::kRuntimeNDArray && y.type_code() == TypeIndex::kRuntimeNDArray) {
+    dt = NDArrayHelper::DTypePromotion(x.As<NDArray>().DataType(), y.As<NDArray>().DataType());
+  } else if (x.type_code() == TypeIndex::kRuntimeNDArray) {
+    DataType base = x.As<NDArray>().DataType();
+    dt = number_dtype(y, &base);
+  } else if (y.type_code() == TypeIndex::kRuntimeNDArray) {
+    DataType base = y.As<NDArray>().DataType();
+    dt = number_dtype(x, &base);
+  } else {
+    DataType x_dt = number_dtype(x, nullptr);
+    dt = number_dtype(y, &x_dt);
+  }
+  auto to_array = [&dt](const Any& v) -> NDArray {
+    if (v.type_code() != TypeIndex::kRuntimeNDArray) {
+      return ScalarArray(v, dt, 1);
+    }
+    NDArray nd = v.As<NDArray>();
+    MXCHECK(nd->device.device_type == kDLCPU) << "matx.array.where: only cpu NDArray is supported";
+    // the mixed dtypes are rare, they are converted once instead of instantiating the kernel
+    return nd.DataType() == dt ? nd : nd.as_type(DLDataType2String(dt).decode());
+  };
+  NDArray x_nd = to_array(x);
+  NDArray y_nd = to_array(y);
+  std::vector<int64_t> shape;
+  std::vector<int64_t> xy_shape;
+  if (!NDArrayHelper::GetBroadcastShape(x_nd.Shape(), y_nd.Shape(), xy_shape) ||
+      !NDArrayHelper::GetBroadcastShape(cond_nd.Shape(), xy_shape, shape)) {
+    MXTHROW << "matx.array.where: shape not match";
+  }
+  NDArray ret = NDArray::Empty(shape, dt, NDArrayHelper::GetCPUDevice());
+  std::vector<int64_t> c_strides = elementwise::BroadcastStrides(shape, cond_nd);
+  std::vector<int64_t> x_strides = elementwise::BroadcastStrides(shape, x_nd);
+  std::vector<int64_t> y_strides = elementwise::BroadcastStrides(shape, y_nd);
+  elementwise::LoopNest<4> nest(
+      shape.data(),
+      shape.size(),
+      {ret.GetStridesPtr(), c_strides.data(), x_strides.data(), y_strides.data()});
+  auto& st = nest.InnerStrides();
+  MATX_NDARRAY_TYPE_SWITCH(dt, DType, {
+    MATX_NDARRAY_TYPE_SWITCH(cond_nd.DataType(), CType, {
+      using CV = typename ValueType<CType>::type;
+      DType* d_data = elementwise::DataPtr<DType>(ret);
+      const CType* c_data = elementwise::DataPtr<CType>(cond_nd);
+      const DType* x_data = elementwise::DataPtr<DType>(x_nd);
+      const DType* y_data = elementwise::DataPtr<DType>(y_nd);
+      elementwise::Run<4>(nest, [&](const std::array<int64_t, 4>& offsets, int64_t n) {
+        DType* d = d_data + offsets[0];
+        const CType* c = c_data + offsets[1];
+        const DType* xp = x_data + offsets[2];
+        const DType* yp = y_data + offsets[3];
+        if (st[0] == 1 && st[1] == 1 && st[2] == 1 && st[3] == 1) {
+          MATX_ELEMENTWISE_VECTORIZE
+          for (int64_t i = 0; i < n; ++i) {
+            d[i] = static_cast<CV>(c[i]) != CV(0) ? xp[i] : yp[i];
+          }
+        } else {
+          for (int64_t i = 0; i < n; ++i) {
+            d[i * st[0]] = static_cast<CV>(c[i * st[1]]) != CV(0) ? xp[i * st[2]] : yp[i * st[3]];
+          }
+        }
+      });
+    });
+  });
+  return ret;
+}
+
+NDArray NDArrayOperate::Evaluate(const string_view& expr,
+                                 const Dict& operands,
+                                 const NDArray* out) {
+  ExprProgramPtr prog = GetExprProgram(expr);
+  std::vector<ExprInstr> instrs = prog->instrs;
+  // bind the operands, the numbers become constants
+  std::vector<NDArray> nds;
+  std::vector<int> slot_of_operand(prog->names.size(), -1);
+  std::vector<double> value_of_operand(prog->names.size(), 0);
+  for (size_t k = 0; k < prog->names.size(); ++k) {
+    RTValue v = LookupOperand(operands, prog->names[k]);
+    if (v.type_code() == TypeIndex::kRuntimeNDArray) {
+      NDArray nd = v.As<NDArray>();
+      MXCHECK(nd->device.device_type == kDLCPU)
+          << "matx.array.evaluate: only cpu NDArray is supported";
+      slot_of_operand[k] = static_cast<int>(nds.size());
+      nds.push_back(std::move(nd));
+    } else {
+      MXCHECK(IsNumber(v)) << "matx.array.evaluate: operand '" << prog->names[k]
+                           << "' must be NDArray or number, but get " << v.type_name();
+      value_of_operand[k] = v.As<double>();
+    }
+  }
+  MXCHECK(!nds.empty()) << "matx.array.evaluate: at least one operand must be NDArray";
+  MXCHECK(nds.size() <= kExprMaxArrays)
+      << "matx.array.evaluate: at most " << kExprMaxArrays << " NDArray operands are supported";
+  std::vector<int> load_slots(instrs.size(), -1);
+  for (size_t i = 0; i < instrs.size(); ++i) {
+    if (instrs[i].op != ExprOp::kLoad) {
+      continue;
+    }
+    int slot = slot_of_operand[instrs[i].operand];
+    if (slot < 0) {
+      instrs[i].op = ExprOp::kConst;
+      instrs[i].value = value_of_operand[instrs[i].operand];
+    } else {
+      load_slots[i] = slot;
+    }
+  }
+
+  std::vector<int64_t> shape = nds[0].Shape();
+  bool any_double = false;
+  for (auto& nd : nds) {
+    std::vector<int64_t> next;
+    if (!NDArrayHelper::GetBroadcastShape(shape, nd.Shape(), next)) {
+      MXTHROW << "matx.array.evaluate: shape not match";
+    }
+    shape.swap(next);
+    any_double |= nd.DataType().is_float() && nd.DataType().bits() == 64;
+  }
+  DataType dt(String2DLDataType(any_double ? "float64" : "float32"));
+  NDArray ret = elementwise::PrepareOutput(
+      shape, out != nullptr && out->defined() ? out->DataType() : dt, nds[0]->device, out);
+
+  std::vector<std::vector<int64_t>> strides;
+  std::vector<ExprArray> arrays;
+  strides.reserve(nds.size());
+  for (auto& nd : nds) {
+    strides.push_back(elementwise::BroadcastStrides(shape, nd));
+    elementwise::CheckNoPartialOverlap(ret, nd, strides.back());
+    arrays.push_back(ExprArray{static_cast<const char*>(nd->data) + nd->byte_offset,
+                               nd.DataType().bytes(),
+                               nd.DataType()});
+  }
+  // the unused operand slots have zero strides, which merge with any dim
+  std::vector<int64_t> zeros(shape.size(), 0);
+  std::array<const int64_t*, kExprMaxArrays + 1> nest_strides;
+  nest_strides.fill(zeros.data());
+  nest_strides[0] = ret.GetStridesPtr();
+  for (size_t k = 0; k < strides.size(); ++k) {
+    nest_strides[k + 1] = strides[k].data();
+  }
+  elementwise::LoopNest<kExprMaxArrays + 1> nest(shape.data(), shape.size(), nest_strides);
+
+  bool compute_double = any_double || (ret.DataType().bits() == 64) ||
+                        (ret.DataType().is_int() && ret.DataType().bits() >= 32);
+  if (compute_double) {
+    RunProgram<double>(instrs, arrays, load_slots, nest, ret);
+  } else {
+    RunProgram<float>(instrs, arrays, load_slots, nest, ret);
+  }
+  return ret;
+}
+
+}  // namespace runtime
+}  // namespace matxscript
@@ -1,5 +1,8 @@
 // Copyright 2022 ByteDance Ltd. and/or its affiliates.
 #include <matxscript/runtime/container/ndarray_helper.h>
+
+#include <matxscript/runtime/container/ndarray_elementwise.h>
+#include <matxscript/runtime/threadpool/lock_based_thread_pool.h>
 #include "matxscript/runtime/runtime_port.h"
 
 namespace matxscript {
@@ -48,103 +51,64 @@ struct RDivOP {
   }
 };
 
-template <typename OP, typename DstDtype, typename LDType, typename RDType>
-void ScalarAssign(DstDtype* dst_data,
-                  const LDType* l_data,
-                  const RDType r,
-                  const int64_t* dst_strides,
-                  const int64_t* l_strides,
-                  const int64_t* shape,
-                  int ndim) {
-  if (ndim == 1) {
-    DstDtype* t = dst_data;
-    for (int64_t i = 0; i < shape[0]; ++i, t += dst_strides[0]) {
-      OP::Map(l_data[i * l_strides[0]], r, t);
-    }
-    return;
-  }
-  for (int64_t i = 0; i < shape[0]; ++i) {
-    ScalarAssign<OP, DstDtype, LDType, RDType>(dst_data + i * dst_strides[0],
-                                               l_data + i * l_strides[0],
-                                               r,
-                                               dst_strides + 1,
-                                               l_strides + 1,
-                                               shape + 1,
-                                               ndim - 1);
-  }
-}
-
-template <typename OP, typename DstDtype, typename LDType, typename RDType>
-void BinaryAssign(DstDtype* dst_data,
-                  const LDType* l_data,
-                  const RDType* r_data,
-                  const int64_t* dst_strides,
-                  const int64_t* l_strides,
-                  const int64_t* r_strides,
-                  const int64_t* shape,
-                  int ndim) {
-  if (ndim == 1) {
-    DstDtype* t = dst_data;
-    for (int64_t i = 0; i < shape[0]; ++i, t += dst_strides[0]) {
-      OP::Map(l_data[i * l_strides[0]], r_data[i * r_strides[0]], t);
-    }
-    return;
-  }
-  for (int64_t i = 0; i < shape[0]; ++i) {
-    BinaryAssign<OP, DstDtype, LDType, RDType>(dst_data + i * dst_strides[0],
-                                               l_data + i * l_strides[0],
-                                               r_data + i * r_strides[0],
-                                               dst_strides + 1,
-                                               l_strides + 1,
-                                               r_strides + 1,
-                                               shape + 1,
-                                               ndim - 1);
-  }
+template <typename OP, typename DType, typename LDType, typename RDType>
+void BinaryKernel(const elementwise::LoopNest<3>& nest,
+                  const NDArray& dst,
+                  const NDArray& lhs,
+                  const NDArray& rhs) {
+  DType* dst_data = elementwise::DataPtr<DType>(dst);
+  const LDType* l_data = elementwise::DataPtr<LDType>(lhs);
+  const RDType* r_data = elementwise::DataPtr<RDType>(rhs);
+  auto& st = nest.InnerStrides();
+  elementwise::Run<3>(nest, [&](const std::array<int64_t, 3>& offsets, int64_t n) {
+    elementwise::BinaryInner<OP, DType, LDType, RDType>(
+        dst_data + offsets[0], l_data + offsets[1], r_data + offsets[2], n, st[0], st[1], st[2]);
+  });
 }
 
-std::vector<int64_t> broadcast_stride(const std::vector<int64_t>& broadcast_shape,
-                                      const int64_t* shape,
-                                      const int64_t* strides,
-                                      int dim) {
-  int bdim = broadcast_shape.size();
-  int delta = bdim - dim;
-  std::vector<int64_t> ret(bdim, 0);
-  for (int i = 0; i < dim; ++i) {
-    if (shape[i] > 1) {
-      ret[i + delta] = strides[i];
-    } else {
-      ret[i + delta] = 0;
-    }
-  }
-  return ret;
+template <typename OP, typename DType, typename LDType, typename SType>
+void ScalarKernel(const elementwise::LoopNest<2>& nest,
+                  const NDArray& dst,
+                  const NDArray& lhs,
+                  SType s) {
+  DType* dst_data = elementwise::DataPtr<DType>(dst);
+  const LDType* l_data = elementwise::DataPtr<LDType>(lhs);
+  auto& st = nest.InnerStrides();
+  elementwise::Run<2>(nest, [&](const std::array<int64_t, 2>& offsets, int64_t n) {
+    elementwise::ScalarInner<OP, DType, LDType, SType>(
+        dst_data + offsets[0], l_data + offsets[1], s, n, st[0], st[1]);
+  });
 }
 
 template <typename OP>
-NDArray broadcast_binary_nd(const NDArray& nd1, const NDArray& nd2, const DataType& data_type) {
+NDArray binary_nd(const NDArray& nd1,
+                  const NDArray& nd2,
+                  const DataType& data_type,
+                  const NDArray* out) {
   std::vector<int64_t> broadcast_shape;
   // TODO: nd.Shape create a new vector, which is not necessary here
   if (!NDArrayHelper::GetBroadcastShape(nd1.Shape(), nd2.Shape(), broadcast_shape)) {
     MXTHROW << "ndarray operator: shape not match";
   }
-  std::vector<int64_t> nd1_strides =
-      broadcast_stride(broadcast_shape, nd1.GetShapePtr(), nd1.GetStridesPtr(), nd1.GetDim());
-  std::vector<int64_t> nd2_strides =
-      broadcast_stride(broadcast_shape, nd2.GetShapePtr(), nd2.GetStridesPtr(), nd2.GetDim());
-  NDArray ret = NDArray::Empty(broadcast_shape, data_type, nd1->device);
-  MATX_NDARRAY_TYPE_SWITCH(ret.DataType(), DType, {
+  std::vector<int64_t> nd1_strides = elementwise::BroadcastStrides(broadcast_shape, nd1);
+  std::vector<int64_t> nd2_strides = elementwise::BroadcastStrides(broadcast_shape, nd2);
+  NDArray ret = elementwise::PrepareOutput(broadcast_shape, data_type, nd1->device, out);
+  elementwise::CheckNoPartialOverlap(ret, nd1, nd1_strides);
+  elementwise::CheckNoPartialOverlap(ret, nd2, nd2_strides);
+  elementwise::LoopNest<3> nest(broadcast_shape.data(),
+                                broadcast_shape.size(),
+                                {ret.GetStridesPtr(), nd1_strides.data(), nd2_strides.data()});
+  auto dst_dt = ret.DataType();
+  if (dst_dt == nd1.DataType() && dst_dt == nd2.DataType()) {
+    // the common case, one instantiation per dtype
+    MATX_NDARRAY_TYPE_SWITCH(
+        dst_dt, DType, { BinaryKernel<OP, DType, DType, DType>(nest, ret, nd1, nd2); });
+    return ret;
+  }
+  MATX_NDARRAY_TYPE_SWITCH(dst_dt, DType, {
     MATX_NDARRAY_TYPE_SWITCH(nd1.DataType(), LDType, {
       MATX_NDARRAY_TYPE_SWITCH(nd2.DataType(), RDType, {
-        LDType* l_data = (LDType*)((char*)nd1->data + nd1->byte_offset);
-        RDType* r_data = (RDType*)((char*)nd2->data + nd2->byte_offset);
-        DType* dst_data = (DType*)((char*)ret->data + ret->byte_offset);
-        BinaryAssign<OP, DType, LDType, RDType>(dst_data,
-                                                l_data,
-                                                r_data,
-                                                ret.GetStridesPtr(),
-                                                nd1_strides.data(),
-                                                nd2_strides.data(),
-                                                broadcast_shape.data(),
-                                                broadcast_shape.size());
+        BinaryKernel<OP, DType, LDType, RDType>(nest, ret, nd1, nd2);
       });
     });
   });
@@ -152,180 +116,232 @@ NDArray broadcast_binary_nd(const NDArray& nd1, const NDArray& nd2, const DataTy
 }
 
 template <typename OP, typename SType>
-void broadcast_binary_scalar(const NDArray& nd1, SType s, NDArray& ret) {
-  auto shape = ret.Shape();
+NDArray binary_scalar(const NDArray& nd1, SType s, const DataType& data_type, const NDArray* out) {
+  auto shape = nd1.Shape();
+  NDArray ret = elementwise::PrepareOutput(shape, data_type, NDArrayHelper::GetCPUDevice(), out);
+  std::vector<int64_t> nd1_strides(nd1.GetStridesPtr(), nd1.GetStridesPtr() + nd1.GetDim());
+  elementwise::CheckNoPartialOverlap(ret, nd1, nd1_strides);
+  elementwise::LoopNest<2> nest(
+      shape.data(), shape.size(), {ret.GetStridesPtr(), nd1_strides.data()});
   MATX_NDARRAY_TYPE_SWITCH(ret.DataType(), DType, {
-    MATX_NDARRAY_TYPE_SWITCH(nd1.DataType(), LDType, {
-      LDType* l_data = (LDType*)((char*)nd1->data + nd1->byte_offset);
-      DType* dst_data = (DType*)((char*)ret->data + ret->byte_offset);
-      ScalarAssign<OP, DType, LDType, SType>(dst_data,
-                                             l_data,
-                                             s,
-                                             ret.GetStridesPtr(),
-                                             nd1.GetStridesPtr(),
-                                             ret.Shape().data(),
-                                             shape.size());
-    });
+    MATX_NDARRAY_TYPE_SWITCH(
+        nd1.DataType(), LDType, { ScalarKernel<OP, DType, LDType, SType>(nest, ret, nd1, s); });
   });
+  return ret;
 }
 
-template <typename OP>
-NDArray contiguous_binary_nd(const NDArray& nd1, const NDArray& nd2, const DataType& data_type) {
-  NDArray ret = NDArray::Empty(nd1.Shape(), data_type, nd1->device);
-  int64_t element_num = NDArrayHelper::GetItemNum(ret.GetShapePtr(), ret.GetDim());
-  MATX_NDARRAY_TYPE_SWITCH(ret.DataType(), DType, {
-    MATX_NDARRAY_TYPE_SWITCH(nd1.DataType(), LDType, {
-      MATX_NDARRAY_TYPE_SWITCH(nd2.DataType(), RDType, {
-        LDType* l_data = (LDType*)((char*)nd1->data + nd1->byte_offset);
-        RDType* r_data = (RDType*)((char*)nd2->data + nd2->byte_offset);
-        DType* dst_data = (DType*)((char*)ret->data + ret->byte_offset);
-        for (int64_t i = 0; i < element_num; ++i) {
-          OP::Map(*(l_data + i), *(r_data + i), dst_data + i);
-        }
-      });
-    });
-  });
-  return ret;
+class RangeTask : public internal::LockBasedRunnable {
+ public:
+  RangeTask(const std::function<void(int64_t, int64_t)>* range_func, int64_t begin, int64_t end)
+      : range_func_(range_func), begin_(begin), end_(end) {
+  }
+
+ protected:
+  void RunImpl() override {
+    (*range_func_)(begin_, end_);
+  }
+
+ private:
+  const std::function<void(int64_t, int64_t)>* range_func_;
+  int64_t begin_;
+  int64_t end_;
+};
+
+thread_local internal::IThreadPool* CURRENT_COMPUTE_POOL = nullptr;
+
+}  // namespace
+
+/******************************************************************************
+ * elementwise engine
+ *****************************************************************************/
+
+NDArrayComputePoolScope::NDArrayComputePoolScope(internal::IThreadPool* pool)
+    : prev_(CURRENT_COMPUTE_POOL) {
+  CURRENT_COMPUTE_POOL = pool;
 }
 
-template <typename OP, typename SType>
-void contiguous_binary_scalar(const NDArray& nd1, SType s, NDArray& ret) {
-  int64_t element_num = NDArrayHelper::GetItemNum(ret.GetShapePtr(), ret.GetDim());
-  MATX_NDARRAY_TYPE_SWITCH(ret.DataType(), DType, {
-    MATX_NDARRAY_TYPE_SWITCH(nd1.DataType(), LDType, {
-      LDType* l_data = (LDType*)((char*)nd1->data + nd1->byte_offset);
-      DType* dst_data = (DType*)((char*)ret->data + ret->byte_offset);
-      for (int64_t i = 0; i < element_num; ++i) {
-        OP::Map(*(l_data + i), s, dst_data + i);
-      }
-    });
-  });
+NDArrayComputePoolScope::~NDArrayComputePoolScope() {
+  CURRENT_COMPUTE_POOL = prev_;
 }
 
-}  // namespace
+internal::IThreadPool* NDArrayComputePoolScope::Current() {
+  return CURRENT_COMPUTE_POOL;
+}
+
+namespace elementwise {
 
-NDArray NDArrayOperate::Add(const NDArray& lhs, const NDArray& rhs) {
-  if (NDArrayHelper::IsSameShape(lhs, rhs) && lhs.IsContiguous() && rhs.IsContiguous()) {
-    return contiguous_binary_nd<AddOP>(
-        lhs, rhs, NDArrayHelper::DTypePromotion(lhs.DataType(), rhs.DataType()));
+int64_t NumTasks(int64_t numel) {
+  auto* pool = CURRENT_COMPUTE_POOL;
+  if (pool == nullptr || numel < kParallelMinElements) {
+    return 1;
   }
-  return broadcast_binary_nd<AddOP>(
-      lhs, rhs, NDArrayHelper::DTypePromotion(lhs.DataType(), rhs.DataType()));
+  return std::min(static_cast<int64_t>(pool->GetThreadsNum()) + 1, numel / kParallelMinChunk);
 }
 
-NDArray NDArrayOperate::Add(const NDArray& lhs, int64_t num) {
-  NDArray ret = NDArray::Empty(lhs.Shape(), lhs.DataType(), NDArrayHelper::GetCPUDevice());
-  if (lhs.IsContiguous()) {
-    contiguous_binary_scalar<AddOP>(lhs, num, ret);
-    return ret;
+void ParallelRange(int64_t total,
+                   int64_t num_tasks,
+                   const std::function<void(int64_t, int64_t)>& range_func) {
+  auto* pool = CURRENT_COMPUTE_POOL;
+  if (pool == nullptr || num_tasks <= 1 || total <= 1) {
+    range_func(0, total);
+    return;
+  }
+  num_tasks = std::min(num_tasks, total);
+  int64_t step = (total + num_tasks - 1) / num_tasks;
+  std::vector<internal::IRunnablePtr> tasks;
+  tasks.reserve(num_tasks);
+  int64_t last_begin = 0;
+  for (int64_t begin = 0; begin < total; begin += step) {
+    if (begin + step >= total) {
+      last_begin = begin;
+      break;
+    }
+    tasks.emplace_back(std::make_shared<RangeTask>(&range_func, begin, begin + step));
+  }
+  if (!tasks.empty()) {
+    pool->EnqueueBulk(tasks);
+  }
+  // the caller takes the last range, then waits for the pool
+  std::exception_ptr eptr;
+  try {
+    range_func(last_begin, total);
+  } catch (...) {
+    eptr = std::current_exception();
+  }
+  internal::IThreadPool::WaitBulk(tasks);
+  if (eptr) {
+    std::rethrow_exception(eptr);
   }
-  broadcast_binary_scalar<AddOP>(lhs, num, ret);
-  return ret;
 }
 
-NDArray NDArrayOperate::Add(const NDArray& lhs, double num) {
-  NDArray ret = NDArray::Empty(
-      lhs.Shape(), NDArrayHelper::DTypeFromDouble(lhs.DataType()), NDArrayHelper::GetCPUDevice());
-  if (lhs.IsContiguous()) {
-    contiguous_binary_scalar<AddOP>(lhs, num, ret);
-    return ret;
+std::vector<int64_t> BroadcastStrides(const std::vector<int64_t>& shape, const NDArray& nd) {
+  int bdim = shape.size();
+  int dim = nd.GetDim();
+  int delta = bdim - dim;
+  const int64_t* nd_shape = nd.GetShapePtr();
+  const int64_t* nd_strides = nd.GetStridesPtr();
+  std::vector<int64_t> ret(bdim, 0);
+  for (int i = 0; i < dim; ++i) {
+    ret[i + delta] = nd_shape[i] > 1 ? nd_strides[i] : 0;
   }
-  broadcast_binary_scalar<AddOP>(lhs, num, ret);
   return ret;
 }
 
-NDArray NDArrayOperate::Sub(const NDArray& lhs, const NDArray& rhs) {
-  if (NDArrayHelper::IsSameShape(lhs, rhs) && lhs.IsContiguous() && rhs.IsContiguous()) {
-    return contiguous_binary_nd<SubOP>(
-        lhs, rhs, NDArrayHelper::DTypePromotion(lhs.DataType(), rhs.DataType()));
+NDArray PrepareOutput(const std::vector<int64_t>& shape,
+                      const DataType& dtype,
+                      const DLDevice& device,
+                      const NDArray* out) {
+  if (out == nullptr || !out->defined()) {
+    return NDArray::Empty(shape, dtype, device);
   }
-  return broadcast_binary_nd<SubOP>(
-      lhs, rhs, NDArrayHelper::DTypePromotion(lhs.DataType(), rhs.DataType()));
+  MXCHECK(NDArrayHelper::IsSameShape(out->Shape(), shape))
+      << "ndarray operator: the shape of out does not match the result";
+  MXCHECK(out->DataType() == dtype)
+      << "ndarray operator: expect out dtype is " << dtype << ", but get " << out->DataType();
+  MXCHECK((*out)->device.device_type == kDLCPU) << "ndarray operator: out must be on cpu";
+  return *out;
 }
 
-NDArray NDArrayOperate::Sub(int64_t num, const NDArray& rhs) {
-  NDArray ret = NDArray::Empty(rhs.Shape(), rhs.DataType(), NDArrayHelper::GetCPUDevice());
-  if (rhs.IsContiguous()) {
-    contiguous_binary_scalar<RSubOP>(rhs, num, ret);
-    return ret;
+void CheckNoPartialOverlap(const NDArray& dst,
+                           const NDArray& src,
+                           const std::vector<int64_t>& src_strides) {
+  auto extent = [](const char* base,
+                   const int64_t* shape,
+                   const int64_t* strides,
+                   int ndim,
+                   int64_t itemsize) -> std::pair<const char*, const char*> {
+    const char* lo = base;
+    const char* hi = base + itemsize;
+    for (int d = 0; d < ndim; ++d) {
+      if (shape[d] == 0) {
+        return {base, base};
+      }
+      int64_t span = (shape[d] - 1) * strides[d] * itemsize;
+      if (span > 0) {
+        hi += span;
+      } else {
+        lo += span;
+      }
+    }
+    return {lo, hi};
+  };
+  const char* dst_base = static_cast<const char*>(dst->data) + dst->byte_offset;
+  const char* src_base = static_cast<const char*>(src->data) + src->byte_offset;
+  auto dst_ext = extent(
+      dst_base, dst.GetShapePtr(), dst.GetStridesPtr(), dst.GetDim(), dst.DataType().bytes());
+  auto src_ext = extent(
+      src_base, src.GetShapePtr(), src.GetStridesPtr(), src.GetDim(), src.DataType().bytes());
+  if (dst_ext.second <= src_ext.first || src_ext.second <= dst_ext.first) {
+    return;
   }
-  broadcast_binary_scalar<RSubOP>(rhs, num, ret);
-  return ret;
+  // in-place is fine when every element is read and written at the same position
+  bool same_layout = dst_base == src_base && dst.DataType() == src.DataType();
+  const int64_t* dst_shape = dst.GetShapePtr();
+  const int64_t* dst_strides = dst.GetStridesPtr();
+  for (int d = 0; same_layout && d < dst.GetDim(); ++d) {
+    if (dst_shape[d] > 1 && dst_strides[d] != src_strides[d]) {
+      same_layout = false;
+    }
+  }
+  MXCHECK(same_layout) << "ndarray operator: out partially overlaps an input";
 }
 
-NDArray NDArrayOperate::Sub(double num, const NDArray& rhs) {
-  NDArray ret = NDArray::Empty(
-      rhs.Shape(), NDArrayHelper::DTypeFromDouble(rhs.DataType()), NDArrayHelper::GetCPUDevice());
-  if (rhs.IsContiguous()) {
-    contiguous_binary_scalar<RSubOP>(rhs, num, ret);
-    return ret;
-  }
-  broadcast_binary_scalar<RSubOP>(rhs, num, ret);
-  return ret;
+}  // namespace elementwise
+
+NDArray NDArrayOperate::Add(const NDArray& lhs, const NDArray& rhs, const NDArray* out) {
+  return binary_nd<AddOP>(
+      lhs, rhs, NDArrayHelper::DTypePromotion(lhs.DataType(), rhs.DataType()), out);
+}
+
+NDArray NDArrayOperate::Add(const NDArray& lhs, int64_t num, const NDArray* out) {
+  return binary_scalar<AddOP>(lhs, num, lhs.DataType(), out);
+}
+
+NDArray NDArrayOperate::Add(const NDArray& lhs, double num, const NDArray* out) {
+  return binary_scalar<AddOP>(lhs, num, NDArrayHelper::DTypeFromDouble(lhs.DataType()), out);
+}
+
+NDArray NDArrayOperate::Sub(const NDArray& lhs, const NDArray& rhs, const NDArray* out) {
+  return binary_nd<SubOP>(
+      lhs, rhs, NDArrayHelper::DTypePromotion(lhs.DataType(), rhs.DataType()), out);
 }
 
-NDArray NDArrayOperate::Div(const NDArray& lhs, const NDArray& rhs) {
+NDArray NDArrayOperate::Sub(int64_t num, const NDArray& rhs, const NDArray* out) {
+  return binary_scalar<RSubOP>(rhs, num, rhs.DataType(), out);
+}
+
+NDArray NDArrayOperate::Sub(double num, const NDArray& rhs, const NDArray* out) {
+  return binary_scalar<RSubOP>(rhs, num, NDArrayHelper::DTypeFromDouble(rhs.DataType()), out);
+}
+
+NDArray NDArrayOperate::Div(const NDArray& lhs, const NDArray& rhs, const NDArray* out) {
   auto target_dt = NDArrayHelper::DTypePromotion(lhs.DataType(), rhs.DataType());
   if (target_dt.is_int()) {
     target_dt = DataType(String2DLDataType("float32"));
   }
-  if (NDArrayHelper::IsSameShape(lhs, rhs) && lhs.IsContiguous() && rhs.IsContiguous()) {
-    return contiguous_binary_nd<DivOP>(lhs, rhs, target_dt);
-  }
-  return broadcast_binary_nd<DivOP>(lhs, rhs, target_dt);
+  return binary_nd<DivOP>(lhs, rhs, target_dt, out);
 }
 
-NDArray NDArrayOperate::Div(double num, const NDArray& rhs) {
-  NDArray ret = NDArray::Empty(
-      rhs.Shape(), NDArrayHelper::DTypeFromDouble(rhs.DataType()), NDArrayHelper::GetCPUDevice());
-  if (rhs.IsContiguous()) {
-    contiguous_binary_scalar<RDivOP>(rhs, num, ret);
-    return ret;
-  }
-  broadcast_binary_scalar<RDivOP>(rhs, num, ret);
-  return ret;
+NDArray NDArrayOperate::Div(double num, const NDArray& rhs, const NDArray* out) {
+  return binary_scalar<RDivOP>(rhs, num, NDArrayHelper::DTypeFromDouble(rhs.DataType()), out);
 }
 
-NDArray NDArrayOperate::Div(const NDArray& lhs, double num) {
-  NDArray ret = NDArray::Empty(
-      lhs.Shape(), NDArrayHelper::DTypeFromDouble(lhs.DataType()), NDArrayHelper::GetCPUDevice());
-  if (lhs.IsContiguous()) {
-    contiguous_binary_scalar<DivOP>(lhs, num, ret);
-    return ret;
-  }
-  broadcast_binary_scalar<DivOP>(lhs, num, ret);
-  return ret;
+NDArray NDArrayOperate::Div(const NDArray& lhs, double num, const NDArray* out) {
+  return binary_scalar<DivOP>(lhs, num, NDArrayHelper::DTypeFromDouble(lhs.DataType()), out);
 }
 
-NDArray NDArrayOperate::Mul(const NDArray& lhs, const NDArray& rhs) {
-  if (NDArrayHelper::IsSameShape(lhs, rhs) && lhs.IsContiguous() && rhs.IsContiguous()) {
-    return contiguous_binary_nd<MulOP>(
-        lhs, rhs, NDArrayHelper::DTypePromotion(lhs.DataType(), rhs.DataType()));
-  }
-  return broadcast_binary_nd<MulOP>(
-      lhs, rhs, NDArrayHelper::DTypePromotion(lhs.DataType(), rhs.DataType()));
+NDArray NDArrayOperate::Mul(const NDArray& lhs, const NDArray& rhs, const NDArray* out) {
+  return binary_nd<MulOP>(
+      lhs, rhs, NDArrayHelper::DTypePromotion(lhs.DataType(), rhs.DataType()), out);
 }
 
-NDArray NDArrayOperate::Mul(const NDArray& lhs, int64_t num) {
-  NDArray ret = NDArray::Empty(lhs.Shape(), lhs.DataType(), NDArrayHelper::GetCPUDevice());
-  if (lhs.IsContiguous()) {
-    contiguous_binary_scalar<MulOP>(lhs, num, ret);
-    return ret;
-  }
-  broadcast_binary_scalar<MulOP>(lhs, num, ret);
-  return ret;
+NDArray NDArrayOperate::Mul(const NDArray& lhs, int64_t num, const NDArray* out) {
+  return binary_scalar<MulOP>(lhs, num, lhs.DataType(), out);
 }
 
-NDArray NDArrayOperate::Mul(const NDArray& lhs, double num) {
-  NDArray ret = NDArray::Empty(
-      lhs.Shape(), NDArrayHelper::DTypeFromDouble(lhs.DataType()), NDArrayHelper::GetCPUDevice());
-  if (lhs.IsContiguous()) {
-    contiguous_binary_scalar<MulOP>(lhs, num, ret);
-    return ret;
-  }
-  broadcast_binary_scalar<MulOP>(lhs, num, ret);
-  return ret;
+NDArray NDArrayOperate::Mul(const NDArray& lhs, double num, const NDArray* out) {
+  return binary_scalar<MulOP>(lhs, num, NDArrayHelper::DTypeFromDouble(lhs.DataType()), out);
 }
 
 }  // namespace runtime
-}  // namespace matxscript
\ No newline at end of file
+}  // namespace matxscript
@@ -0,0 +1,419 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#include <matxscript/runtime/container/string_batch.h>
+
+#include <cstring>
+
+#include <matxscript/runtime/container/container_slice_helper.h>
+#include <matxscript/runtime/container/native_object_private.h>
+#include <matxscript/runtime/container/ndarray_helper.h>
+#include <matxscript/runtime/container/string_helper.h>
+#include <matxscript/runtime/container/unicode_helper.h>
+#include <matxscript/runtime/container_private.h>
+#include <matxscript/runtime/dlpack.h>
+#include <matxscript/runtime/logging.h>
+#include <matxscript/runtime/native_object_maker.h>
+#include <matxscript/runtime/native_object_registry.h>
+#include <matxscript/runtime/unicodelib/unicode_kind.h>
+#include <matxscript/runtime/utf8/utf8_greedy_encoder.h>
+
+namespace matxscript {
+namespace runtime {
+
+StringBatch::StringBatch(string_view data, const int64_t* offsets, int64_t num, bool is_unicode)
+    : is_unicode_(is_unicode) {
+  MXCHECK(num >= 0) << "[StringBatch] invalid number of items: " << num;
+  int64_t base = num > 0 ? offsets[0] : 0;
+  int64_t end = num > 0 ? offsets[num] : 0;
+  MXCHECK(base >= 0 && end <= static_cast<int64_t>(data.size()))
+      << "[StringBatch] offsets [" << base << ", " << end << "] are out of the data buffer of "
+      << data.size() << " bytes";
+  offsets_.resize(num + 1);
+  offsets_[0] = 0;
+  for (int64_t i = 1; i <= num; ++i) {
+    MXCHECK(offsets[i] >= offsets[i - 1]) << "[StringBatch] offsets must be non-decreasing";
+    offsets_[i] = offsets[i] - base;
+  }
+  data_.assign(data.data() + base, data.data() + end);
+}
+
+namespace {
+
+// the utf-8 size of latin-1 or ucs2 code units
+template <typename T>
+size_t NarrowUnitsUTF8Size(const T* s, size_t len) {
+  size_t nbytes = len;
+  for (size_t i = 0; i < len; ++i) {
+    uint32_t c = s[i];
+    MXCHECK(c < 0xD800 || c > 0xDFFF) << "UnicodeEncodeError: surrogates not allowed";
+    nbytes += (c >= 0x80) + (c >= 0x800);
+  }
+  return nbytes;
+}
+
+template <typename T>
+void NarrowUnitsUTF8Encode(const T* s, size_t len, char* dst) {
+  for (size_t i = 0; i < len; ++i) {
+    uint32_t c = s[i];
+    if (c < 0x80) {
+      *dst++ = static_cast<char>(c);
+    } else if (c < 0x800) {
+      *dst++ = static_cast<char>(0xC0 | (c >> 6));
+      *dst++ = static_cast<char>(0x80 | (c & 0x3F));
+    } else {
+      *dst++ = static_cast<char>(0xE0 | (c >> 12));
+      *dst++ = static_cast<char>(0x80 | ((c >> 6) & 0x3F));
+      *dst++ = static_cast<char>(0x80 | (c & 0x3F));
+    }
+  }
+}
+
+size_t ItemUTF8Size(const char* item, size_t size, int kind) {
+  switch (kind) {
+    case kUnicodeKind1Byte: {
+      return NarrowUnitsUTF8Size(reinterpret_cast<const uint8_t*>(item), size);
+    } break;
+    case kUnicodeKind2Byte: {
+      return NarrowUnitsUTF8Size(reinterpret_cast<const uint16_t*>(item), size);
+    } break;
+    case kUnicodeKind4Byte: {
+      auto* units = reinterpret_cast<const uint32_t*>(item);
+      return utf8_details::GreedyCountBytesSize(units, units + size);
+    } break;
+    default: {
+      MXCHECK(kind == kUnicodeKindASCII) << "[StringBatch] invalid unicode kind: " << kind;
+      return size;
+    } break;
+  }
+}
+
+void ItemUTF8Encode(const char* item, size_t size, int kind, char* dst) {
+  switch (kind) {
+    case kUnicodeKind1Byte: {
+      NarrowUnitsUTF8Encode(reinterpret_cast<const uint8_t*>(item), size, dst);
+    } break;
+    case kUnicodeKind2Byte: {
+      NarrowUnitsUTF8Encode(reinterpret_cast<const uint16_t*>(item), size, dst);
+    } break;
+    case kUnicodeKind4Byte: {
+      auto* units = reinterpret_cast<const uint32_t*>(item);
+      utf8_details::GreedyEncoder(units, units + size, reinterpret_cast<unsigned char*>(dst));
+    } break;
+    default: {
+      std::memcpy(dst, item, size);
+    } break;
+  }
+}
+
+}  // namespace
+
+StringBatch::StringBatch(
+    const char* const* items, const size_t* sizes, int64_t num, bool is_unicode, const int* kinds)
+    : is_unicode_(is_unicode) {
+  offsets_.resize(num + 1);
+  offsets_[0] = 0;
+  for (int64_t i = 0; i < num; ++i) {
+    size_t nbytes = kinds ? ItemUTF8Size(items[i], sizes[i], kinds[i]) : sizes[i];
+    offsets_[i + 1] = offsets_[i] + static_cast<int64_t>(nbytes);
+  }
+  // the code units are encoded straight into the buffer, without a utf-8 copy per item
+  data_.resize(offsets_[num]);
+  for (int64_t i = 0; i < num; ++i) {
+    if (kinds) {
+      ItemUTF8Encode(items[i], sizes[i], kinds[i], data_.data() + offsets_[i]);
+    } else {
+      std::memcpy(data_.data() + offsets_[i], items[i], sizes[i]);
+    }
+  }
+}
+
+StringBatch StringBatch::FromList(const List& items) {
+  bool is_unicode = items.empty() || items[0].type_code() == TypeIndex::kRuntimeUnicode;
+  StringBatch batch(is_unicode);
+  batch.offsets_.reserve(items.size() + 1);
+  for (auto& item : items) {
+    switch (item.type_code()) {
+      case TypeIndex::kRuntimeString: {
+        MXCHECK(!is_unicode) << "[StringBatch] all items must be str or all items must be bytes";
+        batch.push_back(item.AsNoCheck<string_view>());
+      } break;
+      case TypeIndex::kRuntimeUnicode: {
+        MXCHECK(is_unicode) << "[StringBatch] all items must be str or all items must be bytes";
+        batch.push_back(UnicodeHelper::Encode(item.AsNoCheck<unicode_view>()));
+      } break;
+      default: {
+        MXTHROW << "[StringBatch] expect str or bytes items, but get " << item.type_name();
+      } break;
+    }
+  }
+  return batch;
+}
+
+RTValue StringBatch::get_item(int64_t i) const {
+  int64_t len = size();
+  MXCHECK((i >= 0 && i < len) || (i < 0 && i >= -len)) << "ValueError: index overflow";
+  i = index_correction(i, len);
+  if (is_unicode_) {
+    return StringHelper::Decode(view(i));
+  }
+  auto item = view(i);
+  return String(item.data(), item.size());
+}
+
+StringBatch StringBatch::get_slice(int64_t start, int64_t end) const {
+  int64_t len = size();
+  start = slice_index_correction(start, len);
+  end = slice_index_correction(end, len);
+  if (end < start) {
+    end = start;
+  }
+  return StringBatch(
+      string_view(data_.data(), data_.size()), offsets_.data() + start, end - start, is_unicode_);
+}
+
+bool StringBatch::contains(const Any& item) const {
+  String holder;
+  string_view needle;
+  if (item.type_code() == TypeIndex::kRuntimeUnicode && is_unicode_) {
+    holder = UnicodeHelper::Encode(item.AsNoCheck<unicode_view>());
+    needle = holder;
+  } else if (item.type_code() == TypeIndex::kRuntimeString && !is_unicode_) {
+    needle = item.AsNoCheck<string_view>();
+  } else {
+    return false;
+  }
+  for (int64_t i = 0; i < size(); ++i) {
+    if (view(i) == needle) {
+      return true;
+    }
+  }
+  return false;
+}
+
+void StringBatch::reserve(int64_t num, int64_t nbytes) {
+  offsets_.reserve(num + 1);
+  data_.reserve(nbytes);
+}
+
+void StringBatch::push_back(string_view item) {
+  data_.insert(data_.end(), item.data(), item.data() + item.size());
+  offsets_.push_back(static_cast<int64_t>(data_.size()));
+}
+
+void StringBatch::pop_back() {
+  MXCHECK(size() > 0) << "IndexError: pop from empty StringBatch";
+  offsets_.pop_back();
+  data_.resize(offsets_.back());
+}
+
+void StringBatch::clear() {
+  data_.clear();
+  offsets_.assign(1, 0);
+}
+
+List StringBatch::to_list() const {
+  List result;
+  int64_t len = size();
+  result.reserve(len);
+  if (is_unicode_) {
+    for (int64_t i = 0; i < len; ++i) {
+      result.push_back(StringHelper::Decode(view(i)));
+    }
+  } else {
+    for (int64_t i = 0; i < len; ++i) {
+      auto item = view(i);
+      result.push_back(String(item.data(), item.size()));
+    }
+  }
+  return result;
+}
+
+NDArray StringBatch::data() const {
+  auto arr = NDArray::Empty({static_cast<int64_t>(data_.size())},
+                            DLDataType{kDLUInt, 8, 1},
+                            NDArrayHelper::GetCPUDevice());
+  if (!data_.empty()) {
+    std::memcpy(const_cast<void*>(arr.RawData()), data_.data(), data_.size());
+  }
+  return arr;
+}
+
+NDArray StringBatch::offsets() const {
+  auto arr = NDArray::Empty({static_cast<int64_t>(offsets_.size())},
+                            DLDataType{kDLInt, 64, 1},
+                            NDArrayHelper::GetCPUDevice());
+  std::memcpy(const_cast<void*>(arr.RawData()), offsets_.data(), offsets_.size() * sizeof(int64_t));
+  return arr;
+}
+
+Iterator StringBatch::iter() const {
+  std::shared_ptr<const StringBatch> self;
+  try {
+    self = shared_from_this();
+  } catch (const std::bad_weak_ptr&) {
+    // a batch on the stack, iterate a copy of it
+    self = std::make_shared<StringBatch>(*this);
+  }
+  auto pos = std::make_shared<int64_t>(0);
+  auto has_next = [self, pos]() -> bool { return *pos < self->size(); };
+  auto next = [self, pos]() -> RTValue { return self->get_item((*pos)++); };
+  auto next_and_check = [self, pos](bool* has_next) -> RTValue {
+    RTValue item = self->get_item((*pos)++);
+    *has_next = *pos < self->size();
+    return item;
+  };
+  return Iterator::MakeGenericIterator(None, has_next, next, next_and_check);
+}
+
+StringBatch* StringBatch::FromAny(const Any& value) {
+  if (value.type_code() != TypeIndex::kRuntimeUserData) {
+    return nullptr;
+  }
+  auto* ud_ptr =
+      static_cast<ILightUserData*>(value.AsObjectViewNoCheck<UserDataRef>().data().ud_ptr());
+  if (ud_ptr == nullptr || ud_ptr->type_2_71828182846() != UserDataStructType::kNativeData) {
+    return nullptr;
+  }
+  auto* native = static_cast<NativeObject*>(ud_ptr);
+  if (native->native_class_name_ != kClassName) {
+    return nullptr;
+  }
+  return static_cast<StringBatch*>(native->opaque_ptr_.get());
+}
+
+UserDataRef StringBatch::MakeUserData(StringBatch batch) {
+  auto udref = make_native_userdata(kClassName, {});
+  auto* self =
+      static_cast<StringBatch*>((static_cast<NativeObject*>(udref.ud_ptr())->opaque_ptr_).get());
+  *self = std::move(batch);
+  return udref;
+}
+
+MATX_REGISTER_NATIVE_OBJECT(StringBatch)
+    .SetConstructor([](PyArgs args) -> std::shared_ptr<void> {
+      switch (args.size()) {
+        case 0: {
+          return std::make_shared<StringBatch>();
+        } break;
+        case 1: {
+          if (args[0].type_code() == TypeIndex::kRuntimeList) {
+            return std::make_shared<StringBatch>(
+                StringBatch::FromList(args[0].AsObjectViewNoCheck<List>().data()));
+          }
+          return std::make_shared<StringBatch>(args[0].As<int64_t>() != 0);
+        } break;
+        case 3: {
+          // the Arrow buffers: data, offsets and whether the items are str
+          auto data = args[0].As<string_view>();
+          bool is_unicode = args[2].As<int64_t>() != 0;
+          if (args[1].type_code() == TypeIndex::kRuntimeNDArray) {
+            auto offsets = args[1].AsObjectViewNoCheck<NDArray>();
+            const auto& arr = offsets.data();
+            MXCHECK(arr->ndim == 1 && arr.IsContiguous() && arr.DataType() == DataType::Int(64))
+                << "[StringBatch] offsets must be a contiguous 1-D int64 array";
+            MXCHECK(arr->shape[0] > 0) << "[StringBatch] offsets must not be empty";
+            return std::make_shared<StringBatch>(
+                data, static_cast<const int64_t*>(arr.RawData()), arr->shape[0] - 1, is_unicode);
+          }
+          auto offsets_list = args[1].As<List>();
+          MXCHECK(!offsets_list.empty()) << "[StringBatch] offsets must not be empty";
+          std::vector<int64_t> offsets;
+          offsets.reserve(offsets_list.size());
+          for (auto& offset : offsets_list) {
+            offsets.push_back(offset.As<int64_t>());
+          }
+          return std::make_shared<StringBatch>(
+              data, offsets.data(), static_cast<int64_t>(offsets.size()) - 1, is_unicode);
+        } break;
+        default: {
+          MXTHROW << "[StringBatch] Expect 0, 1 or 3 arguments but get " << args.size();
+        } break;
+      }
+      return nullptr;
+    })
+    .RegisterFunction("__len__",
+                      [](void* self, PyArgs args) -> RTValue {
+                        return reinterpret_cast<StringBatch*>(self)->size();
+                      })
+    .RegisterFunction("__getitem__",
+                      [](void* self, PyArgs args) -> RTValue {
+                        MXCHECK_EQ(args.size(), 1)
+                            << "[StringBatch][func: __getitem__] Expect 1 arguments but get "
+                            << args.size();
+                        return reinterpret_cast<StringBatch*>(self)->get_item(
+                            args[0].As<int64_t>());
+                      })
+    .RegisterFunction("__getslice__",
+                      [](void* self, PyArgs args) -> RTValue {
+                        MXCHECK(args.size() == 2 || args.size() == 3)
+                            << "[StringBatch][func: __getslice__] Expect 2 or 3 arguments but get "
+                            << args.size();
+                        MXCHECK(args.size() == 2 || args[2].As<int64_t>() == 1)
+                            << "[StringBatch][func: __getslice__] step must be 1";
+                        return StringBatch::MakeUserData(
+                            reinterpret_cast<StringBatch*>(self)->get_slice(args[0].As<int64_t>(),
+                                                                            args[1].As<int64_t>()));
+                      })
+    .RegisterFunction("__contains__",
+                      [](void* self, PyArgs args) -> RTValue {
+                        MXCHECK_EQ(args.size(), 1)
+                            << "[StringBatch][func: __contains__] Expect 1 arguments but get "
+                            << args.size();
+                        return reinterpret_cast<StringBatch*>(self)->contains(args[0]);
+                      })
+    .RegisterFunction("__iter__",
+                      [](void* self, PyArgs args) -> RTValue {
+                        return reinterpret_cast<StringBatch*>(self)->iter();
+                      })
+    .RegisterFunction("append",
+                      [](void* self, PyArgs args) -> RTValue {
+                        MXCHECK_EQ(args.size(), 1)
+                            << "[StringBatch][func: append] Expect 1 arguments but get "
+                            << args.size();
+                        auto* batch = reinterpret_cast<StringBatch*>(self);
+                        if (batch->is_unicode()) {
+                          batch->push_back(UnicodeHelper::Encode(args[0].As<unicode_view>()));
+                        } else {
+                          batch->push_back(args[0].As<string_view>());
+                        }
+                        return None;
+                      })
+    .RegisterFunction("is_unicode",
+                      [](void* self, PyArgs args) -> RTValue {
+                        return reinterpret_cast<StringBatch*>(self)->is_unicode();
+                      })
+    .RegisterFunction("nbytes",
+                      [](void* self, PyArgs args) -> RTValue {
+                        return reinterpret_cast<StringBatch*>(self)->nbytes();
+                      })
+    .RegisterFunction("to_list",
+                      [](void* self, PyArgs args) -> RTValue {
+                        return reinterpret_cast<StringBatch*>(self)->to_list();
+                      })
+    .RegisterFunction("data",
+                      [](void* self, PyArgs args) -> RTValue {
+                        return reinterpret_cast<StringBatch*>(self)->data();
+                      })
+    .RegisterFunction("offsets", [](void* self, PyArgs args) -> RTValue {
+      return reinterpret_cast<StringBatch*>(self)->offsets();
+    });
+
+}  // namespace runtime
+}  // namespace matxscript
@@ -80,6 +80,12 @@ Iterator make(const Any& obj) {
           .generic_call_attr("__iter__", {})
           .As<Iterator>();
     } break;
+    case TypeIndex::kRuntimeUserData: {
+      return obj.AsObjectViewNoCheck<UserDataRef>()
+          .data()
+          .generic_call_attr("__iter__", {})
+          .As<Iterator>();
+    } break;
     case TypeIndex::kRuntimeString: {
       String container = obj.AsNoCheck<String>();
       return container.iter();
@@ -244,6 +244,11 @@ RTValue kernel_object___getslice__(const Any& self,
       return ud_view.data().generic_call_attr(
           "__getslice__", {start.As<RTView>(), end.As<RTView>(), step.As<RTView>()});
     } break;
+    case TypeIndex::kRuntimeUserData: {
+      auto ud_view = self.AsObjectViewNoCheck<UserDataRef>();
+      return ud_view.data().generic_call_attr(
+          "__getslice__", {start.As<RTView>(), end.As<RTView>(), step.As<RTView>()});
+    } break;
     default: {
       MXTHROW << "\"" << self.type_name() << "\" object has no method \"__getslice__\"";
     } break;
@@ -645,27 +650,47 @@ RTValue container_max(const Iterator& iter) {
 }
 
 // ndarray
+// an undefined NDArray means no out
+static NDArray nd_module_out_arg(const Any& out, const char* func_name) {
+  if (out.is_nullptr()) {
+    return NDArray();
+  }
+  MXCHECK(out.type_code() == TypeIndex::kRuntimeNDArray)
+      << func_name << ": out must be NDArray or None, but get " << out.type_name();
+  return out.AsObjectRefNoCheck<NDArray>();
+}
+
 NDArray kernel_nd_module_add(const Any& lhs, const Any& rhs) {
+  return kernel_nd_module_add(lhs, rhs, None);
+}
+
+NDArray kernel_nd_module_add(const Any& lhs, const Any& rhs, const Any& out) {
+  auto out_nd = nd_module_out_arg(out, "matx.array.add");
   if (lhs.type_code() == TypeIndex::kRuntimeNDArray &&
       rhs.type_code() == TypeIndex::kRuntimeNDArray) {
     return NDArrayOperate::Add(lhs.AsObjectViewNoCheck<NDArray>().data(),
-                               rhs.AsObjectViewNoCheck<NDArray>().data());
+                               rhs.AsObjectViewNoCheck<NDArray>().data(),
+                               &out_nd);
   }
   if (lhs.type_code() == TypeIndex::kRuntimeNDArray &&
       rhs.type_code() == TypeIndex::kRuntimeInteger) {
-    return NDArrayOperate::Add(lhs.AsObjectViewNoCheck<NDArray>().data(), rhs.As<int64_t>());
+    return NDArrayOperate::Add(
+        lhs.AsObjectViewNoCheck<NDArray>().data(), rhs.As<int64_t>(), &out_nd);
   }
   if (lhs.type_code() == TypeIndex::kRuntimeNDArray &&
       rhs.type_code() == TypeIndex::kRuntimeFloat) {
-    return NDArrayOperate::Add(lhs.AsObjectViewNoCheck<NDArray>().data(), rhs.As<double>());
+    return NDArrayOperate::Add(
+        lhs.AsObjectViewNoCheck<NDArray>().data(), rhs.As<double>(), &out_nd);
   }
   if (lhs.type_code() == TypeIndex::kRuntimeInteger &&
       rhs.type_code() == TypeIndex::kRuntimeNDArray) {
-    return NDArrayOperate::Add(rhs.AsObjectViewNoCheck<NDArray>().data(), lhs.As<int64_t>());
+    return NDArrayOperate::Add(
+        rhs.AsObjectViewNoCheck<NDArray>().data(), lhs.As<int64_t>(), &out_nd);
   }
   if (lhs.type_code() == TypeIndex::kRuntimeFloat &&
       rhs.type_code() == TypeIndex::kRuntimeNDArray) {
-    return NDArrayOperate::Add(rhs.AsObjectViewNoCheck<NDArray>().data(), lhs.As<double>());
+    return NDArrayOperate::Add(
+        rhs.AsObjectViewNoCheck<NDArray>().data(), lhs.As<double>(), &out_nd);
   }
   MXTHROW << "NDArray add op only supports: "
           << "(NDArray,NDArray) and (NDArray, number)";
@@ -673,26 +698,36 @@ NDArray kernel_nd_module_add(const Any& lhs, const Any& rhs) {
 }
 
 NDArray kernel_nd_module_sub(const Any& lhs, const Any& rhs) {
+  return kernel_nd_module_sub(lhs, rhs, None);
+}
+
+NDArray kernel_nd_module_sub(const Any& lhs, const Any& rhs, const Any& out) {
+  auto out_nd = nd_module_out_arg(out, "matx.array.sub");
   if (lhs.type_code() == TypeIndex::kRuntimeNDArray &&
       rhs.type_code() == TypeIndex::kRuntimeNDArray) {
     return NDArrayOperate::Sub(lhs.AsObjectViewNoCheck<NDArray>().data(),
-                               rhs.AsObjectViewNoCheck<NDArray>().data());
+                               rhs.AsObjectViewNoCheck<NDArray>().data(),
+                               &out_nd);
   }
   if (lhs.type_code() == TypeIndex::kRuntimeNDArray &&
       rhs.type_code() == TypeIndex::kRuntimeInteger) {
-    return NDArrayOperate::Add(lhs.AsObjectViewNoCheck<NDArray>().data(), -(rhs.As<int64_t>()));
+    return NDArrayOperate::Add(
+        lhs.AsObjectViewNoCheck<NDArray>().data(), -(rhs.As<int64_t>()), &out_nd);
   }
   if (lhs.type_code() == TypeIndex::kRuntimeNDArray &&
       rhs.type_code() == TypeIndex::kRuntimeFloat) {
-    return NDArrayOperate::Add(lhs.AsObjectViewNoCheck<NDArray>().data(), -(rhs.As<double>()));
+    return NDArrayOperate::Add(
+        lhs.AsObjectViewNoCheck<NDArray>().data(), -(rhs.As<double>()), &out_nd);
   }
   if (lhs.type_code() == TypeIndex::kRuntimeInteger &&
       rhs.type_code() == TypeIndex::kRuntimeNDArray) {
-    return NDArrayOperate::Sub(lhs.As<int64_t>(), rhs.AsObjectViewNoCheck<NDArray>().data());
+    return NDArrayOperate::Sub(
+        lhs.As<int64_t>(), rhs.AsObjectViewNoCheck<NDArray>().data(), &out_nd);
   }
   if (lhs.type_code() == TypeIndex::kRuntimeFloat &&
       rhs.type_code() == TypeIndex::kRuntimeNDArray) {
-    return NDArrayOperate::Sub(lhs.As<double>(), rhs.AsObjectViewNoCheck<NDArray>().data());
+    return NDArrayOperate::Sub(
+        lhs.As<double>(), rhs.AsObjectViewNoCheck<NDArray>().data(), &out_nd);
   }
   MXTHROW << "NDArray sub op only supports: "
           << "(NDArray,NDArray) and (NDArray, number)";
@@ -700,28 +735,36 @@ NDArray kernel_nd_module_sub(const Any& lhs, const Any& rhs) {
 }
 
 NDArray kernel_nd_module_div(const Any& lhs, const Any& rhs) {
+  return kernel_nd_module_div(lhs, rhs, None);
+}
+
+NDArray kernel_nd_module_div(const Any& lhs, const Any& rhs, const Any& out) {
+  auto out_nd = nd_module_out_arg(out, "matx.array.div");
   if (lhs.type_code() == TypeIndex::kRuntimeNDArray &&
       rhs.type_code() == TypeIndex::kRuntimeNDArray) {
     return NDArrayOperate::Div(lhs.AsObjectViewNoCheck<NDArray>().data(),
-                               rhs.AsObjectViewNoCheck<NDArray>().data());
+                               rhs.AsObjectViewNoCheck<NDArray>().data(),
+                               &out_nd);
   }
   if (lhs.type_code() == TypeIndex::kRuntimeNDArray &&
       rhs.type_code() == TypeIndex::kRuntimeInteger) {
-    return NDArrayOperate::Div(lhs.AsObjectViewNoCheck<NDArray>().data(),
-                               (double)(rhs.As<int64_t>()));
+    return NDArrayOperate::Div(
+        lhs.AsObjectViewNoCheck<NDArray>().data(), (double)(rhs.As<int64_t>()), &out_nd);
   }
   if (lhs.type_code() == TypeIndex::kRuntimeNDArray &&
       rhs.type_code() == TypeIndex::kRuntimeFloat) {
-    return NDArrayOperate::Div(lhs.AsObjectViewNoCheck<NDArray>().data(), rhs.As<double>());
+    return NDArrayOperate::Div(
+        lhs.AsObjectViewNoCheck<NDArray>().data(), rhs.As<double>(), &out_nd);
   }
   if (lhs.type_code() == TypeIndex::kRuntimeInteger &&
       rhs.type_code() == TypeIndex::kRuntimeNDArray) {
-    return NDArrayOperate::Div((double)(lhs.As<int64_t>()),
-                               rhs.AsObjectViewNoCheck<NDArray>().data());
+    return NDArrayOperate::Div(
+        (double)(lhs.As<int64_t>()), rhs.AsObjectViewNoCheck<NDArray>().data(), &out_nd);
   }
   if (lhs.type_code() == TypeIndex::kRuntimeFloat &&
       rhs.type_code() == TypeIndex::kRuntimeNDArray) {
-    return NDArrayOperate::Div(lhs.As<double>(), rhs.AsObjectViewNoCheck<NDArray>().data());
+    return NDArrayOperate::Div(
+        lhs.As<double>(), rhs.AsObjectViewNoCheck<NDArray>().data(), &out_nd);
   }
   MXTHROW << "NDArray div op only supports: "
           << "(NDArray,NDArray) and (NDArray, number)";
@@ -729,26 +772,36 @@ NDArray kernel_nd_module_div(const Any& lhs, const Any& rhs) {
 }
 
 NDArray kernel_nd_module_mul(const Any& lhs, const Any& rhs) {
+  return kernel_nd_module_mul(lhs, rhs, None);
+}
+
+NDArray kernel_nd_module_mul(const Any& lhs, const Any& rhs, const Any& out) {
+  auto out_nd = nd_module_out_arg(out, "matx.array.mul");
   if (lhs.type_code() == TypeIndex::kRuntimeNDArray &&
       rhs.type_code() == TypeIndex::kRuntimeNDArray) {
     return NDArrayOperate::Mul(lhs.AsObjectViewNoCheck<NDArray>().data(),
-                               rhs.AsObjectViewNoCheck<NDArray>().data());
+                               rhs.AsObjectViewNoCheck<NDArray>().data(),
+                               &out_nd);
   }
   if (lhs.type_code() == TypeIndex::kRuntimeNDArray &&
       rhs.type_code() == TypeIndex::kRuntimeInteger) {
-    return NDArrayOperate::Mul(lhs.AsObjectViewNoCheck<NDArray>().data(), rhs.As<int64_t>());
+    return NDArrayOperate::Mul(
+        lhs.AsObjectViewNoCheck<NDArray>().data(), rhs.As<int64_t>(), &out_nd);
   }
   if (lhs.type_code() == TypeIndex::kRuntimeNDArray &&
       rhs.type_code() == TypeIndex::kRuntimeFloat) {
-    return NDArrayOperate::Mul(lhs.AsObjectViewNoCheck<NDArray>().data(), rhs.As<double>());
+    return NDArrayOperate::Mul(
+        lhs.AsObjectViewNoCheck<NDArray>().data(), rhs.As<double>(), &out_nd);
   }
   if (lhs.type_code() == TypeIndex::kRuntimeInteger &&
       rhs.type_code() == TypeIndex::kRuntimeNDArray) {
-    return NDArrayOperate::Mul(rhs.AsObjectViewNoCheck<NDArray>().data(), lhs.As<int64_t>());
+    return NDArrayOperate::Mul(
+        rhs.AsObjectViewNoCheck<NDArray>().data(), lhs.As<int64_t>(), &out_nd);
   }
   if (lhs.type_code() == TypeIndex::kRuntimeFloat &&
       rhs.type_code() == TypeIndex::kRuntimeNDArray) {
-    return NDArrayOperate::Mul(rhs.AsObjectViewNoCheck<NDArray>().data(), lhs.As<double>());
+    return NDArrayOperate::Mul(
+        rhs.AsObjectViewNoCheck<NDArray>().data(), lhs.As<double>(), &out_nd);
   }
   MXTHROW << "NDArray multiply op only supports: "
           << "(NDArray,NDArray) and (NDArray, number)";
@@ -785,6 +838,126 @@ NDArray kernel_nd_module_stack(PyArgs args) {
   }
 }
 
+static NDArray nd_module_nd_arg(const Any& nd, const char* func_name) {
+  MXCHECK(nd.type_code() == TypeIndex::kRuntimeNDArray)
+      << func_name << ": expect the first argument is NDArray, but get " << nd.type_name();
+  return nd.AsObjectRefNoCheck<NDArray>();
+}
+
+// the optional arguments which are not given are None
+static const Any& nd_module_opt_arg(const PyArgs& args, int i) {
+  return i < args.size() ? args[i] : static_cast<const Any&>(None);
+}
+
+static RTValue nd_module_reduce(PyArgs args,
+                                const char* func_name,
+                                RTValue (*reduce)(const NDArray&, const Any&, bool)) {
+  MXCHECK(args.size() >= 1 && args.size() <= 3)
+      << func_name << " expect 1 to 3 args, but get " << args.size();
+  auto nd = nd_module_nd_arg(args[0], func_name);
+  const Any& axis = nd_module_opt_arg(args, 1);
+  bool keepdims = args.size() > 2 ? args[2].As<bool>() : false;
+  return reduce(nd, axis, keepdims);
+}
+
+static NDArray nd_module_unary(PyArgs args,
+                               const char* func_name,
+                               NDArray (*func)(const NDArray&, const NDArray*)) {
+  MXCHECK(args.size() == 1 || args.size() == 2)
+      << func_name << " expect 1 or 2 args, but get " << args.size();
+  auto nd = nd_module_nd_arg(args[0], func_name);
+  auto out_nd = nd_module_out_arg(nd_module_opt_arg(args, 1), func_name);
+  return func(nd, &out_nd);
+}
+
+RTValue kernel_nd_module_sum(PyArgs args) {
+  return nd_module_reduce(args, "matx.array.sum", &NDArrayOperate::Sum);
+}
+
+RTValue kernel_nd_module_mean(PyArgs args) {
+  return nd_module_reduce(args, "matx.array.mean", &NDArrayOperate::Mean);
+}
+
+RTValue kernel_nd_module_max(PyArgs args) {
+  return nd_module_reduce(args, "matx.array.max", &NDArrayOperate::Max);
+}
+
+RTValue kernel_nd_module_min(PyArgs args) {
+  return nd_module_reduce(args, "matx.array.min", &NDArrayOperate::Min);
+}
+
+RTValue kernel_nd_module_argmax(PyArgs args) {
+  return nd_module_reduce(args, "matx.array.argmax", &NDArrayOperate::ArgMax);
+}
+
+RTValue kernel_nd_module_argmin(PyArgs args) {
+  return nd_module_reduce(args, "matx.array.argmin", &NDArrayOperate::ArgMin);
+}
+
+NDArray kernel_nd_module_exp(PyArgs args) {
+  return nd_module_unary(args, "matx.array.exp", &NDArrayOperate::Exp);
+}
+
+NDArray kernel_nd_module_log(PyArgs args) {
+  return nd_module_unary(args, "matx.array.log", &NDArrayOperate::Log);
+}
+
+NDArray kernel_nd_module_sqrt(PyArgs args) {
+  return nd_module_unary(args, "matx.array.sqrt", &NDArrayOperate::Sqrt);
+}
+
+NDArray kernel_nd_module_abs(PyArgs args) {
+  return nd_module_unary(args, "matx.array.abs", &NDArrayOperate::Abs);
+}
+
+NDArray kernel_nd_module_clip(PyArgs args) {
+  MXCHECK(args.size() == 3 || args.size() == 4)
+      << "matx.array.clip expect 3 or 4 args, but get " << args.size();
+  auto nd = nd_module_nd_arg(args[0], "matx.array.clip");
+  auto out_nd = nd_module_out_arg(nd_module_opt_arg(args, 3), "matx.array.clip");
+  return NDArrayOperate::Clip(nd, args[1], args[2], &out_nd);
+}
+
+NDArray kernel_nd_module_where(PyArgs args) {
+  MXCHECK(args.size() == 3) << "matx.array.where expect 3 args, but get " << args.size();
+  return NDArrayOperate::Where(args[0], args[1], args[2]);
+}
+
+NDArray kernel_nd_module_cast_scale(PyArgs args) {
+  MXCHECK(args.size() >= 2 && args.size() <= 5)
+      << "matx.array.cast_scale expect 2 to 5 args, but get " << args.size();
+  auto nd = nd_module_nd_arg(args[0], "matx.array.cast_scale");
+  String dtype;
+  if (args[1].type_code() == TypeIndex::kRuntimeUnicode) {
+    dtype = UTF8Encode(args[1].AsNoCheck<unicode_view>());
+  } else {
+    MXCHECK(args[1].type_code() == TypeIndex::kRuntimeString)
+        << "matx.array.cast_scale: dtype must be str, but get " << args[1].type_name();
+    dtype = args[1].AsNoCheck<string_view>();
+  }
+  double scale = args.size() > 2 ? args[2].As<double>() : 1.0;
+  double shift = args.size() > 3 ? args[3].As<double>() : 0.0;
+  auto out_nd = nd_module_out_arg(nd_module_opt_arg(args, 4), "matx.array.cast_scale");
+  return NDArrayOperate::CastScale(nd, DataType(String2DLDataType(dtype)), scale, shift, &out_nd);
+}
+
+NDArray kernel_nd_module_evaluate(PyArgs args) {
+  MXCHECK(args.size() == 2 || args.size() == 3)
+      << "matx.array.evaluate expect 2 or 3 args, but get " << args.size();
+  String expr;
+  if (args[0].type_code() == TypeIndex::kRuntimeUnicode) {
+    expr = UTF8Encode(args[0].AsNoCheck<unicode_view>());
+  } else {
+    MXCHECK(args[0].type_code() == TypeIndex::kRuntimeString)
+        << "matx.array.evaluate: expr must be str, but get " << args[0].type_name();
+    expr = args[0].AsNoCheck<string_view>();
+  }
+  MXCHECK(args[1].type_code() == TypeIndex::kRuntimeDict)
+      << "matx.array.evaluate: operands must be dict, but get " << args[1].type_name();
+  auto out_nd = nd_module_out_arg(nd_module_opt_arg(args, 2), "matx.array.evaluate");
+  return NDArrayOperate::Evaluate(expr.view(), args[1].AsObjectViewNoCheck<Dict>().data(), &out_nd);
+}
+
 void kernel_list_module_sort(PyArgs args) {
   MXCHECK(args.size() == 1 || args.size() == 2)
       << "list_sort expect 1 or 2 args, bug get " << args.size();
@@ -1980,8 +2153,10 @@ RTValue kernel_object_prefix_search_all(const Any& self, PyArgs args) {
 RTValue kernel_object_save(const Any& self, PyArgs args) {
   switch (self.type_code()) {
     case TypeIndex::kRuntimeTrie: {
-      MXCHECK(args.size() == 1) << "trie.save Expect 1 arguments but get " << args.size();
-      return self.ptr<TrieNode>()->save(args[0].As<Unicode>());
+      MXCHECK(args.size() == 1 || args.size() == 2)
+          << "trie.save Expect 1 or 2 arguments but get " << args.size();
+      bool mapped = args.size() == 2 && args[1].As<int64_t>() != 0;
+      return self.ptr<TrieNode>()->save(args[0].As<Unicode>(), mapped);
     } break;
     case TypeIndex::kRuntimeUserData: {
       auto ud_view = self.AsObjectViewNoCheck<UserDataRef>();
@@ -2122,12 +2297,36 @@ RTValue kernel_json_load(PyArgs args) {
 RTValue kernel_json_loads(PyArgs args) {
   MXCHECK(args.size() == 1) << "json.loads Expect 1 arguments but get " << args.size();
   if (args[0].type_code() == TypeIndex::kRuntimeUnicode) {
-    return json_loads(UTF8Encode(args[0].AsNoCheck<unicode_view>()));
+    return json_loads(args[0].AsNoCheck<unicode_view>());
   }
   return json_loads(args[0].As<string_view>());
 }
 
-// RTValue kernel_json_dump(PyArgs args);
+static String JsonFilePath(const Any& path) {
+  if (path.type_code() == TypeIndex::kRuntimeUnicode) {
+    return UTF8Encode(path.AsNoCheck<unicode_view>());
+  }
+  return String(path.As<string_view>());
+}
+
+void kernel_json_dump(PyArgs args) {
+  MXCHECK(args.size() >= 2 && args.size() <= 4)
+      << "json_dump Expect 2-4 arguments but get " << args.size();
+  auto path = JsonFilePath(args[1]);
+  if (args.size() == 2) {
+    return json_dump(args[0], path);
+  }
+  if (args.size() == 3) {
+    return json_dump(args[0], path, args[2].As<int64_t>());
+  }
+  return json_dump(args[0], path, args[2].As<int64_t>(), args[3].As<bool>());
+}
+
+Iterator kernel_json_lines(PyArgs args) {
+  MXCHECK(args.size() == 1) << "json_lines Expect 1 arguments but get " << args.size();
+  return json_lines(JsonFilePath(args[0]));
+}
+
 Unicode kernel_json_dumps(PyArgs args) {
   if (args.size() == 1) {
     return json_dumps(args[0]);
@@ -2136,7 +2335,7 @@ Unicode kernel_json_dumps(PyArgs args) {
     return json_dumps(args[0], args[1].As<int64_t>());
   }
   MXCHECK(args.size() == 3) << "json.loads Expect 1-3 arguments but get " << args.size();
-  return json_dumps(args[0], args[1].As<int64_t>(), args[1].As<int64_t>());
+  return json_dumps(args[0], args[1].As<int64_t>(), args[2].As<bool>());
 }
 
 // file
@@ -19,43 +19,493 @@
  */
 #include <matxscript/runtime/jsonlib/json.h>
 
-#include <rapidjson/document.h>
+#include <cstdio>
+#include <deque>
+#include <fstream>
+#include <memory>
+#include <type_traits>
+#include <unordered_map>
+#include <vector>
 
-#include <matxscript/pipeline/pickle.h>
-#include <matxscript/runtime/json_util.h>
+#include <matxscript/runtime/logging.h>
+#ifndef RAPIDJSON_ASSERT
+#define RAPIDJSON_ASSERT(x) MXCHECK(x)
+#endif
+#include <rapidjson/error/en.h>
+#include <rapidjson/filewritestream.h>
+#include <rapidjson/prettywriter.h>
+#include <rapidjson/reader.h>
+#include <rapidjson/stringbuffer.h>
+#include <rapidjson/writer.h>
+
+#include <matxscript/runtime/container/itertor_private.h>
+#include <matxscript/runtime/container_private.h>
+#include <matxscript/runtime/file_reader.h>
+#include <matxscript/runtime/generic/generic_constructor_funcs.h>
 #include <matxscript/runtime/registry.h>
+#include <matxscript/runtime/utf8/encoders.h>
+#include <matxscript/runtime/utf8_util.h>
 
 namespace matxscript {
 namespace runtime {
 
+namespace {
+
+/******************************************************************************
+ * SAX parser, the values are built on a stack without a rapidjson DOM
+ *****************************************************************************/
+
+// a read-only stream over a buffer which is not null-terminated
+template <typename CharType>
+class JsonViewStream {
+ public:
+  typedef CharType Ch;
+
+  JsonViewStream(const Ch* data, size_t size) : src_(data), begin_(data), end_(data + size) {
+  }
+
+  Ch Peek() const {
+    return src_ == end_ ? Ch(0) : *src_;
+  }
+  Ch Take() {
+    return src_ == end_ ? Ch(0) : *src_++;
+  }
+  size_t Tell() const {
+    return static_cast<size_t>(src_ - begin_);
+  }
+
+  Ch* PutBegin() {
+    RAPIDJSON_ASSERT(false);
+    return nullptr;
+  }
+  void Put(Ch) {
+    RAPIDJSON_ASSERT(false);
+  }
+  void Flush() {
+    RAPIDJSON_ASSERT(false);
+  }
+  size_t PutEnd(Ch*) {
+    RAPIDJSON_ASSERT(false);
+    return 0;
+  }
+
+ private:
+  const Ch* src_;
+  const Ch* begin_;
+  const Ch* end_;
+};
+
+template <typename Ch>
+using JsonCharView =
+    typename std::conditional<std::is_same<Ch, char>::value, string_view, unicode_view>::type;
+
+inline Unicode JsonMakeUnicode(const char* s, size_t len) {
+  return UTF8Decode(s, len);
+}
+
+inline Unicode JsonMakeUnicode(const char32_t* s, size_t len) {
+  return Unicode(s, len);
+}
+
+// The object keys repeat across a document and across the lines of a json-lines file,
+// short keys are decoded once and shared.
+template <typename Ch>
+class JsonKeyCache {
+ public:
+  static constexpr size_t kMaxKeySize = 64;
+  static constexpr size_t kMaxKeyNum = 4096;
+
+  Unicode Get(const Ch* s, size_t len) {
+    if (len > kMaxKeySize) {
+      return JsonMakeUnicode(s, len);
+    }
+    auto it = keys_.find(JsonCharView<Ch>(s, len));
+    if (it != keys_.end()) {
+      return it->second;
+    }
+    Unicode key = JsonMakeUnicode(s, len);
+    if (keys_.size() < kMaxKeyNum) {
+      owned_.emplace_back(s, len);
+      keys_.emplace(JsonCharView<Ch>(owned_.back().data(), len), key);
+    }
+    return key;
+  }
+
+ private:
+  // deque never moves its elements, the views in keys_ stay valid
+  std::deque<std::basic_string<Ch>> owned_;
+  std::unordered_map<JsonCharView<Ch>, Unicode> keys_;
+};
+
+template <typename Ch>
+using JsonEncoding = typename std::
+    conditional<std::is_same<Ch, char>::value, rapidjson::UTF8<>, rapidjson::UTF32<char32_t>>::type;
+
+template <typename Ch>
+class RTValueHandler : public rapidjson::BaseReaderHandler<JsonEncoding<Ch>, RTValueHandler<Ch>> {
+ public:
+  explicit RTValueHandler(JsonKeyCache<Ch>* keys) : keys_(keys) {
+  }
+
+  bool Null() {
+    stack_.emplace_back();
+    return true;
+  }
+  bool Bool(bool b) {
+    stack_.emplace_back(b);
+    return true;
+  }
+  bool Int(int i) {
+    stack_.emplace_back(static_cast<int64_t>(i));
+    return true;
+  }
+  bool Uint(unsigned u) {
+    stack_.emplace_back(static_cast<int64_t>(u));
+    return true;
+  }
+  bool Int64(int64_t i) {
+    stack_.emplace_back(i);
+    return true;
+  }
+  bool Uint64(uint64_t u) {
+    stack_.emplace_back(static_cast<int64_t>(u));
+    return true;
+  }
+  bool Double(double d) {
+    stack_.emplace_back(d);
+    return true;
+  }
+  bool String(const Ch* s, rapidjson::SizeType len, bool) {
+    stack_.emplace_back(JsonMakeUnicode(s, len));
+    return true;
+  }
+  bool Key(const Ch* s, rapidjson::SizeType len, bool) {
+    stack_.emplace_back(keys_->Get(s, len));
+    return true;
+  }
+  bool StartObject() {
+    return true;
+  }
+  bool EndObject(rapidjson::SizeType member_count) {
+    Dict d;
+    d.reserve(member_count);
+    auto first = stack_.end() - 2 * static_cast<ptrdiff_t>(member_count);
+    for (auto it = first; it != stack_.end(); it += 2) {
+      d.set_item(std::move(*it), std::move(*(it + 1)));
+    }
+    stack_.erase(first, stack_.end());
+    stack_.emplace_back(std::move(d));
+    return true;
+  }
+  bool StartArray() {
+    return true;
+  }
+  bool EndArray(rapidjson::SizeType element_count) {
+    List l;
+    l.reserve(element_count);
+    auto first = stack_.end() - static_cast<ptrdiff_t>(element_count);
+    for (auto it = first; it != stack_.end(); ++it) {
+      l.push_back(std::move(*it));
+    }
+    stack_.erase(first, stack_.end());
+    stack_.emplace_back(std::move(l));
+    return true;
+  }
+
+  RTValue Result() {
+    MXCHECK(stack_.size() == 1);
+    RTValue ret = std::move(stack_.back());
+    stack_.clear();
+    return ret;
+  }
+
+ private:
+  JsonKeyCache<Ch>* keys_;
+  std::vector<RTValue> stack_;
+};
+
+// utf-8 input is parsed as is, utf-32 input is parsed without transcoding to utf-8
+template <typename Ch>
+class JsonParser {
+ public:
+  RTValue Parse(const Ch* data, size_t size) {
+    constexpr unsigned flag = rapidjson::kParseNanAndInfFlag;
+    JsonViewStream<Ch> is(data, size);
+    RTValueHandler<Ch> handler(&keys_);
+    auto result = reader_.template Parse<flag>(is, handler);
+    if (result.IsError()) {
+      MXTHROW << "Error(offset " << result.Offset()
+              << "): " << rapidjson::GetParseError_En(result.Code());
+    }
+    return handler.Result();
+  }
+
+ private:
+  JsonKeyCache<Ch> keys_;
+  rapidjson::GenericReader<JsonEncoding<Ch>, JsonEncoding<Ch>> reader_;
+};
+
+/******************************************************************************
+ * json-lines iterator, one value per non-blank line
+ *****************************************************************************/
+
+class JsonLinesIteratorNode : public IteratorNode {
+ public:
+  explicit JsonLinesIteratorNode(string_view path)
+      : path_(path.data(), path.size()), reader_(new FileReader(path, false)) {
+    Advance();
+  }
+  ~JsonLinesIteratorNode() = default;
+
+  bool HasNext() const override {
+    return has_next_;
+  }
+  RTValue Next() override {
+    RTValue ret = std::move(next_);
+    Advance();
+    return ret;
+  }
+  RTValue Next(bool* has_next) override {
+    RTValue ret = std::move(next_);
+    Advance();
+    *has_next = has_next_;
+    return ret;
+  }
+  RTView NextView(bool* has_next, RTValue* holder_or_null) override {
+    *holder_or_null = std::move(next_);
+    Advance();
+    *has_next = has_next_;
+    return *holder_or_null;
+  }
+  int64_t Distance() const override {
+    return -1;
+  }
+
+  uint64_t HashCode() const override {
+    return std::hash<String>()(path_);
+  }
+
+ private:
+  static bool IsBlank(const char* line, size_t len) {
+    for (size_t i = 0; i < len; ++i) {
+      if (line[i] != ' ' && line[i] != '\t' && line[i] != '\r' && line[i] != '\n') {
+        return false;
+      }
+    }
+    return true;
+  }
+
+  void Advance() {
+    const char* line = nullptr;
+    size_t len = 0;
+    while (reader_->ReadLine(&line, &len)) {
+      if (!IsBlank(line, len)) {
+        next_ = parser_.Parse(line, len);
+        has_next_ = true;
+        return;
+      }
+    }
+    has_next_ = false;
+  }
+
+ private:
+  String path_;
+  std::unique_ptr<FileReader> reader_;
+  JsonParser<char> parser_;
+  RTValue next_;
+  bool has_next_ = false;
+};
+
+/******************************************************************************
+ * SAX writer, the values are written to the stream without a rapidjson DOM
+ *****************************************************************************/
+
+template <typename Writer>
+class RTValueJsonWriter {
+ public:
+  explicit RTValueJsonWriter(Writer* writer) : writer_(writer) {
+  }
+
+  void Write(const Any& value) {
+    switch (value.type_code()) {
+      case TypeIndex::kRuntimeNullptr: {
+        writer_->Null();
+      } break;
+      case TypeIndex::kRuntimeInteger: {
+        writer_->Int64(value.AsNoCheck<int64_t>());
+      } break;
+      case TypeIndex::kRuntimeFloat: {
+        writer_->Double(value.AsNoCheck<double>());
+      } break;
+      case TypeIndex::kRuntimeString: {
+        auto s = value.AsNoCheck<string_view>();
+        WriteString(s.data(), s.size(), false);
+      } break;
+      case TypeIndex::kRuntimeUnicode: {
+        WriteUnicode(value.AsNoCheck<unicode_view>(), false);
+      } break;
+      case TypeIndex::kRuntimeList: {
+        auto view = value.AsObjectViewNoCheck<List>();
+        writer_->StartArray();
+        for (auto& item : view.data()) {
+          Write(item);
+        }
+        writer_->EndArray();
+      } break;
+      case TypeIndex::kRuntimeTuple: {
+        auto view = value.AsObjectViewNoCheck<Tuple>();
+        writer_->StartArray();
+        for (auto& item : view.data()) {
+          Write(item);
+        }
+        writer_->EndArray();
+      } break;
+      case TypeIndex::kRuntimeDict: {
+        auto view = value.AsObjectViewNoCheck<Dict>();
+        writer_->StartObject();
+        for (auto item : view.data().items()) {
+          WriteKey(item.first);
+          Write(item.second);
+        }
+        writer_->EndObject();
+      } break;
+      default: {
+        MXTHROW << "[ToJson] unsupported runtime value type: " << value.type_name();
+      } break;
+    }
+  }
+
+ private:
+  void WriteKey(const Any& key) {
+    switch (key.type_code()) {
+      // TODO(wuxian): fix bool
+      // case TypeIndex::kRuntimeBool:
+      case TypeIndex::kRuntimeInteger:
+      case TypeIndex::kRuntimeFloat: {
+        WriteUnicode(Kernel_Unicode::make(key), true);
+      } break;
+      case TypeIndex::kRuntimeUnicode: {
+        WriteUnicode(key.AsNoCheck<unicode_view>(), true);
+      } break;
+      case TypeIndex::kRuntimeNullptr: {
+        WriteString("null", 4, true);
+      } break;
+      default:
+        MXTHROW << "keys must be str, int, float, bool or None, not " << key.type_name();
+    }
+  }
+
+  void WriteUnicode(unicode_view s, bool is_key) {
+    auto* first = reinterpret_cast<const uint32_t*>(s.data());
+    buffer_.resize(utf8_details::GreedyCountBytesSize(first, first + s.size()));
+    utf8_details::GreedyEncoder(
+        first, first + s.size(), reinterpret_cast<unsigned char*>(&buffer_[0]));
+    WriteString(buffer_.data(), buffer_.size(), is_key);
+  }
+
+  void WriteString(const char* s, size_t len, bool is_key) {
+    auto size = static_cast<rapidjson::SizeType>(len);
+    bool ok = is_key ? writer_->Key(s, size) : writer_->String(s, size);
+    MXCHECK(ok) << "[ToJson] invalid utf-8 string";
+  }
+
+ private:
+  Writer* writer_;
+  // reused for the utf-8 bytes of each str
+  std::string buffer_;
+};
+
+template <typename OutputStream, typename TargetEncoding>
+void DumpJson(const Any& obj, OutputStream& os, int indent) {
+  constexpr unsigned flag = rapidjson::kWriteValidateEncodingFlag | rapidjson::kWriteNanAndInfFlag;
+  if (indent < 0) {
+    using Writer = rapidjson::
+        Writer<OutputStream, rapidjson::UTF8<>, TargetEncoding, rapidjson::CrtAllocator, flag>;
+    Writer writer(os);
+    RTValueJsonWriter<Writer>(&writer).Write(obj);
+  } else {
+    using Writer = rapidjson::PrettyWriter<OutputStream,
+                                           rapidjson::UTF8<>,
+                                           TargetEncoding,
+                                           rapidjson::CrtAllocator,
+                                           flag>;
+    Writer writer(os);
+    writer.SetIndent(' ', indent);
+    RTValueJsonWriter<Writer>(&writer).Write(obj);
+  }
+}
+
+template <typename OutputStream>
+void DumpJson(const Any& obj, OutputStream& os, int indent, bool ensure_ascii) {
+  if (ensure_ascii) {
+    DumpJson<OutputStream, rapidjson::ASCII<>>(obj, os, indent);
+  } else {
+    DumpJson<OutputStream, rapidjson::UTF8<>>(obj, os, indent);
+  }
+}
+
+String ReadFileContent(string_view path) {
+  std::ifstream ifs(path.data(), std::ios::in | std::ios::binary);
+  if (!ifs) {
+    MXTHROW << "Can't open the file. Please check " << path;
+  }
+  ifs.seekg(0, std::ios::end);
+  auto length = static_cast<std::size_t>(ifs.tellg());
+  ifs.seekg(0, std::ios::beg);
+  String::ContainerType buffer(length, String::ContainerType::NoInit{});
+  ifs.read(buffer.data(), length);
+  return String(std::move(buffer));
+}
+
+}  // namespace
+
+// the parsers are kept per thread so that the keys are shared across the documents
 RTValue json_loads(string_view s) {
-  rapidjson::Document doc;
-  JsonUtil::FromString(s, doc);
-  return pickle::FromJson(doc, true);
+  thread_local JsonParser<char> parser;
+  return parser.Parse(s.data(), s.size());
+}
+
+RTValue json_loads(unicode_view s) {
+  thread_local JsonParser<char32_t> parser;
+  return parser.Parse(s.data(), s.size());
 }
 
 RTValue json_load(const File& fp) {
-  rapidjson::Document doc;
   // TODO(wuxian): refactor JsonUtil or abandon it
-  JsonUtil::FromFile(fp.path().data(), doc);
-  return pickle::FromJson(doc, true);
+  return json_loads(ReadFileContent(fp.path()));
+}
+
+Iterator json_lines(string_view path) {
+  auto data = make_object<JsonLinesIteratorNode>(path);
+  return Iterator(std::move(data));
 }
 
 Unicode json_dumps(const Any& obj, int indent, bool ensure_ascii) {
-  rapidjson::Document doc;
-  pickle::ToJson(obj, doc, doc.GetAllocator());
-  if (indent == -1) {
-    return JsonUtil::ToString(&doc, false, ensure_ascii).decode();
-  } else {
-    return JsonUtil::ToString(&doc, true, ensure_ascii, indent).decode();
-  }
+  rapidjson::StringBuffer buffer;
+  DumpJson(obj, buffer, indent, ensure_ascii);
+  return UTF8Decode(buffer.GetString(), buffer.GetSize());
 }
 
-// RTValue json_dump(const RTValue& obj, const File& fp) {
-// TODO(wuxian): Need a file class that supports write operations
-// }
+void json_dump(const Any& obj, string_view path, int indent, bool ensure_ascii) {
+  String path_s(path.data(), path.size());
+  std::unique_ptr<FILE, int (*)(FILE*)> fp(fopen(path_s.c_str(), "wb"), &fclose);
+  MXCHECK(fp != nullptr) << "Can't open the file. Please check " << path;
+  char buffer[65536];
+  rapidjson::FileWriteStream os(fp.get(), buffer, sizeof(buffer));
+  DumpJson(obj, os, indent, ensure_ascii);
+  os.Flush();
+}
 
 MATXSCRIPT_REGISTER_GLOBAL("runtime.JsonDumps").set_body_typed(json_dumps);
 
+MATXSCRIPT_REGISTER_GLOBAL("runtime.JsonDump")
+    .set_body_typed([](const Any& obj, const Unicode& path, int indent, bool ensure_ascii) {
+      json_dump(obj, path.encode(), indent, ensure_ascii);
+    });
+
+MATXSCRIPT_REGISTER_GLOBAL("runtime.JsonLines").set_body_typed([](const Unicode& path) {
+  return json_lines(path.encode());
+});
+
 }  // namespace runtime
 }  // namespace matxscript
@@ -0,0 +1,101 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#include <matxscript/runtime/latency_histogram.h>
+
+#include <cstdio>
+
+namespace matxscript {
+namespace runtime {
+
+namespace {
+
+// all the digits of the micros, the default stream precision of 6 significant digits
+// would flatten the sum once it passes 1000 seconds
+void WriteSeconds(std::ostream& os, uint64_t micros) {
+  char buf[32];
+  snprintf(buf,
+           sizeof(buf),
+           "%llu.%06llu",
+           static_cast<unsigned long long>(micros / 1000000),
+           static_cast<unsigned long long>(micros % 1000000));
+  os << buf;
+}
+
+}  // namespace
+
+const uint64_t LatencyHistogram::kBucketBounds[LatencyHistogram::kNumBounds] = {
+    10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000, 500000,
+    1000000};
+
+void LatencyHistogram::Observe(uint64_t micros) noexcept {
+  int i = 0;
+  while (i < kNumBounds && micros > kBucketBounds[i]) {
+    ++i;
+  }
+  buckets_[i].fetch_add(1, std::memory_order_relaxed);
+  sum_.fetch_add(micros, std::memory_order_relaxed);
+  count_.fetch_add(1, std::memory_order_relaxed);
+}
+
+void LatencyHistogram::Reset() noexcept {
+  for (auto& bucket : buckets_) {
+    bucket.store(0, std::memory_order_relaxed);
+  }
+  count_.store(0, std::memory_order_relaxed);
+  sum_.store(0, std::memory_order_relaxed);
+}
+
+Dict LatencyHistogram::ToDict() const {
+  List buckets;
+  buckets.reserve(kNumBounds + 1);
+  uint64_t cumulative = 0;
+  for (int i = 0; i <= kNumBounds; ++i) {
+    cumulative += buckets_[i].load(std::memory_order_relaxed);
+    int64_t le = i < kNumBounds ? static_cast<int64_t>(kBucketBounds[i]) : -1;
+    buckets.push_back(Tuple::dynamic(le, static_cast<int64_t>(cumulative)));
+  }
+  Dict d;
+  d[U"count"] = static_cast<int64_t>(Count());
+  d[U"sum_us"] = static_cast<int64_t>(SumMicros());
+  d[U"buckets"] = std::move(buckets);
+  return d;
+}
+
+void LatencyHistogram::WritePrometheus(std::ostream& os,
+                                       const string_view& name,
+                                       const string_view& labels) const {
+  const char* sep = labels.empty() ? "" : ",";
+  uint64_t cumulative = 0;
+  for (int i = 0; i < kNumBounds; ++i) {
+    cumulative += buckets_[i].load(std::memory_order_relaxed);
+    os << name << "_bucket{" << labels << sep << "le=\"";
+    WriteSeconds(os, kBucketBounds[i]);
+    os << "\"} " << cumulative << "\n";
+  }
+  cumulative += buckets_[kNumBounds].load(std::memory_order_relaxed);
+  os << name << "_bucket{" << labels << sep << "le=\"+Inf\"} " << cumulative << "\n";
+  os << name << "_sum{" << labels << "} ";
+  WriteSeconds(os, SumMicros());
+  os << "\n";
+  os << name << "_count{" << labels << "} " << cumulative << "\n";
+}
+
+}  // namespace runtime
+}  // namespace matxscript
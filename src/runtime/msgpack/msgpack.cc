@@ -21,6 +21,8 @@
 
 #include <stddef.h>
 #include <stdint.h>
+#include <algorithm>
+#include <cstring>
 #include <memory>
 
 #include "pack.h"
@@ -40,12 +42,21 @@ namespace serialization {
 
 static constexpr long long ITEM_LIMIT = (2LL << 31) - 1;
 
+// an NDArray with a pad before the meta, so that its data is aligned in the stream:
+// | pad size: uint8 | pad | dtype | ndim | shape | data |
+static constexpr int8_t kAlignedNDArrayExtType = 66;
+static constexpr size_t kNDArrayAlignment = 64;
+// the smallest chunk allocated by MessageStreamUnpacker
+static constexpr size_t kMinStreamChunkSize = 1024 * 1024;
+
 struct MessagePackerOptions {
   bool use_single_float = false;
   bool autoreset = true;
   bool use_bin_type = true;
   bool strict_types = false;
   bool datetime = false;
+  // pack NDArray as kAlignedNDArrayExtType
+  bool align_ndarray = false;
   size_t buf_size = 1024 * 1024;
 };
 
@@ -65,8 +76,11 @@ struct BasicMessagePacker {
  private:
   MessagePackerOptions options_;
   msgpack_packer msg_pk_;
+  // the stream offset of the packing buffer
+  size_t stream_offset_ = 0;
 
   friend class MessagePacker;
+  friend class MessageStreamPacker;
 };
 
 BasicMessagePacker::BasicMessagePacker(MessagePackerOptions options) {
@@ -221,14 +235,39 @@ int BasicMessagePacker::pack(const Any& o, int nest_limit) {
       auto v = o.AsObjectRefNoCheck<NDArray>();
       const DLTensor* dl_tensor = v.operator->();
       auto data_size = GetDataSize(*dl_tensor);
-      L = sizeof(DLDataType)                                       // dtype
-          + sizeof(int32_t) + (sizeof(int64_t) * dl_tensor->ndim)  // shape
-          + data_size;                                             // data
-      ret = msgpack_pack_ext(&this->msg_pk_, TypeIndex::kRuntimeNDArray, L);
+      size_t meta_size = sizeof(DLDataType)                                        // dtype
+                         + sizeof(int32_t) + (sizeof(int64_t) * dl_tensor->ndim);  // shape
+      size_t pad = 0;
+      if (this->options_.align_ndarray) {
+        // always an ext32 header, so the pad can be computed before the header is written
+        size_t data_offset = this->stream_offset_ + this->msg_pk_.length + 6 + 1 + meta_size;
+        pad = (kNDArrayAlignment - data_offset % kNDArrayAlignment) % kNDArrayAlignment;
+        L = 1 + pad + meta_size + data_size;
+        if (L > ITEM_LIMIT) {
+          THROW_PY_ValueError("ndarray is too large");
+        }
+        unsigned char header[6];
+        header[0] = 0xc9;
+        _msgpack_store32(&header[1], static_cast<uint32_t>(L));
+        header[5] = static_cast<unsigned char>(kAlignedNDArrayExtType);
+        ret = msgpack_pack_write(&this->msg_pk_, reinterpret_cast<const char*>(header), 6);
+      } else {
+        L = meta_size + data_size;
+        if (L > ITEM_LIMIT) {
+          THROW_PY_ValueError("ndarray is too large");
+        }
+        ret = msgpack_pack_ext(&this->msg_pk_, TypeIndex::kRuntimeNDArray, L);
+      }
       CHECK_MSGPACK_CALL(ret, "pack ndarray failed");
       ret = msgpack_pack_extend_write_buf(&this->msg_pk_, L);
       CHECK_MSGPACK_CALL(ret, "pack ndarray failed");
       char* write_buf = this->msg_pk_.buf + this->msg_pk_.length - L;
+      if (this->options_.align_ndarray) {
+        *write_buf = static_cast<char>(pad);
+        write_buf++;
+        std::memset(write_buf, 0, pad);
+        write_buf += pad;
+      }
       // dtype
       std::memcpy(write_buf, &(dl_tensor->dtype.code), 1);
       write_buf++;
@@ -279,25 +318,65 @@ String MessagePacker::pack(const Any& o, const MessagePackerOptions& options, in
  * unpack
  *****************************************************************************/
 
+struct BufferTensorContext {
+  std::shared_ptr<void> owner;
+  std::vector<int64_t> shape;
+  DLManagedTensor tensor;
+};
+
+static void BufferTensorDeleter(DLManagedTensor* self) {
+  delete static_cast<BufferTensorContext*>(self->manager_ctx);
+}
+
+// the objects of the unfinished containers are not owned by the root yet,
+// the context is empty afterwards
+static void unpack_clear_all(unpack_context* ctx) {
+  for (unsigned int i = 1; i < ctx->top; ++i) {
+    if (ctx->stack[i - 1].ct == CT_MAP_VALUE) {
+      msgpack_unpack_object_destroy(&(ctx->stack[i - 1].map_key));
+    }
+    msgpack_unpack_object_destroy(&(ctx->stack[i].obj));
+  }
+  if (ctx->top > 0 && ctx->stack[ctx->top - 1].ct == CT_MAP_VALUE) {
+    msgpack_unpack_object_destroy(&(ctx->stack[ctx->top - 1].map_key));
+  }
+  unpack_clear(ctx);
+  unpack_init(ctx);
+}
+
 struct MessageUnpacker {
   static constexpr int DEFAULT_RECURSE_LIMIT = 511;
 
  public:
-  static int custom_ext_callback(int8_t typecode,
+  static int custom_ext_callback(unpack_user* u,
+                                 int8_t typecode,
                                  const char* pos,
                                  unsigned int length,
                                  msgpack_unpack_object* o);
 
-  static RTValue unpackb(const string_view& packed, bool use_list);
+  static NDArray unpack_ndarray(const unpack_user* u, const char* pos, unsigned int length);
+
+  static void init_context(unpack_context* ctx,
+                           bool use_list,
+                           const std::shared_ptr<void>* buffer_owner);
+
+  // parse packed from *off on, returns 1 and the object if it is complete, or 0 if more data
+  // is needed, ctx then keeps the parse state and the next call resumes from *off
+  static int unpack_resume(unpack_context* ctx, const string_view& packed, size_t* off, RTValue* obj);
+
+  static RTValue unpackb(const string_view& packed,
+                         bool use_list,
+                         const std::shared_ptr<void>* buffer_owner = nullptr);
 };
 
-int MessageUnpacker::custom_ext_callback(int8_t typecode,
+int MessageUnpacker::custom_ext_callback(unpack_user* u,
+                                         int8_t typecode,
                                          const char* pos,
                                          unsigned int length,
                                          msgpack_unpack_object* o) {
   switch (typecode) {
     case TypeIndex::kRuntimeSet: {
-      auto value = MessageUnpacker::unpackb(string_view(pos, length), false);
+      auto value = MessageUnpacker::unpackb(string_view(pos, length), false, u->buffer_owner);
       if (!value.IsObjectRef<Tuple>()) {
         THROW_PY_ValueError("Unpack failed: Set Format Error");
       }
@@ -306,40 +385,13 @@ int MessageUnpacker::custom_ext_callback(int8_t typecode,
           .MoveToCHost(o);
     } break;
     case TypeIndex::kRuntimeNDArray: {
-      const char* buf = pos;
-      MXCHECK(length >= (4 + sizeof(int32_t))) << "Msgpack: Invalid NDArray Data Format";
-      // dtype
-      DLDataType dtype;
-      std::memcpy(&dtype.code, buf, 1);
-      buf += 1;
-      std::memcpy(&dtype.bits, buf, 1);
-      buf += 1;
-      std::memcpy(&dtype.lanes, buf, 2);
-      buf += 2;
-      // shape
-      int32_t ndim;
-      std::memcpy(&ndim, buf, sizeof(int32_t));
-      buf += sizeof(int32_t);
-      MXCHECK(length >= (4 + sizeof(int32_t) + ndim * sizeof(int64_t)))
-          << "Msgpack: Invalid NDArray Data Format";
-      std::vector<int64_t> shapes;
-      shapes.reserve(ndim);
-      size_t size = 1;
-      for (int i = 0; i < ndim; ++i) {
-        int64_t shape;
-        std::memcpy(&shape, buf, sizeof(int64_t));
-        buf += sizeof(int64_t);
-        shapes.emplace_back(shape);
-        size *= static_cast<size_t>(shape);
-      }
-      size *= (dtype.bits * dtype.lanes + 7) / 8;
-      MXCHECK_EQ(length, (4 + sizeof(int32_t) + ndim * sizeof(int64_t) + size))
-          << "Msgpack: Invalid NDArray Data Format";
-      // data
-      DLDevice device{kDLCPU, 0};
-      auto arr = NDArray::Empty(std::move(shapes), dtype, device);
-      arr.CopyFromBytes(buf, size);
-      RTValue(std::move(arr)).MoveToCHost(o);
+      RTValue(unpack_ndarray(u, pos, length)).MoveToCHost(o);
+    } break;
+    case kAlignedNDArrayExtType: {
+      MXCHECK(length >= 1) << "Msgpack: Invalid NDArray Data Format";
+      unsigned int pad = static_cast<unsigned char>(pos[0]);
+      MXCHECK(length >= 1 + pad) << "Msgpack: Invalid NDArray Data Format";
+      RTValue(unpack_ndarray(u, pos + 1 + pad, length - 1 - pad)).MoveToCHost(o);
     } break;
     default: {
       THROW_PY_ValueError("Unpack failed: unknown ext type code: ", typecode);
@@ -349,35 +401,219 @@ int MessageUnpacker::custom_ext_callback(int8_t typecode,
   return 0;
 }
 
-RTValue MessageUnpacker::unpackb(const string_view& packed, bool use_list) {
-  unpack_context ctx;
-  size_t off = 0;
-  int ret;
-  const char* buf = packed.data();
-  size_t buf_len = packed.size();
+NDArray MessageUnpacker::unpack_ndarray(const unpack_user* u,
+                                        const char* pos,
+                                        unsigned int length) {
+  const char* buf = pos;
+  MXCHECK(length >= (4 + sizeof(int32_t))) << "Msgpack: Invalid NDArray Data Format";
+  // dtype
+  DLDataType dtype;
+  std::memcpy(&dtype.code, buf, 1);
+  buf += 1;
+  std::memcpy(&dtype.bits, buf, 1);
+  buf += 1;
+  std::memcpy(&dtype.lanes, buf, 2);
+  buf += 2;
+  // shape
+  int32_t ndim;
+  std::memcpy(&ndim, buf, sizeof(int32_t));
+  buf += sizeof(int32_t);
+  MXCHECK(length >= (4 + sizeof(int32_t) + ndim * sizeof(int64_t)))
+      << "Msgpack: Invalid NDArray Data Format";
+  std::vector<int64_t> shapes;
+  shapes.reserve(ndim);
+  size_t size = 1;
+  for (int i = 0; i < ndim; ++i) {
+    int64_t shape;
+    std::memcpy(&shape, buf, sizeof(int64_t));
+    buf += sizeof(int64_t);
+    shapes.emplace_back(shape);
+    size *= static_cast<size_t>(shape);
+  }
+  size *= (dtype.bits * dtype.lanes + 7) / 8;
+  MXCHECK_EQ(length, (4 + sizeof(int32_t) + ndim * sizeof(int64_t) + size))
+      << "Msgpack: Invalid NDArray Data Format";
+  // data
+  DLDevice device{kDLCPU, 0};
+  size_t alignment = std::min<size_t>(8, std::max<size_t>(1, dtype.bits / 8));
+  if (u->buffer_owner && size > 0 && reinterpret_cast<uintptr_t>(buf) % alignment == 0) {
+    // a view which keeps the buffer alive
+    auto* ctx = new BufferTensorContext{*u->buffer_owner, std::move(shapes), {}};
+    auto& dl_tensor = ctx->tensor.dl_tensor;
+    dl_tensor.data = const_cast<char*>(buf);
+    dl_tensor.device = device;
+    dl_tensor.ndim = ndim;
+    dl_tensor.dtype = dtype;
+    dl_tensor.shape = ctx->shape.data();
+    dl_tensor.strides = nullptr;
+    dl_tensor.byte_offset = 0;
+    ctx->tensor.manager_ctx = ctx;
+    ctx->tensor.deleter = BufferTensorDeleter;
+    return NDArray::FromDLPack(&ctx->tensor);
+  }
+  auto arr = NDArray::Empty(std::move(shapes), dtype, device);
+  arr.CopyFromBytes(buf, size);
+  return arr;
+}
 
-  unpack_init(&ctx);
-  ctx.user.use_list = use_list;
-  ctx.user.ext_hook = MessageUnpacker::custom_ext_callback;
+void MessageUnpacker::init_context(unpack_context* ctx,
+                                   bool use_list,
+                                   const std::shared_ptr<void>* buffer_owner) {
+  unpack_init(ctx);
+  ctx->user.use_list = use_list;
+  ctx->user.ext_hook = MessageUnpacker::custom_ext_callback;
+  ctx->user.buffer_owner = buffer_owner;
+  ctx->user.error = nullptr;
+}
 
-  ret = unpack_construct(&ctx, buf, buf_len, &off);
+int MessageUnpacker::unpack_resume(unpack_context* ctx,
+                                   const string_view& packed,
+                                   size_t* off,
+                                   RTValue* obj) {
+  int ret = unpack_construct(ctx, packed.data(), packed.size(), off);
   if (ret == 1) {
-    auto obj = unpack_data(&ctx);
-    if (off < buf_len) {
-      THROW_PY_ValueError("ExtraData: ", string_view(buf + off, buf_len - off));
-    }
-    return RTValue::MoveFromCHost(&obj);
+    auto data = unpack_data(ctx);
+    *obj = RTValue::MoveFromCHost(&data);
+    return ret;
   }
-  unpack_clear(&ctx);
   if (ret == 0) {
-    THROW_PY_ValueError("Unpack failed: incomplete input");
-  } else if (ret == -2) {
+    return ret;
+  }
+  unpack_clear_all(ctx);
+  if (ctx->user.error) {
+    std::exception_ptr error = std::move(ctx->user.error);
+    ctx->user.error = nullptr;
+    std::rethrow_exception(error);
+  }
+  if (ret == -2) {
     THROW_PY_ValueError("Unpack failed: FormatError");
   } else if (ret == -3) {
     THROW_PY_ValueError("Unpack failed: StackError");
   }
   THROW_PY_ValueError("Unpack failed: error = ", ret);
-  return None;
+  return ret;
+}
+
+RTValue MessageUnpacker::unpackb(const string_view& packed,
+                                 bool use_list,
+                                 const std::shared_ptr<void>* buffer_owner) {
+  unpack_context ctx;
+  init_context(&ctx, use_list, buffer_owner);
+  size_t off = 0;
+  RTValue obj;
+  if (unpack_resume(&ctx, packed, &off, &obj) == 0) {
+    unpack_clear_all(&ctx);
+    THROW_PY_ValueError("Unpack failed: incomplete input");
+  }
+  if (off < packed.size()) {
+    THROW_PY_ValueError("ExtraData: ", packed.substr(off));
+  }
+  return obj;
+}
+
+/******************************************************************************
+ * stream
+ *****************************************************************************/
+
+MessageStreamPacker::MessageStreamPacker(bool align_ndarray) {
+  MessagePackerOptions options;
+  options.align_ndarray = align_ndarray;
+  packer_.reset(new BasicMessagePacker(options));
+}
+
+MessageStreamPacker::~MessageStreamPacker() = default;
+
+String MessageStreamPacker::pack(const Any& obj) {
+  packer_->msg_pk_.length = 0;
+  packer_->stream_offset_ = offset_;
+  int ret = packer_->pack(obj, MessagePacker::DEFAULT_RECURSE_LIMIT);
+  if (ret != 0) {
+    THROW_PY_RuntimeError("msgpack: serialization error");
+  }
+  offset_ += packer_->msg_pk_.length;
+  return String{packer_->msg_pk_.buf, packer_->msg_pk_.length};
+}
+
+MessageStreamUnpacker::MessageStreamUnpacker(bool zero_copy)
+    : zero_copy_(zero_copy), ctx_(new unpack_context) {
+  MessageUnpacker::init_context(ctx_.get(), true, zero_copy_ ? &owner_ : nullptr);
+}
+
+MessageStreamUnpacker::~MessageStreamUnpacker() {
+  // the containers of an incomplete record
+  unpack_clear_all(ctx_.get());
+}
+
+void MessageStreamUnpacker::reset_context() {
+  // a finished record is moved out and a failed one is released by unpack_resume
+  MessageUnpacker::init_context(ctx_.get(), true, zero_copy_ ? &owner_ : nullptr);
+  parsed_ = 0;
+}
+
+void MessageStreamUnpacker::feed(string_view data) {
+  if (data.empty()) {
+    return;
+  }
+  if (tail_ + data.size() > capacity_) {
+    // a byte is put at (its stream offset % kNDArrayAlignment) of an aligned chunk,
+    // so the data of an aligned NDArray is aligned in memory too
+    size_t pending = tail_ - head_;
+    size_t start = static_cast<size_t>(offset_) % kNDArrayAlignment;
+    size_t need = start + pending + data.size();
+    if (chunk_ != nullptr && chunk_.use_count() == 1 && need <= capacity_) {
+      // no view refers to the chunk, move the pending bytes to the front
+      std::memmove(base_ + start, base_ + head_, pending);
+    } else {
+      size_t capacity = std::max(need * 2, kMinStreamChunkSize);
+      std::shared_ptr<char> chunk(new char[capacity + kNDArrayAlignment],
+                                  std::default_delete<char[]>());
+      auto addr = reinterpret_cast<uintptr_t>(chunk.get());
+      char* base = chunk.get() + (kNDArrayAlignment - addr % kNDArrayAlignment) % kNDArrayAlignment;
+      if (pending > 0) {
+        std::memcpy(base + start, base_ + head_, pending);
+      }
+      // the old chunk is kept by the views into it
+      chunk_ = std::move(chunk);
+      base_ = base;
+      capacity_ = capacity;
+    }
+    head_ = start;
+    tail_ = start + pending;
+  }
+  std::memcpy(base_ + tail_, data.data(), data.size());
+  tail_ += data.size();
+}
+
+bool MessageStreamUnpacker::next(RTValue* record) {
+  if (head_ + parsed_ == tail_) {
+    return false;
+  }
+  if (zero_copy_) {
+    owner_ = chunk_;
+  }
+  size_t off = parsed_;
+  int ret;
+  try {
+    ret = MessageUnpacker::unpack_resume(
+        ctx_.get(), string_view(base_ + head_, tail_ - head_), &off, record);
+  } catch (...) {
+    owner_.reset();
+    reset_context();
+    throw;
+  }
+  owner_.reset();
+  if (ret == 0) {
+    parsed_ = off;
+    return false;
+  }
+  head_ += off;
+  offset_ += off;
+  reset_context();
+  if (head_ == tail_ && chunk_.use_count() == 1) {
+    // all data is consumed and no view refers to the chunk, reuse it from the front
+    head_ = tail_ = static_cast<size_t>(offset_) % kNDArrayAlignment;
+  }
+  return true;
 }
 
 /******************************************************************************
@@ -388,6 +624,21 @@ RTValue msgpack_loads(const string_view& s) {
   return MessageUnpacker::unpackb(s, true);
 }
 
+RTValue msgpack_loads(const String& s, bool zero_copy) {
+  if (!zero_copy) {
+    return MessageUnpacker::unpackb(s.view(), true);
+  }
+  // the views are writable NDArrays, so they refer to a private copy of s. The buffer of s
+  // may be shared by other Strings, which must not see the writes.
+  std::shared_ptr<char> buffer(new char[s.size() + kNDArrayAlignment],
+                               std::default_delete<char[]>());
+  auto addr = reinterpret_cast<uintptr_t>(buffer.get());
+  char* base = buffer.get() + (kNDArrayAlignment - addr % kNDArrayAlignment) % kNDArrayAlignment;
+  std::memcpy(base, s.data(), s.size());
+  std::shared_ptr<void> owner = std::move(buffer);
+  return MessageUnpacker::unpackb(string_view(base, s.size()), true, &owner);
+}
+
 String msgpack_dumps(const Any& obj) {
   MessagePackerOptions options;
   return MessagePacker::pack(obj, options);
@@ -17,6 +17,9 @@
  */
 #pragma once
 
+#include <exception>
+#include <memory>
+
 #include <matxscript/runtime/container.h>
 #include <matxscript/runtime/container_private.h>
 #include <matxscript/runtime/runtime_value.h>
@@ -32,7 +35,10 @@ namespace serialization {
 
 typedef MATXScriptAny msgpack_unpack_object;
 
-typedef int (*MessagePackExtensionCallBack)(int8_t typecode,
+struct unpack_user;
+
+typedef int (*MessagePackExtensionCallBack)(unpack_user* u,
+                                            int8_t typecode,
                                             const char* pos,
                                             unsigned int length,
                                             msgpack_unpack_object* o);
@@ -40,12 +46,28 @@ typedef int (*MessagePackExtensionCallBack)(int8_t typecode,
 typedef struct unpack_user {
     bool use_list;
     MessagePackExtensionCallBack ext_hook;
+    // the owner of the unpacked buffer, NDArray values may be views into the buffer if not null
+    const std::shared_ptr<void>* buffer_owner;
+    // the exception of a callback, it is rethrown after the unfinished containers are released
+    std::exception_ptr error;
 } unpack_user;
 
 struct unpack_context;
 typedef struct unpack_context unpack_context;
 typedef int (*execute_fn)(unpack_context *ctx, const char* data, size_t len, size_t* off);
 
+// a throwing callback returns -1 instead, so unpack_execute records the stack before it exits
+template <typename FUNC>
+static inline int unpack_callback_guard(unpack_user* u, FUNC func)
+{
+    try {
+        return func();
+    } catch (...) {
+        u->error = std::current_exception();
+        return -1;
+    }
+}
+
 static inline msgpack_unpack_object msgpack_unpack_object_init()
 {
     return msgpack_unpack_object{0, 0, TypeIndex::kRuntimeNullptr};
@@ -145,29 +167,35 @@ static inline int unpack_callback_false(unpack_user* u, msgpack_unpack_object* o
 
 static inline int unpack_callback_array(unpack_user* u, unsigned int n, msgpack_unpack_object* o)
 {
-    if (u->use_list) {
-        List li;
-        li.reserve(n);
-        RTValue(std::move(li)).MoveToCHost(o);
-    } else {
-        auto new_node = make_inplace_array_object<TupleNode, RTValue>(n);
-        new_node->size = 0;
-        RTValue(Tuple(std::move(new_node))).MoveToCHost(o);
-    }
-    return 0;
+    return unpack_callback_guard(u, [&]() {
+        if (u->use_list) {
+            List li;
+            li.reserve(n);
+            RTValue(std::move(li)).MoveToCHost(o);
+        } else {
+            auto new_node = make_inplace_array_object<TupleNode, RTValue>(n);
+            new_node->size = 0;
+            RTValue(Tuple(std::move(new_node))).MoveToCHost(o);
+        }
+        return 0;
+    });
 }
 
 static inline int unpack_callback_array_item(unpack_user* u, unsigned int current, msgpack_unpack_object* c, msgpack_unpack_object o)
 {
-    if (u->use_list) {
-        reinterpret_cast<ListNode*>(c->data.v_handle)->emplace_back(RTValue::MoveFromCHost(&o));
-    } else {
-        auto* tup_node = reinterpret_cast<TupleNode*>(c->data.v_handle);
-        tup_node->EmplaceInit(current, RTValue::MoveFromCHost(&o));
-        // Only increment size after the initialization succeeds
-        tup_node->size++;
-    }
-    return 0;
+    // o is owned by the container or released, even if this fails
+    RTValue item = RTValue::MoveFromCHost(&o);
+    return unpack_callback_guard(u, [&]() {
+        if (u->use_list) {
+            reinterpret_cast<ListNode*>(c->data.v_handle)->emplace_back(std::move(item));
+        } else {
+            auto* tup_node = reinterpret_cast<TupleNode*>(c->data.v_handle);
+            tup_node->EmplaceInit(current, std::move(item));
+            // Only increment size after the initialization succeeds
+            tup_node->size++;
+        }
+        return 0;
+    });
 }
 
 static inline int unpack_callback_array_end(unpack_user* u, msgpack_unpack_object* c)
@@ -177,17 +205,24 @@ static inline int unpack_callback_array_end(unpack_user* u, msgpack_unpack_objec
 
 static inline int unpack_callback_map(unpack_user* u, unsigned int n, msgpack_unpack_object* o)
 {
-    Dict d;
-    d.reserve(n);
-    RTValue(std::move(d)).MoveToCHost(o);
-    return 0;
+    return unpack_callback_guard(u, [&]() {
+        Dict d;
+        d.reserve(n);
+        RTValue(std::move(d)).MoveToCHost(o);
+        return 0;
+    });
 }
 
 static inline int unpack_callback_map_item(unpack_user* u, unsigned int current, msgpack_unpack_object* c, msgpack_unpack_object k, msgpack_unpack_object v)
 {
-    auto* dict_node = reinterpret_cast<DictNode*>(c->data.v_handle);
-    dict_node->emplace(RTValue::MoveFromCHost(&k), RTValue::MoveFromCHost(&v));
-    return 0;
+    // k and v are owned by the dict or released, even if this fails
+    RTValue key = RTValue::MoveFromCHost(&k);
+    RTValue value = RTValue::MoveFromCHost(&v);
+    return unpack_callback_guard(u, [&]() {
+        auto* dict_node = reinterpret_cast<DictNode*>(c->data.v_handle);
+        dict_node->emplace(std::move(key), std::move(value));
+        return 0;
+    });
 }
 
 static inline int unpack_callback_map_end(unpack_user* u, msgpack_unpack_object* c)
@@ -197,14 +232,18 @@ static inline int unpack_callback_map_end(unpack_user* u, msgpack_unpack_object*
 
 static inline int unpack_callback_raw(unpack_user* u, const char* b, const char* p, unsigned int l, msgpack_unpack_object* o)
 {
-    RTValue(UTF8Decode(p, l)).MoveToCHost(o);
-    return 0;
+    return unpack_callback_guard(u, [&]() {
+        RTValue(UTF8Decode(p, l)).MoveToCHost(o);
+        return 0;
+    });
 }
 
 static inline int unpack_callback_bin(unpack_user* u, const char* b, const char* p, unsigned int l, msgpack_unpack_object* o)
 {
-    RTValue(String(p, l)).MoveToCHost(o);
-    return 0;
+    return unpack_callback_guard(u, [&]() {
+        RTValue(String(p, l)).MoveToCHost(o);
+        return 0;
+    });
 }
 
 typedef struct msgpack_timestamp {
@@ -251,7 +290,9 @@ static int unpack_callback_ext(unpack_user* u, const char* base, const char* pos
         }
         o->data.v_float64 = double(ts.tv_sec) + ts.tv_nsec/1000000000.0;
     } else {
-        return u->ext_hook(typecode, pos, length-1, o);
+        return unpack_callback_guard(u, [&]() {
+            return u->ext_hook(u, typecode, pos, length-1, o);
+        });
     }
     return 0;
 }
@@ -336,6 +336,8 @@ _push:
         c->ct = CT_MAP_VALUE;
         goto _header_again;
     case CT_MAP_VALUE:
+        /* the key is owned by the map item callback, even if it fails */
+        c->ct = CT_MAP_KEY;
         if(construct_cb(_map_item)(user, c->count, &c->obj, c->map_key, obj) < 0) { goto _failed; }
         if(++c->count == c->size) {
             obj = c->obj;
@@ -344,7 +346,6 @@ _push:
             /*printf("stack pop %d\n", top);*/
             goto _push;
         }
-        c->ct = CT_MAP_KEY;
         goto _header_again;
 
     default:
@@ -25,22 +25,47 @@
 #include <matxscript/runtime/native_object_registry.h>
 #include <matxscript/runtime/threadpool/lock_based_thread_pool.h>
 #include <matxscript/runtime/threadpool/lock_free_thread_pool.h>
+#include <matxscript/runtime/threadpool/work_stealing_thread_pool.h>
 #include <matxscript/runtime/type_helper_macros.h>
 
 namespace matxscript {
 namespace runtime {
 
+// the enqueue time of a task, observed by the worker when the task starts
+struct QueueWaitStamp {
+  std::shared_ptr<LatencyHistogram> hist;
+  uint64_t enqueue_nanos = 0;
+
+  explicit QueueWaitStamp(std::shared_ptr<LatencyHistogram> h) : hist(std::move(h)) {
+    if (hist) {
+      enqueue_nanos = EnvTime::Default()->NowNanos();
+    }
+  }
+
+  void Observe() {
+    if (hist) {
+      hist->ObserveSince(enqueue_nanos);
+    }
+  }
+};
+
 template <typename RunnableType, bool UnpackArgs = false>
 class ParallelForTask : public RunnableType {
  public:
-  ParallelForTask(const UserDataRef& op, const Any* input_first, RTValue* output_first, int64_t len)
+  ParallelForTask(const UserDataRef& op,
+                  const Any* input_first,
+                  RTValue* output_first,
+                  int64_t len,
+                  std::shared_ptr<LatencyHistogram> wait_hist = nullptr)
       : op_(&op),
         input_first_(input_first),
         input_last_(input_first + len),
-        output_first_(output_first) {
+        output_first_(output_first),
+        wait_stamp_(std::move(wait_hist)) {
   }
 
   void RunImpl() override {
+    wait_stamp_.Observe();
     while (input_first_ != input_last_) {
       if (UnpackArgs) {
         switch (input_first_->type_code()) {
@@ -81,6 +106,7 @@ class ParallelForTask : public RunnableType {
   const Any* input_first_;
   const Any* input_last_;
   RTValue* output_first_;
+  QueueWaitStamp wait_stamp_;
 };
 
 template <typename RunnableType>
@@ -88,11 +114,15 @@ struct AsyncTask : public RunnableType {
   UserDataRef closure;
   std::vector<RTValue> args;
   RTValue result;
-  AsyncTask(UserDataRef closure, std::vector<RTValue> args)
-      : closure(std::move(closure)), args(std::move(args)) {
+  QueueWaitStamp wait_stamp;
+  AsyncTask(UserDataRef closure,
+            std::vector<RTValue> args,
+            std::shared_ptr<LatencyHistogram> wait_hist = nullptr)
+      : closure(std::move(closure)), args(std::move(args)), wait_stamp(std::move(wait_hist)) {
   }
 
   void RunImpl() override {
+    wait_stamp.Observe();
     result = closure.generic_call(PyArgs(args.data(), args.size()));
   }
 };
@@ -100,6 +130,7 @@ struct AsyncTask : public RunnableType {
 ThreadPoolExecutor::ThreadPoolExecutor(const std::shared_ptr<internal::IThreadPool>& pool,
                                        bool lock_free)
     : lock_free_(lock_free), thread_num_(pool->GetThreadsNum()), pool_(pool) {
+  steal_pool_ = dynamic_cast<internal::WorkStealingThreadPool*>(pool.get());
   auto t_ids = pool->GetThreadIds();
   for (auto& id : t_ids) {
     pool_thread_ids_.emplace(id);
@@ -132,37 +163,52 @@ void ThreadPoolExecutor::ParallelForImpl(const UserDataRef& op,
   bool need_change = true;
   std::vector<internal::IRunnablePtr> tasks;
   tasks.reserve(expt_num_threads);
+  // the first task is run by the caller, nested calls run all tasks inline
+  bool nested = pool_thread_ids_.find(std::this_thread::get_id()) != pool_thread_ids_.end();
   for (int64_t i = 0; i < expt_num_threads && pos < input_size; ++i) {
     if (need_change && step_l != 0 && pos + step_l * (expt_num_threads - i) == input_size) {
       step = step_l;
       need_change = false;
     }
+    auto wait_hist = (i == 0 || nested) ? nullptr : wait_hist_;
     if (lock_free_) {
       if (unpack_args) {
         auto task = std::make_shared<ParallelForTask<internal::LockFreeRunnable, true>>(
-            op, inputs_begin + pos, outputs_begin + pos, step);
+            op, inputs_begin + pos, outputs_begin + pos, step, wait_hist);
         tasks.push_back(std::static_pointer_cast<internal::IRunnable>(task));
       } else {
         auto task = std::make_shared<ParallelForTask<internal::LockFreeRunnable, false>>(
-            op, inputs_begin + pos, outputs_begin + pos, step);
+            op, inputs_begin + pos, outputs_begin + pos, step, wait_hist);
         tasks.push_back(std::static_pointer_cast<internal::IRunnable>(task));
       }
     } else {
       if (unpack_args) {
         auto task = std::make_shared<ParallelForTask<internal::LockBasedRunnable, true>>(
-            op, inputs_begin + pos, outputs_begin + pos, step);
+            op, inputs_begin + pos, outputs_begin + pos, step, wait_hist);
         tasks.push_back(std::static_pointer_cast<internal::IRunnable>(task));
       } else {
         auto task = std::make_shared<ParallelForTask<internal::LockBasedRunnable, false>>(
-            op, inputs_begin + pos, outputs_begin + pos, step);
+            op, inputs_begin + pos, outputs_begin + pos, step, wait_hist);
         tasks.push_back(std::static_pointer_cast<internal::IRunnable>(task));
       }
     }
     pos += step;
   }
 
-  auto cur_tid = std::this_thread::get_id();
-  if (pool_thread_ids_.find(cur_tid) != pool_thread_ids_.end()) {
+  if (nested && steal_pool_ != nullptr) {
+    // the idle workers steal the tasks, this worker runs queued tasks while waiting
+    for (size_t i = 1; i < tasks.size(); ++i) {
+      pool_->Enqueue(tasks[i], i);
+    }
+    tasks[0]->Run();
+    for (auto& task : tasks) {
+      while (!task->Done()) {
+        if (!steal_pool_->RunPendingTask()) {
+          std::this_thread::yield();
+        }
+      }
+    }
+  } else if (nested) {
     // fix nested pmap
     for (auto& task : tasks) {
       task->Run();
@@ -297,8 +343,8 @@ RTValue ThreadPoolExecutor::ApplyAsync(const UserDataRef& callable, const PyArgs
     args_holder.emplace_back(args[i].As<RTValue>());
   }
   if (lock_free_) {
-    auto closure_task =
-        std::make_shared<AsyncTask<internal::LockFreeRunnable>>(callable, std::move(args_holder));
+    auto closure_task = std::make_shared<AsyncTask<internal::LockFreeRunnable>>(
+        callable, std::move(args_holder), wait_hist_);
     auto my_closure_task = std::static_pointer_cast<internal::IRunnable>(closure_task);
     pool_->Enqueue(my_closure_task, seq);
     return Future::make_future_udref([closure_task]() {
@@ -306,8 +352,8 @@ RTValue ThreadPoolExecutor::ApplyAsync(const UserDataRef& callable, const PyArgs
       return closure_task->result;
     });
   } else {
-    auto closure_task =
-        std::make_shared<AsyncTask<internal::LockBasedRunnable>>(callable, std::move(args_holder));
+    auto closure_task = std::make_shared<AsyncTask<internal::LockBasedRunnable>>(
+        callable, std::move(args_holder), wait_hist_);
     auto my_closure_task = std::static_pointer_cast<internal::IRunnable>(closure_task);
     pool_->Enqueue(my_closure_task, seq);
     return Future::make_future_udref([closure_task]() {
@@ -333,19 +379,35 @@ RTValue ThreadPoolExecutor::Submit(PyArgs args) {
 
 MATX_REGISTER_NATIVE_OBJECT(ThreadPoolExecutor)
     .SetConstructor([](PyArgs args) -> std::shared_ptr<void> {
-      MXCHECK(args.size() == 2 || args.size() == 3)
-          << "[ThreadPoolExecutor] Expect 2 or 3 arguments but get " << args.size();
+      MXCHECK(args.size() >= 2 && args.size() <= 5)
+          << "[ThreadPoolExecutor] Expect 2-5 arguments but get " << args.size();
       int pool_size = args[0].As<int64_t>();
       bool lock_free = args[1].As<bool>();
       int64_t intervals_ns = 1;
-      if (args.size() == 3) {
+      if (args.size() >= 3) {
         intervals_ns = args[2].As<int64_t>();
       }
-      auto pool = lock_free
-                      ? std::unique_ptr<internal::IThreadPool>(new internal::SPSCLockFreeThreadPool(
-                            pool_size, "matx.ThreadPool", intervals_ns))
-                      : std::unique_ptr<internal::IThreadPool>(
-                            new internal::LockBasedThreadPool(pool_size, "matx.ThreadPool"));
+      // work_stealing ignores intervals_ns, its idle workers spin shortly and then sleep
+      bool work_stealing = false;
+      if (args.size() >= 4) {
+        work_stealing = args[3].As<bool>();
+      }
+      std::vector<int> cpu_ids;
+      if (args.size() >= 5) {
+        for (auto& cpu_id : args[4].As<List>()) {
+          cpu_ids.push_back(cpu_id.As<int64_t>());
+        }
+      }
+      std::unique_ptr<internal::IThreadPool> pool;
+      if (work_stealing) {
+        pool.reset(
+            new internal::WorkStealingThreadPool(pool_size, "matx.ThreadPool", std::move(cpu_ids)));
+      } else if (lock_free) {
+        pool.reset(
+            new internal::SPSCLockFreeThreadPool(pool_size, "matx.ThreadPool", intervals_ns));
+      } else {
+        pool.reset(new internal::LockBasedThreadPool(pool_size, "matx.ThreadPool"));
+      }
       return std::make_shared<ThreadPoolExecutor>(std::move(pool), lock_free);
     })
     .RegisterFunction(
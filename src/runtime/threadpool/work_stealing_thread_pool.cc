@@ -0,0 +1,245 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#include <matxscript/runtime/threadpool/work_stealing_thread_pool.h>
+
+#ifdef __linux__
+#include <pthread.h>
+#include <sched.h>
+#endif
+
+#include <matxscript/runtime/logging.h>
+
+namespace matxscript {
+namespace runtime {
+namespace internal {
+
+namespace {
+
+// the pool and the deque of the current worker thread
+thread_local WorkStealingThreadPool* tls_pool = nullptr;
+thread_local size_t tls_index = 0;
+
+inline void CpuRelax() {
+#if defined(__x86_64__) || defined(__i386__)
+  __builtin_ia32_pause();
+#elif defined(__aarch64__)
+  asm volatile("yield" ::: "memory");
+#endif
+}
+
+void PinCurrentThread(int cpu_id) {
+#ifdef __linux__
+  cpu_set_t cpu_set;
+  CPU_ZERO(&cpu_set);
+  CPU_SET(cpu_id, &cpu_set);
+  int rc = pthread_setaffinity_np(pthread_self(), sizeof(cpu_set), &cpu_set);
+  if (rc != 0) {
+    MXLOG(WARNING) << "[WorkStealingThreadPool] failed to pin a worker to cpu " << cpu_id;
+  }
+#endif
+}
+
+}  // namespace
+
+constexpr int64_t WorkStealingThreadPool::kDefaultSpinRounds;
+
+void WorkStealingThreadPool::ThreadEntry(WorkStealingThreadPool* pool,
+                                         size_t index,
+                                         const std::string& name) {
+#ifdef __linux__
+  pthread_setname_np(pthread_self(), name.c_str());
+#endif
+  if (!pool->cpu_ids_.empty()) {
+    PinCurrentThread(pool->cpu_ids_[index % pool->cpu_ids_.size()]);
+  }
+  tls_pool = pool;
+  tls_index = index;
+  for (;;) {
+    IRunnablePtr task = nullptr;
+    bool found = false;
+    for (int64_t i = 0; i <= pool->spin_rounds_; ++i) {
+      if (pool->Take(index, &task)) {
+        found = true;
+        break;
+      }
+      if (pool->stop_.load(std::memory_order_relaxed)) {
+        break;
+      }
+      CpuRelax();
+    }
+    if (found) {
+      task->Run();
+      continue;
+    }
+    if (pool->stop_.load()) {
+      // the queued tasks are drained before exiting
+      if (pool->pending_.load() <= 0) {
+        return;
+      }
+      continue;
+    }
+    std::unique_lock<std::mutex> lock(pool->park_mutex_);
+    pool->parked_.fetch_add(1);
+    pool->park_cond_.wait(lock, [pool] { return pool->stop_.load() || pool->pending_.load() > 0; });
+    pool->parked_.fetch_sub(1);
+  }
+}
+
+WorkStealingThreadPool::WorkStealingThreadPool(size_t threads,
+                                               const std::string& name,
+                                               std::vector<int> cpu_ids,
+                                               int64_t spin_rounds)
+    : cpu_ids_(std::move(cpu_ids)), spin_rounds_(spin_rounds < 0 ? 0 : spin_rounds) {
+#ifdef _WIN32
+  belong_to_pid_ = GetCurrentProcessId();
+#else
+  belong_to_pid_ = getpid();
+#endif
+  MXCHECK_GT(threads, 0) << "[WorkStealingThreadPool] expect at least one thread";
+  for (size_t i = 0; i < threads; ++i) {
+    queues_.emplace_back(new TaskDeque());
+  }
+  for (size_t i = 0; i < threads; ++i) {
+    char buffer[16] = {0};
+    snprintf(buffer, sizeof(buffer), "T%zu.%s", i, name.c_str());
+    workers_.emplace_back(WorkStealingThreadPool::ThreadEntry, this, i, std::string(buffer));
+  }
+}
+
+WorkStealingThreadPool::~WorkStealingThreadPool() {
+#ifdef _WIN32
+  auto cur_pid = GetCurrentProcessId();
+#else
+  auto cur_pid = getpid();
+#endif
+  if (cur_pid == belong_to_pid_) {
+    {
+      std::lock_guard<std::mutex> lock(park_mutex_);
+      stop_ = true;
+    }
+    park_cond_.notify_all();
+    for (auto& worker : workers_) {
+      if (worker.joinable()) {
+        worker.join();
+      }
+    }
+  } else {
+    // After fork, the child process inherits the data-structures of the parent
+    // process' thread-pool, but since those threads don't exist, the thread-pool
+    // is corrupt. So detach thread here in order to prevent segfaults.
+    for (auto& worker : workers_) {
+      worker.detach();
+    }
+  }
+}
+
+void WorkStealingThreadPool::Push(size_t index, IRunnablePtr& runner) {
+  MXCHECK(runner != nullptr) << "Enqueue arg invalid: runner is null pointer";
+  auto& queue = *queues_[index];
+  {
+    std::lock_guard<std::mutex> lock(queue.mutex);
+    queue.tasks.push_back(runner);
+  }
+  pending_.fetch_add(1);
+}
+
+void WorkStealingThreadPool::Notify() {
+  // pairs with the parked_ increment of the workers, one of both sides sees the other
+  if (parked_.load() > 0) {
+    {
+      std::lock_guard<std::mutex> lock(park_mutex_);
+    }
+    park_cond_.notify_one();
+  }
+}
+
+void WorkStealingThreadPool::Enqueue(IRunnablePtr& runner, size_t seq) {
+  size_t index = tls_pool == this ? tls_index : seq % queues_.size();
+  Push(index, runner);
+  Notify();
+}
+
+void WorkStealingThreadPool::EnqueueBulk(std::vector<IRunnablePtr>& runners) {
+  for (size_t i = 0; i < runners.size(); ++i) {
+    size_t index = tls_pool == this ? tls_index : i % queues_.size();
+    Push(index, runners[i]);
+  }
+  if (parked_.load() > 0) {
+    {
+      std::lock_guard<std::mutex> lock(park_mutex_);
+    }
+    park_cond_.notify_all();
+  }
+}
+
+bool WorkStealingThreadPool::Take(size_t index, IRunnablePtr* task) {
+  if (pending_.load(std::memory_order_acquire) <= 0) {
+    return false;
+  }
+  size_t num = queues_.size();
+  // the newest task of the own deque is the hottest in cache
+  {
+    auto& queue = *queues_[index];
+    std::lock_guard<std::mutex> lock(queue.mutex);
+    if (!queue.tasks.empty()) {
+      *task = std::move(queue.tasks.back());
+      queue.tasks.pop_back();
+      pending_.fetch_sub(1);
+      return true;
+    }
+  }
+  // steal the oldest task of the others, busy deques are skipped
+  for (size_t i = 1; i < num; ++i) {
+    auto& queue = *queues_[(index + i) % num];
+    std::unique_lock<std::mutex> lock(queue.mutex, std::try_to_lock);
+    if (lock.owns_lock() && !queue.tasks.empty()) {
+      *task = std::move(queue.tasks.front());
+      queue.tasks.pop_front();
+      pending_.fetch_sub(1);
+      return true;
+    }
+  }
+  return false;
+}
+
+bool WorkStealingThreadPool::RunPendingTask() {
+  IRunnablePtr task = nullptr;
+  if (!Take(tls_pool == this ? tls_index : 0, &task)) {
+    return false;
+  }
+  task->Run();
+  return true;
+}
+
+size_t WorkStealingThreadPool::GetThreadsNum() const {
+  return workers_.size();
+}
+
+std::vector<std::thread::id> WorkStealingThreadPool::GetThreadIds() const {
+  std::vector<std::thread::id> ids;
+  for (auto& w : workers_) {
+    ids.push_back(w.get_id());
+  }
+  return ids;
+}
+
+}  // namespace internal
+}  // namespace runtime
+}  // namespace matxscript
@@ -20,6 +20,7 @@
  * under the License.
  */
 #include <matxscript/runtime/container/unicode.h>
+#include <matxscript/runtime/unicodelib/unicode_kind.h>
 #include <matxscript/runtime/unicodelib/unicode_ops.h>
 
 namespace matxscript {
@@ -62,6 +63,19 @@ static inline int lower_ucs4(
   return _PyUnicode_ToLowerFull(c, mapped);
 }
 
+// ascii maps one to one, so the result is sized once instead of reserving 3 units per char
+template <char32_t FIRST, char32_t LAST, int DELTA>
+static inline Unicode ascii_case_convert(unicode_view input) {
+  Unicode::ContainerType result(input.size(), Unicode::ContainerType::NoInit{});
+  auto* dst = result.data();
+  auto* src = input.data();
+  for (size_t i = 0; i < input.size(); ++i) {
+    char32_t c = src[i];
+    dst[i] = (c >= FIRST && c <= LAST) ? static_cast<char32_t>(c + DELTA) : c;
+  }
+  return Unicode(std::move(result));
+}
+
 unicode_string py_unicode_do_upper(unicode_view input) {
   unicode_string result;
   intptr_t i;
@@ -93,6 +107,9 @@ unicode_string py_unicode_do_lower(unicode_view input) {
 }
 
 Unicode py_unicode_do_upper_optimize(unicode_view input) {
+  if (UnicodeKindOf(input.data(), input.size()) == kUnicodeKindASCII) {
+    return ascii_case_convert<U'a', U'z', 'A' - 'a'>(input);
+  }
   Unicode result;
   intptr_t i;
   result.reserve(input.length() * 3);
@@ -108,6 +125,9 @@ Unicode py_unicode_do_upper_optimize(unicode_view input) {
 }
 
 Unicode py_unicode_do_lower_optimize(unicode_view input) {
+  if (UnicodeKindOf(input.data(), input.size()) == kUnicodeKindASCII) {
+    return ascii_case_convert<U'A', U'Z', 'a' - 'A'>(input);
+  }
   Unicode result;
   intptr_t i;
   result.reserve(input.length() * 3);
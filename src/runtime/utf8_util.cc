@@ -21,6 +21,7 @@
 
 #include <matxscript/runtime/container/string.h>
 #include <matxscript/runtime/container/unicode.h>
+#include <matxscript/runtime/unicodelib/unicode_kind.h>
 #include <matxscript/runtime/utf8/decoders.h>
 #include <matxscript/runtime/utf8/encoders.h>
 
@@ -34,16 +35,27 @@ Unicode UTF8Decode(string_view input) {
 Unicode UTF8Decode(const char* s_ptr, size_t len) {
   constexpr int SMALL_BUFFER_SIZE = 64;
   auto* s_u_ptr = (const unsigned char*)(s_ptr);
+  auto* s_u_end = s_u_ptr + len;
+  // the ascii prefix is one unit per byte, the decoder starts at the first high byte
+  auto prefix = UnicodeAsciiPrefixSize(s_u_ptr, len);
+  auto* rest = s_u_ptr + prefix;
   if (len <= SMALL_BUFFER_SIZE) {  // small string
     char32_t buffer[SMALL_BUFFER_SIZE];
-    auto size = utf8_details::GreedyTableDecoder::Convert(s_u_ptr, s_u_ptr + len, buffer);
-    return Unicode(buffer, size);
+    UnicodeWidenCopy(s_u_ptr, prefix, buffer);
+    auto size = utf8_details::GreedyTableDecoder::Convert(rest, s_u_end, buffer + prefix);
+    return Unicode(buffer, prefix + size);
   } else {
-    // for avoid allocate memory
-    auto unit_size = utf8_details::GreedyTableDecoder::CountUnitSize(s_u_ptr, s_u_ptr + len);
+    // for avoid allocate memory, only the rest after the prefix is counted
+    auto unit_size = prefix;
+    if (prefix < len) {
+      unit_size += utf8_details::GreedyTableDecoder::CountUnitSize(rest, s_u_end);
+    }
     Unicode::ContainerType unicodes(unit_size, Unicode::ContainerType::NoInit{});
-    auto size = utf8_details::GreedyTableDecoder::Convert(s_u_ptr, s_u_ptr + len, unicodes.data());
-    assert(size == unit_size);
+    UnicodeWidenCopy(s_u_ptr, prefix, unicodes.data());
+    if (prefix < len) {
+      auto size = utf8_details::GreedyTableDecoder::Convert(rest, s_u_end, unicodes.data() + prefix);
+      assert(prefix + size == unit_size);
+    }
     return Unicode(std::move(unicodes));
   }
 }
@@ -53,6 +65,11 @@ String UTF8Encode(unicode_view input) {
 }
 
 String UTF8Encode(const uint32_t* s, size_t len) {
+  if (UnicodeOrReduce(s, len) < 0x80) {
+    String::ContainerType bytes(len, String::ContainerType::NoInit{});
+    UnicodeNarrowCopy(reinterpret_cast<const char32_t*>(s), len, bytes.data());
+    return String(std::move(bytes));
+  }
   auto bytes_size = utf8_details::GreedyCountBytesSize(s, s + len);
   String::ContainerType bytes(bytes_size, String::ContainerType::NoInit{});
   auto size = utf8_details::GreedyEncoder(s, s + len, (unsigned char*)(bytes.data()));
@@ -19,80 +19,496 @@
  */
 #include <matxscript/server/simple_mpmc_server.h>
 
+#include <algorithm>
+#include <fstream>
+#include <map>
+
+#include <matxscript/runtime/container/ndarray_helper.h>
+#include <matxscript/runtime/env_time.h>
+#include <matxscript/runtime/logging.h>
+
 namespace matxscript {
 namespace runtime {
 namespace server {
 
+namespace {
+
+// the size of the first dimension, -1 means the value can not be batched
+int64_t GetBatchDimSize(const RTValue& value) {
+  switch (value.type_code()) {
+    case TypeIndex::kRuntimeList: {
+      return value.AsObjectRefNoCheck<List>().size();
+    } break;
+    case TypeIndex::kRuntimeTuple: {
+      return value.AsObjectRefNoCheck<Tuple>().size();
+    } break;
+    case TypeIndex::kRuntimeNDArray: {
+      auto view = value.AsObjectViewNoCheck<NDArray>();
+      const NDArray& nd = view.data();
+      return nd->ndim > 0 ? nd->shape[0] : -1;
+    } break;
+    default: {
+      return -1;
+    } break;
+  }
+}
+
+// all batched inputs of one request must have the same size
+int64_t GetRequestBatchSize(const std::unordered_map<std::string, RTValue>& feed_dict) {
+  int64_t batch_size = -1;
+  for (auto& kv : feed_dict) {
+    int64_t dim_size = GetBatchDimSize(kv.second);
+    if (dim_size < 0) {
+      continue;
+    }
+    if (batch_size >= 0 && batch_size != dim_size) {
+      return -1;
+    }
+    batch_size = dim_size;
+  }
+  return batch_size;
+}
+
+const RTValue& GetFirstItem(const RTValue& value) {
+  if (value.type_code() == TypeIndex::kRuntimeList) {
+    return value.AsObjectViewNoCheck<List>().data()[0];
+  }
+  return value.AsObjectViewNoCheck<Tuple>().data()[0];
+}
+
+// whether the items of two batched values can be put into one batch: arrays concatenate
+// on the first dim, the items of lists and tuples must be alike as well
+bool SameItemLayout(const RTValue& lhs, const RTValue& rhs) {
+  if (lhs.type_code() != rhs.type_code()) {
+    return false;
+  }
+  switch (lhs.type_code()) {
+    case TypeIndex::kRuntimeList:
+    case TypeIndex::kRuntimeTuple: {
+      // the items of a batch have one structure, comparing the first ones is enough
+      if (GetBatchDimSize(lhs) == 0 || GetBatchDimSize(rhs) == 0) {
+        return true;
+      }
+      return SameItemLayout(GetFirstItem(lhs), GetFirstItem(rhs));
+    } break;
+    case TypeIndex::kRuntimeNDArray: {
+      const NDArray& l = lhs.AsObjectViewNoCheck<NDArray>().data();
+      const NDArray& r = rhs.AsObjectViewNoCheck<NDArray>().data();
+      if (l->ndim != r->ndim || l->dtype.code != r->dtype.code || l->dtype.bits != r->dtype.bits ||
+          l->dtype.lanes != r->dtype.lanes || l->device.device_type != r->device.device_type ||
+          l->device.device_id != r->device.device_id) {
+        return false;
+      }
+      for (int i = 1; i < l->ndim; ++i) {
+        if (l->shape[i] != r->shape[i]) {
+          return false;
+        }
+      }
+      return true;
+    } break;
+    default: {
+      return true;
+    } break;
+  }
+}
+
+bool CanMergeRequest(const std::unordered_map<std::string, RTValue>& lhs,
+                     const std::unordered_map<std::string, RTValue>& rhs) {
+  if (lhs.size() != rhs.size()) {
+    return false;
+  }
+  for (auto& kv : lhs) {
+    auto itr = rhs.find(kv.first);
+    if (itr == rhs.end() || kv.second.type_code() != itr->second.type_code()) {
+      return false;
+    }
+    if (GetBatchDimSize(kv.second) < 0) {
+      if (!Any::Equal(kv.second, itr->second)) {
+        return false;
+      }
+    } else if (!SameItemLayout(kv.second, itr->second)) {
+      return false;
+    }
+  }
+  return true;
+}
+
+RTValue MergeBatchValue(const std::vector<const RTValue*>& values) {
+  switch (values[0]->type_code()) {
+    case TypeIndex::kRuntimeList: {
+      List result;
+      for (auto* value : values) {
+        result.extend(value->AsObjectRefNoCheck<List>());
+      }
+      return result;
+    } break;
+    case TypeIndex::kRuntimeTuple: {
+      std::vector<RTValue> items;
+      for (auto* value : values) {
+        auto tup = value->AsObjectRefNoCheck<Tuple>();
+        items.insert(items.end(), tup.begin(), tup.end());
+      }
+      return Tuple(std::make_move_iterator(items.begin()), std::make_move_iterator(items.end()));
+    } break;
+    case TypeIndex::kRuntimeNDArray: {
+      List arrays;
+      arrays.reserve(values.size());
+      for (auto* value : values) {
+        arrays.push_back(*value);
+      }
+      return NDArrayOperate::Concatenate(RTValue(std::move(arrays)), 0);
+    } break;
+    default: {
+      // not batched, all requests hold the same value
+      return *values[0];
+    } break;
+  }
+}
+
+RTValue SliceBatchValue(const RTValue& value, int64_t begin, int64_t end) {
+  switch (value.type_code()) {
+    case TypeIndex::kRuntimeList: {
+      return value.AsObjectRefNoCheck<List>().get_slice(begin, end);
+    } break;
+    case TypeIndex::kRuntimeTuple: {
+      return value.AsObjectRefNoCheck<Tuple>().get_slice(begin, end);
+    } break;
+    case TypeIndex::kRuntimeNDArray: {
+      return value.AsObjectRefNoCheck<NDArray>().get_slice(begin, end, 1);
+    } break;
+    default: {
+      return value;
+    } break;
+  }
+}
+
+}  // namespace
+
+std::vector<int64_t> BatchingOptions::ReadAllowedBatchSizes(string_view folder) {
+  static constexpr const char* meta_file_name = "meta.pb.txt";
+  static const string_view batch_size_key = "allowed_batch_sizes:";
+  std::vector<int64_t> batch_sizes;
+  std::string meta_path(folder.data(), folder.size());
+  if (!meta_path.empty() && meta_path.back() != '/') {
+    meta_path.push_back('/');
+  }
+  meta_path.append(meta_file_name);
+  std::ifstream fin(meta_path);
+  if (fin.fail()) {
+    return batch_sizes;
+  }
+  std::string line;
+  while (std::getline(fin, line)) {
+    string_view line_view(line);
+    auto pos = line_view.find(batch_size_key);
+    if (pos == string_view::npos) {
+      continue;
+    }
+    auto value = line_view.substr(pos + batch_size_key.size());
+    batch_sizes.push_back(std::stoll(std::string(value.data(), value.size())));
+  }
+  return batch_sizes;
+}
+
+void SimpleMPMCServer::Submit(RunnablePtr task) {
+  MXCHECK(!stop_.load()) << "[SimpleMPMCServer:" << name_ << "] the server is stopped";
+  for (;;) {
+    if (tasks_.try_enqueue(task)) {
+      break;
+    }
+    // queue is full, sleep 1us
+    std::this_thread::sleep_for(std::chrono::nanoseconds(1));
+  }
+  // pairs with the idle counter in WaitTask, either the worker sees the new depth
+  // before sleeping or we see the idle worker and wake it up
+  queue_depth_.fetch_add(1);
+  if (num_idle_workers_.load() > 0) {
+    std::lock_guard<std::mutex> lock(idle_mutex_);
+    idle_cond_.notify_one();
+  }
+}
+
+bool SimpleMPMCServer::WaitTask(RunnablePtr& task, uint64_t deadline_us) {
+  for (;;) {
+    if (tasks_.try_dequeue(task)) {
+      queue_depth_.fetch_sub(1);
+      return true;
+    }
+    if (stop_.load()) {
+      return false;
+    }
+    uint64_t now = EnvTime::Default()->NowMicros();
+    if (deadline_us > 0 && now >= deadline_us) {
+      return false;
+    }
+    std::unique_lock<std::mutex> lock(idle_mutex_);
+    num_idle_workers_.fetch_add(1);
+    auto ready = [this]() { return stop_.load() || queue_depth_.load() > 0; };
+    if (deadline_us > 0) {
+      idle_cond_.wait_for(lock, std::chrono::microseconds(deadline_us - now), ready);
+    } else {
+      idle_cond_.wait(lock, ready);
+    }
+    num_idle_workers_.fetch_sub(1);
+  }
+}
+
 void SimpleMPMCServer::ThreadEntry(SimpleMPMCServer* pool,
-                                   TXSession* sess_ptr,
+                                   size_t replica,
                                    const std::string& name) {
 #ifdef __linux__
   pthread_setname_np(pthread_self(), name.c_str());
 #endif
-  for (;;) {
-    RunnablePtr task = nullptr;
-    for (;;) {
-      if (pool->tasks_.try_dequeue(task)) {
-        break;
+  const TXSession* sess_ptr = pool->handlers_[replica].get();
+  ReplicaCounter* counter = pool->counters_[replica].get();
+  RunnablePtr task = nullptr;
+  while (pool->WaitTask(task)) {
+    auto begin = EnvTime::Default()->NowMicros();
+    task->Run(sess_ptr);
+    counter->busy_us.fetch_add(EnvTime::Default()->NowMicros() - begin, std::memory_order_relaxed);
+    counter->num_requests.fetch_add(1, std::memory_order_relaxed);
+    counter->num_runs.fetch_add(1, std::memory_order_relaxed);
+    task->SetDone();
+    task = nullptr;
+  }
+}
+
+void SimpleMPMCServer::RunBatch(const TXSession* sess_ptr,
+                                std::vector<RunnablePtr>& batch,
+                                const std::unordered_set<std::string>& batched_outputs) {
+  auto begin = EnvTime::Default()->NowMicros();
+  try {
+    if (batch.size() == 1) {
+      batch[0]->SetOutputs(sess_ptr->Run(*batch[0]->Inputs()));
+    } else {
+      // merge
+      std::vector<int64_t> offsets;
+      offsets.reserve(batch.size() + 1);
+      offsets.push_back(0);
+      for (auto& task : batch) {
+        offsets.push_back(offsets.back() + GetRequestBatchSize(*task->Inputs()));
+      }
+      std::unordered_map<std::string, RTValue> feed_dict;
+      std::vector<const RTValue*> values(batch.size());
+      try {
+        for (auto& kv : *batch[0]->Inputs()) {
+          for (size_t i = 0; i < batch.size(); ++i) {
+            values[i] = &batch[i]->Inputs()->at(kv.first);
+          }
+          feed_dict.emplace(kv.first, MergeBatchValue(values));
+        }
+      } catch (...) {
+        // the inputs can not be merged, so one bad request does not fail the others
+        for (auto& task : batch) {
+          try {
+            task->SetOutputs(sess_ptr->Run(*task->Inputs()));
+          } catch (...) {
+            task->SetException(std::current_exception());
+          }
+        }
+        auto end = EnvTime::Default()->NowMicros();
+        for (auto& task : batch) {
+          task->SetRunTimeCost(end - begin);
+        }
+        return;
+      }
+      auto result = sess_ptr->Run(feed_dict);
+      // scatter
+      int64_t total_size = offsets.back();
+      for (auto& kv : result) {
+        if (batched_outputs.count(kv.first)) {
+          MXCHECK_EQ(GetBatchDimSize(kv.second), total_size)
+              << "the batched output '" << kv.first << "' does not match the merged batch size";
+        }
       }
-      if (pool->stop_) {
-        break;
+      for (size_t i = 0; i < batch.size(); ++i) {
+        std::vector<std::pair<std::string, RTValue>> outputs;
+        outputs.reserve(result.size());
+        for (auto& kv : result) {
+          if (batched_outputs.count(kv.first)) {
+            outputs.emplace_back(kv.first, SliceBatchValue(kv.second, offsets[i], offsets[i + 1]));
+          } else {
+            outputs.emplace_back(kv.first, kv.second);
+          }
+        }
+        batch[i]->SetOutputs(std::move(outputs));
       }
-      // queue is full, sleep 1us
-      std::this_thread::sleep_for(std::chrono::nanoseconds(1));
     }
-    if (pool->stop_) {
+  } catch (...) {
+    auto except_ptr = std::current_exception();
+    for (auto& task : batch) {
+      task->SetException(except_ptr);
+    }
+  }
+  auto end = EnvTime::Default()->NowMicros();
+  for (auto& task : batch) {
+    task->SetRunTimeCost(end - begin);
+  }
+}
+
+void SimpleMPMCServer::BatchingThreadEntry(SimpleMPMCServer* pool,
+                                           size_t replica,
+                                           const std::string& name) {
+#ifdef __linux__
+  pthread_setname_np(pthread_self(), name.c_str());
+#endif
+  const TXSession* sess_ptr = pool->handlers_[replica].get();
+  ReplicaCounter* counter = pool->counters_[replica].get();
+  const auto& options = pool->batching_options_;
+  // the batched outputs of each set of batched input names
+  std::map<std::vector<std::string>, std::unordered_set<std::string>> batched_outputs_cache;
+  std::unordered_set<std::string> declared_outputs(options.batched_outputs.begin(),
+                                                   options.batched_outputs.end());
+  // the request which can not be merged into the last batch
+  RunnablePtr pending = nullptr;
+  std::vector<RunnablePtr> batch;
+  for (;;) {
+    RunnablePtr task = std::move(pending);
+    pending = nullptr;
+    if (task == nullptr && !pool->WaitTask(task)) {
       return;
+    }
+    batch.clear();
+    batch.push_back(task);
+    int64_t batch_size = GetRequestBatchSize(*task->Inputs());
+    if (batch_size >= 0 && batch_size < options.max_batch_size) {
+      auto deadline = EnvTime::Default()->NowMicros() + options.max_wait_us;
+      RunnablePtr next = nullptr;
+      while (pool->WaitTask(next, deadline)) {
+        int64_t next_size = GetRequestBatchSize(*next->Inputs());
+        if (next_size < 0 || batch_size + next_size > options.max_batch_size ||
+            !CanMergeRequest(*task->Inputs(), *next->Inputs())) {
+          pending = std::move(next);
+          break;
+        }
+        batch.push_back(std::move(next));
+        next = nullptr;
+        batch_size += next_size;
+        if (batch_size >= options.max_batch_size) {
+          break;
+        }
+      }
+    }
+    auto begin = EnvTime::Default()->NowMicros();
+    if (!declared_outputs.empty()) {
+      RunBatch(sess_ptr, batch, declared_outputs);
     } else {
-      if (task != nullptr) {
-        task->Run(sess_ptr);
-        std::atomic_thread_fence(std::memory_order_acquire);
-        task->SetDone();
+      std::vector<std::string> batched_inputs;
+      for (auto& kv : *task->Inputs()) {
+        if (GetBatchDimSize(kv.second) >= 0) {
+          batched_inputs.push_back(kv.first);
+        }
       }
+      std::sort(batched_inputs.begin(), batched_inputs.end());
+      auto itr = batched_outputs_cache.find(batched_inputs);
+      if (itr == batched_outputs_cache.end()) {
+        auto names = sess_ptr->OutputsDependingOn(
+            std::unordered_set<std::string>(batched_inputs.begin(), batched_inputs.end()));
+        itr = batched_outputs_cache
+                  .emplace(std::move(batched_inputs),
+                           std::unordered_set<std::string>(names.begin(), names.end()))
+                  .first;
+      }
+      RunBatch(sess_ptr, batch, itr->second);
+    }
+    counter->busy_us.fetch_add(EnvTime::Default()->NowMicros() - begin, std::memory_order_relaxed);
+    counter->num_requests.fetch_add(batch.size(), std::memory_order_relaxed);
+    counter->num_runs.fetch_add(1, std::memory_order_relaxed);
+    for (auto& finish_task : batch) {
+      finish_task->SetDone();
     }
   }
 }
 
 SimpleMPMCServer::SimpleMPMCServer(std::vector<std::shared_ptr<TXSession>> handlers,
                                    std::string name)
-    : stop_(false), name_(std::move(name)), tasks_(1024), handlers_(std::move(handlers)) {
+    : handlers_(std::move(handlers)), tasks_(1024), stop_(false), name_(std::move(name)) {
+  for (size_t i = 0; i < handlers_.size(); ++i) {
+    counters_.emplace_back(new ReplicaCounter);
+  }
+}
+
+SimpleMPMCServer::SimpleMPMCServer(std::vector<std::shared_ptr<TXSession>> handlers,
+                                   std::string name,
+                                   BatchingOptions batching_options)
+    : SimpleMPMCServer(std::move(handlers), std::move(name)) {
+  batching_options_ = std::move(batching_options);
+  auto& allowed_sizes = batching_options_.allowed_batch_sizes;
+  if (!allowed_sizes.empty()) {
+    int64_t max_allowed_size = *std::max_element(allowed_sizes.begin(), allowed_sizes.end());
+    if (batching_options_.max_batch_size <= 1 ||
+        batching_options_.max_batch_size > max_allowed_size) {
+      batching_options_.max_batch_size = max_allowed_size;
+    }
+  }
+  MXCHECK_GE(batching_options_.max_wait_us, 0) << "max_wait_us must not be negative";
 }
 
 void SimpleMPMCServer::start() {
+  bool enable_batching = batching_options_.max_batch_size > 1;
+  start_time_us_ = EnvTime::Default()->NowMicros();
   for (size_t i = 0; i < handlers_.size(); ++i) {
     char buffer[16] = {0};
     snprintf(buffer, sizeof(buffer), "T%zu.%s", i, name_.c_str());
-    workers_.emplace_back(
-        SimpleMPMCServer::ThreadEntry, this, handlers_[i].get(), std::string(buffer));
+    if (enable_batching) {
+      workers_.emplace_back(SimpleMPMCServer::BatchingThreadEntry, this, i, std::string(buffer));
+    } else {
+      workers_.emplace_back(SimpleMPMCServer::ThreadEntry, this, i, std::string(buffer));
+    }
   }
 }
 
 void SimpleMPMCServer::stop() {
-  stop_ = true;
+  {
+    std::lock_guard<std::mutex> lock(idle_mutex_);
+    stop_ = true;
+  }
+  idle_cond_.notify_all();
+  // the workers drain the queue before they exit
   for (std::thread& worker : workers_) {
     if (worker.joinable()) {
       worker.join();
     }
   }
+  // no worker was started, fail the callers instead of blocking them forever
+  RunnablePtr task = nullptr;
+  while (tasks_.try_dequeue(task)) {
+    queue_depth_.fetch_sub(1);
+    try {
+      MXTHROW << "[SimpleMPMCServer:" << name_ << "] the server is stopped";
+    } catch (...) {
+      task->SetException(std::current_exception());
+    }
+    task->SetDone();
+    task = nullptr;
+  }
+}
+
+ServerStats SimpleMPMCServer::stats() const {
+  ServerStats result;
+  result.queue_depth = queue_depth();
+  if (start_time_us_ > 0) {
+    result.uptime_us = EnvTime::Default()->NowMicros() - start_time_us_;
+  }
+  for (auto& counter : counters_) {
+    ServerStats::Replica replica;
+    replica.num_requests = counter->num_requests.load(std::memory_order_relaxed);
+    replica.num_runs = counter->num_runs.load(std::memory_order_relaxed);
+    replica.busy_us = counter->busy_us.load(std::memory_order_relaxed);
+    if (result.uptime_us > 0) {
+      replica.utilization = std::min(1.0, static_cast<double>(replica.busy_us) / result.uptime_us);
+    }
+    result.replicas.push_back(replica);
+  }
+  return result;
 }
 
 std::vector<std::pair<std::string, RTValue>> SimpleMPMCServer::process(
     const std::unordered_map<std::string, RTValue>& feed_dict) {
   std::vector<std::pair<std::string, RTValue>> outputs;
   auto runner = std::make_shared<Runnable>(&feed_dict, &outputs);
-  // push task
-  for (;;) {
-    if (tasks_.try_enqueue(runner)) {
-      break;
-    }
-    // queue is full, sleep 1us
-    std::this_thread::sleep_for(std::chrono::nanoseconds(1));
-  }
-  // wait for finish
-  while (!runner->Done()) {
-    // sleep 0.01ms
-    std::this_thread::sleep_for(std::chrono::nanoseconds(10000));
-  }
+  Submit(runner);
+  runner->Wait();
   if (runner->HasException()) {
     std::rethrow_exception(runner->ExceptionPtr());
   }
@@ -106,22 +522,10 @@ std::vector<std::pair<std::string, RTValue>> SimpleMPMCServer::process_with_tc(
   std::vector<std::pair<std::string, RTValue>> outputs;
   auto runner = std::make_shared<RunnableWithTimeCost>(&feed_dict, &outputs);
   uint64_t enqueue_begin = EnvTime::Default()->NowMicros();
-  auto runner_base = std::static_pointer_cast<RunnableWithTimeCost>(runner);
-  // push task
-  for (;;) {
-    if (tasks_.try_enqueue(runner_base)) {
-      break;
-    }
-    // queue is full, sleep 1us
-    std::this_thread::sleep_for(std::chrono::nanoseconds(1));
-  }
+  Submit(runner);
   uint64_t enqueue_end = EnvTime::Default()->NowMicros();
   *enqueue_tc_us = enqueue_end - enqueue_begin;
-  // wait for finish
-  while (!runner->Done()) {
-    // sleep 0.01ms
-    std::this_thread::sleep_for(std::chrono::nanoseconds(10000));
-  }
+  runner->Wait();
   *real_run_tc_us = runner->time_cost;
   if (runner->HasException()) {
     std::rethrow_exception(runner->ExceptionPtr());
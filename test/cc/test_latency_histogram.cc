@@ -0,0 +1,42 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#include <gtest/gtest.h>
+#include <matxscript/runtime/latency_histogram.h>
+#include <sstream>
+
+namespace matxscript {
+namespace runtime {
+
+TEST(LatencyHistogram, PrometheusPrecision) {
+  LatencyHistogram histogram;
+  // more than 1000 seconds in total, every micro second is kept
+  histogram.Observe(1234567890123);
+  histogram.Observe(1);
+  std::ostringstream os;
+  histogram.WritePrometheus(os, "latency_seconds", "op=\"a\"");
+  auto text = os.str();
+  EXPECT_NE(text.find("latency_seconds_sum{op=\"a\"} 1234567.890124\n"), std::string::npos);
+  EXPECT_NE(text.find("latency_seconds_bucket{op=\"a\",le=\"0.000010\"} 1\n"), std::string::npos);
+  EXPECT_NE(text.find("latency_seconds_bucket{op=\"a\",le=\"+Inf\"} 2\n"), std::string::npos);
+  EXPECT_NE(text.find("latency_seconds_count{op=\"a\"} 2\n"), std::string::npos);
+}
+
+}  // namespace runtime
+}  // namespace matxscript
@@ -35,6 +35,38 @@ TEST(Json, loads) {
   std::cout << v << std::endl;
 }
 
+TEST(Json, loads_sax) {
+  String s = "{\"a\": [1, -2, 3.5, true, null, NaN], \"b\": {\"a\": \"\\u4f60x\"}, \"a\": 1}";
+  RTValue v = json_loads(s);
+  Dict d = v.As<Dict>();
+  EXPECT_EQ(d.size(), 2);
+  EXPECT_EQ(d.get_item(Unicode(U"a")), RTValue(1));
+  Dict b = d.get_item(Unicode(U"b")).As<Dict>();
+  EXPECT_EQ(b.get_item(Unicode(U"a")), Unicode(U"\u4f60x"));
+  EXPECT_EQ(json_loads(s.decode()), v);
+
+  List l = json_loads(UTF8Encode(U"[1, -2, 3.5, \"\u4f60\"]")).As<List>();
+  EXPECT_EQ(l, (List{1, -2, 3.5, Unicode(U"\u4f60")}));
+  EXPECT_ANY_THROW(json_loads("[1, 2"));
+  EXPECT_ANY_THROW(json_loads(unicode_view(U"{\"a\": 1} x")));
+}
+
+TEST(Json, lines) {
+  String fn = "./json_lines_data.jsonl";
+  std::ofstream of(fn.c_str());
+  of << "{\"id\": 1, \"text\": \"a\"}\n\n{\"id\": 2, \"text\": \"b\"}\n[3]";
+  of.close();
+  Iterator iter = json_lines(fn);
+  List values;
+  bool has_next = iter.HasNext();
+  while (has_next) {
+    values.push_back(iter.Next(&has_next));
+  }
+  EXPECT_EQ(values.size(), 3);
+  EXPECT_EQ(values[1].As<Dict>().get_item(Unicode(U"text")), Unicode(U"b"));
+  EXPECT_EQ(values[2], RTValue(List{3}));
+}
+
 TEST(Json, load) {
   Unicode fn(U"./json_load_data.json");
   std::ofstream of(fn.encode());
@@ -53,6 +85,19 @@ TEST(Json, dumps) {
   std::cout << s << std::endl;
   s = json_dumps(RTView(d), 2, false);
   std::cout << s << std::endl;
+
+  List l{Unicode(U"\u4f60"), None, 1.5, Tuple::dynamic(1, 2)};
+  EXPECT_EQ(json_dumps(RTView(l)), U"[\"\\u4F60\",null,1.5,[1,2]]");
+  EXPECT_EQ(json_dumps(RTView(l), -1, false), U"[\"\u4f60\",null,1.5,[1,2]]");
+  EXPECT_EQ(json_dumps(RTView(Unicode(U"x"))), U"\"x\"");
+}
+
+TEST(Json, dump) {
+  String fn = "./json_dump_data.json";
+  Dict d{{Unicode(U"hello"), List{1, 2}}, {Unicode(U"\u4f60"), Unicode(U"matx")}};
+  json_dump(RTView(d), fn, 2, false);
+  File fp(fn.decode());
+  EXPECT_EQ(json_load(fp), RTValue(d));
 }
 
 }  // namespace runtime
@@ -0,0 +1,70 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#include <gtest/gtest.h>
+#include <matxscript/runtime/algorithm/mapped_trie.h>
+#include <matxscript/runtime/algorithm/prefix_mapping.h>
+#include <matxscript/runtime/algorithm/trie_ref.h>
+#include <cstdio>
+
+namespace matxscript {
+namespace runtime {
+
+TEST(MappedTrie, PrefixMapping) {
+  String path = "test_mapped_prefix_mapping.da";
+  std::map<String, int> dic{{"hello", 1}, {"hello world", 2}, {"world", 3}};
+  PrefixMapping(dic).Save(path);
+  ASSERT_TRUE(MappedTrieFile::IsMappedTrieFile(path));
+
+  auto file = MappedTrieFile::Open(path);
+  EXPECT_EQ(file->num_keys(), 3);
+  // the same unchanged file is mapped once
+  EXPECT_EQ(file.get(), MappedTrieFile::Open(path).get());
+
+  PrefixMapping mapping(file);
+  int val = -1;
+  EXPECT_EQ(mapping.PrefixSearch("hello world!", 12, &val), 11);
+  EXPECT_EQ(val, 2);
+  EXPECT_EQ(mapping.PrefixSearch("hi", 2, &val), 0);
+  std::remove(path.c_str());
+}
+
+TEST(MappedTrie, TrieUpdate) {
+  std::map<string_view, int64_t> dic{{"hello", 1}, {"world", 2}};
+  Trie trie(dic);
+  ASSERT_EQ(trie.save(Unicode(U"test_mapped_trie.da"), true), 0);
+  ASSERT_FALSE(MappedTrieFile::IsMappedTrieFile("not_exists.da"));
+
+  Trie mapped;
+  Trie other;
+  ASSERT_EQ(mapped.load(Unicode(U"test_mapped_trie.da")), 0);
+  ASSERT_EQ(other.load(Unicode(U"test_mapped_trie.da")), 0);
+  int64_t index = -1;
+  EXPECT_EQ(mapped.PrefixSearch(string_view("world"), &index), 5);
+  EXPECT_EQ(index, 2);
+  // the update goes to a private copy
+  mapped.update(string_view("hi"), 3);
+  EXPECT_EQ(mapped.PrefixSearch(string_view("hi"), &index), 2);
+  EXPECT_EQ(index, 3);
+  EXPECT_EQ(other.PrefixSearch(string_view("hi"), &index), 0);
+  std::remove("test_mapped_trie.da");
+}
+
+}  // namespace runtime
+}  // namespace matxscript
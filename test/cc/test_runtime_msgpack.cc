@@ -0,0 +1,111 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#include <gtest/gtest.h>
+#include <matxscript/runtime/container.h>
+#include <matxscript/runtime/msgpack/msgpack.h>
+
+namespace matxscript {
+namespace runtime {
+namespace serialization {
+
+TEST(Msgpack, ZeroCopyLoads) {
+  NDArray arr = NDArray::Empty({4, 3}, DLDataType{kDLFloat, 32, 1}, DLContext{kDLCPU, 0});
+  auto* data = static_cast<float*>(arr->data);
+  for (int i = 0; i < 12; ++i) {
+    data[i] = i;
+  }
+  String packed = msgpack_dumps(RTValue(List{arr, String("hi")}));
+  RTValue obj = msgpack_loads(packed, true);
+  auto items = obj.AsObjectRef<List>();
+  EXPECT_EQ(items[1], String("hi"));
+  auto view = items[0].AsObjectRef<NDArray>();
+  EXPECT_EQ(view.Shape(), arr.Shape());
+  EXPECT_EQ(0, memcmp(view->data, arr->data, 12 * sizeof(float)));
+}
+
+TEST(Msgpack, Stream) {
+  MessageStreamPacker packer(true);
+  String stream;
+  String first_record;
+  for (int64_t i = 1; i <= 4; ++i) {
+    NDArray arr = NDArray::Empty({i, 5}, DLDataType{kDLInt, 64, 1}, DLContext{kDLCPU, 0});
+    auto* data = static_cast<int64_t*>(arr->data);
+    for (int64_t j = 0; j < i * 5; ++j) {
+      data[j] = j;
+    }
+    String packed = packer.pack(RTValue(Dict{{String("id"), i}, {String("x"), arr}}));
+    if (i == 1) {
+      first_record = packed;
+    }
+    stream.append(packed);
+  }
+  EXPECT_EQ(packer.tell(), stream.size());
+
+  // feed in small pieces, the records are returned once they are complete
+  MessageStreamUnpacker unpacker;
+  std::vector<RTValue> records;
+  for (size_t pos = 0; pos < stream.size(); pos += 7) {
+    unpacker.feed(string_view(stream).substr(pos, 7));
+    RTValue record;
+    while (unpacker.next(&record)) {
+      records.push_back(record);
+    }
+  }
+  EXPECT_EQ(unpacker.buffered(), 0);
+  ASSERT_EQ(records.size(), 4);
+  for (int64_t i = 1; i <= 4; ++i) {
+    auto record = records[i - 1].AsObjectRef<Dict>();
+    EXPECT_EQ(record[String("id")], i);
+    auto arr = record[String("x")].AsObjectRef<NDArray>();
+    EXPECT_EQ(arr.Shape(), std::vector<int64_t>({i, 5}));
+    // the views are aligned in the stream
+    EXPECT_EQ(reinterpret_cast<uintptr_t>(arr->data) % 64, 0);
+    EXPECT_EQ(static_cast<const int64_t*>(arr->data)[i * 5 - 1], i * 5 - 1);
+  }
+
+  // the aligned records can be read by msgpack_loads too
+  auto first = msgpack_loads(first_record, false).AsObjectRef<Dict>();
+  EXPECT_EQ(first[String("id")], 1);
+  EXPECT_EQ(first[String("x")].AsObjectRef<NDArray>().Shape(), std::vector<int64_t>({1, 5}));
+}
+
+TEST(Msgpack, ExtErrorInContainer) {
+  // [{"a": 1}, [1, <fixext1 of an unknown type>]]
+  const char packed[] = "\x92\x81\xa1\x61\x01\x92\x01\xd4\x63\x00";
+  EXPECT_THROW(msgpack_loads(string_view(packed, sizeof(packed) - 1)), std::exception);
+
+  MessageStreamUnpacker unpacker;
+  unpacker.feed(string_view(packed, 6));
+  RTValue record;
+  EXPECT_FALSE(unpacker.next(&record));
+  unpacker.feed(string_view(packed + 6, sizeof(packed) - 1 - 6));
+  EXPECT_THROW(unpacker.next(&record), std::exception);
+
+  // the unpacker is usable after the error
+  MessageStreamUnpacker unpacker2;
+  String valid = msgpack_dumps(RTValue(List{1, String("x")}));
+  unpacker2.feed(valid);
+  ASSERT_TRUE(unpacker2.next(&record));
+  EXPECT_EQ(record.AsObjectRef<List>()[1], String("x"));
+}
+
+}  // namespace serialization
+}  // namespace runtime
+}  // namespace matxscript
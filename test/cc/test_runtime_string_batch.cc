@@ -0,0 +1,85 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#include <gtest/gtest.h>
+#include <matxscript/runtime/c_runtime_api.h>
+#include <matxscript/runtime/container.h>
+#include <matxscript/runtime/container/string_batch.h>
+#include <matxscript/runtime/generic/generic_constructor_funcs.h>
+#include <matxscript/runtime/generic/generic_funcs.h>
+
+namespace matxscript {
+namespace runtime {
+
+TEST(StringBatch, FromList) {
+  List items{Unicode(U"hello"), Unicode(U""), Unicode(U"你好")};
+  auto batch = StringBatch::FromList(items);
+  EXPECT_TRUE(batch.is_unicode());
+  EXPECT_EQ(batch.size(), 3);
+  EXPECT_EQ(batch.nbytes(), 11);
+  EXPECT_EQ(batch.view(2), "\xe4\xbd\xa0\xe5\xa5\xbd");
+  EXPECT_EQ(batch.get_item(-1), Unicode(U"你好"));
+  EXPECT_EQ(batch.to_list(), items);
+  EXPECT_TRUE(batch.contains(RTValue(Unicode(U"hello"))));
+  EXPECT_FALSE(batch.contains(RTValue(String("hello"))));
+  EXPECT_ANY_THROW(batch.get_item(3));
+  EXPECT_ANY_THROW(StringBatch::FromList(List({Unicode(U"a"), String("b")})));
+
+  batch.push_back("abc");
+  batch.pop_back();
+  EXPECT_EQ(batch.to_list(), items);
+  EXPECT_EQ(batch.get_slice(1, 100).to_list(), List({Unicode(U""), Unicode(U"你好")}));
+}
+
+TEST(StringBatch, Buffers) {
+  // offsets of a sliced arrow array start after 0
+  int64_t offsets[] = {2, 4, 4, 7};
+  StringBatch batch("xxabcde", offsets, 3, false);
+  EXPECT_EQ(batch.to_list(), List({String("ab"), String(""), String("cde")}));
+  auto data = batch.data();
+  EXPECT_EQ(data.Shape(), std::vector<int64_t>({5}));
+  auto rebased = batch.offsets();
+  EXPECT_EQ(static_cast<const int64_t*>(rebased.RawData())[3], 5);
+  int64_t bad_offsets[] = {0, 3, 1};
+  EXPECT_ANY_THROW(StringBatch("abc", bad_offsets, 2, false));
+}
+
+TEST(StringBatch, UserData) {
+  const char* items[] = {"a", "bc"};
+  size_t sizes[] = {1, 2};
+  MATXScriptAny value;
+  EXPECT_EQ(MATXScriptRuntimeMakeStringBatch(items, sizes, nullptr, 2, 1, &value), 0);
+  RTValue ud = RTValue::MoveFromCHost(&value);
+  auto* batch = StringBatch::FromAny(ud);
+  ASSERT_NE(batch, nullptr);
+  EXPECT_EQ(batch->size(), 2);
+  EXPECT_EQ(StringBatch::FromAny(RTValue(List())), nullptr);
+
+  EXPECT_EQ(kernel_object___len__(ud), 2);
+  EXPECT_EQ(kernel_object___getitem__(ud, 1), Unicode(U"bc"));
+  List iterated;
+  auto iter = Kernel_Iterable::make(ud);
+  while (iter.HasNext()) {
+    iterated.push_back(iter.Next());
+  }
+  EXPECT_EQ(iterated, List({Unicode(U"a"), Unicode(U"bc")}));
+}
+
+}  // namespace runtime
+}  // namespace matxscript
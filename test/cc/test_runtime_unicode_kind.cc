@@ -0,0 +1,82 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#include <gtest/gtest.h>
+#include <matxscript/runtime/c_runtime_api.h>
+#include <matxscript/runtime/container.h>
+#include <matxscript/runtime/unicodelib/unicode_kind.h>
+#include <matxscript/runtime/utf8_util.h>
+
+namespace matxscript {
+namespace runtime {
+
+TEST(UnicodeKind, KindOf) {
+  unicode_view ascii = U"hello world";
+  unicode_view latin1 = U"café";
+  unicode_view ucs2 = U"你好";
+  unicode_view ucs4 = U"a\U0001F600";
+  EXPECT_EQ(UnicodeKindOf(ascii.data(), ascii.size()), kUnicodeKindASCII);
+  EXPECT_EQ(UnicodeKindOf(latin1.data(), latin1.size()), kUnicodeKind1Byte);
+  EXPECT_EQ(UnicodeKindOf(ucs2.data(), ucs2.size()), kUnicodeKind2Byte);
+  EXPECT_EQ(UnicodeKindOf(ucs4.data(), ucs4.size()), kUnicodeKind4Byte);
+  EXPECT_EQ(UnicodeKindOf(ascii.data(), 0), kUnicodeKindASCII);
+  const char* mixed = "abcdefghij\xc3\xa9";
+  EXPECT_EQ(UnicodeAsciiPrefixSize((const unsigned char*)"abc\t\n", 5), 5);
+  EXPECT_EQ(UnicodeAsciiPrefixSize((const unsigned char*)mixed, 12), 10);
+  EXPECT_EQ(UnicodeAsciiPrefixSize((const unsigned char*)"\xe4\xbd\xa0", 3), 0);
+}
+
+TEST(UnicodeKind, FastPaths) {
+  Unicode large_ascii;
+  large_ascii.resize(200, U'a');
+  EXPECT_EQ(UTF8Decode(UTF8Encode(large_ascii)), large_ascii);
+  EXPECT_EQ(UTF8Encode(large_ascii).size(), 200);
+  EXPECT_EQ(UTF8Decode("caf\xc3\xa9", 5), U"café");
+  Unicode large_mixed = large_ascii + U"café你好" + large_ascii;
+  EXPECT_EQ(UTF8Decode(UTF8Encode(large_mixed)), large_mixed);
+  Unicode large_cjk;
+  large_cjk.resize(100, U'你');
+  EXPECT_EQ(UTF8Decode(UTF8Encode(large_cjk)), large_cjk);
+  EXPECT_EQ(UTF8Encode(U"café"), "caf\xc3\xa9");
+
+  EXPECT_EQ(UnicodeHelper::Lower(U"Hello WORLD 123"), U"hello world 123");
+  EXPECT_EQ(UnicodeHelper::Upper(U"Hello world 123"), U"HELLO WORLD 123");
+  EXPECT_EQ(UnicodeHelper::Lower(U"İABC"), U"i̇abc");
+  EXPECT_EQ(UnicodeHelper::Upper(U"straße"), U"STRASSE");
+
+  List expect{Unicode(U"a"), Unicode(U"b"), Unicode(U"c你")};
+  EXPECT_EQ(UnicodeHelper::Split(U" a\tb\x1f　c你 ", unicode_view()), expect);
+}
+
+TEST(UnicodeKind, MakeUnicodeFromKind) {
+  const uint8_t latin1[] = {'c', 'a', 'f', 0xe9};
+  const uint16_t ucs2[] = {0x4f60, 0x597d};
+  const uint32_t ucs4[] = {'a', 0x1F600};
+  MATXScriptAny value;
+  EXPECT_EQ(MATXScriptRuntimeMakeUnicodeFromKind(latin1, 4, kUnicodeKind1Byte, &value), 0);
+  EXPECT_EQ(RTValue::MoveFromCHost(&value).As<Unicode>(), U"café");
+  EXPECT_EQ(MATXScriptRuntimeMakeUnicodeFromKind(ucs2, 2, kUnicodeKind2Byte, &value), 0);
+  EXPECT_EQ(RTValue::MoveFromCHost(&value).As<Unicode>(), U"你好");
+  EXPECT_EQ(MATXScriptRuntimeMakeUnicodeFromKind(ucs4, 2, kUnicodeKind4Byte, &value), 0);
+  EXPECT_EQ(RTValue::MoveFromCHost(&value).As<Unicode>(), U"a\U0001F600");
+  EXPECT_NE(MATXScriptRuntimeMakeUnicodeFromKind(ucs4, 2, 3, &value), 0);
+}
+
+}  // namespace runtime
+}  // namespace matxscript
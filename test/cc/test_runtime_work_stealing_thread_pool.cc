@@ -0,0 +1,94 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#include <gtest/gtest.h>
+#include <matxscript/runtime/threadpool/lock_based_thread_pool.h>
+#include <matxscript/runtime/threadpool/work_stealing_thread_pool.h>
+#include <atomic>
+
+namespace matxscript {
+namespace runtime {
+namespace internal {
+
+class CountTask : public LockBasedRunnable {
+ public:
+  CountTask(WorkStealingThreadPool* pool, std::atomic<int64_t>* counter, int depth)
+      : pool_(pool), counter_(counter), depth_(depth) {
+  }
+
+ protected:
+  void RunImpl() override {
+    counter_->fetch_add(1);
+    if (depth_ <= 0) {
+      return;
+    }
+    // the sub tasks go to the deque of this worker and are stolen by the others
+    std::vector<IRunnablePtr> tasks;
+    for (int i = 0; i < 4; ++i) {
+      tasks.push_back(std::make_shared<CountTask>(pool_, counter_, depth_ - 1));
+    }
+    pool_->EnqueueBulk(tasks);
+    for (auto& task : tasks) {
+      while (!task->Done()) {
+        if (!pool_->RunPendingTask()) {
+          std::this_thread::yield();
+        }
+      }
+    }
+    IThreadPool::WaitBulk(tasks);
+  }
+
+ private:
+  WorkStealingThreadPool* pool_;
+  std::atomic<int64_t>* counter_;
+  int depth_;
+};
+
+TEST(WorkStealingThreadPool, NestedTasks) {
+  std::atomic<int64_t> counter{0};
+  WorkStealingThreadPool pool(4, "test", {}, 16);
+  EXPECT_EQ(pool.GetThreadsNum(), 4);
+  for (int round = 0; round < 10; ++round) {
+    std::vector<IRunnablePtr> tasks;
+    for (int i = 0; i < 8; ++i) {
+      tasks.push_back(std::make_shared<CountTask>(&pool, &counter, 2));
+    }
+    pool.EnqueueBulk(tasks);
+    IThreadPool::WaitBulk(tasks);
+    // the workers are parked now, the next round wakes them up
+    std::this_thread::sleep_for(std::chrono::milliseconds(5));
+  }
+  EXPECT_EQ(counter.load(), 10 * 8 * (1 + 4 + 16));
+}
+
+TEST(WorkStealingThreadPool, Exception) {
+  struct ThrowTask : public LockBasedRunnable {
+    void RunImpl() override {
+      throw std::runtime_error("error");
+    }
+  };
+  WorkStealingThreadPool pool(2, "test");
+  IRunnablePtr task = std::make_shared<ThrowTask>();
+  pool.Enqueue(task, 0);
+  EXPECT_THROW(task->Wait(), std::runtime_error);
+}
+
+}  // namespace internal
+}  // namespace runtime
+}  // namespace matxscript
@@ -19,10 +19,13 @@
  */
 #include <gtest/gtest.h>
 #include <matxscript/pipeline/tx_session.h>
+#include <matxscript/runtime/threadpool/lock_based_thread_pool.h>
+#include <matxscript/runtime/threadpool/work_stealing_thread_pool.h>
 #include <matxscript/server/simple_mpmc_server.h>
 #include <iostream>
 #include <map>
 #include <string>
+#include <thread>
 #include <vector>
 
 namespace matxscript {
@@ -75,5 +78,153 @@ TEST(TXSession, Server) {
   }
 }
 
+TEST(TXSession, BatchingServer) {
+  auto sess = std::make_shared<TXSession>();
+  auto sym = sess->CreateVariable("texts", List{String("test query")});
+  sess->Trace(sym.get());
+  std::vector<std::shared_ptr<TXSession>> handlers;
+  handlers.push_back(std::move(sess));
+
+  server::BatchingOptions options;
+  options.max_batch_size = 8;
+  options.max_wait_us = 1000;
+  server::SimpleMPMCServer server(handlers, "TXSession", options);
+  server.start();
+
+  std::vector<std::thread> clients;
+  std::vector<int> num_succeed(8, 0);
+  for (int i = 0; i < 8; ++i) {
+    clients.emplace_back([&server, &num_succeed, i]() {
+      for (int j = 0; j < 16; ++j) {
+        List texts;
+        for (int k = 0; k <= i % 3; ++k) {
+          texts.push_back(String(std::to_string(i * 100 + j * 10 + k)));
+        }
+        std::unordered_map<std::string, RTValue> feed_dict;
+        feed_dict.emplace("texts", texts);
+        auto result = server.process(feed_dict);
+        if (result.size() == 1 && result[0].second == RTValue(texts)) {
+          ++num_succeed[i];
+        }
+      }
+    });
+  }
+  for (auto& client : clients) {
+    client.join();
+  }
+  auto stats = server.stats();
+  EXPECT_EQ(stats.queue_depth, 0);
+  EXPECT_EQ(stats.replicas.size(), 1);
+  EXPECT_EQ(stats.replicas[0].num_requests, 8 * 16);
+  EXPECT_LE(stats.replicas[0].num_runs, 8 * 16);
+  server.stop();
+  for (auto n : num_succeed) {
+    EXPECT_EQ(n, 16);
+  }
+}
+
+TEST(TXSession, BatchingServerUnbatchedOutput) {
+  auto sess = std::make_shared<TXSession>();
+  auto texts = sess->CreateVariable("texts", List{String("test query")});
+  // the constant does not come from the batched inputs, it is never split
+  List labels{String("neg"), String("pos")};
+  auto const_labels = sess->CreateConstant(labels);
+  sess->Trace({texts.get(), const_labels.get()});
+  std::vector<std::shared_ptr<TXSession>> handlers;
+  handlers.push_back(std::move(sess));
+
+  server::BatchingOptions options;
+  options.max_batch_size = 2;
+  options.max_wait_us = 10000;
+  server::SimpleMPMCServer server(handlers, "TXSession", options);
+  server.start();
+
+  std::vector<std::thread> clients;
+  std::vector<int> num_succeed(4, 0);
+  for (int i = 0; i < 4; ++i) {
+    clients.emplace_back([&server, &num_succeed, &labels, i]() {
+      for (int j = 0; j < 16; ++j) {
+        List texts{String(std::to_string(i * 100 + j))};
+        std::unordered_map<std::string, RTValue> feed_dict;
+        feed_dict.emplace("texts", texts);
+        auto result = server.process(feed_dict);
+        if (result.size() == 2 && result[0].second == RTValue(texts) &&
+            result[1].second == RTValue(labels)) {
+          ++num_succeed[i];
+        }
+      }
+    });
+  }
+  for (auto& client : clients) {
+    client.join();
+  }
+  server.stop();
+  for (auto n : num_succeed) {
+    EXPECT_EQ(n, 16);
+  }
+}
+
+TEST(TXSession, BatchingServerMixedNDArray) {
+  auto sess = std::make_shared<TXSession>();
+  auto sym = sess->CreateVariable(
+      "x", NDArray::Empty({1, 4}, DLDataType{kDLFloat, 32, 1}, DLDevice{kDLCPU, 0}));
+  sess->Trace(sym.get());
+  std::vector<std::shared_ptr<TXSession>> handlers;
+  handlers.push_back(std::move(sess));
+
+  server::BatchingOptions options;
+  options.max_batch_size = 8;
+  options.max_wait_us = 1000;
+  server::SimpleMPMCServer server(handlers, "TXSession", options);
+  server.start();
+
+  // the arrays of different dtypes or inner shapes are not put into one batch
+  std::vector<std::thread> clients;
+  std::vector<int> num_succeed(6, 0);
+  for (int i = 0; i < 6; ++i) {
+    clients.emplace_back([&server, &num_succeed, i]() {
+      for (int j = 0; j < 16; ++j) {
+        std::vector<int64_t> shape = {1 + j % 2, 4 + i % 2};
+        DLDataType dtype = i % 3 == 0 ? DLDataType{kDLInt, 32, 1} : DLDataType{kDLFloat, 32, 1};
+        std::unordered_map<std::string, RTValue> feed_dict;
+        feed_dict.emplace("x", NDArray::Empty(shape, dtype, DLDevice{kDLCPU, 0}));
+        auto result = server.process(feed_dict);
+        if (result.size() == 1) {
+          auto arr = result[0].second.AsObjectRef<NDArray>();
+          if (arr.Shape() == shape && arr.DataType() == DataType(dtype)) {
+            ++num_succeed[i];
+          }
+        }
+      }
+    });
+  }
+  for (auto& client : clients) {
+    client.join();
+  }
+  server.stop();
+  for (auto n : num_succeed) {
+    EXPECT_EQ(n, 16);
+  }
+}
+
+TEST(TXSession, SharedWorkStealingPool) {
+  TXSessionOptions options;
+  options.name = "TXSession_shared_work_stealing_pool";
+  TXSession sess(options);
+  sess.SetSchedulingThreads(2, true);
+  sess.SetOpComputeThreads(2, true);
+  EXPECT_NE(dynamic_cast<internal::LockBasedThreadPool*>(sess.GetComputeThreadPool()), nullptr);
+
+  // the shared pools are recreated, not taken from the cached lock based ones
+  sess.SetWorkStealingPool(true);
+  EXPECT_NE(dynamic_cast<internal::WorkStealingThreadPool*>(sess.GetSchedulingThreadPool()),
+            nullptr);
+  EXPECT_NE(dynamic_cast<internal::WorkStealingThreadPool*>(sess.GetComputeThreadPool()),
+            nullptr);
+
+  sess.SetWorkStealingPool(false);
+  EXPECT_NE(dynamic_cast<internal::LockBasedThreadPool*>(sess.GetComputeThreadPool()), nullptr);
+}
+
 }  // namespace runtime
 }  // namespace matxscript
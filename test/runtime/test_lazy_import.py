@@ -0,0 +1,108 @@
+# Copyright 2022 ByteDance Ltd. and/or its affiliates.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import os
+import subprocess
+import sys
+import uuid
+import unittest
+import matx
+from matx import pipeline
+
+SCRIPT_PATH = os.path.split(os.path.realpath(__file__))[0]
+
+
+class TestLazyImport(unittest.TestCase):
+
+    def test_submodules_not_imported(self):
+        code = ("import sys, matx\n"
+                "assert 'matx.text' not in sys.modules\n"
+                "assert 'matx.vision' not in sys.modules\n"
+                "assert matx.text.WordPieceTokenizer is not None\n"
+                "assert 'matx.text' in sys.modules\n")
+        subprocess.check_call([sys.executable, "-c", code])
+
+    def test_prefix_plugin_loader(self):
+        loaded = []
+        pipeline.PluginLoader.register_prefix("LazyTestNative", lambda: loaded.append(1))
+        loader = pipeline.PluginLoader.lookup("LazyTestNativeOp")
+        self.assertIsNotNone(loader)
+        loader()
+        self.assertEqual(loaded, [1])
+        self.assertIsNone(pipeline.PluginLoader.lookup("LazyTestOther"))
+        self.assertIsNotNone(pipeline.PluginLoader.lookup("text_tokenizer_WordPieceTokenizer"))
+
+    def test_load_ops_on_demand(self):
+        pipeline.load_ops(["/not/exist/libmy_lazy_ops.so"], op_names=["MyLazyTestOp"])
+        self.assertTrue(callable(pipeline.ops.MyLazyTestOp))
+        loader = pipeline.PluginLoader.lookup("MyLazyTestOp")
+        self.assertIsNotNone(loader)
+        # the lib is only opened when the op is used
+        with self.assertRaises(OSError):
+            loader()
+        # a failed load is kept pending and retried
+        with self.assertRaises(OSError):
+            loader()
+
+    def test_load_error_not_retried(self):
+        from unittest import mock
+        from matx.pipeline import module
+        loaded = []
+        pipeline.PluginLoader.register_prefix(
+            "LazyRetryNative", lambda: loaded.append(1), lambda: bool(loaded))
+        self.addCleanup(pipeline.PluginLoader.prefix_registrations.pop, "LazyRetryNative")
+        self.addCleanup(pipeline.PluginLoader.prefix_states.pop, "LazyRetryNative")
+        error = ValueError("bad device")
+        with mock.patch.object(module, "read_spec_and_load_plugins", return_value={}), \
+                mock.patch.object(module._ffi_api, "LoadTXSessionFromSpec", side_effect=error):
+            with self.assertRaises(ValueError) as ctx:
+                module.load_module("/not/exist", "model.spec.json", -1)
+        # only a missing op or native class loads all the plugins and retries
+        self.assertIs(ctx.exception, error)
+        self.assertEqual(loaded, [])
+        self.assertTrue(module._is_unregistered_class_error(
+            RuntimeError("Native class not found: LazyRetryNativeTokenizer")))
+
+    def test_load_text_model_in_new_process(self):
+        vocab_path = SCRIPT_PATH + "/../data/vocab.txt"
+        save_path = SCRIPT_PATH + "/../tempdir/TestLazyImport_%d" % uuid.uuid4().int
+        save_code = ("import matx\n"
+                     "from typing import Any, List\n"
+                     "class MyTokenizer:\n"
+                     "    def __init__(self) -> None:\n"
+                     "        self.op: matx.text.WordPieceTokenizer = matx.text.WordPieceTokenizer(\n"
+                     "            vocab_path=%r, lookup_id=False, subwords_prefix='')\n"
+                     "    def __call__(self, a: List[str]) -> Any:\n"
+                     "        return self.op.tokenize(a)\n"
+                     "tokenizer = matx.script(MyTokenizer)()\n"
+                     "def workflow(a):\n"
+                     "    return tokenizer(a)\n"
+                     "matx.trace(workflow, ['helloworld']).save(%r)\n") % (vocab_path, save_path)
+        subprocess.check_call([sys.executable, "-c", save_code])
+        # a fresh process has not imported matx.text, the model pulls in the text ops
+        load_code = ("import sys, matx\n"
+                     "mod = matx.load(%r, 'cpu')\n"
+                     "assert mod.run({'a': ['helloworld']}) == ['hello', 'world']\n") % save_path
+        subprocess.check_call([sys.executable, "-c", load_code])
+
+
+if __name__ == '__main__':
+    import logging
+
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
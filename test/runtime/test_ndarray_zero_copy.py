@@ -0,0 +1,65 @@
+# Copyright 2022 ByteDance Ltd. and/or its affiliates.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import gc
+import unittest
+
+import numpy as np
+
+import matx
+
+
+class TestNDArrayZeroCopy(unittest.TestCase):
+
+    def test_asnumpy_without_copy(self):
+        nd = matx.array.NDArray([1, 2, 3, 4, 5, 6], shape=[2, 3], dtype='float32')
+        arr = nd.asnumpy(copy=False)
+        self.assertEqual(arr.shape, (2, 3))
+        self.assertEqual(arr.dtype, np.float32)
+        arr[1, 2] = 100
+        self.assertEqual(nd.asnumpy()[1, 2], 100)
+        # numpy keeps the NDArray alive
+        del nd
+        gc.collect()
+        np.testing.assert_equal(arr, [[1, 2, 3], [4, 5, 100]])
+
+    def test_array_interface_strides(self):
+        nd = matx.array.NDArray([1, 2, 3, 4, 5, 6], shape=[2, 3], dtype='int64')
+        nd_t = nd.transpose()
+        np.testing.assert_equal(np.asarray(nd_t), np.asarray(nd).T)
+        np.testing.assert_equal(nd_t.numpy(copy=False), nd_t.contiguous().numpy())
+
+    def test_from_numpy_without_copy(self):
+        arr = np.arange(12, dtype=np.float32).reshape(3, 4)
+        nd = matx.array.from_numpy(arr, copy=False)
+        self.assertEqual(list(nd.shape()), [3, 4])
+        arr[0, 0] = -1
+        self.assertEqual(nd.asnumpy()[0, 0], -1)
+        # NDArray keeps the numpy array alive
+        expect = arr.copy()
+        del arr
+        gc.collect()
+        np.testing.assert_equal(nd.asnumpy(), expect)
+
+        nd = matx.array.from_numpy(np.arange(4, dtype=np.int32), copy=True)
+        np.testing.assert_equal(nd.asnumpy(), [0, 1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# Copyright 2022 ByteDance Ltd. and/or its affiliates.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import unittest
+from typing import Any, List
+
+import matx
+
+
+class TestStringBatch(unittest.TestCase):
+
+    def test_python_api(self):
+        items = ["hello", "", "你好"]
+        batch = matx.StringBatch(items)
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch[2], "你好")
+        self.assertEqual(batch[-3], "hello")
+        self.assertEqual(list(batch), items)
+        self.assertEqual(batch.to_list(), items)
+        self.assertEqual(batch[1:].to_list(), items[1:])
+        self.assertTrue("你好" in batch)
+        self.assertEqual(batch.nbytes(), 11)
+
+        data, offsets = batch.buffers()
+        self.assertEqual(offsets.tolist(), [0, 5, 5, 11])
+        same = matx.StringBatch.from_buffers(bytes(data.tolist()), offsets)
+        self.assertEqual(same.to_list(), items)
+
+        bytes_batch = matx.StringBatch((b"a", b"bc"))
+        self.assertFalse(bytes_batch.is_unicode())
+        self.assertEqual(bytes_batch.to_list(), [b"a", b"bc"])
+        with self.assertRaises(TypeError):
+            matx.StringBatch(["a", b"b"])
+
+        # latin-1, ucs2 and ucs4 str are encoded from their code units
+        wide_items = ["café", "naïve 你好", "a\U0001F600", "x" * 100]
+        wide = matx.StringBatch(wide_items)
+        self.assertEqual(wide.to_list(), wide_items)
+        self.assertEqual(wide.nbytes(), sum(len(item.encode()) for item in wide_items))
+        with self.assertRaises(Exception):
+            matx.StringBatch(["\ud800"])
+
+        empty = matx.StringBatch([], is_unicode=False)
+        empty.append(b"x")
+        self.assertEqual(empty.to_list(), [b"x"])
+
+    def test_script(self):
+        def concat(batch: Any) -> List:
+            result = []
+            for i in range(len(batch)):
+                result.append(batch[i])
+            for item in batch:
+                result.append(item)
+            return result
+
+        batch = matx.StringBatch(["a", "b"])
+        self.assertEqual(matx.script(concat)(batch), ["a", "b", "a", "b"])
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
@@ -69,6 +69,55 @@ class TestBuiltinTextOps(unittest.TestCase):
         print(tx_ret3)
         self.assertEqual(tx_ret3, expect)
 
+        batch_ret = tokenizer.tokenize(matx.StringBatch(example))
+        self.assertIsInstance(batch_ret, matx.StringBatch)
+        self.assertEqual(batch_ret.to_list(), expect)
+        batch_ret, batch_lens = tokenizer.tokenizer_with_meta(matx.StringBatch(example))
+        self.assertIsInstance(batch_ret, matx.StringBatch)
+        self.assertEqual(batch_ret.to_list(), expect)
+        self.assertEqual(batch_lens, [1, 1, 2, 1])
+
+    def test_wordpiece_batch_encode(self):
+        vocab_path = self.data_path + os.sep + "vocab.txt"
+        tokenizer = matx.text.WordPieceTokenizer(
+            vocab_path=vocab_path,
+            lookup_id=True,
+            subwords_prefix="",
+        )
+        ret = tokenizer.batch_encode(["hello world", "helloworld kkk!"],
+                                     max_length=6,
+                                     basic_tokenize=True,
+                                     pad_token=None)
+        self.assertEqual(ret["input_ids"].tolist(), [[0, 3, 4, 1, 0, 0], [0, 3, 4, 2, 2, 1]])
+        self.assertEqual(ret["attention_mask"].tolist(), [[1, 1, 1, 1, 0, 0], [1] * 6])
+        self.assertEqual(ret["token_type_ids"].tolist(), [[0] * 6, [0] * 6])
+
+        ret = tokenizer.batch_encode(matx.StringBatch(["hello world"]),
+                                     [["world", "hello"]],
+                                     max_length=5,
+                                     pad_token=None)
+        self.assertEqual(ret["input_ids"].tolist(), [[0, 3, 1, 4, 1]])
+        self.assertEqual(ret["token_type_ids"].tolist(), [[0, 0, 0, 1, 1]])
+
+    def test_wordpiece_mapped_vocab(self):
+        vocab_path = self.data_path + os.sep + "vocab.txt"
+        os.makedirs(self.tmp_path, exist_ok=True)
+        mapped_vocab_path = self.tmp_path + os.sep + "vocab.da"
+        tokenizer = matx.text.WordPieceTokenizer(
+            vocab_path=vocab_path,
+            lookup_id=True,
+            subwords_prefix="",
+        )
+        tokenizer.save_vocab(mapped_vocab_path)
+        mapped_tokenizer = matx.text.WordPieceTokenizer(
+            vocab_path=mapped_vocab_path,
+            lookup_id=True,
+            subwords_prefix="",
+        )
+        example = ["hello", "world", "helloworld", "kkk"]
+        self.assertEqual(mapped_tokenizer.tokenize(example), tokenizer.tokenize(example))
+        self.assertEqual(mapped_tokenizer.tokenize(example), [3, 4, 3, 4, 2])
+
     def test_jieba(self):
         test_content = "这是一个伸手不见五指的黑夜。我叫孙悟空，我爱北京，我爱Python和C++。"
         jieba = matx.text.Jieba()
@@ -88,6 +137,36 @@ class TestBuiltinTextOps(unittest.TestCase):
         print(op(test_content, True, False))
         print(op(test_content, False, False))
 
+    def test_jieba_batch(self):
+        sentences = ["这是一个伸手不见五指的黑夜。", "我叫孙悟空，我爱北京，我爱Python和C++。"] * 20
+        jieba = matx.text.Jieba()
+        for cut_all in (False, True):
+            expect = [jieba.lcut(s, cut_all=cut_all) for s in sentences]
+            for inputs in (sentences, matx.StringBatch(sentences)):
+                words, lens = jieba.batch_lcut(inputs, cut_all=cut_all)
+                self.assertIsInstance(words, matx.StringBatch)
+                self.assertEqual(list(lens), [len(x) for x in expect])
+                self.assertEqual(words.to_list(), [w for x in expect for w in x])
+
+        offsets, lens = jieba.batch_lcut(sentences, with_offsets=True)
+        offsets = offsets.tolist()
+        words = []
+        start = 0
+        for s, n in zip(sentences, lens):
+            words.append([s[b:e] for b, e in offsets[start:start + n]])
+            start += n
+        self.assertEqual(words, [jieba.lcut(s) for s in sentences])
+
+        bytes_sentences = [s.encode() for s in sentences]
+        offsets, lens = jieba.batch_lcut(bytes_sentences, with_offsets=True)
+        self.assertEqual(offsets.tolist()[lens[0]][0], 0)
+        self.assertEqual(offsets.tolist()[lens[0] - 1][1], len(bytes_sentences[0]))
+
+        words, lens = jieba.batch_lcut_for_search(sentences)
+        expect = [jieba.lcut_for_search(s) for s in sentences]
+        self.assertEqual(list(lens), [len(x) for x in expect])
+        self.assertEqual(words.to_list(), [w for x in expect for w in x])
+
     def test_emoji_filter(self):
         class MyEmojiFilter:
             def __init__(self):
@@ -0,0 +1,126 @@
+# Copyright 2022 ByteDance Ltd. and/or its affiliates.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import os
+import shutil
+import tempfile
+import unittest
+import matx
+from matx.contrib.compile_cache import CompileCache, make_key
+
+
+def prebuild_add(a: int, b: int) -> int:
+    return a + b
+
+
+class PrebuildCounter:
+
+    def __init__(self, init: int) -> None:
+        self.count: int = init
+
+    def __call__(self) -> int:
+        self.count += 1
+        return self.count
+
+
+class TestCompileCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.work_path = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.work_path, ignore_errors=True)
+
+    def make_lib(self, name, size):
+        path = os.path.join(self.work_path, name)
+        with open(path, "wb") as f:
+            f.write(b"\0" * size)
+        return path
+
+    def test_key(self):
+        key = make_key("int main() {}", ["-O3"], "g++")
+        self.assertEqual(key, make_key("int main() {}", ["-O3"], "g++"))
+        self.assertNotEqual(key, make_key("int main() {}", ["-O2"], "g++"))
+        self.assertNotEqual(key, make_key("int main() { }", ["-O3"], "g++"))
+
+    def test_lru_eviction(self):
+        cache = CompileCache(os.path.join(self.work_path, "cache"), max_size=250)
+        keys = ["%064x" % i for i in range(3)]
+        cache.store(keys[0], self.make_lib("a.so", 100))
+        cache.store(keys[1], self.make_lib("b.so", 100))
+        # touch the first entry, the second one becomes the least recently used
+        first = cache.lookup(keys[0])
+        os.utime(cache.lookup(keys[1]), (0, 0))
+        self.assertIsNotNone(first)
+        cache.store(keys[2], self.make_lib("c.so", 100))
+        self.assertIsNotNone(cache.lookup(keys[0]))
+        self.assertIsNone(cache.lookup(keys[1]))
+        self.assertIsNotNone(cache.lookup(keys[2]))
+
+        output = os.path.join(self.work_path, "out.so")
+        self.assertTrue(cache.fetch(keys[2], output))
+        self.assertEqual(os.path.getsize(output), 100)
+        self.assertFalse(cache.fetch(keys[1], output))
+
+    def test_size_index(self):
+        cache_dir = os.path.join(self.work_path, "cache")
+        cache = CompileCache(cache_dir, max_size=250)
+        keys = ["%064x" % i for i in range(3)]
+        cache.store(keys[0], self.make_lib("a.so", 100))
+        cache.store(keys[1], self.make_lib("b.so", 100))
+        self.assertEqual(cache._read_size(), 200)
+        # replacing an entry only adds the difference
+        cache.store(keys[1], self.make_lib("b.so", 50))
+        self.assertEqual(cache._read_size(), 150)
+        # a lost index is rebuilt from the directory
+        os.remove(os.path.join(cache_dir, "size"))
+        cache.store(keys[2], self.make_lib("c.so", 100))
+        self.assertEqual(cache._read_size(), 250)
+        cache.store(keys[0], self.make_lib("a.so", 200))
+        self.assertEqual(cache._read_size(), sum(size for _, size, _ in cache.entries()))
+        self.assertLessEqual(cache._read_size(), 250)
+
+    def test_read_only_dirs(self):
+        shared_dir = os.path.join(self.work_path, "shared")
+        CompileCache(shared_dir).store("ab" * 32, self.make_lib("a.so", 10))
+        cache = CompileCache(None, read_only_dirs=[shared_dir])
+        self.assertIsNotNone(cache.lookup("ab" * 32))
+        cache.store("cd" * 32, self.make_lib("b.so", 10))
+        self.assertIsNone(cache.lookup("cd" * 32))
+
+    def test_prebuild(self):
+        dso_paths = matx.prebuild([prebuild_add, PrebuildCounter], num_workers=2)
+        self.assertEqual(len(dso_paths), 2)
+        for dso_path in dso_paths:
+            self.assertTrue(os.path.isfile(dso_path[0]))
+        self.assertEqual(matx.script(prebuild_add)(1, 2), 3)
+        self.assertEqual(matx.script(PrebuildCounter)(1)(), 2)
+
+    def test_prebuild_background(self):
+        future = matx.prebuild([prebuild_add], num_workers=1, wait=False)
+        dso_paths = future.result()
+        self.assertEqual(len(dso_paths), 1)
+        self.assertTrue(os.path.isfile(dso_paths[0][0]))
+        self.assertEqual(matx.prebuild([], wait=False).result(), [])
+
+
+if __name__ == '__main__':
+    import logging
+
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
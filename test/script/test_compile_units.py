@@ -0,0 +1,114 @@
+# Copyright 2022 ByteDance Ltd. and/or its affiliates.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from typing import Any, List
+import matx
+from matx import toolchain
+
+script_module = sys.modules["matx.script"]
+
+
+class UnitsBase:
+
+    def __init__(self, x: int) -> None:
+        self.x: int = x
+
+    def get(self) -> int:
+        return self.x
+
+
+class UnitsChild(UnitsBase):
+
+    def __init__(self, x: int, y: int = 3) -> None:
+        super().__init__(x)
+        self.y: int = y
+
+    def __call__(self, a: List) -> Any:
+        return units_add_len(a, self.y) + self.get()
+
+
+def units_add_len(a: List, b: int = 2) -> int:
+    return len(a) + b
+
+
+def units_make_child(a: List) -> int:
+    c = UnitsChild(1)
+    return c(a)
+
+
+def units_generator(n: int) -> Any:
+    for i in range(n):
+        yield i
+
+
+def units_use_generator(n: int) -> List:
+    return [i for i in units_generator(n)]
+
+
+class TestCompileUnits(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.work_path = tempfile.mkdtemp()
+        self.compile_jobs = script_module.MATX_COMPILE_JOBS
+        self.unit_size = script_module.MATX_COMPILE_UNIT_SIZE
+        script_module.MATX_COMPILE_JOBS = 4
+        script_module.MATX_COMPILE_UNIT_SIZE = 1
+
+    def tearDown(self) -> None:
+        script_module.MATX_COMPILE_JOBS = self.compile_jobs
+        script_module.MATX_COMPILE_UNIT_SIZE = self.unit_size
+        shutil.rmtree(self.work_path, ignore_errors=True)
+
+    def test_split_units(self):
+        sc_ctx = toolchain.from_source(units_make_child)
+        units = sc_ctx.rt_module.get_units()
+        self.assertEqual(len(units), 4)
+        # the module context and the static members are defined only once
+        self.assertEqual(sum(unit.count("__matxscript_module_ctx = NULL") for unit in units), 1)
+        self.assertEqual(sum(unit.count("UnitsChild::tag_s_") for unit in units[1:]), 0)
+
+        so_path = os.path.join(self.work_path, "libunits.so")
+        options = ["-std=c++14", "-O2", "-D_GLIBCXX_USE_CXX11_ABI=0"]
+        toolchain.export_units(units, so_path, options, matx.contrib.cc.find_sys_cc_path())
+        self.assertTrue(os.path.isfile(so_path))
+        self.assertEqual(os.listdir(self.work_path), ["libunits.so"])
+
+        self.assertEqual(matx.script(units_make_child)([1, 2]), 7)
+        self.assertEqual(matx.script(UnitsChild)(3, 4)([1]), 8)
+
+    def test_small_module(self):
+        script_module.MATX_COMPILE_UNIT_SIZE = 1024 * 1024
+        sc_ctx = toolchain.from_source(units_add_len)
+        self.assertEqual(sc_ctx.rt_module.get_units(), [])
+
+    def test_generator_not_split(self):
+        sc_ctx = toolchain.from_source(units_use_generator)
+        self.assertEqual(sc_ctx.rt_module.get_units(), [])
+        self.assertEqual(matx.script(units_use_generator)(3), [0, 1, 2])
+
+
+if __name__ == '__main__':
+    import logging
+
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
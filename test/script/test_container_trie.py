@@ -190,6 +190,30 @@ class TestContainerTrie(unittest.TestCase):
         check(generic_load_trie, "hello hello world", {(5, 1), (17, 3)})
         os.remove(file_path)
 
+    def test_save_load_mapped(self):
+        import os
+
+        def test_trie_generic_save_mapped(trie: Any, file_path: str) -> int:
+            return trie.save(file_path, True)
+
+        generic_save_op = matx.script(test_trie_generic_save_mapped)
+
+        file_path = "trie_save_load_mapped.da"
+        trie = matx.Trie({'hello': 1, 'hello world': 2, 'hello hello world': 3})
+        self.assertEqual(0, trie.save(file_path, True))
+        self.assertEqual(0, generic_save_op(trie, file_path))
+
+        load_trie = matx.Trie()
+        other_trie = matx.Trie()
+        self.assertEqual(0, load_trie.load(file_path))
+        self.assertEqual(0, other_trie.load(file_path))
+        self.assertEqual((11, 2), load_trie.prefix_search("hello world"))
+        # updating copies the mapped trie, the other tries are not changed
+        load_trie.update("hello", 5)
+        self.assertEqual((5, 5), load_trie.prefix_search("hello"))
+        self.assertEqual((5, 1), other_trie.prefix_search("hello"))
+        os.remove(file_path)
+
 
 if __name__ == "__main__":
     import logging
@@ -76,6 +76,47 @@ class TestJson(unittest.TestCase):
         result = json_dumps_func(obj)
         self.assertEqual(result, '{"\\u4F60":{"x":4},"\\u6211":[2,3]}')
 
+    def test_json_dumps_options(self):
+        @matx.script
+        def json_dumps_func(obj: Any) -> str:
+            return json.dumps(obj, indent=2, ensure_ascii=False)
+
+        obj = matx.Dict({"\u6211": [2, 3]})
+        result = json_dumps_func(obj)
+        self.assertEqual(result, '{\n  "\u6211": [\n    2,\n    3\n  ]\n}')
+        self.assertEqual(json.loads(result), {"\u6211": [2, 3]})
+
+    def test_json_lines(self):
+        test_file = self.tmp_path + "test_json_lines.jsonl"
+        with open(test_file, "w") as f:
+            f.write('{"k": 1}\n\n{"k": "\u6211"}\n')
+        result = list(matx.json_lines(test_file))
+        self.assertEqual(result, [matx.Dict({"k": 1}), matx.Dict({"k": "\u6211"})])
+
+        @matx.script
+        def json_lines_func(path: str) -> List:
+            values = []
+            for value in matx.json_lines(path):
+                values.append(value)
+            return values
+
+        self.assertEqual(json_lines_func(test_file), result)
+
+    def test_json_dump(self):
+        test_file = self.tmp_path + "test_json_dump.json"
+
+        @matx.script
+        def json_dump_func(obj: Any, path: str) -> None:
+            matx.json_dump(obj, path, indent=2, ensure_ascii=False)
+
+        obj = matx.Dict({"\u6211": [2, 3]})
+        json_dump_func(obj, test_file)
+        with open(test_file) as f:
+            self.assertEqual(f.read(), '{\n  "\u6211": [\n    2,\n    3\n  ]\n}')
+        matx.json_dump(obj, test_file)
+        with open(test_file) as f:
+            self.assertEqual(json.load(f), {"\u6211": [2, 3]})
+
     def test_consistency(self):
         @matx.script
         def json_loads_func(s: str) -> Any:
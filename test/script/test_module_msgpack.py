@@ -16,11 +16,13 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import io
 import unittest
 import msgpack
 import numpy as np
 
 import matx
+from matx.runtime.msgpack import Packer, Unpacker
 
 
 class TestMsgpack(unittest.TestCase):
@@ -44,6 +46,66 @@ class TestMsgpack(unittest.TestCase):
         arr2 = matx.msgpack_loads(tx_bytes)
         self.assertTrue(np.alltrue(arr.numpy() == arr2.numpy()))
 
+    def test_msgpack_zero_copy_loads(self):
+        arr = matx.NDArray(list(range(24)), [2, 3, 4], "float32")
+        tx_bytes = matx.msgpack_dumps({"x": arr, "s": "hello", "l": [arr, b"hi"]})
+        tx_data = matx.msgpack_loads(tx_bytes, zero_copy=True)
+        self.assertEqual(tx_data["s"], "hello")
+        self.assertEqual(tx_data["l"][1], b"hi")
+        self.assertTrue(np.alltrue(tx_data["x"].numpy() == arr.numpy()))
+        self.assertTrue(np.alltrue(tx_data["l"][0].numpy() == arr.numpy()))
+        # the views are over a private copy, writing them does not change the packed bytes
+        tx_data["x"][0] = matx.NDArray(0, [3, 4], "float32")
+        self.assertTrue(np.alltrue(matx.msgpack_loads(tx_bytes)["x"].numpy() == arr.numpy()))
+
+    def test_msgpack_stream(self):
+        records = []
+        for i in range(5):
+            arr = matx.NDArray(list(range((i + 1) * 7)), [i + 1, 7], "int64")
+            records.append({"id": i, "name": "r%d" % i, "x": arr})
+        stream = io.BytesIO()
+        packer = Packer(stream, align_ndarray=True)
+        for record in records:
+            packer.pack(record)
+        packer.pack([1, 2.5, None])
+
+        # a small read_size splits the records across reads
+        stream.seek(0)
+        unpacked = list(Unpacker(stream, read_size=13))
+        self.assertEqual(len(unpacked), len(records) + 1)
+        for record, tx_record in zip(records, unpacked):
+            self.assertEqual(tx_record["id"], record["id"])
+            self.assertEqual(tx_record["name"], record["name"])
+            self.assertEqual(tx_record["x"].shape(), record["x"].shape())
+            self.assertTrue(np.alltrue(tx_record["x"].numpy() == record["x"].numpy()))
+        self.assertEqual(unpacked[-1], [1, 2.5, None])
+
+        # feed in pieces, the records are returned once they are complete
+        data = stream.getvalue()
+        unpacker = Unpacker(zero_copy=False)
+        count = 0
+        for i in range(0, len(data), 100):
+            unpacker.feed(data[i:i + 100])
+            count += len(list(unpacker))
+        self.assertEqual(count, len(records) + 1)
+        self.assertEqual(unpacker.buffered, 0)
+
+        # a truncated stream
+        with self.assertRaises(ValueError):
+            list(Unpacker(io.BytesIO(data[:-3])))
+
+    def test_msgpack_stream_compatible(self):
+        arr = matx.NDArray(1, [2, 3, 8], "int32")
+        data = Packer().pack(arr)
+        self.assertEqual(data, matx.msgpack_dumps(arr))
+        arr2 = matx.msgpack_loads(Packer(align_ndarray=True).pack(arr))
+        self.assertTrue(np.alltrue(arr.numpy() == arr2.numpy()))
+        # records written by dumps can be read by Unpacker
+        stream = io.BytesIO(matx.msgpack_dumps(arr) + matx.msgpack_dumps("end"))
+        unpacked = list(Unpacker(stream))
+        self.assertTrue(np.alltrue(arr.numpy() == unpacked[0].numpy()))
+        self.assertEqual(unpacked[1], "end")
+
 
 if __name__ == "__main__":
     import logging
@@ -637,6 +637,170 @@ class TestMatxNdarray(unittest.TestCase):
         b = matx.NDArray([2, 2, 2, 2, 2, 2], [2, 3], "int32")
         test(a[::2], b, a.asnumpy()[::2] * b.asnumpy())
 
+    def test_nd_out(self):
+        def nd_module_add_out(x: Any, y: Any, z: matx.NDArray) -> matx.NDArray:
+            return matx.array.add(x, y, out=z)
+        nd_module_add_out_op = matx.script(nd_module_add_out)
+
+        a = numpy.arange(12, dtype="float32").reshape(3, 4)
+        b = numpy.arange(4, dtype="float32")
+        for func in (nd_module_add_out, nd_module_add_out_op):
+            out = matx.array.from_numpy(numpy.zeros((3, 4), dtype="float32"))
+            ret = func(matx.array.from_numpy(a), matx.array.from_numpy(b), out)
+            self.assertTrue((out.asnumpy() == a + b).all())
+            self.assertTrue((ret.asnumpy() == a + b).all())
+
+        # in place
+        x = matx.array.from_numpy(a)
+        matx.array.mul(x, 2, out=x)
+        self.assertTrue((x.asnumpy() == a * 2).all())
+
+        # dtype and shape of out must match the result
+        with self.assertRaises(Exception):
+            out = matx.array.from_numpy(a.astype("int32"))
+            matx.array.add(matx.array.from_numpy(a), 1.5, out=out)
+        with self.assertRaises(Exception):
+            matx.array.add(matx.array.from_numpy(a), 1, out=matx.array.from_numpy(b))
+
+    def test_nd_large_elementwise(self):
+        def nd_large_ops(x: matx.NDArray, y: matx.NDArray) -> matx.NDArray:
+            return matx.array.div(matx.array.sub(matx.array.mul(x, y), 1.5), 2.0)
+
+        a = numpy.random.rand(256, 1024).astype("float32")
+        b = numpy.random.rand(1024).astype("float32")
+        expect = (a * b - 1.5) / 2.0
+
+        nd_large_ops_op = matx.script(nd_large_ops)
+        self.assertTrue(numpy.isclose(
+            nd_large_ops_op(matx.array.from_numpy(a), matx.array.from_numpy(b)).asnumpy(),
+            expect).all())
+
+        # split across the compute pool of the session
+        def workflow(x, y):
+            return nd_large_ops_op(x, y)
+
+        jit_mod = matx.trace(workflow, matx.array.from_numpy(a), matx.array.from_numpy(b))
+        jit_mod.set_pmap_threads(4)
+        ret = jit_mod.run({"x": matx.array.from_numpy(a), "y": matx.array.from_numpy(b)})
+        self.assertTrue(numpy.isclose(ret.asnumpy(), expect).all())
+
+        # transposed input
+        t = numpy.ascontiguousarray(a.T)
+        ret = jit_mod.run({"x": matx.array.from_numpy(t).transpose(),
+                           "y": matx.array.from_numpy(b)})
+        self.assertTrue(numpy.isclose(ret.asnumpy(), expect).all())
+
+    def test_nd_reduce(self):
+        def nd_reduce(x: matx.NDArray) -> Any:
+            return [matx.array.sum(x), matx.array.mean(x, 0), matx.array.max(x, axis=1),
+                    matx.array.argmin(x, 1, keepdims=True)]
+        nd_reduce_op = matx.script(nd_reduce)
+
+        a = numpy.random.rand(5, 7).astype("float32")
+        for func in (nd_reduce, nd_reduce_op):
+            s, m, mx, am = func(matx.array.from_numpy(a))
+            self.assertAlmostEqual(s, a.sum(), places=3)
+            self.assertTrue(numpy.isclose(m.asnumpy(), a.mean(0)).all())
+            self.assertTrue((mx.asnumpy() == a.max(1)).all())
+            self.assertTrue((am.asnumpy() == a.argmin(1).reshape(5, 1)).all())
+
+        b = numpy.arange(24, dtype="int32").reshape(2, 3, 4)
+        nd = matx.array.from_numpy(b)
+        self.assertEqual(matx.array.sum(nd), b.sum())
+        self.assertEqual(matx.array.argmax(nd), b.argmax())
+        self.assertEqual(matx.array.sum(nd, 1).dtype(), "int64")
+        for axis in (0, 1, 2, -1):
+            self.assertTrue((matx.array.sum(nd, axis).asnumpy() == b.sum(axis)).all())
+            self.assertTrue((matx.array.min(nd, axis).asnumpy() == b.min(axis)).all())
+            self.assertTrue((matx.array.argmax(nd, axis).asnumpy() == b.argmax(axis)).all())
+        # non contiguous input
+        t = matx.array.from_numpy(numpy.ascontiguousarray(b.transpose(2, 1, 0))).transpose()
+        self.assertTrue((matx.array.sum(t, 1).asnumpy() == b.sum(1)).all())
+        with self.assertRaises(Exception):
+            matx.array.sum(nd, 3)
+
+    def test_nd_unary_math(self):
+        def nd_normalize(x: matx.NDArray) -> matx.NDArray:
+            y = matx.array.cast_scale(x, "float32", 1 / 255.0, -0.5)
+            return matx.array.clip(matx.array.sqrt(matx.array.exp(y)), 0.9, None)
+        nd_normalize_op = matx.script(nd_normalize)
+
+        a = numpy.arange(256, dtype="uint8").reshape(16, 16)
+        y = a.astype("float32") / 255.0 - 0.5
+        expect = numpy.clip(numpy.sqrt(numpy.exp(y)), 0.9, None)
+        for func in (nd_normalize, nd_normalize_op):
+            ret = func(matx.array.from_numpy(a))
+            self.assertEqual(ret.dtype(), "float32")
+            self.assertTrue(numpy.isclose(ret.asnumpy(), expect).all())
+
+        f = numpy.array([-300.4, -1.5, 0.4, 2.6, 300.2], dtype="float32")
+        ret = matx.array.cast_scale(matx.array.from_numpy(f), "uint8")
+        self.assertSequenceEqual(ret.asnumpy().tolist(), [0, 0, 0, 3, 255])
+        ret = matx.array.abs(matx.array.from_numpy(f))
+        self.assertTrue((ret.asnumpy() == numpy.abs(f)).all())
+        ret = matx.array.log(matx.array.from_numpy(numpy.array([1, 4], dtype="int32")))
+        self.assertTrue(numpy.isclose(ret.asnumpy(), numpy.log([1, 4])).all())
+
+        cond = numpy.array([[1], [0]], dtype="int32")
+        x = numpy.arange(6, dtype="float32").reshape(2, 3)
+        ret = matx.array.where(matx.array.from_numpy(cond), matx.array.from_numpy(x), -1)
+        self.assertTrue((ret.asnumpy() == numpy.where(cond, x, -1)).all())
+
+    def test_nd_evaluate(self):
+        def nd_standardize(x: matx.NDArray, m: float, s: float) -> matx.NDArray:
+            return matx.array.evaluate("where(x > m, (x - m) / s, -exp(-x))",
+                                       {"x": x, "m": m, "s": s})
+        nd_standardize_op = matx.script(nd_standardize)
+
+        a = numpy.random.rand(64, 1000).astype("float32")
+        m, s = float(a.mean()), float(a.std())
+        expect = numpy.where(a > m, (a - m) / s, -numpy.exp(-a))
+        for func in (nd_standardize, nd_standardize_op):
+            ret = func(matx.array.from_numpy(a), m, s)
+            self.assertEqual(ret.dtype(), "float32")
+            self.assertTrue(numpy.isclose(ret.asnumpy(), expect, atol=1e-6).all())
+
+        # broadcasting, out and the lazy builder
+        x = matx.array.from_numpy(a)
+        mean = matx.array.from_numpy(a.mean(0))
+        std = matx.array.from_numpy(a.std(0))
+        expect = (a - a.mean(0)) / a.std(0)
+        out = matx.array.from_numpy(numpy.zeros_like(a))
+        ret = ((matx.array.lazy(x) - mean) / std).eval(out=out)
+        self.assertTrue(numpy.isclose(out.asnumpy(), expect, atol=1e-5).all())
+        ret = (2 ** matx.array.lazy(x)).clip(1.2, 1.8).eval()
+        self.assertTrue(numpy.isclose(ret.asnumpy(), numpy.clip(2 ** a, 1.2, 1.8)).all())
+        self.assertEqual(matx.array.evaluate("x * 2", {"x": x.as_type("float64")}).dtype(),
+                         "float64")
+        ret = abs(1.5 - matx.array.lazy(x)).eval()
+        self.assertTrue(numpy.isclose(ret.asnumpy(), numpy.abs(1.5 - a)).all())
+        ret = (x - matx.array.lazy(mean)).eval()
+        self.assertTrue(numpy.isclose(ret.asnumpy(), a - a.mean(0)).all())
+        ret = (matx.array.lazy(x) - 1.5).eval()
+        self.assertTrue(numpy.isclose(ret.asnumpy(), a - 1.5).all())
+
+        class Offset(object):
+            def __radd__(self, other):
+                return "radd"
+
+            def __add__(self, other):
+                return "add"
+
+        # unknown operands are left to the other side in both orders
+        self.assertEqual(matx.array.lazy(x) + Offset(), "radd")
+        self.assertEqual(Offset() + matx.array.lazy(x), "add")
+        with self.assertRaises(TypeError):
+            matx.array.lazy(x) * "a"
+        with self.assertRaises(TypeError):
+            "a" * matx.array.lazy(x)
+
+        with self.assertRaises(Exception):
+            matx.array.evaluate("x +", {"x": x})
+        with self.assertRaises(Exception):
+            matx.array.evaluate("foo(x)", {"x": x})
+        with self.assertRaises(Exception):
+            matx.array.evaluate("x + y", {"x": x})
+
     def test_nd_rand(self):
         def nd_module_rand(shape: List) -> matx.NDArray:
             return matx.array.rand(shape)
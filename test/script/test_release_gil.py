@@ -0,0 +1,113 @@
+# Copyright 2022 ByteDance Ltd. and/or its affiliates.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import threading
+import unittest
+from typing import Callable, List
+import matx
+
+
+def heavy_sum(n: int) -> int:
+    s = 0
+    for i in range(n):
+        s += i % 7
+    return s
+
+
+class AddOne:
+
+    def __init__(self) -> None:
+        pass
+
+    def __call__(self, a: int) -> int:
+        return a + 1
+
+
+def parallel_call(f: Callable, inputs: List) -> List:
+    thread_pool = matx.make_native_object("ThreadPoolExecutor", 4, False)
+    return thread_pool.ParallelFor(f, inputs)
+
+
+def call_callback(f: Callable, n: int) -> List:
+    return [f(i) for i in range(n)]
+
+
+class TestReleaseGIL(unittest.TestCase):
+
+    def run_in_threads(self, func, num_threads=4):
+        results = [None] * num_threads
+        errors = []
+
+        def worker(idx):
+            try:
+                results[idx] = func()
+            except BaseException as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(num_threads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        return results
+
+    def test_native_call_in_threads(self):
+        heavy_sum_op = matx.script(heavy_sum)
+        expect = heavy_sum(100000)
+        results = self.run_in_threads(lambda: heavy_sum_op(100000))
+        self.assertEqual(results, [expect] * 4)
+
+    def test_python_callback_in_threads(self):
+        # the packed function releases the GIL and the closure takes it back
+        double = matx.to_packed_func(lambda x: x * 2)
+        results = self.run_in_threads(lambda: [double(x) for x in range(100)])
+        for r in results:
+            self.assertEqual(r, [x * 2 for x in range(100)])
+
+    def test_native_pool_in_threads(self):
+        add_one_op = matx.script(AddOne)()
+        parallel_call_op = matx.script(parallel_call)
+        inputs = list(range(100))
+        expect = [x + 1 for x in inputs]
+        results = self.run_in_threads(lambda: parallel_call_op(add_one_op, inputs))
+        for r in results:
+            self.assertEqual(list(r), expect)
+
+    def test_scripted_code_calls_python(self):
+        # the scripted code runs without the GIL, the python callback takes it back,
+        # also from the native worker threads of the pool
+        double = matx.to_packed_func(lambda x: x * 2)
+        call_callback_op = matx.script(call_callback)
+        parallel_call_op = matx.script(parallel_call)
+        inputs = list(range(100))
+        expect = [x * 2 for x in inputs]
+        results = self.run_in_threads(lambda: call_callback_op(double, 100))
+        for r in results:
+            self.assertEqual(list(r), expect)
+        results = self.run_in_threads(lambda: parallel_call_op(double, inputs))
+        for r in results:
+            self.assertEqual(list(r), expect)
+
+
+if __name__ == '__main__':
+    import logging
+
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
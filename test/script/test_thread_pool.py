@@ -56,6 +56,18 @@ class ParallelOp2:
         return self.thread_pool.ParallelFor(op, inputs)
 
 
+class WorkStealingParallelOp:
+    __slots__: Tuple[matx.NativeObject] = ['thread_pool']
+
+    def __init__(self, pool_size: int) -> None:
+        # pool_size, lock_free, intervals_ns, work_stealing
+        self.thread_pool = matx.make_native_object(
+            "ThreadPoolExecutor", pool_size, False, 0, True)
+
+    def __call__(self, op: Callable, inputs: List) -> List:
+        return self.thread_pool.ParallelFor(op, inputs)
+
+
 class TestThreadPoolExecutor(unittest.TestCase):
 
     def test_parallel_for(self):
@@ -82,6 +94,12 @@ class TestThreadPoolExecutor(unittest.TestCase):
         self.assertEqual(pipeline1([1.1, 2.1, 3.1]), matx.List([2.2, 4.2, 6.2]))
         self.assertEqual(pipeline2([1.1, 2.1, 3.1]), matx.List([2.2, 4.2, 6.2]))
 
+    def test_work_stealing_parallel_for(self):
+        op_1 = matx.script(Op1)
+        parallel_op = matx.script(WorkStealingParallelOp)(3)
+        inputs = [float(i) for i in range(16)]
+        self.assertEqual(parallel_op(op_1, inputs), matx.List([2 * x for x in inputs]))
+
 
 class TestThreadPoolWithException(unittest.TestCase):
 
@@ -0,0 +1,89 @@
+# Copyright 2022 ByteDance Ltd. and/or its affiliates.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import os
+import uuid
+import unittest
+import matx
+from typing import Any
+
+SCRIPT_PATH = os.path.split(os.path.realpath(__file__))[0]
+
+
+@matx.script
+def lookup_table(table: matx.NDArray, vocab: bytes, i: int) -> Any:
+    return table[i], vocab[i]
+
+
+class TestBinarySpec(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_path = SCRIPT_PATH + "/../tempdir/"
+        self.work_path = self.tmp_path + "TestBinarySpec_%d/" % uuid.uuid4().int
+        if not os.path.exists(self.work_path):
+            os.mkdir(self.work_path)
+
+    def test_save_load(self):
+        table = matx.NDArray(list(range(8192)), [8192], "int64")
+        vocab = b"abcdefgh" * 1024
+
+        def workflow(i):
+            return lookup_table(table, vocab, i)
+
+        jit_mod = matx.trace(workflow, 0)
+        expect = [jit_mod.run({"i": i}) for i in (0, 100, 8191)]
+
+        save_path = self.work_path + "test_save_load"
+        matx.save(jit_mod, save_path, binary=True)
+        self.assertTrue(os.path.isfile(os.path.join(save_path, "model.spec.msgpack")))
+        # the large constants are in the data file
+        self.assertGreaterEqual(
+            os.path.getsize(os.path.join(save_path, "model.spec.data")), 8192 * 8 + 8192)
+
+        jit_mod_2 = matx.load(save_path, "cpu")
+        self.assertEqual([jit_mod_2.run({"i": i}) for i in (0, 100, 8191)], expect)
+        # the files are replaced by rename, no temp file is left
+        self.assertEqual(sorted(os.listdir(save_path)), ["model.spec.data", "model.spec.msgpack"])
+
+    def test_replace_spec_format(self):
+        def workflow(i):
+            return i + 1
+
+        jit_mod = matx.trace(workflow, 0)
+        save_path = self.work_path + "test_replace_spec_format"
+        matx.save(jit_mod, save_path, binary=True)
+        matx.save(jit_mod, save_path)
+        # the binary spec is removed by the json save
+        self.assertFalse(os.path.exists(os.path.join(save_path, "model.spec.msgpack")))
+        self.assertFalse(os.path.exists(os.path.join(save_path, "model.spec.data")))
+        self.assertEqual(matx.pipeline.default_spec_name(save_path), "model.spec.json")
+        matx.save(jit_mod, save_path, binary=True)
+        self.assertFalse(os.path.exists(os.path.join(save_path, "model.spec.json")))
+        self.assertEqual(matx.load(save_path, "cpu").run({"i": 1}), 2)
+        # a folder with both specs, e.g. copied over an old one, is ambiguous
+        with open(os.path.join(save_path, "model.spec.json"), "w") as f:
+            f.write("{}")
+        with self.assertRaises(RuntimeError):
+            matx.load(save_path, "cpu")
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
@@ -0,0 +1,92 @@
+# Copyright 2022 ByteDance Ltd. and/or its affiliates.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import os
+import unittest
+import uuid
+from typing import List
+import matx
+
+
+@matx.script
+def make_ngram(query: str, max_ngram_size: int) -> List:
+    ngram_list = []
+    query_terms = query.strip().split(' ')
+    for l in range(1, max_ngram_size + 1):
+        for j in range(0, len(query_terms) - l + 1):
+            ngram_list.append(" ".join(query_terms[j: j + l]))
+    return ngram_list
+
+
+@matx.script
+def first_term(terms: List) -> str:
+    return terms[0]
+
+
+def workflow(query):
+    # r2 only depends on r1, the wide branches r3/r4 are independent
+    r1 = make_ngram(query, 2)
+    r2 = make_ngram(first_term(r1), 3)
+    r3 = make_ngram(query, 3)
+    r4 = make_ngram(query, 4)
+    return r1, r2, r3, r4
+
+
+SCRIPT_PATH = os.path.split(os.path.realpath(__file__))[0]
+
+
+class TestDataflowScheduling(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_path = SCRIPT_PATH + "/../tempdir/"
+        self.work_path = self.tmp_path + "TestDataflowScheduling_%d/" % uuid.uuid4().int
+        if not os.path.exists(self.work_path):
+            os.mkdir(self.work_path)
+
+    def test_dataflow_scheduling(self):
+        query = "hello world this is a test query"
+        jit_mod = matx.trace(workflow, query)
+        ret1 = jit_mod.run({"query": query})
+        jit_mod.set_op_parallelism_threads(4)
+        ret2 = jit_mod.run({"query": query})
+        level_meta = jit_mod.gen_step_meta({"query": query})
+        self.assertFalse(jit_mod.get_dataflow_scheduling())
+        jit_mod.set_dataflow_scheduling(True)
+        self.assertTrue(jit_mod.get_dataflow_scheduling())
+        for _ in range(10):
+            ret3 = jit_mod.run({"query": query})
+            self.assertEqual(ret1, ret3)
+        self.assertEqual(ret1, ret2)
+
+        meta = jit_mod.gen_step_meta({"query": query})
+        self.assertEqual(sorted(op["op"] for op in meta["ops"]),
+                         sorted(op["op"] for op in level_meta["ops"]))
+
+        save_path = self.work_path + "test_dataflow_scheduling"
+        jit_mod.save(save_path)
+        jit_mod = matx.load(save_path, 'cpu')
+        self.assertTrue(jit_mod.get_dataflow_scheduling())
+        ret4 = jit_mod.run({"query": query})
+        self.assertEqual(ret1, ret4)
+
+
+if __name__ == '__main__':
+    import logging
+
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
@@ -0,0 +1,110 @@
+# Copyright 2022 ByteDance Ltd. and/or its affiliates.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import os
+import unittest
+import uuid
+from typing import List
+import matx
+from matx.pipeline.builtin_op import get_interpreter_op
+
+SCRIPT_PATH = os.path.split(os.path.realpath(__file__))[0]
+
+
+@matx.script
+def count_words(texts: List[str]) -> int:
+    return len(texts)
+
+
+@matx.script
+def append_one(items: List) -> List:
+    items.append(1)
+    return items
+
+
+def workflow(texts):
+    add_op = get_interpreter_op("__add__")
+    mul_op = get_interpreter_op("__mul__")
+    getitem_op = get_interpreter_op("__getitem__")
+    len_op = get_interpreter_op("__len__")
+    # folded to one constant
+    scale = mul_op(add_op(matx.pipeline.Const(1), matx.pipeline.Const(2)),
+                   matx.pipeline.Const(4))
+    # the same getitem is traced twice
+    first = getitem_op(texts, matx.pipeline.Const(0))
+    first_again = getitem_op(texts, matx.pipeline.Const(0))
+    # len(texts[0]) * 12 + count_words(texts) is fused into one node
+    num = add_op(mul_op(len_op(first_again), scale), count_words(texts))
+    return first, num
+
+
+def concat_workflow(a, b):
+    add_op = get_interpreter_op("__add__")
+    # each a + b is a new list, one of them is changed by append_one
+    return append_one(add_op(a, b)), add_op(a, b)
+
+
+class TestGraphOptimizer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_path = SCRIPT_PATH + "/../tempdir/"
+        self.work_path = self.tmp_path + "TestGraphOptimizer_%d/" % uuid.uuid4().int
+        if not os.path.exists(self.work_path):
+            os.mkdir(self.work_path)
+
+    def check_results(self, jit_mod):
+        self.assertEqual(jit_mod.run({"texts": ["hello", "world"]}), ("hello", 62))
+        self.assertEqual(jit_mod.run({"texts": ["hi"]}), ("hi", 25))
+
+    def test_optimize(self):
+        jit_mod = matx.trace(workflow, ["hello", "world"])
+        self.check_results(jit_mod)
+        stats = jit_mod.optimize()
+        self.assertLess(stats["nodes_after"], stats["nodes_before"])
+        self.assertEqual(stats["folded"], 2)
+        self.assertGreater(stats["merged"], 0)
+        self.assertGreater(stats["fused"], 0)
+        self.check_results(jit_mod)
+
+        save_path = self.work_path + "test_optimize"
+        matx.save(jit_mod, save_path)
+        new_jit_mod = matx.load(save_path, "cpu")
+        self.check_results(new_jit_mod)
+
+    def test_keep_new_containers(self):
+        jit_mod = matx.trace(concat_workflow, [1], [2])
+        stats = jit_mod.optimize()
+        self.assertEqual(stats["merged"], 0)
+        self.assertEqual(jit_mod.run({"a": [1], "b": [2]}), ([1, 2, 1], [1, 2]))
+
+    def test_disable_passes(self):
+        jit_mod = matx.trace(workflow, ["hello", "world"])
+        stats = jit_mod.optimize(fold_constants=False,
+                                 eliminate_common_subexpr=False,
+                                 fuse_interpreter_ops=False)
+        self.assertEqual(stats["folded"], 0)
+        self.assertEqual(stats["merged"], 0)
+        self.assertEqual(stats["fused"], 0)
+        self.check_results(jit_mod)
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
@@ -0,0 +1,83 @@
+# Copyright 2022 ByteDance Ltd. and/or its affiliates.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import unittest
+import matx
+
+
+class MyAdd:
+
+    def __init__(self) -> None:
+        pass
+
+    def __call__(self, a: int, b: int) -> int:
+        if b < 0:
+            raise ValueError("b is negative")
+        return a + b
+
+
+class TestOpMetrics(unittest.TestCase):
+
+    def test_snapshot(self):
+        add_op = matx.script(MyAdd)()
+
+        def workflow(a, b):
+            return add_op(a, b)
+
+        jit_mod = matx.trace(workflow, 1, 2)
+        jit_mod.reset_metrics()
+        for i in range(10):
+            self.assertEqual(jit_mod.run({"a": i, "b": 1}), i + 1)
+        with self.assertRaises(Exception):
+            jit_mod.run({"a": 1, "b": -1})
+
+        metrics = jit_mod.get_metrics()
+        ops = [op for op in metrics["ops"] if "MyAdd" in op["op"]]
+        self.assertEqual(len(ops), 1)
+        self.assertEqual(ops[0]["calls"], 11)
+        self.assertEqual(ops[0]["errors"], 1)
+        latency = ops[0]["latency"]
+        self.assertEqual(latency["count"], 11)
+        # the last bucket is +Inf and holds all the calls
+        self.assertEqual(latency["buckets"][-1][1], 11)
+
+        jit_mod.reset_metrics()
+        metrics = jit_mod.get_metrics()
+        ops = [op for op in metrics["ops"] if "MyAdd" in op["op"]]
+        self.assertEqual(ops[0]["calls"], 0)
+
+    def test_prometheus(self):
+        add_op = matx.script(MyAdd)()
+
+        def workflow(a, b):
+            return add_op(a, b)
+
+        jit_mod = matx.trace(workflow, 1, 2)
+        jit_mod.run({"a": 1, "b": 2})
+        text = jit_mod.get_metrics_prometheus()
+        self.assertIn("# TYPE matx_op_latency_seconds histogram", text)
+        self.assertIn("MyAdd", text)
+        self.assertIn('pool="scheduling"', text)
+        self.assertIn('le="+Inf"', text)
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
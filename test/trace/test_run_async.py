@@ -0,0 +1,104 @@
+# Copyright 2022 ByteDance Ltd. and/or its affiliates.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import asyncio
+import os
+import sys
+import unittest
+from typing import List
+import matx
+
+
+@matx.script
+def make_ngram(query: str, max_ngram_size: int) -> List:
+    ngram_list = []
+    query_terms = query.strip().split(' ')
+    for l in range(1, max_ngram_size + 1):
+        for j in range(0, len(query_terms) - l + 1):
+            ngram_list.append(" ".join(query_terms[j: j + l]))
+    return ngram_list
+
+
+@matx.script
+def get_term(terms: List, i: int) -> str:
+    return terms[i]
+
+
+def workflow(query, index):
+    ngram = make_ngram(query, 2)
+    return ngram, get_term(ngram, index)
+
+
+class TestRunAsync(unittest.TestCase):
+
+    def test_run_async(self):
+        query = "hello world this is a test query"
+        jit_mod = matx.trace(workflow, query, 0)
+        expect = [jit_mod.run({"query": query, "index": i}) for i in range(8)]
+        jit_mod.set_async_run_threads(2)
+        self.assertEqual(jit_mod.get_async_run_threads(), 2)
+
+        async def run_all():
+            futures = [jit_mod.run_async({"query": query, "index": i}) for i in range(8)]
+            return await asyncio.gather(*futures)
+
+        results = asyncio.run(run_all())
+        self.assertEqual(list(results), expect)
+
+    def test_run_async_exception(self):
+        query = "hello world"
+        jit_mod = matx.trace(workflow, query, 0)
+
+        async def run_one():
+            return await jit_mod.run_async({"query": query, "index": 100})
+
+        with self.assertRaises(Exception):
+            asyncio.run(run_one())
+        # the async run pool is created on demand
+        self.assertGreater(jit_mod.get_async_run_threads(), 0)
+        jit_mod.disable_async_run_threads()
+        self.assertEqual(jit_mod.get_async_run_threads(), 0)
+
+    @unittest.skipIf(sys.platform == "win32", "fork is not supported")
+    def test_run_async_after_fork(self):
+        query = "hello world this is a test query"
+        jit_mod = matx.trace(workflow, query, 0)
+        expect = jit_mod.run({"query": query, "index": 1})
+        jit_mod.set_async_run_threads(2)
+
+        async def run_one():
+            return await asyncio.wait_for(jit_mod.run_async({"query": query, "index": 1}), 30)
+
+        pid = os.fork()
+        if pid == 0:
+            # the child gets a new async run pool of the same size
+            ok = False
+            try:
+                ok = jit_mod.get_async_run_threads() == 2 and asyncio.run(run_one()) == expect
+            finally:
+                os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.WEXITSTATUS(status), 0)
+        self.assertEqual(asyncio.run(run_one()), expect)
+
+
+if __name__ == '__main__':
+    import logging
+
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
@@ -0,0 +1,97 @@
+# Copyright 2022 ByteDance Ltd. and/or its affiliates.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import os
+import threading
+import unittest
+import uuid
+from typing import List
+import matx
+
+SCRIPT_PATH = os.path.split(os.path.realpath(__file__))[0]
+
+
+@matx.script
+def upper_words(texts: List[str]) -> List[str]:
+    return [t.upper() for t in texts]
+
+
+class TestServer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_path = SCRIPT_PATH + "/../tempdir/"
+        self.work_path = self.tmp_path + "TestServer_%d/" % uuid.uuid4().int
+        if not os.path.exists(self.work_path):
+            os.mkdir(self.work_path)
+
+    def save_model(self):
+        def workflow(texts):
+            return upper_words(texts)
+
+        jit_mod = matx.trace(workflow, ["a"])
+        save_path = self.work_path + "upper_words"
+        matx.save(jit_mod, save_path)
+        return save_path
+
+    def run_clients(self, server, num_clients=8, num_requests=32):
+        errors = []
+
+        def client(i):
+            for j in range(num_requests):
+                texts = ["q%d_%d" % (i, j)] * (i % 3 + 1)
+                ret = server.run({"texts": texts})
+                if list(ret) != [t.upper() for t in texts]:
+                    errors.append((texts, ret))
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(num_clients)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+
+    def test_replicas(self):
+        save_path = self.save_model()
+        with matx.pipeline.Server(save_path, replicas=3) as server:
+            self.run_clients(server)
+            stats = server.stats()
+            self.assertEqual(stats["queue_depth"], 0)
+            self.assertEqual(server.queue_depth, 0)
+            self.assertEqual(len(stats["replicas"]), 3)
+            self.assertEqual(sum(r["requests"] for r in stats["replicas"]), 8 * 32)
+            for r in stats["replicas"]:
+                self.assertGreaterEqual(r["utilization"], 0.0)
+                self.assertLessEqual(r["utilization"], 1.0)
+
+    def test_batching(self):
+        save_path = self.save_model()
+        server = matx.pipeline.Server(save_path, replicas=2, max_batch_size=8, max_wait_us=1000)
+        self.run_clients(server)
+        stats = server.stats()
+        self.assertEqual(sum(r["requests"] for r in stats["replicas"]), 8 * 32)
+        self.assertLessEqual(sum(r["runs"] for r in stats["replicas"]), 8 * 32)
+        server.close()
+        with self.assertRaises(AssertionError):
+            server.run({"texts": ["a"]})
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
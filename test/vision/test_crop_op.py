@@ -84,6 +84,15 @@ class TestCenterCropOp(unittest.TestCase):
                          self.width, self.height)
         self._helper(op_ret, self.custom_crop_res)
 
+    def test_crop_op_out(self):
+        crop_op = CropOp(device=self.device)
+        out = [matx.array.from_numpy(np.zeros((h, w, 3), dtype=np.uint8))
+               for h, w in zip(self.height, self.width)]
+        op_ret = crop_op(self.image_nds, self.x, self.y,
+                         self.width, self.height, out=out)
+        self._helper(op_ret, self.custom_crop_res)
+        self._helper(out, self.custom_crop_res)
+
     def _helper(self, ret, target):
         for i in range(self.batch_size):
             np.testing.assert_almost_equal(
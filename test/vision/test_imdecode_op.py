@@ -21,7 +21,7 @@ import unittest
 import os
 import cv2
 import matx
-from matx.vision import ImdecodeOp, SYNC_CPU, ImdecodeNoExceptionOp
+from matx.vision import ImdecodeOp, SYNC_CPU, ImdecodeNoExceptionOp, ImdecodeResizeOp
 import numpy as np
 os.environ["MATX_NUM_GTHREADS"] = "1"
 script_path = os.path.dirname(os.path.abspath(os.path.expanduser(__file__)))
@@ -129,6 +129,24 @@ class TestImdecodeOp(unittest.TestCase):
         self._helper(images[0], cv_out1)
         self.assertSequenceEqual([1, 0, 0, 1, 1, 1, 1, 0, 0, 1, 0], flags)
 
+    def test_decode_resize(self):
+        op = ImdecodeResizeOp(self.device, "BGR", (80, 80))
+        r = op([self.image_content1, self.no_jpeg_content])
+        # [360, 640, 3] is decoded at 1/4 scale
+        reduced = cv2.imdecode(np.frombuffer(self.image_content1, np.uint8),
+                               cv2.IMREAD_REDUCED_COLOR_4)
+        cv_out1 = cv2.resize(reduced, (80, 80))
+        cv_nojpeg = cv2.resize(cv2.imread(self.no_jpeg_file), (80, 80))
+        self.assertSequenceEqual(r[0].shape(), [80, 80, 3])
+        self.assertLess(np.mean(np.abs(r[0].asnumpy().astype(np.float32) - cv_out1)), 1.0)
+        self.assertLess(np.mean(np.abs(r[1].asnumpy().astype(np.float32) - cv_nojpeg)), 1.0)
+
+        op = matx.script(ImdecodeResizeOp)(self.device, "RGB", (80, 80))
+        out = matx.array.from_numpy(np.zeros((1, 80, 80, 3), dtype=np.uint8))
+        r = op([self.image_content1], out=out)
+        cv_rgb = cv2.cvtColor(cv_out1, cv2.COLOR_BGR2RGB)
+        self.assertLess(np.mean(np.abs(out.asnumpy()[0].astype(np.float32) - cv_rgb)), 1.0)
+
     def _helper(self, nd_out, cv_out):
         self.assertEqual(np.sum(nd_out.asnumpy() - cv_out), 0)
 
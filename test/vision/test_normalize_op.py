@@ -57,6 +57,16 @@ class TestNormalizeOp(unittest.TestCase):
         script_ret = norm_script_op(self.image_nd)
         self._helper(script_ret)
 
+    def test_normalize_op_batch_out(self):
+        shape = (self.batch_size,) + self.origin_res[0].shape
+        out = matx.array.from_numpy(np.zeros(shape, dtype=np.float32))
+        norm_op = vision.NormalizeOp(self.device, self.mean, self.std, dtype=self.dtype)
+        op_ret = norm_op(self.image_nd, out=out)
+        self._helper(op_ret)
+        batch = out.asnumpy()
+        for i in range(self.batch_size):
+            np.testing.assert_almost_equal(batch[i], self.origin_res[i], decimal=5)
+
     def _helper(self, ret):
         for i in range(self.batch_size):
             np.testing.assert_almost_equal(ret[i].asnumpy(), self.origin_res[i], decimal=5)
@@ -107,6 +107,28 @@ class TestResizeOp(unittest.TestCase):
         script_ret = script_resize_op(self.image_nd, sizes)
         self._helper(script_ret, desired_sizes)
 
+    def test_resize_op_batch_out(self):
+        size = (224, 224)
+        out = matx.array.from_numpy(
+            np.zeros((self.batch_size, 224, 224, 3), dtype=np.uint8))
+        expect = byted_vision.ResizeOp(self.device, size=size)(self.image_nd)
+
+        resize_op = byted_vision.ResizeOp(self.device, size=size)
+        op_ret = resize_op(self.image_nd, out=out)
+        batch = out.asnumpy()
+        for i in range(self.batch_size):
+            np.testing.assert_equal(op_ret[i].asnumpy(), expect[i].asnumpy())
+            np.testing.assert_equal(batch[i], expect[i].asnumpy())
+
+        script_resize_op = matx.script(byted_vision.ResizeOp)(self.device, size=size)
+        script_ret = script_resize_op(self.image_nd, out=out)
+        for i in range(self.batch_size):
+            np.testing.assert_equal(script_ret[i].asnumpy(), expect[i].asnumpy())
+
+        # the output size does not match out
+        with self.assertRaises(Exception):
+            resize_op(self.image_nd, [(100, 100)] * self.batch_size, out=out)
+
     def _helper(self, ret, sizes):
         for i in range(self.batch_size):
             res = ret[i].asnumpy()
@@ -48,6 +48,42 @@ class TestCompose(unittest.TestCase):
         bytedvision_res = bytedvision_ops([self.img_nd]).asnumpy()
         assert len(bytedvision_res.shape) == 4
 
+    def test_fused_compose_cpu(self):
+        img_nds = [matx.array.from_numpy(self.img) for _ in range(3)]
+        transforms = [
+            Resize([256], device_id=-1),
+            CenterCrop([224], device_id=-1),
+            Normalize((0.485, 0.456, 0.406), (0.229, 0.224, 0.225),
+                      global_scale=1.0 / 255.0, device_id=-1),
+            ToTensor(device_id=-1)
+        ]
+        fused_ops = Compose(-1, transforms, fuse=True)
+        unfused_ops = Compose(-1, transforms)
+        self.assertEqual(len(fused_ops.transforms), 1)
+        fused_res = fused_ops(img_nds).asnumpy()
+        unfused_res = unfused_ops(img_nds).asnumpy()
+        self.assertEqual(fused_res.shape, (3, 3, 224, 224))
+        np.testing.assert_almost_equal(fused_res, unfused_res, decimal=4)
+
+    def test_fused_compose_cpu_channels(self):
+        transforms = [
+            CenterCrop([224], device_id=-1),
+            ConvertImageDtype("float32", global_scale=1.0 / 255, device_id=-1),
+            ToTensor(device_id=-1)
+        ]
+        fused_ops = Compose(-1, transforms, fuse=True)
+        unfused_ops = Compose(-1, transforms)
+        self.assertEqual(len(fused_ops.transforms), 1)
+        gray = cv2.cvtColor(self.img, cv2.COLOR_RGB2GRAY)
+        gray_nds = [matx.array.from_numpy(gray) for _ in range(2)]
+        fused_res = fused_ops(gray_nds).asnumpy()
+        unfused_res = unfused_ops(gray_nds).asnumpy()
+        self.assertEqual(fused_res.shape, unfused_res.shape)
+        np.testing.assert_almost_equal(fused_res, unfused_res, decimal=4)
+        # a mix of gray and rgb images is left to the unfused transforms
+        mixed_nds = [matx.array.from_numpy(gray), matx.array.from_numpy(self.img)]
+        self.assertFalse(fused_ops.transforms[0]._can_fuse(mixed_nds))
+
 
 if __name__ == "__main__":
     import logging
@@ -17,11 +17,16 @@
  * specific language governing permissions and limitations
  * under the License.
  */
+#include <cstring>
 #include <map>
 #include <memory>
+#include <vector>
 
 #include <matxscript/runtime/algorithm/cedar.h>
 #include <matxscript/runtime/container.h>
+#include <matxscript/runtime/container/ndarray_elementwise.h>
+#include <matxscript/runtime/container/ndarray_helper.h>
+#include <matxscript/runtime/container/string_batch.h>
 #include <matxscript/runtime/file_reader.h>
 #include <matxscript/runtime/file_util.h>
 #include "cppjieba/Jieba.hpp"
@@ -41,6 +46,16 @@ namespace extension {
 namespace jieba {
 
 namespace details {
+
+// batch_lcut splits the sentences over the compute pool in chunks of at least this many
+constexpr int64_t kMinSentencesPerTask = 16;
+
+enum class CutMode {
+  kCut,
+  kCutAll,
+  kCutForSearch,
+};
+
 List std_string_list_to_Unicode_List(const std::vector<std::string>& list_of_words_std) {
   List list_of_words;
   list_of_words.reserve(list_of_words_std.size());
@@ -81,6 +96,13 @@ class CPPJieba {
   RTValue lcut(string_view sentence, bool cut_all = false, bool HMM = true);
   RTValue lcut_for_search(unicode_view sentence, bool HMM = true);
   RTValue lcut_for_search(string_view sentence, bool HMM = true);
+  RTValue batch_lcut(const Any& sentences, details::CutMode mode, bool HMM, bool with_offsets);
+
+ private:
+  void CutWords(const std::string& sentence,
+                details::CutMode mode,
+                bool HMM,
+                std::vector<cppjieba::Word>* words) const;
 
  private:
   std::shared_ptr<cppjieba::Jieba> jieba_ptr;
@@ -126,6 +148,159 @@ RTValue CPPJieba::lcut_for_search(string_view sentence, bool HMM) {
   return details::std_string_list_to_String_List(list_of_words_std);
 }
 
+void CPPJieba::CutWords(const std::string& sentence,
+                        details::CutMode mode,
+                        bool HMM,
+                        std::vector<cppjieba::Word>* words) const {
+  switch (mode) {
+    case details::CutMode::kCutAll: {
+      jieba_ptr->CutAll(sentence, *words);
+    } break;
+    case details::CutMode::kCutForSearch: {
+      jieba_ptr->CutForSearch(sentence, *words, HMM);
+    } break;
+    default: {
+      jieba_ptr->Cut(sentence, *words, HMM);
+    } break;
+  }
+}
+
+/**
+ * batch_lcut(sentences, cut_all, HMM, with_offsets)
+ * batch_lcut_for_search(sentences, HMM, with_offsets)
+ *
+ * Segment a List of str/bytes or a StringBatch in parallel on the compute pool of the session.
+ * Returns a Tuple of the words of all sentences as one StringBatch and a List of the number of
+ * words of each sentence. With with_offsets the words are not copied, the first item is an
+ * int64 [num_words, 2] NDArray of the begin and end of each word in its sentence instead,
+ * counted in chars for str and in bytes for bytes.
+ */
+RTValue CPPJieba::batch_lcut(const Any& sentences,
+                             details::CutMode mode,
+                             bool HMM,
+                             bool with_offsets) {
+  MXCHECK(jieba_ptr != nullptr) << "jieba is not initialized.";
+  auto* batch = StringBatch::FromAny(sentences);
+  MXCHECK(batch != nullptr || sentences.type_code() == TypeIndex::kRuntimeList)
+      << "[Jieba::batch_lcut] expect sentences is List or StringBatch, but get "
+      << sentences.type_name();
+  const RTValue* items = nullptr;
+  int64_t batch_size = 0;
+  bool is_unicode = true;
+  if (batch) {
+    batch_size = batch->size();
+    is_unicode = batch->is_unicode();
+  } else {
+    auto list_view = sentences.AsObjectViewNoCheck<List>();
+    items = list_view.data().data();
+    batch_size = list_view.data().size();
+    if (batch_size > 0) {
+      is_unicode = items[0].type_code() == TypeIndex::kRuntimeUnicode;
+    }
+    auto item_type = is_unicode ? TypeIndex::kRuntimeUnicode : TypeIndex::kRuntimeString;
+    for (int64_t i = 0; i < batch_size; ++i) {
+      MXCHECK(items[i].type_code() == item_type)
+          << "[Jieba::batch_lcut] expect all sentences are str or all are bytes, but get "
+          << items[i].type_name();
+    }
+  }
+
+  // the words of each task are gathered in order after all tasks are done
+  struct TaskResult {
+    explicit TaskResult(bool is_unicode) : words(is_unicode) {
+    }
+    StringBatch words;
+    std::vector<int64_t> offsets;
+  };
+  auto* pool = NDArrayComputePoolScope::Current();
+  int64_t num_tasks = 1;
+  if (pool != nullptr) {
+    num_tasks = std::max(int64_t(1),
+                         std::min(static_cast<int64_t>(pool->GetThreadsNum()) + 1,
+                                  batch_size / details::kMinSentencesPerTask));
+  }
+  int64_t step = (batch_size + num_tasks - 1) / num_tasks;
+  std::vector<TaskResult> results(num_tasks, TaskResult(is_unicode));
+  std::vector<int64_t> num_words(batch_size, 0);
+
+  std::function<void(int64_t, int64_t)> range_func = [&](int64_t task_begin, int64_t task_end) {
+    // the buffers are reused by all sentences of the task
+    std::string sentence;
+    std::vector<cppjieba::Word> words;
+    for (int64_t task = task_begin; task < task_end; ++task) {
+      auto& result = results[task];
+      int64_t end = std::min(batch_size, (task + 1) * step);
+      for (int64_t i = task * step; i < end; ++i) {
+        if (batch) {
+          auto item = batch->view(i);
+          sentence.assign(item.data(), item.size());
+        } else if (is_unicode) {
+          // cppjieba only reads utf-8, pass a StringBatch to skip this encoding
+          auto item = UnicodeHelper::Encode(items[i].AsNoCheck<unicode_view>());
+          sentence.assign(item.data(), item.size());
+        } else {
+          auto item = items[i].AsNoCheck<string_view>();
+          sentence.assign(item.data(), item.size());
+        }
+        words.clear();
+        CutWords(sentence, mode, HMM, &words);
+        num_words[i] = words.size();
+        for (auto& word : words) {
+          if (!with_offsets) {
+            result.words.push_back(string_view(word.word));
+          } else if (is_unicode) {
+            result.offsets.push_back(word.unicode_offset);
+            result.offsets.push_back(word.unicode_offset + word.unicode_length);
+          } else {
+            result.offsets.push_back(word.offset);
+            result.offsets.push_back(word.offset + word.word.size());
+          }
+        }
+      }
+    }
+  };
+  elementwise::ParallelRange(num_tasks, num_tasks, range_func);
+
+  List output_lens;
+  output_lens.reserve(batch_size);
+  for (auto n : num_words) {
+    output_lens.push_back(n);
+  }
+  if (with_offsets) {
+    int64_t total = 0;
+    for (auto& result : results) {
+      total += result.offsets.size();
+    }
+    auto offsets = NDArray::Empty({total / 2, 2}, DataType::Int(64), NDArrayHelper::GetCPUDevice());
+    auto* data = static_cast<int64_t*>(const_cast<void*>(offsets.RawData()));
+    for (auto& result : results) {
+      if (!result.offsets.empty()) {
+        std::memcpy(data, result.offsets.data(), result.offsets.size() * sizeof(int64_t));
+        data += result.offsets.size();
+      }
+    }
+    return Tuple::dynamic(std::move(offsets), std::move(output_lens));
+  }
+  if (num_tasks == 1) {
+    return Tuple::dynamic(StringBatch::MakeUserData(std::move(results[0].words)),
+                          std::move(output_lens));
+  }
+  int64_t total_words = 0;
+  int64_t total_bytes = 0;
+  for (auto& result : results) {
+    total_words += result.words.size();
+    total_bytes += result.words.nbytes();
+  }
+  StringBatch output_words(is_unicode);
+  output_words.reserve(total_words, total_bytes);
+  for (auto& result : results) {
+    for (int64_t i = 0; i < result.words.size(); ++i) {
+      output_words.push_back(result.words.view(i));
+    }
+  }
+  return Tuple::dynamic(StringBatch::MakeUserData(std::move(output_words)), std::move(output_lens));
+}
+
 using text_cutter_CPPJieba = CPPJieba;
 MATX_REGISTER_NATIVE_OBJECT(text_cutter_CPPJieba)
     .SetConstructor([](PyArgs args) -> std::shared_ptr<void> {
@@ -156,6 +331,23 @@ MATX_REGISTER_NATIVE_OBJECT(text_cutter_CPPJieba)
           }
           return List{};
         })
+    .RegisterFunction("batch_lcut",
+                      [](void* self, PyArgs args) -> RTValue {
+                        MXCHECK_EQ(args.size(), 4)
+                            << "[Jieba::batch_lcut] Expect 4 arguments but get " << args.size();
+                        auto mode =
+                            args[1].As<bool>() ? details::CutMode::kCutAll : details::CutMode::kCut;
+                        return reinterpret_cast<CPPJieba*>(self)->batch_lcut(
+                            args[0], mode, args[2].As<bool>(), args[3].As<bool>());
+                      })
+    .RegisterFunction(
+        "batch_lcut_for_search",
+        [](void* self, PyArgs args) -> RTValue {
+          MXCHECK_EQ(args.size(), 3)
+              << "[Jieba::batch_lcut_for_search] Expect 3 arguments but get " << args.size();
+          return reinterpret_cast<CPPJieba*>(self)->batch_lcut(
+              args[0], details::CutMode::kCutForSearch, args[1].As<bool>(), args[2].As<bool>());
+        })
     .RegisterFunction("lcut_for_search", [](void* self, PyArgs args) -> RTValue {
       switch (args[0].type_code()) {
         case TypeIndex::kRuntimeUnicode: {
@@ -17,13 +17,23 @@
  * specific language governing permissions and limitations
  * under the License.
  */
+#include <algorithm>
+#include <cctype>
 #include <map>
+#include <vector>
 
 #include <matxscript/runtime/algorithm/cedar.h>
+#include <matxscript/runtime/algorithm/mapped_trie.h>
 #include <matxscript/runtime/algorithm/prefix_mapping.h>
 #include <matxscript/runtime/container.h>
+#include <matxscript/runtime/container/ndarray_elementwise.h>
+#include <matxscript/runtime/container/ndarray_helper.h>
+#include <matxscript/runtime/container/string_batch.h>
 #include <matxscript/runtime/file_reader.h>
 #include <matxscript/runtime/file_util.h>
+#include <matxscript/runtime/threadpool/i_thread_pool.h>
+#include <matxscript/runtime/unicodelib/py_unicodedata.h>
+#include <matxscript/runtime/unicodelib/unicode_normal_form.h>
 #include "matxscript/runtime/container/string_helper.h"
 #include "matxscript/runtime/container/unicode_view.h"
 #include "matxscript/runtime/native_object_registry.h"
@@ -36,6 +46,72 @@ namespace runtime {
 namespace extension {
 namespace tokenizer {
 
+namespace {
+
+// batch_encode splits the sentences over the compute pool in chunks of at least this many
+constexpr int64_t kMinSentencesPerTask = 16;
+
+inline bool IsChineseChar(char32_t c) {
+  return (c >= 0x4E00 && c <= 0x9FFF) || (c >= 0x3400 && c <= 0x4DBF) ||
+         (c >= 0x20000 && c <= 0x2A6DF) || (c >= 0x2A700 && c <= 0x2B73F) ||
+         (c >= 0x2B740 && c <= 0x2B81F) || (c >= 0x2B820 && c <= 0x2CEAF) ||
+         (c >= 0xF900 && c <= 0xFAFF) || (c >= 0x2F800 && c <= 0x2FA1F);
+}
+
+/**
+ * The pre-split of the BERT BasicTokenizer: drop control chars, split on whitespace and
+ * punctuation, and make every CJK char a word. With do_lower_case the text is lowered and
+ * its accents are stripped. The words are appended to words as utf-8.
+ */
+void BasicSplit(string_view text, bool do_lower_case, std::vector<String>* words) {
+  static const PyUnicodeData unicode_data;
+  Unicode chars = StringHelper::Decode(text);
+  if (do_lower_case) {
+    chars = unicode_data.normalize(UnicodeNormalForm::NFD, UnicodeHelper::Lower(chars));
+  }
+  Unicode word;
+  auto flush = [&word, words]() {
+    if (!word.empty()) {
+      words->push_back(UnicodeHelper::Encode(word));
+      word.clear();
+    }
+  };
+  for (char32_t c : chars) {
+    if (c == 0 || c == 0xFFFD) {
+      continue;
+    }
+    if (c == U' ' || c == U'\t' || c == U'\n' || c == U'\r') {
+      flush();
+      continue;
+    }
+    if (c < 0x80) {
+      // ascii punctuation is split even if its category is not P*, like "$" or "^"
+      if ((c >= 33 && c <= 47) || (c >= 58 && c <= 64) || (c >= 91 && c <= 96) ||
+          (c >= 123 && c <= 126)) {
+        flush();
+        words->push_back(String(1, static_cast<char>(c)));
+      } else if (c >= 32 && c != 127) {
+        word.push_back(c);
+      }
+      continue;
+    }
+    auto category = unicode_data.category(c);
+    if (category == "Zs") {
+      flush();
+    } else if (category[0] == 'C' || (do_lower_case && category == "Mn")) {
+      continue;
+    } else if (category[0] == 'P' || IsChineseChar(c)) {
+      flush();
+      words->push_back(UnicodeHelper::Encode(unicode_view(&c, 1)));
+    } else {
+      word.push_back(c);
+    }
+  }
+  flush();
+}
+
+}  // namespace
+
 class WordPieceTokenizer {
  public:
   WordPieceTokenizer(String vocab_path,
@@ -51,23 +127,45 @@ class WordPieceTokenizer {
   void tokenize(const unicode_view& raw_token, const List& output_tokens) const;
   void tokenize(const List& sentence, const List& output_tokens) const;
   void tokenize(const List& sentence, const List& output_tokens, const List& output_lens) const;
+  // the items are read in place, the lens are appended when output_lens is not nullptr
+  void tokenize(const StringBatch& sentence, const List& output_ids, const List* output_lens) const;
+  void tokenize(const StringBatch& sentence,
+                StringBatch& output_tokens,
+                const List* output_lens) const;
 
  public:
   RTValue tokenize(PyArgs args);
   RTValue tokenize_with_meta(PyArgs args);
+  RTValue batch_encode(PyArgs args);
+  // write the vocab as a mapped trie file, which can be passed as vocab_path later
+  void save_vocab(const String& path) const;
 
  private:
-  template <class PostFunction>
+  // the subword ids of one word, the word is not split
+  void TokenizeIds(const char* token_buf, int64_t token_len, std::vector<int64_t>* ids) const;
+  // a str/bytes is split on whitespace or by BasicSplit, a List is taken as pre-split words
+  void EncodeText(string_view text,
+                  bool basic_tokenize,
+                  bool do_lower_case,
+                  std::vector<int64_t>* ids) const;
+  void EncodeSentence(const Any& sentence,
+                      bool basic_tokenize,
+                      bool do_lower_case,
+                      std::vector<int64_t>* ids) const;
+  int64_t SpecialTokenId(const Any& token) const;
+
+ private:
+  template <class PostFunction, class Output>
   inline void TokenizeImplWithPrefix(const char* token_buf,
                                      int64_t token_len,
                                      const PostFunction& post_func,
-                                     const List& output_tokens) const;
+                                     Output& output_tokens) const;
 
-  template <class PostFunction>
+  template <class PostFunction, class Output>
   inline void TokenizeImplNoPrefix(const char* token_buf,
                                    int64_t token_len,
                                    const PostFunction& post_func,
-                                   const List& output_tokens) const;
+                                   Output& output_tokens) const;
 
  private:
   String vocab_path_;
@@ -97,20 +195,25 @@ WordPieceTokenizer::WordPieceTokenizer(String vocab_path,
   vocab_path_ = std::move(vocab_path);
   MXCHECK(FileUtil::Exists(vocab_path_)) << "vocab file \"" << vocab_path_ << "\" not exists!";
 
-  std::map<String, int> tokens;
-  FileReader reader(vocab_path_);
-  const char* line = nullptr;
-  size_t line_len = 0;
-  int64_t line_no = 0;
-  while (reader.ReadLine(&line, &line_len)) {
-    // Ignoring empty lines
-    if (line_len == 0) {
-      continue;
+  if (MappedTrieFile::IsMappedTrieFile(vocab_path_)) {
+    // a vocab written by save_vocab is mapped and shared instead of being built again
+    prefix_matcher_ = std::make_shared<PrefixMapping>(MappedTrieFile::Open(vocab_path_));
+  } else {
+    std::map<String, int> tokens;
+    FileReader reader(vocab_path_);
+    const char* line = nullptr;
+    size_t line_len = 0;
+    int64_t line_no = 0;
+    while (reader.ReadLine(&line, &line_len)) {
+      // Ignoring empty lines
+      if (line_len == 0) {
+        continue;
+      }
+      tokens.emplace(String(line, line_len), line_no);
+      ++line_no;
     }
-    tokens.emplace(String(line, line_len), line_no);
-    ++line_no;
+    prefix_matcher_ = std::make_shared<PrefixMapping>(tokens);
   }
-  prefix_matcher_ = std::make_shared<PrefixMapping>(tokens);
   if (unk_token.is_nullptr()) {
     unk_id_ = -1;
   } else {
@@ -119,11 +222,11 @@ WordPieceTokenizer::WordPieceTokenizer(String vocab_path,
   }
 }
 
-template <class PostFunction>
+template <class PostFunction, class Output>
 inline void WordPieceTokenizer::TokenizeImplWithPrefix(const char* token_buf,
                                                        int64_t token_len,
                                                        const PostFunction& post_func,
-                                                       const List& output_tokens) const {
+                                                       Output& output_tokens) const {
   commons::details::SmallBuffer<512> small_subword_buffer(token_len + subwords_prefix_.size());
   char* subword_buf = small_subword_buffer.Data();
 
@@ -181,11 +284,11 @@ inline void WordPieceTokenizer::TokenizeImplWithPrefix(const char* token_buf,
   }
 }
 
-template <class PostFunction>
+template <class PostFunction, class Output>
 inline void WordPieceTokenizer::TokenizeImplNoPrefix(const char* token_buf,
                                                      int64_t token_len,
                                                      const PostFunction& post_func,
-                                                     const List& output_tokens) const {
+                                                     Output& output_tokens) const {
   if (skip_empty_ && token_len == 0) {
     // strip empty word
     return;
@@ -315,6 +418,130 @@ void WordPieceTokenizer::tokenize(const List& sentence,
   }
 }
 
+void WordPieceTokenizer::tokenize(const StringBatch& sentence,
+                                  const List& output_ids,
+                                  const List* output_lens) const {
+  auto post_func = [](const char* token_buf, int token_len, int value, const List& output) {
+    output.push_back(value);
+  };
+  output_ids.reserve(output_ids.size() + sentence.size() + 4);
+  for (int64_t i = 0; i < sentence.size(); ++i) {
+    auto last_size = output_ids.size();
+    auto token = sentence.view(i);
+    if (subwords_prefix_.empty()) {
+      TokenizeImplNoPrefix(token.data(), token.size(), post_func, output_ids);
+    } else {
+      TokenizeImplWithPrefix(token.data(), token.size(), post_func, output_ids);
+    }
+    if (output_lens) {
+      output_lens->push_back(output_ids.size() - last_size);
+    }
+  }
+}
+
+void WordPieceTokenizer::tokenize(const StringBatch& sentence,
+                                  StringBatch& output_tokens,
+                                  const List* output_lens) const {
+  // the subwords are appended to the buffer of the batch, no str is made per token
+  auto post_func = [](const char* token_buf, int token_len, int value, StringBatch& output) {
+    output.push_back(string_view(token_buf, token_len));
+  };
+  output_tokens.reserve(output_tokens.size() + sentence.size() + 4,
+                        output_tokens.nbytes() + sentence.nbytes() + 16);
+  for (int64_t i = 0; i < sentence.size(); ++i) {
+    auto last_size = output_tokens.size();
+    auto token = sentence.view(i);
+    if (subwords_prefix_.empty()) {
+      TokenizeImplNoPrefix(token.data(), token.size(), post_func, output_tokens);
+    } else {
+      TokenizeImplWithPrefix(token.data(), token.size(), post_func, output_tokens);
+    }
+    if (output_lens) {
+      output_lens->push_back(output_tokens.size() - last_size);
+    }
+  }
+}
+
+void WordPieceTokenizer::TokenizeIds(const char* token_buf,
+                                     int64_t token_len,
+                                     std::vector<int64_t>* ids) const {
+  auto post_func = [](const char* buf, int len, int value, std::vector<int64_t>& output) {
+    output.push_back(value);
+  };
+  if (subwords_prefix_.empty()) {
+    TokenizeImplNoPrefix(token_buf, token_len, post_func, *ids);
+  } else {
+    TokenizeImplWithPrefix(token_buf, token_len, post_func, *ids);
+  }
+}
+
+void WordPieceTokenizer::EncodeText(string_view text,
+                                    bool basic_tokenize,
+                                    bool do_lower_case,
+                                    std::vector<int64_t>* ids) const {
+  if (basic_tokenize) {
+    std::vector<String> words;
+    BasicSplit(text, do_lower_case, &words);
+    for (auto& word : words) {
+      TokenizeIds(word.data(), word.size(), ids);
+    }
+    return;
+  }
+  const char* p = text.data();
+  const char* end = p + text.size();
+  while (p < end) {
+    while (p < end && std::isspace(static_cast<unsigned char>(*p))) {
+      ++p;
+    }
+    const char* word = p;
+    while (p < end && !std::isspace(static_cast<unsigned char>(*p))) {
+      ++p;
+    }
+    if (p > word) {
+      TokenizeIds(word, p - word, ids);
+    }
+  }
+}
+
+void WordPieceTokenizer::EncodeSentence(const Any& sentence,
+                                        bool basic_tokenize,
+                                        bool do_lower_case,
+                                        std::vector<int64_t>* ids) const {
+  switch (sentence.type_code()) {
+    case TypeIndex::kRuntimeString: {
+      EncodeText(sentence.AsNoCheck<string_view>(), basic_tokenize, do_lower_case, ids);
+    } break;
+    case TypeIndex::kRuntimeUnicode: {
+      auto text = UnicodeHelper::Encode(sentence.AsNoCheck<unicode_view>());
+      EncodeText(text, basic_tokenize, do_lower_case, ids);
+    } break;
+    case TypeIndex::kRuntimeList: {
+      for (auto& word : sentence.AsObjectViewNoCheck<List>().data()) {
+        auto word_bytes = commons::details::GetString(word, __FILE__, __LINE__);
+        if (basic_tokenize) {
+          EncodeText(word_bytes, basic_tokenize, do_lower_case, ids);
+        } else {
+          TokenizeIds(word_bytes.data(), word_bytes.size(), ids);
+        }
+      }
+    } break;
+    default: {
+      MXTHROW << "[WordPieceTokenizer] unsupported sentence type: " << sentence.type_name();
+    } break;
+  }
+}
+
+int64_t WordPieceTokenizer::SpecialTokenId(const Any& token) const {
+  if (token.is_nullptr()) {
+    return -1;
+  }
+  auto token_bytes = commons::details::GetString(token, __FILE__, __LINE__);
+  int value = -1;
+  auto match_len = prefix_matcher_->PrefixSearch(token_bytes.data(), token_bytes.size(), &value);
+  MXCHECK(match_len == token_bytes.size()) << "special token \'" << token_bytes << "\' not found";
+  return value;
+}
+
 RTValue WordPieceTokenizer::tokenize(PyArgs args) {
   MXCHECK_EQ(args.size(), 1) << "[WordPieceTokenizer::tokenize] Expect 1 arguments but get "
                              << args.size();
@@ -323,6 +550,18 @@ RTValue WordPieceTokenizer::tokenize(PyArgs args) {
     case TypeIndex::kRuntimeList: {
       this->tokenize(args[0].AsObjectViewNoCheck<List>().data(), output_tokens);
     } break;
+    case TypeIndex::kRuntimeUserData: {
+      auto* sentence = StringBatch::FromAny(args[0]);
+      MXCHECK(sentence != nullptr)
+          << "[WordPieceTokenizer] unsupported data type: " << args[0].type_name();
+      if (lookup_id_) {
+        this->tokenize(*sentence, output_tokens, nullptr);
+      } else {
+        StringBatch batch_tokens(sentence->is_unicode());
+        this->tokenize(*sentence, batch_tokens, nullptr);
+        return StringBatch::MakeUserData(std::move(batch_tokens));
+      }
+    } break;
     default: {
       MXCHECK(false) << "[WordPieceTokenizer] unsupported data type: " << args[0].type_name();
     } break;
@@ -339,6 +578,18 @@ RTValue WordPieceTokenizer::tokenize_with_meta(PyArgs args) {
     case TypeIndex::kRuntimeList: {
       this->tokenize(args[0].AsObjectViewNoCheck<List>().data(), output_tokens, output_lens);
     } break;
+    case TypeIndex::kRuntimeUserData: {
+      auto* sentence = StringBatch::FromAny(args[0]);
+      MXCHECK(sentence != nullptr)
+          << "[WordPieceTokenizer] unsupported data type: " << args[0].type_name();
+      if (lookup_id_) {
+        this->tokenize(*sentence, output_tokens, &output_lens);
+      } else {
+        StringBatch batch_tokens(sentence->is_unicode());
+        this->tokenize(*sentence, batch_tokens, &output_lens);
+        return Tuple::dynamic(StringBatch::MakeUserData(std::move(batch_tokens)), output_lens);
+      }
+    } break;
     default: {
       MXCHECK(false) << "[WordPieceTokenizer] unsupported data type: " << args[0].type_name();
     } break;
@@ -346,6 +597,136 @@ RTValue WordPieceTokenizer::tokenize_with_meta(PyArgs args) {
   return Tuple::dynamic(output_tokens, output_lens);
 }
 
+/**
+ * batch_encode(sentences, sentences_pair, max_length, basic_tokenize, do_lower_case,
+ *              cls_token, sep_token, pad_token)
+ *
+ * Encode a batch like the BERT tokenizers: [CLS] a [SEP] (b [SEP]), truncated longest first
+ * and padded to max_length. The sentences are a List of str/bytes or of pre-split words,
+ * or a StringBatch, sentences_pair is None or the same kind of batch. The special tokens
+ * may be None. Returns a Dict of int64 [batch, max_length] input_ids, attention_mask and
+ * token_type_ids. The sentences are encoded in parallel on the compute pool of the session.
+ */
+RTValue WordPieceTokenizer::batch_encode(PyArgs args) {
+  MXCHECK_EQ(args.size(), 8) << "[WordPieceTokenizer::batch_encode] Expect 8 arguments but get "
+                             << args.size();
+  const Any& sentences = args[0];
+  const Any& sentences_pair = args[1];
+  int64_t max_length = args[2].As<int64_t>();
+  bool basic_tokenize = args[3].As<int64_t>() != 0;
+  bool do_lower_case = args[4].As<int64_t>() != 0;
+  int64_t cls_id = SpecialTokenId(args[5]);
+  int64_t sep_id = SpecialTokenId(args[6]);
+  int64_t pad_id = args[7].is_nullptr() ? 0 : SpecialTokenId(args[7]);
+
+  auto* batch = StringBatch::FromAny(sentences);
+  auto* batch_pair = StringBatch::FromAny(sentences_pair);
+  MXCHECK(batch != nullptr || sentences.type_code() == TypeIndex::kRuntimeList)
+      << "[WordPieceTokenizer::batch_encode] expect sentences is List or StringBatch, but get "
+      << sentences.type_name();
+  int64_t batch_size = batch ? batch->size() : sentences.AsObjectViewNoCheck<List>().data().size();
+  bool has_pair = !sentences_pair.is_nullptr();
+  if (has_pair) {
+    MXCHECK(batch_pair != nullptr || sentences_pair.type_code() == TypeIndex::kRuntimeList)
+        << "[WordPieceTokenizer::batch_encode] expect sentences_pair is None, List or "
+           "StringBatch, but get "
+        << sentences_pair.type_name();
+    int64_t pair_size =
+        batch_pair ? batch_pair->size() : sentences_pair.AsObjectViewNoCheck<List>().data().size();
+    MXCHECK_EQ(pair_size, batch_size)
+        << "[WordPieceTokenizer::batch_encode] sentences_pair must have the same size";
+  }
+  int64_t num_special = (cls_id >= 0) + (sep_id >= 0) * (has_pair ? 2 : 1);
+  MXCHECK(max_length > num_special)
+      << "[WordPieceTokenizer::batch_encode] max_length must be larger than the number of "
+         "special tokens";
+
+  auto cpu = NDArrayHelper::GetCPUDevice();
+  auto input_ids = NDArray::Empty({batch_size, max_length}, DataType::Int(64), cpu);
+  auto attention_mask = NDArray::Empty({batch_size, max_length}, DataType::Int(64), cpu);
+  auto token_type_ids = NDArray::Empty({batch_size, max_length}, DataType::Int(64), cpu);
+  auto* ids_data = static_cast<int64_t*>(const_cast<void*>(input_ids.RawData()));
+  auto* mask_data = static_cast<int64_t*>(const_cast<void*>(attention_mask.RawData()));
+  auto* type_data = static_cast<int64_t*>(const_cast<void*>(token_type_ids.RawData()));
+
+  auto encode = [&](const StringBatch* b, const Any& list, int64_t i, std::vector<int64_t>* ids) {
+    if (b) {
+      EncodeText(b->view(i), basic_tokenize, do_lower_case, ids);
+    } else {
+      EncodeSentence(
+          list.AsObjectViewNoCheck<List>().data()[i], basic_tokenize, do_lower_case, ids);
+    }
+  };
+  std::function<void(int64_t, int64_t)> range_func = [&](int64_t begin, int64_t end) {
+    std::vector<int64_t> ids_a;
+    std::vector<int64_t> ids_b;
+    for (int64_t i = begin; i < end; ++i) {
+      ids_a.clear();
+      ids_b.clear();
+      encode(batch, sentences, i, &ids_a);
+      if (has_pair) {
+        encode(batch_pair, sentences_pair, i, &ids_b);
+      }
+      // truncate the longer sentence first
+      size_t budget = max_length - num_special;
+      while (ids_a.size() + ids_b.size() > budget) {
+        if (ids_a.size() > ids_b.size()) {
+          ids_a.pop_back();
+        } else {
+          ids_b.pop_back();
+        }
+      }
+      int64_t* row_ids = ids_data + i * max_length;
+      int64_t* row_mask = mask_data + i * max_length;
+      int64_t* row_type = type_data + i * max_length;
+      int64_t pos = 0;
+      auto put = [&](int64_t id, int64_t type_id) {
+        row_ids[pos] = id;
+        row_mask[pos] = 1;
+        row_type[pos] = type_id;
+        ++pos;
+      };
+      if (cls_id >= 0) {
+        put(cls_id, 0);
+      }
+      for (auto id : ids_a) {
+        put(id, 0);
+      }
+      if (sep_id >= 0) {
+        put(sep_id, 0);
+      }
+      if (has_pair) {
+        for (auto id : ids_b) {
+          put(id, 1);
+        }
+        if (sep_id >= 0) {
+          put(sep_id, 1);
+        }
+      }
+      std::fill(row_ids + pos, row_ids + max_length, pad_id);
+      std::fill(row_mask + pos, row_mask + max_length, 0);
+      std::fill(row_type + pos, row_type + max_length, 0);
+    }
+  };
+  auto* pool = NDArrayComputePoolScope::Current();
+  int64_t num_tasks = 1;
+  if (pool != nullptr) {
+    num_tasks = std::min(static_cast<int64_t>(pool->GetThreadsNum()) + 1,
+                         batch_size / kMinSentencesPerTask);
+  }
+  elementwise::ParallelRange(batch_size, num_tasks, range_func);
+
+  Dict result;
+  result[Unicode(U"input_ids")] = std::move(input_ids);
+  result[Unicode(U"attention_mask")] = std::move(attention_mask);
+  result[Unicode(U"token_type_ids")] = std::move(token_type_ids);
+  return result;
+}
+
+void WordPieceTokenizer::save_vocab(const String& path) const {
+  prefix_matcher_->Save(path);
+}
+
 using text_tokenizer_WordPieceTokenizer = WordPieceTokenizer;
 MATX_REGISTER_NATIVE_OBJECT(text_tokenizer_WordPieceTokenizer)
     .SetConstructor([](PyArgs args) -> std::shared_ptr<void> {
@@ -368,8 +749,21 @@ MATX_REGISTER_NATIVE_OBJECT(text_tokenizer_WordPieceTokenizer)
                       [](void* self, PyArgs args) -> RTValue {
                         return reinterpret_cast<WordPieceTokenizer*>(self)->tokenize(args);
                       })
-    .RegisterFunction("tokenize_with_meta", [](void* self, PyArgs args) -> RTValue {
-      return reinterpret_cast<WordPieceTokenizer*>(self)->tokenize_with_meta(args);
+    .RegisterFunction("tokenize_with_meta",
+                      [](void* self, PyArgs args) -> RTValue {
+                        return reinterpret_cast<WordPieceTokenizer*>(self)->tokenize_with_meta(
+                            args);
+                      })
+    .RegisterFunction("batch_encode",
+                      [](void* self, PyArgs args) -> RTValue {
+                        return reinterpret_cast<WordPieceTokenizer*>(self)->batch_encode(args);
+                      })
+    .RegisterFunction("save_vocab", [](void* self, PyArgs args) -> RTValue {
+      MXCHECK_EQ(args.size(), 1) << "[WordPieceTokenizer][save_vocab] Expect 1 arguments but get "
+                                 << args.size();
+      String path = commons::details::GetString(args[0], __FILE__, __LINE__);
+      reinterpret_cast<WordPieceTokenizer*>(self)->save_vocab(path);
+      return None;
     });
 
 }  // namespace tokenizer
@@ -33,12 +33,13 @@ namespace ops {
 using namespace ::matxscript::runtime;
 
 struct CropTaskInput {
-  CropTaskInput(NDArray image, std::vector<int> crop_param)
-      : image_(std::move(image)), crop_params_(std::move(crop_param)) {
+  CropTaskInput(NDArray image, std::vector<int> crop_param, NDArray out = NDArray())
+      : image_(std::move(image)), crop_params_(std::move(crop_param)), out_(std::move(out)) {
   }
 
   NDArray image_;
   std::vector<int> crop_params_;
+  NDArray out_;
 };
 
 using CropTaskInputPtr = std::shared_ptr<CropTaskInput>;
@@ -67,15 +68,16 @@ void CropTask::RunImpl() {
     CropTaskInputPtr crop_task_input_ptr = (*input_it);
 
     cv::Mat org_image = NDArrayToOpencvMat(crop_task_input_ptr->image_);
-    cv::Mat crop_image;
+    cv::Mat crop_image = MakeOutputMat(crop_task_input_ptr->out_);
     MXCHECK(crop_task_input_ptr->crop_params_.size() == 4)
         << "crop params sizes must be equals to 4 in CropTaskInput .";
-    crop_image = org_image(cv::Rect(crop_task_input_ptr->crop_params_[0],
-                                    crop_task_input_ptr->crop_params_[1],
-                                    crop_task_input_ptr->crop_params_[2],
-                                    crop_task_input_ptr->crop_params_[3]));
+    org_image(cv::Rect(crop_task_input_ptr->crop_params_[0],
+                       crop_task_input_ptr->crop_params_[1],
+                       crop_task_input_ptr->crop_params_[2],
+                       crop_task_input_ptr->crop_params_[3]))
+        .copyTo(crop_image);
 
-    (*output_it) = OpencvMatToNDArray(crop_image);
+    (*output_it) = OutputMatToNDArray(crop_image, crop_task_input_ptr->out_);
   }
 };
 
@@ -84,14 +86,22 @@ class VisionCropOpCPU : public VisionBaseOpCPU {
   VisionCropOpCPU(const Any& session_info) : VisionBaseOpCPU(session_info) {
     task_manager_ptr = std::make_shared<TaskManager>(thread_pool_);
   }
-  RTValue process(
-      const List& images, const List& x, const List& y, const List& widths, const List& heights);
+  RTValue process(const List& images,
+                  const List& x,
+                  const List& y,
+                  const List& widths,
+                  const List& heights,
+                  const Any& out = None);
 
   TaskManagerPtr task_manager_ptr = nullptr;
 };
 
-RTValue VisionCropOpCPU::process(
-    const List& images, const List& x, const List& y, const List& widths, const List& heights) {
+RTValue VisionCropOpCPU::process(const List& images,
+                                 const List& x,
+                                 const List& y,
+                                 const List& widths,
+                                 const List& heights,
+                                 const Any& out) {
   cv::setNumThreads(0);
   std::vector<CropTaskInputPtr> crop_task_inputs;
   int batch_size = images.size();
@@ -100,6 +110,7 @@ RTValue VisionCropOpCPU::process(
   MXCHECK(batch_size == x.size() && batch_size == y.size() && batch_size == widths.size() &&
           batch_size == heights.size())
       << "The params sizes must be match in VisionCropOpCPU. ";
+  std::vector<NDArray> outputs = GetBatchOutputs(out, batch_size);
   // construct crop_task_input
   for (int i = 0; i < batch_size; ++i) {
     auto nd_view = images[i].As<NDArray>();
@@ -116,7 +127,8 @@ RTValue VisionCropOpCPU::process(
         << "Y + Height should be less than or equal to image height, but get : "
         << y_pointer + height << ", origin image height: " << src_shape[0];
     std::vector<int> parmes({x_pointer, y_pointer, width, height});
-    crop_task_inputs.emplace_back(std::make_shared<CropTaskInput>(nd_view, std::move(parmes)));
+    crop_task_inputs.emplace_back(std::make_shared<CropTaskInput>(
+        nd_view, std::move(parmes), outputs.empty() ? NDArray() : outputs[i]));
   }
 
   List nd_ret;
@@ -152,13 +164,15 @@ MATX_REGISTER_NATIVE_OBJECT(VisionCropOpCPU)
       return std::make_shared<VisionCropOpCPU>(args[0]);
     })
     .RegisterFunction("process", [](void* self, PyArgs args) -> RTValue {
-      MXCHECK_EQ(args.size(), 6) << "[BytedVisionCropOpCPU] Expect 6 arguments but get "
-                                 << args.size();
+      // args[5] is sync, the optional args[6] is out
+      MXCHECK(args.size() == 6 || args.size() == 7)
+          << "[BytedVisionCropOpCPU] Expect 6 or 7 arguments but get " << args.size();
       return reinterpret_cast<VisionCropOpCPU*>(self)->process(args[0].AsObjectView<List>().data(),
                                                                args[1].AsObjectView<List>().data(),
                                                                args[2].AsObjectView<List>().data(),
                                                                args[3].AsObjectView<List>().data(),
-                                                               args[4].AsObjectView<List>().data());
+                                                               args[4].AsObjectView<List>().data(),
+                                                               args.size() == 7 ? args[6] : Any());
     });
 
 }  // namespace ops
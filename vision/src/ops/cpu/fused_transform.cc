@@ -0,0 +1,417 @@
+// Copyright 2022 ByteDance Ltd. and/or its affiliates.
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#include "matxscript/runtime/container/list_ref.h"
+#include "matxscript/runtime/container/ndarray.h"
+#include "matxscript/runtime/logging.h"
+#include "matxscript/runtime/native_object_registry.h"
+#include "matxscript/runtime/py_args.h"
+#include "matxscript/runtime/runtime_value.h"
+#include "ops/base/vision_base_op.h"
+#include "utils/opencv_util.h"
+#include "utils/task_manager.h"
+#include "utils/type_helper.h"
+#include "vision_base_op_cpu.h"
+
+namespace byted_matx_vision {
+namespace ops {
+using namespace ::matxscript::runtime;
+
+namespace {
+
+// the crop, resize and crop of an image, an empty rect or size means the step is skipped
+struct FusedTransformParams {
+  cv::Rect pre_crop;
+  cv::Size size;
+  cv::Rect post_crop;
+};
+
+cv::Rect ListToRect(const Any& rect) {
+  auto view = rect.AsObjectView<List>();
+  const List& values = view.data();
+  if (values.size() == 0) {
+    return cv::Rect();
+  }
+  MXCHECK_EQ(values.size(), 4) << "crop params sizes must be equals to 4 in FusedTransformOp";
+  return cv::Rect(
+      values[0].As<int>(), values[1].As<int>(), values[2].As<int>(), values[3].As<int>());
+}
+
+cv::Size ListToSize(const Any& size) {
+  auto view = size.AsObjectView<List>();
+  const List& values = view.data();
+  if (values.size() == 0) {
+    return cv::Size();
+  }
+  MXCHECK_EQ(values.size(), 2) << "resize params sizes must be equals to 2 in FusedTransformOp";
+  // (h, w) like ResizeOp
+  return cv::Size(values[1].As<int>(), values[0].As<int>());
+}
+
+void CheckRect(const cv::Rect& rect, int height, int width) {
+  MXCHECK(0 <= rect.x && 0 < rect.width && rect.x + rect.width <= width && 0 <= rect.y &&
+          0 < rect.height && rect.y + rect.height <= height)
+      << "[FusedTransformOp] crop (" << rect.x << ", " << rect.y << ", " << rect.width << ", "
+      << rect.height << ") is out of the image (" << height << ", " << width << ")";
+}
+
+// the (h, w) of the output image
+cv::Size GetOutputSize(const FusedTransformParams& params, int height, int width) {
+  cv::Size size(width, height);
+  if (!params.pre_crop.empty()) {
+    CheckRect(params.pre_crop, size.height, size.width);
+    size = params.pre_crop.size();
+  }
+  if (!params.size.empty()) {
+    size = params.size;
+  }
+  if (!params.post_crop.empty()) {
+    CheckRect(params.post_crop, size.height, size.width);
+    size = params.post_crop.size();
+  }
+  return size;
+}
+
+// dst = src * alpha + beta per channel, cast and written in HWC or CHW in one pass
+template <typename SrcT, typename DstT>
+void NormalizeToLayout(
+    const cv::Mat& src, const float* alpha, const float* beta, bool chw, DstT* dst) {
+  const int rows = src.rows;
+  const int cols = src.cols;
+  const int channels = src.channels();
+  const int64_t plane = static_cast<int64_t>(rows) * cols;
+  for (int r = 0; r < rows; ++r) {
+    const SrcT* src_row = src.ptr<SrcT>(r);
+    if (chw) {
+      for (int c = 0; c < channels; ++c) {
+        DstT* dst_row = dst + c * plane + static_cast<int64_t>(r) * cols;
+        const float a = alpha[c];
+        const float b = beta[c];
+        for (int x = 0; x < cols; ++x) {
+          dst_row[x] = cv::saturate_cast<DstT>(src_row[x * channels + c] * a + b);
+        }
+      }
+    } else {
+      DstT* dst_row = dst + static_cast<int64_t>(r) * cols * channels;
+      for (int x = 0; x < cols * channels; x += channels) {
+        for (int c = 0; c < channels; ++c) {
+          dst_row[x + c] = cv::saturate_cast<DstT>(src_row[x + c] * alpha[c] + beta[c]);
+        }
+      }
+    }
+  }
+}
+
+template <typename SrcT>
+void NormalizeToLayout(
+    const cv::Mat& src, const float* alpha, const float* beta, bool chw, int dst_depth, void* dst) {
+  switch (dst_depth) {
+    case CV_8U: {
+      NormalizeToLayout<SrcT, uchar>(src, alpha, beta, chw, static_cast<uchar*>(dst));
+    } break;
+    case CV_32F: {
+      NormalizeToLayout<SrcT, float>(src, alpha, beta, chw, static_cast<float*>(dst));
+    } break;
+    case CV_64F: {
+      NormalizeToLayout<SrcT, double>(src, alpha, beta, chw, static_cast<double*>(dst));
+    } break;
+    default: {
+      MXTHROW << "[FusedTransformOp] unsupported output dtype: "
+              << DataType(OpencvDepthToDLDataType(dst_depth));
+    }
+  }
+}
+
+}  // namespace
+
+struct FusedTransformConfig {
+  std::vector<float> alpha;
+  std::vector<float> beta;
+  // -1 keeps the dtype of the input
+  int depth = -1;
+  bool chw = false;
+  int interp = cv::INTER_LINEAR;
+};
+
+struct FusedTransformTaskInput {
+  FusedTransformTaskInput(NDArray image,
+                          FusedTransformParams params,
+                          NDArray out,
+                          const FusedTransformConfig* config)
+      : image_(std::move(image)), params_(params), out_(std::move(out)), config_(config) {
+  }
+
+  NDArray image_;
+  FusedTransformParams params_;
+  // the view of the batch output, or undefined to allocate one
+  NDArray out_;
+  const FusedTransformConfig* config_;
+};
+
+using FusedTransformTaskInputPtr = std::shared_ptr<FusedTransformTaskInput>;
+
+class FusedTransformTask : public internal::LockBasedRunnable {
+ public:
+  FusedTransformTask(std::vector<FusedTransformTaskInputPtr>::iterator first_input,
+                     std::vector<NDArray>::iterator first_output,
+                     int len)
+      : input_it_(first_input), output_it_(first_output), len_(len) {
+  }
+
+ protected:
+  void RunImpl() override;
+
+ private:
+  std::vector<FusedTransformTaskInputPtr>::iterator input_it_;
+  std::vector<NDArray>::iterator output_it_;
+  int len_;
+};
+
+void FusedTransformTask::RunImpl() {
+  std::vector<FusedTransformTaskInputPtr>::iterator input_it = input_it_;
+  std::vector<NDArray>::iterator output_it = output_it_;
+  for (int i = 0; i < len_; ++i, ++input_it, ++output_it) {
+    const FusedTransformTaskInputPtr& input = *input_it;
+    const FusedTransformParams& params = input->params_;
+    const FusedTransformConfig* config = input->config_;
+
+    // the crops are views, only the resize writes an intermediate image
+    cv::Mat mat = NDArrayToOpencvMat(input->image_);
+    if (!params.pre_crop.empty()) {
+      mat = mat(params.pre_crop);
+    }
+    if (!params.size.empty() && params.size != mat.size()) {
+      cv::Mat resized;
+      cv::resize(mat, resized, params.size, 0, 0, config->interp);
+      mat = resized;
+    }
+    if (!params.post_crop.empty()) {
+      mat = mat(params.post_crop);
+    }
+
+    const int channels = mat.channels();
+    std::vector<float> alpha(config->alpha);
+    std::vector<float> beta(config->beta);
+    if (alpha.empty()) {
+      alpha.assign(channels, 1.0f);
+      beta.assign(channels, 0.0f);
+    } else if (alpha.size() == 1) {
+      // a scale without a per channel part, e.g. ConvertImageDtype
+      alpha.assign(channels, alpha[0]);
+      beta.assign(channels, beta[0]);
+    }
+    MXCHECK_EQ(alpha.size(), channels)
+        << "The channel of input should be equal to the channel of mean and std";
+    int depth = config->depth < 0 ? mat.depth() : config->depth;
+
+    NDArray out = input->out_;
+    if (out.defined()) {
+      MXCHECK_EQ(out.ElementSize(), int64_t(channels) * mat.rows * mat.cols)
+          << "[FusedTransformOp] the output image does not match its slice of the stack";
+    } else {
+      std::vector<int64_t> shape;
+      if (config->chw) {
+        shape = {channels, mat.rows, mat.cols};
+      } else if (channels == 1) {
+        shape = {mat.rows, mat.cols};
+      } else {
+        shape = {mat.rows, mat.cols, channels};
+      }
+      out = NDArray::Empty(shape, OpencvDepthToDLDataType(depth), {kDLCPU, 0});
+    }
+    void* dst = const_cast<void*>(out.RawData());
+    switch (mat.depth()) {
+      case CV_8U: {
+        NormalizeToLayout<uchar>(mat, alpha.data(), beta.data(), config->chw, depth, dst);
+      } break;
+      case CV_32F: {
+        NormalizeToLayout<float>(mat, alpha.data(), beta.data(), config->chw, depth, dst);
+      } break;
+      default: {
+        MXTHROW << "[FusedTransformOp] unsupported input dtype: "
+                << DataType(OpencvDepthToDLDataType(mat.depth()));
+      }
+    }
+    (*output_it) = std::move(out);
+  }
+}
+
+class VisionFusedTransformOpCPU : public VisionBaseOpCPU {
+ public:
+  VisionFusedTransformOpCPU(const Any& session_info,
+                            const List& alpha,
+                            const List& beta,
+                            const unicode_view& dtype,
+                            const unicode_view& layout,
+                            const unicode_view& interp)
+      : VisionBaseOpCPU(session_info) {
+    MXCHECK_EQ(alpha.size(), beta.size()) << "The size of alpha and beta should be equal";
+    for (size_t i = 0; i < alpha.size(); ++i) {
+      config_.alpha.push_back(alpha[i].As<float>());
+      config_.beta.push_back(beta[i].As<float>());
+    }
+    if (!dtype.empty()) {
+      config_.depth = UnicodeTypeToOpencvDepth(dtype);
+    }
+    if (layout == U"CHW") {
+      config_.chw = true;
+    } else if (layout != U"HWC") {
+      MXTHROW << "[FusedTransformOp] layout should be HWC or CHW, but get " << layout;
+    }
+    config_.interp = UnicodeToOpencvInterp(interp);
+    MXCHECK(config_.interp >= 0) << "Invalid interp type for FusedTransformOp: " << interp;
+    task_manager_ptr = std::make_shared<TaskManager>(thread_pool_);
+  }
+
+  RTValue process(const List& images,
+                  const List& pre_crop,
+                  const List& sizes,
+                  const List& post_crop,
+                  bool stack);
+
+ private:
+  FusedTransformConfig config_;
+  TaskManagerPtr task_manager_ptr = nullptr;
+};
+
+RTValue VisionFusedTransformOpCPU::process(const List& images,
+                                           const List& pre_crop,
+                                           const List& sizes,
+                                           const List& post_crop,
+                                           bool stack) {
+  cv::setNumThreads(0);
+  int batch_size = images.size();
+  MXCHECK((pre_crop.size() == 0 || pre_crop.size() == batch_size) &&
+          (sizes.size() == 0 || sizes.size() == batch_size) &&
+          (post_crop.size() == 0 || post_crop.size() == batch_size))
+      << "The params sizes must be match in FusedTransformOp";
+
+  std::vector<FusedTransformParams> params(batch_size);
+  std::vector<cv::Size> out_sizes(batch_size);
+  for (int i = 0; i < batch_size; ++i) {
+    if (pre_crop.size() > 0) {
+      params[i].pre_crop = ListToRect(pre_crop[i]);
+    }
+    if (sizes.size() > 0) {
+      params[i].size = ListToSize(sizes[i]);
+    }
+    if (post_crop.size() > 0) {
+      params[i].post_crop = ListToRect(post_crop[i]);
+    }
+    auto shape = images[i].As<NDArray>().Shape();
+    out_sizes[i] = GetOutputSize(params[i], shape[0], shape[1]);
+  }
+
+  // the images of a stack are written into their slices of the batch
+  NDArray batch;
+  int64_t batch_channels = 0;
+  if (stack && batch_size > 0) {
+    NDArray first = images[0].As<NDArray>();
+    auto shape = first.Shape();
+    int64_t channels = shape.size() == 2 ? 1 : shape[2];
+    batch_channels = channels;
+    cv::Size size = out_sizes[0];
+    for (int i = 1; i < batch_size; ++i) {
+      MXCHECK(out_sizes[i] == size) << "[FusedTransformOp] the output images of a stack should "
+                                       "have the same size";
+    }
+    int depth = config_.depth < 0 ? DLDataTypeToOpencvDepth(first.DataType()) : config_.depth;
+    std::vector<int64_t> batch_shape;
+    if (config_.chw) {
+      batch_shape = {batch_size, channels, size.height, size.width};
+    } else if (channels == 1) {
+      batch_shape = {batch_size, size.height, size.width};
+    } else {
+      batch_shape = {batch_size, size.height, size.width, channels};
+    }
+    batch = NDArray::Empty(batch_shape, OpencvDepthToDLDataType(depth), {kDLCPU, 0});
+  }
+
+  std::vector<FusedTransformTaskInputPtr> inputs;
+  inputs.reserve(batch_size);
+  for (int i = 0; i < batch_size; ++i) {
+    NDArray image = images[i].As<NDArray>();
+    NDArray out;
+    if (batch.defined()) {
+      MXCHECK(config_.depth >= 0 || image.DataType() == images[0].As<NDArray>().DataType())
+          << "[FusedTransformOp] the images of a stack should have the same dtype";
+      auto shape = image.Shape();
+      MXCHECK_EQ(shape.size() == 2 ? 1 : shape[2], batch_channels)
+          << "[FusedTransformOp] the images of a stack should have the same channels";
+      out = batch.get_item(i).As<NDArray>();
+    }
+    inputs.emplace_back(
+        std::make_shared<FusedTransformTaskInput>(std::move(image), params[i], out, &config_));
+  }
+
+  std::vector<NDArray> outputs =
+      task_manager_ptr->Execute<FusedTransformTask, FusedTransformTaskInputPtr, NDArray>(
+          inputs, batch_size);
+
+  if (stack) {
+    return batch;
+  }
+  List ret;
+  ret.reserve(batch_size);
+  for (int i = 0; i < batch_size; ++i) {
+    ret.append(std::move(outputs[i]));
+  }
+  return ret;
+}
+
+class VisionFusedTransformGeneralOp : public VisionBaseOp {
+ public:
+  VisionFusedTransformGeneralOp(PyArgs args) : VisionBaseOp(args, "VisionFusedTransformOp") {
+  }
+  ~VisionFusedTransformGeneralOp() = default;
+};
+
+MATX_REGISTER_NATIVE_OBJECT(VisionFusedTransformOpCPU)
+    .SetConstructor([](PyArgs args) -> std::shared_ptr<void> {
+      MXCHECK_EQ(args.size(), 6) << "[VisionFusedTransformOpCPU] Expect 6 arguments but get "
+                                 << args.size();
+      return std::make_shared<VisionFusedTransformOpCPU>(args[5],
+                                                         args[0].AsObjectView<List>().data(),
+                                                         args[1].AsObjectView<List>().data(),
+                                                         args[2].As<unicode_view>(),
+                                                         args[3].As<unicode_view>(),
+                                                         args[4].As<unicode_view>());
+    })
+    .RegisterFunction("process", [](void* self, PyArgs args) -> RTValue {
+      MXCHECK_EQ(args.size(), 6)
+          << "[VisionFusedTransformOpCPU][func: process] Expect 6 arguments but get "
+          << args.size();
+      return reinterpret_cast<VisionFusedTransformOpCPU*>(self)->process(
+          args[0].AsObjectView<List>().data(),
+          args[1].AsObjectView<List>().data(),
+          args[2].AsObjectView<List>().data(),
+          args[3].AsObjectView<List>().data(),
+          args[4].As<bool>());
+    });
+
+MATX_REGISTER_NATIVE_OBJECT(VisionFusedTransformGeneralOp)
+    .SetConstructor([](PyArgs args) -> std::shared_ptr<void> {
+      return std::make_shared<VisionFusedTransformGeneralOp>(args);
+    })
+    .RegisterFunction("process", [](void* self, PyArgs args) -> RTValue {
+      return reinterpret_cast<VisionFusedTransformGeneralOp*>(self)->process(args);
+    });
+
+}  // namespace ops
+}  // namespace byted_matx_vision
@@ -17,6 +17,7 @@
  * specific language governing permissions and limitations
  * under the License.
  */
+#include <algorithm>
 #include <exception>
 #include "matxscript/runtime/container/ndarray.h"
 #include "matxscript/runtime/container/unicode_view.h"
@@ -34,29 +35,156 @@ namespace ops {
 using namespace ::matxscript::runtime;
 
 namespace {
-using DecodeFunction = std::function<RTValue(const string_view& image_binary)>;
+// out is the preallocated output, or an undefined NDArray
+using DecodeFunction = std::function<RTValue(const string_view& image_binary, const NDArray& out)>;
 
-RTValue DecodeBGR(const string_view& image_binary) {
-  cv::Mat image;
+RTValue DecodeBGR(const string_view& image_binary, const NDArray& out) {
+  cv::Mat image = MakeOutputMat(out);
   cv::Mat opencv_input(1, image_binary.size(), CV_8UC1, (void*)image_binary.data());
-  image = cv::imdecode(opencv_input, cv::IMREAD_COLOR);
-  if (image.data == nullptr) {
+  // decode into image, which is not reallocated if out has the size of the image
+  if (cv::imdecode(opencv_input, cv::IMREAD_COLOR, &image).data == nullptr) {
     MXTHROW << "[Imdecode] decode image failed";
   }
   // convert to NDArray
-  return OpencvMatToNDArray(image);
+  return OutputMatToNDArray(image, out);
 }
 
 DecodeFunction GetDecodeCVTFunction(int code) {
-  return [code](const string_view& image_binary) -> NDArray {
-    cv::Mat image;
+  return [code](const string_view& image_binary, const NDArray& out) -> NDArray {
+    cv::Mat image = MakeOutputMat(out);
     cv::Mat opencv_input(1, image_binary.size(), CV_8UC1, (void*)image_binary.data());
     cv::Mat decode_image = cv::imdecode(opencv_input, cv::IMREAD_COLOR);
     if (decode_image.data == nullptr) {
       MXTHROW << "[Imdecode] decode image failed";
     }
     cv::cvtColor(decode_image, image, code);
-    return OpencvMatToNDArray(image);
+    return OutputMatToNDArray(image, out);
+  };
+}
+
+// read the frame size from the SOF marker of a jpeg without decoding it
+bool ReadJpegSize(const string_view& image_binary, int* height, int* width) {
+  auto* p = reinterpret_cast<const unsigned char*>(image_binary.data());
+  size_t size = image_binary.size();
+  if (size < 4 || p[0] != 0xFF || p[1] != 0xD8) {
+    return false;
+  }
+  size_t pos = 2;
+  while (pos + 4 <= size) {
+    if (p[pos] != 0xFF) {
+      return false;
+    }
+    unsigned char marker = p[pos + 1];
+    if (marker == 0xFF) {
+      // fill byte
+      ++pos;
+      continue;
+    }
+    if (marker == 0x01 || (marker >= 0xD0 && marker <= 0xD7)) {
+      // markers without a segment
+      pos += 2;
+      continue;
+    }
+    if (marker == 0xD9 || marker == 0xDA) {
+      // EOI or SOS before any frame header
+      return false;
+    }
+    // SOF0-SOF15 except DHT, JPG and DAC
+    if (marker >= 0xC0 && marker <= 0xCF && marker != 0xC4 && marker != 0xC8 && marker != 0xCC) {
+      if (pos + 9 > size) {
+        return false;
+      }
+      *height = (p[pos + 5] << 8) | p[pos + 6];
+      *width = (p[pos + 7] << 8) | p[pos + 8];
+      return *height > 0 && *width > 0;
+    }
+    size_t seg_len = (p[pos + 2] << 8) | p[pos + 3];
+    if (seg_len < 2) {
+      return false;
+    }
+    pos += 2 + seg_len;
+  }
+  return false;
+}
+
+enum class DecodeResizeMode { kDefault, kNotLarger, kNotSmaller };
+
+DecodeResizeMode UnicodeToDecodeResizeMode(const unicode_view& mode) {
+  if (mode == U"default") {
+    return DecodeResizeMode::kDefault;
+  } else if (mode == U"not_larger") {
+    return DecodeResizeMode::kNotLarger;
+  } else if (mode == U"not_smaller") {
+    return DecodeResizeMode::kNotSmaller;
+  }
+  MXTHROW << "[ImdecodeResizeOp]: unsupported resize mode: " << mode;
+  return DecodeResizeMode::kDefault;
+}
+
+// the output size of an image like ResizeOp
+cv::Size GetDecodeResizeSize(
+    int img_height, int img_width, int height, int width, DecodeResizeMode mode) {
+  double height_scale = static_cast<double>(height) / img_height;
+  double width_scale = static_cast<double>(width) / img_width;
+  if (mode == DecodeResizeMode::kNotLarger) {
+    if (width_scale < height_scale) {
+      height = static_cast<int>(img_height * width_scale);
+    } else if (width_scale > height_scale) {
+      width = static_cast<int>(img_width * height_scale);
+    }
+  } else if (mode == DecodeResizeMode::kNotSmaller) {
+    if (width_scale > height_scale) {
+      height = static_cast<int>(img_height * width_scale);
+    } else if (width_scale < height_scale) {
+      width = static_cast<int>(img_width * height_scale);
+    }
+  }
+  return cv::Size(std::max(width, 1), std::max(height, 1));
+}
+
+// the largest DCT scaling of libjpeg whose output still covers the target size,
+// the short side is compared with the long side of the target in case of an exif rotation
+int GetReducedDecodeFlags(int img_height, int img_width, const cv::Size& target) {
+  int short_side = std::min(img_height, img_width);
+  int long_target = std::max(target.height, target.width);
+  if ((short_side + 7) / 8 >= long_target) {
+    return cv::IMREAD_REDUCED_COLOR_8;
+  }
+  if ((short_side + 3) / 4 >= long_target) {
+    return cv::IMREAD_REDUCED_COLOR_4;
+  }
+  if ((short_side + 1) / 2 >= long_target) {
+    return cv::IMREAD_REDUCED_COLOR_2;
+  }
+  return cv::IMREAD_COLOR;
+}
+
+// code is a cvtColor code applied after the resize, or -1 to keep BGR
+DecodeFunction GetDecodeResizeFunction(
+    int code, int height, int width, DecodeResizeMode mode, int interp) {
+  return [=](const string_view& image_binary, const NDArray& out) -> NDArray {
+    int flags = cv::IMREAD_COLOR;
+    int img_height = 0;
+    int img_width = 0;
+    if (ReadJpegSize(image_binary, &img_height, &img_width)) {
+      flags = GetReducedDecodeFlags(
+          img_height, img_width, GetDecodeResizeSize(img_height, img_width, height, width, mode));
+    }
+    cv::Mat opencv_input(1, image_binary.size(), CV_8UC1, (void*)image_binary.data());
+    cv::Mat decode_image = cv::imdecode(opencv_input, flags);
+    if (decode_image.data == nullptr) {
+      MXTHROW << "[ImdecodeResize] decode image failed";
+    }
+    cv::Size size = GetDecodeResizeSize(decode_image.rows, decode_image.cols, height, width, mode);
+    cv::Mat image = MakeOutputMat(out);
+    if (code < 0) {
+      cv::resize(decode_image, image, size, 0, 0, interp);
+    } else {
+      cv::Mat resized_image;
+      cv::resize(decode_image, resized_image, size, 0, 0, interp);
+      cv::cvtColor(resized_image, image, code);
+    }
+    return OutputMatToNDArray(image, out);
   };
 }
 
@@ -67,22 +195,26 @@ class ImageDecodeTask : public internal::LockBasedRunnable {
                   List::iterator output_first,
                   int len,
                   int offset,
-                  List* flags = nullptr)
+                  List* flags = nullptr,
+                  const std::vector<NDArray>* outs = nullptr)
       : decode_func_(decode_func),
         input_it_(input_first),
         output_it_(output_first),
         len_(len),
         offset_(offset),
         flags_(flags),
+        outs_(outs),
         no_throw_(flags != nullptr) {
   }
 
-  static std::vector<internal::IRunnablePtr> build_tasks(DecodeFunction* decode_func_,
-                                                         List::iterator input_first,
-                                                         List::iterator output_first,
-                                                         int len,
-                                                         int thread_num,
-                                                         List* flags = nullptr);
+  static std::vector<internal::IRunnablePtr> build_tasks(
+      DecodeFunction* decode_func_,
+      List::iterator input_first,
+      List::iterator output_first,
+      int len,
+      int thread_num,
+      List* flags = nullptr,
+      const std::vector<NDArray>* outs = nullptr);
 
  protected:
   void RunImpl() override;
@@ -94,21 +226,23 @@ class ImageDecodeTask : public internal::LockBasedRunnable {
   int len_;
   int offset_;
   List* flags_;
+  const std::vector<NDArray>* outs_;
   const bool no_throw_;
 };
 
 void ImageDecodeTask::RunImpl() {
   for (int i = 0; i < len_; ++i) {
+    NDArray out = outs_ == nullptr ? NDArray() : (*outs_)[offset_ + i];
     if (no_throw_) {
       try {
-        *(output_it_ + i) = (*decode_func_)((input_it_ + i)->As<string_view>());
+        *(output_it_ + i) = (*decode_func_)((input_it_ + i)->As<string_view>(), out);
       } catch (...) {
         flags_->set_item(offset_ + i, false);
         continue;
       }
       flags_->set_item(offset_ + i, true);
     } else {
-      *(output_it_ + i) = (*decode_func_)((input_it_ + i)->As<string_view>());
+      *(output_it_ + i) = (*decode_func_)((input_it_ + i)->As<string_view>(), out);
     }
   }
 }
@@ -118,13 +252,14 @@ std::vector<internal::IRunnablePtr> ImageDecodeTask::build_tasks(DecodeFunction*
                                                                  List::iterator output_first,
                                                                  int len,
                                                                  int thread_num,
-                                                                 List* flags) {
+                                                                 List* flags,
+                                                                 const std::vector<NDArray>* outs) {
   std::vector<internal::IRunnablePtr> ret;
   if (len <= thread_num) {
     ret.reserve(len);
     for (int i = 0; i < len; ++i) {
       ret.emplace_back(std::make_shared<ImageDecodeTask>(
-          decode_func, input_first + i, output_first + i, 1, i, flags));
+          decode_func, input_first + i, output_first + i, 1, i, flags, outs));
     }
     return ret;
   }
@@ -135,14 +270,14 @@ std::vector<internal::IRunnablePtr> ImageDecodeTask::build_tasks(DecodeFunction*
   int curr_offset = 0;
   for (int i = 0; i < remainder; ++i) {
     ret.emplace_back(std::make_shared<ImageDecodeTask>(
-        decode_func, input_first, output_first, step + 1, curr_offset, flags));
+        decode_func, input_first, output_first, step + 1, curr_offset, flags, outs));
     input_first += step + 1;
     output_first += step + 1;
     curr_offset += step + 1;
   }
   for (int i = remainder; i < thread_num; ++i) {
     ret.emplace_back(std::make_shared<ImageDecodeTask>(
-        decode_func, input_first, output_first, step, curr_offset, flags));
+        decode_func, input_first, output_first, step, curr_offset, flags, outs));
     input_first += step;
     output_first += step;
     curr_offset += step;
@@ -168,17 +303,48 @@ class VisionImdecodeOpCPU : public VisionBaseOpCPU {
     }
   }
 
-  RTValue process(const List& images, List* flags = nullptr) {
+  // decode at a reduced resolution when the image is downscaled to (height, width) later
+  VisionImdecodeOpCPU(const Any& session_info,
+                      const unicode_view& fmt,
+                      int height,
+                      int width,
+                      const unicode_view& mode,
+                      const unicode_view& interp)
+      : VisionBaseOpCPU(session_info) {
+    MXCHECK(height > 0 && width > 0)
+        << "[ImdecodeResizeOp]: invalid size: (" << height << ", " << width << ")";
+    int interp_flags = UnicodeToOpencvInterp(interp);
+    MXCHECK(interp_flags >= 0) << "[ImdecodeResizeOp]: invalid interp type: " << interp;
+    int code = -1;
+    if (fmt == U"RGB") {
+      code = cv::COLOR_BGR2RGB;
+    } else if (fmt != U"BGR") {
+      MXTHROW << "[ImdecodeResizeOp]: unsupported format:" << fmt;
+    }
+    decode_func_ =
+        GetDecodeResizeFunction(code, height, width, UnicodeToDecodeResizeMode(mode), interp_flags);
+    if (thread_pool_ != nullptr) {
+      thread_num_ = thread_pool_->GetThreadsNum();
+    }
+  }
+
+  RTValue process(const List& images, List* flags = nullptr, const Any& out = None) {
     cv::setNumThreads(0);
     if (images.size() == 0) {
       return List();
     }
+    std::vector<NDArray> outs = GetBatchOutputs(out, images.size());
     if (flags != nullptr) {
       flags->resize(images.size());
     }
     List ret(images.size(), None);
-    auto tasks = ImageDecodeTask::build_tasks(
-        &decode_func_, images.begin(), ret.begin(), images.size(), thread_num_ + 1, flags);
+    auto tasks = ImageDecodeTask::build_tasks(&decode_func_,
+                                              images.begin(),
+                                              ret.begin(),
+                                              images.size(),
+                                              thread_num_ + 1,
+                                              flags,
+                                              outs.empty() ? nullptr : &outs);
 
     for (size_t i = 1; i < tasks.size(); ++i) {
       thread_pool_->Enqueue(tasks[i], 0);
@@ -214,10 +380,11 @@ MATX_REGISTER_NATIVE_OBJECT(VisionImdecodeOpCPU)
       return std::make_shared<VisionImdecodeOpCPU>(args[2], args[0].As<unicode_view>());
     })
     .RegisterFunction("process", [](void* self, PyArgs args) -> RTValue {
-      MXCHECK(args.size() == 2) << "[VsionImdecodeOpCPU][func: process] Expect 2 arguments but get "
-                                << args.size();
+      // args[1] is sync, the optional args[2] is out
+      MXCHECK(args.size() == 2 || args.size() == 3)
+          << "[VsionImdecodeOpCPU][func: process] Expect 2 or 3 arguments but get " << args.size();
       return reinterpret_cast<VisionImdecodeOpCPU*>(self)->process(
-          args[0].AsObjectView<List>().data());
+          args[0].AsObjectView<List>().data(), nullptr, args.size() == 3 ? args[2] : Any());
     });
 
 using VisionImdecodeNoExceptionOpCPU = VisionImdecodeOpCPU;
@@ -229,15 +396,36 @@ MATX_REGISTER_NATIVE_OBJECT(VisionImdecodeNoExceptionOpCPU)
       return std::make_shared<VisionImdecodeNoExceptionOpCPU>(args[2], args[0].As<unicode_view>());
     })
     .RegisterFunction("process", [](void* self, PyArgs args) -> RTValue {
-      MXCHECK(args.size() == 2)
-          << "[VisionImdecodeNoExceptionOpCPU][func: process] Expect 2 arguments but get "
+      MXCHECK(args.size() == 2 || args.size() == 3)
+          << "[VisionImdecodeNoExceptionOpCPU][func: process] Expect 2 or 3 arguments but get "
           << args.size();
       List flags;
       auto ret = reinterpret_cast<VisionImdecodeNoExceptionOpCPU*>(self)->process(
-          args[0].AsObjectView<List>().data(), &flags);
+          args[0].AsObjectView<List>().data(), &flags, args.size() == 3 ? args[2] : Any());
       return Tuple({ret, flags});
     });
 
+using VisionImdecodeResizeOpCPU = VisionImdecodeOpCPU;
+MATX_REGISTER_NATIVE_OBJECT(VisionImdecodeResizeOpCPU)
+    .SetConstructor([](PyArgs args) -> std::shared_ptr<void> {
+      MXCHECK(args.size() == 6) << "[VisionImdecodeResizeOpCPU] Expect 6 arguments but get "
+                                << args.size();
+      return std::make_shared<VisionImdecodeResizeOpCPU>(args[5],
+                                                         args[0].As<unicode_view>(),
+                                                         args[1].As<int>(),
+                                                         args[2].As<int>(),
+                                                         args[3].As<unicode_view>(),
+                                                         args[4].As<unicode_view>());
+    })
+    .RegisterFunction("process", [](void* self, PyArgs args) -> RTValue {
+      // args[1] is sync, the optional args[2] is out
+      MXCHECK(args.size() == 2 || args.size() == 3)
+          << "[VisionImdecodeResizeOpCPU][func: process] Expect 2 or 3 arguments but get "
+          << args.size();
+      return reinterpret_cast<VisionImdecodeResizeOpCPU*>(self)->process(
+          args[0].AsObjectView<List>().data(), nullptr, args.size() == 3 ? args[2] : Any());
+    });
+
 class VisionImdecodeGeneralOp : public VisionBaseOp {
  public:
   VisionImdecodeGeneralOp(PyArgs args) : VisionBaseOp(args, "VisionImdecodeOp") {
@@ -245,6 +433,13 @@ class VisionImdecodeGeneralOp : public VisionBaseOp {
   ~VisionImdecodeGeneralOp() = default;
 };
 
+class VisionImdecodeResizeGeneralOp : public VisionBaseOp {
+ public:
+  VisionImdecodeResizeGeneralOp(PyArgs args) : VisionBaseOp(args, "VisionImdecodeResizeOp") {
+  }
+  ~VisionImdecodeResizeGeneralOp() = default;
+};
+
 class VisionImdecodeRandomCropGeneralOp : public VisionBaseOp {
  public:
   VisionImdecodeRandomCropGeneralOp(PyArgs args)
@@ -277,6 +472,14 @@ MATX_REGISTER_NATIVE_OBJECT(VisionImdecodeGeneralOp)
       return reinterpret_cast<VisionImdecodeGeneralOp*>(self)->process(args);
     });
 
+MATX_REGISTER_NATIVE_OBJECT(VisionImdecodeResizeGeneralOp)
+    .SetConstructor([](PyArgs args) -> std::shared_ptr<void> {
+      return std::make_shared<VisionImdecodeResizeGeneralOp>(args);
+    })
+    .RegisterFunction("process", [](void* self, PyArgs args) -> RTValue {
+      return reinterpret_cast<VisionImdecodeResizeGeneralOp*>(self)->process(args);
+    });
+
 MATX_REGISTER_NATIVE_OBJECT(VisionImdecodeRandomCropGeneralOp)
     .SetConstructor([](PyArgs args) -> std::shared_ptr<void> {
       return std::make_shared<VisionImdecodeRandomCropGeneralOp>(args);
@@ -34,14 +34,19 @@ namespace ops {
 using namespace ::matxscript::runtime;
 
 struct NormalizeTaskInput {
-  NormalizeTaskInput(NDArray image, std::vector<float>& alpha, std::vector<float>& beta, int dtype)
-      : image_(std::move(image)), alpha_(alpha), beta_(beta), dtype_(dtype) {
+  NormalizeTaskInput(NDArray image,
+                     std::vector<float>& alpha,
+                     std::vector<float>& beta,
+                     int dtype,
+                     NDArray out = NDArray())
+      : image_(std::move(image)), alpha_(alpha), beta_(beta), dtype_(dtype), out_(std::move(out)) {
   }
 
   NDArray image_;
   std::vector<float> alpha_;
   std::vector<float> beta_;
   int dtype_;
+  NDArray out_;
 };
 
 using NormalizeTaskInputPtr = std::shared_ptr<NormalizeTaskInput>;
@@ -63,6 +68,26 @@ class NormalizeTask : public internal::LockBasedRunnable {
   int len_;
 };
 
+// dst = src * alpha + beta per channel in one pass, without the split and merge
+template <typename T>
+void NormalizeToFloat(const cv::Mat& src,
+                      cv::Mat& dst,
+                      const std::vector<float>& alpha,
+                      const std::vector<float>& beta) {
+  const int channels = src.channels();
+  for (int r = 0; r < src.rows; ++r) {
+    const T* src_row = src.ptr<T>(r);
+    float* dst_row = dst.ptr<float>(r);
+    for (int c = 0; c < src.cols; ++c) {
+      for (int k = 0; k < channels; ++k) {
+        dst_row[k] = src_row[k] * alpha[k] + beta[k];
+      }
+      src_row += channels;
+      dst_row += channels;
+    }
+  }
+}
+
 void NormalizeTask::RunImpl() {
   std::vector<NormalizeTaskInputPtr>::iterator input_it = input_it_;
   std::vector<NDArray>::iterator output_it = output_it_;
@@ -74,19 +99,28 @@ void NormalizeTask::RunImpl() {
     std::vector<float> beta_ = normalize_task_input_ptr->beta_;
     int dtype_ = normalize_task_input_ptr->dtype_;
     int channel_size_ = alpha_.size();
-    cv::Mat mat_dst;
+    cv::Mat mat_dst = MakeOutputMat(normalize_task_input_ptr->out_);
     const int channels = mat_src.channels();
     if (channels != channel_size_) {
       MXTHROW << "The channel of input should be equal to the channel of mean and std";
     }
-    std::vector<cv::Mat> bgrChannels(channels);
-    cv::split(mat_src, bgrChannels);
-    for (auto c = 0; c < channels; c++) {
-      bgrChannels[c].convertTo(bgrChannels[c], CV_MAKETYPE(dtype_, 1), alpha_[c], beta_[c]);
+    if (dtype_ == CV_32F && (mat_src.depth() == CV_8U || mat_src.depth() == CV_32F)) {
+      mat_dst.create(mat_src.rows, mat_src.cols, CV_MAKETYPE(CV_32F, channels));
+      if (mat_src.depth() == CV_8U) {
+        NormalizeToFloat<uchar>(mat_src, mat_dst, alpha_, beta_);
+      } else {
+        NormalizeToFloat<float>(mat_src, mat_dst, alpha_, beta_);
+      }
+    } else {
+      std::vector<cv::Mat> bgrChannels(channels);
+      cv::split(mat_src, bgrChannels);
+      for (auto c = 0; c < channels; c++) {
+        bgrChannels[c].convertTo(bgrChannels[c], CV_MAKETYPE(dtype_, 1), alpha_[c], beta_[c]);
+      }
+      cv::merge(bgrChannels, mat_dst);
     }
-    cv::merge(bgrChannels, mat_dst);
 
-    (*output_it) = OpencvMatToNDArray(mat_dst);
+    (*output_it) = OutputMatToNDArray(mat_dst, normalize_task_input_ptr->out_);
   }
 };
 
@@ -100,7 +134,7 @@ class VisionNormalizeOpCPU : VisionBaseOpCPU {
                        const unicode_view& out_fmt);
   ~VisionNormalizeOpCPU() = default;
 
-  RTValue process(const List& image_ndarray);
+  RTValue process(const List& image_ndarray, const Any& out = None);
 
  private:
   float global_scale_;
@@ -139,15 +173,16 @@ VisionNormalizeOpCPU::VisionNormalizeOpCPU(const Any& session_info,
   cv_depth_type = UnicodeTypeToOpencvDepth(rtype);
 }
 
-RTValue VisionNormalizeOpCPU::process(const List& input) {
+RTValue VisionNormalizeOpCPU::process(const List& input, const Any& out) {
   int batch_size = input.size();
+  std::vector<NDArray> outputs = GetBatchOutputs(out, batch_size);
   // construct norm_task_input
   std::vector<NormalizeTaskInputPtr> norm_task_inputs;
   norm_task_inputs.reserve(batch_size);
   for (int i = 0; i < batch_size; ++i) {
     auto nd_view = input[i].As<NDArray>();
-    norm_task_inputs.emplace_back(
-        std::make_shared<NormalizeTaskInput>(nd_view, alpha_, beta_, cv_depth_type));
+    norm_task_inputs.emplace_back(std::make_shared<NormalizeTaskInput>(
+        nd_view, alpha_, beta_, cv_depth_type, outputs.empty() ? NDArray() : outputs[i]));
   }
   List ret;
   std::vector<NDArray> normalize_task_outputs =
@@ -178,14 +213,15 @@ MATX_REGISTER_NATIVE_OBJECT(VisionNormalizeOpCPU)
                                                     args[3].As<float>(),
                                                     args[4].As<unicode_view>());
     })
-    .RegisterFunction("process",
-                      [](void* self, PyArgs args) -> RTValue {
-                        MXCHECK_EQ(args.size(), 2)
-                            << "[VisionNormalizeOpCPU][func: process] Expect 2 arguments but get "
-                            << args.size();
-                        return reinterpret_cast<VisionNormalizeOpCPU*>(self)->process(
-                            args[0].AsObjectView<List>().data());
-                      });
+    .RegisterFunction("process", [](void* self, PyArgs args) -> RTValue {
+      // args[1] is sync, the optional args[2] is out
+      MXCHECK(args.size() == 2 || args.size() == 3)
+          << "[VisionNormalizeOpCPU][func: process] Expect 2 or 3 arguments but "
+             "get "
+          << args.size();
+      return reinterpret_cast<VisionNormalizeOpCPU*>(self)->process(
+          args[0].AsObjectView<List>().data(), args.size() == 3 ? args[2] : Any());
+    });
 
 MATX_REGISTER_NATIVE_OBJECT(VisionNormalizeGeneralOp)
     .SetConstructor([](PyArgs args) -> std::shared_ptr<void> {
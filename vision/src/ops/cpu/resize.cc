@@ -34,14 +34,19 @@ namespace ops {
 using namespace ::matxscript::runtime;
 
 struct ResizeTaskInput {
-  ResizeTaskInput(NDArray image, int height, int width, int interp)
-      : image_(std::move(image)), height_(height), width_(width), interp_(interp) {
+  ResizeTaskInput(NDArray image, int height, int width, int interp, NDArray out = NDArray())
+      : image_(std::move(image)),
+        height_(height),
+        width_(width),
+        interp_(interp),
+        out_(std::move(out)) {
   }
 
   NDArray image_;
   int height_;
   int width_;
   int interp_;
+  NDArray out_;
 };
 
 using ResizeTaskInputPtr = std::shared_ptr<ResizeTaskInput>;
@@ -73,9 +78,9 @@ void ResizeTask::RunImpl() {
     int height = resize_task_input_ptr->height_;
     int width = resize_task_input_ptr->width_;
     int interp_ = resize_task_input_ptr->interp_;
-    cv::Mat mat_dst;
+    cv::Mat mat_dst = MakeOutputMat(resize_task_input_ptr->out_);
     cv::resize(mat_src, mat_dst, cv::Size(width, height), 1.0, 1.0, interp_);
-    (*output_it) = OpencvMatToNDArray(mat_dst);
+    (*output_it) = OutputMatToNDArray(mat_dst, resize_task_input_ptr->out_);
   }
 };
 
@@ -89,7 +94,8 @@ class VisionResizeOpCPU : VisionBaseOpCPU {
   RTValue process(const List& images,
                   const List& height,
                   const List& width,
-                  const unicode_view& interp);
+                  const unicode_view& interp,
+                  const Any& out = None);
 
  private:
   TaskManagerPtr task_manager_ptr = nullptr;
@@ -98,7 +104,8 @@ class VisionResizeOpCPU : VisionBaseOpCPU {
 RTValue VisionResizeOpCPU::process(const List& images,
                                    const List& desired_height,
                                    const List& desired_width,
-                                   const unicode_view& interpolation) {
+                                   const unicode_view& interpolation,
+                                   const Any& out) {
   int batch_size = images.size();
   MXCHECK_EQ(desired_height.size(), batch_size)
       << "argument desired_height should be equal to batch size";
@@ -109,6 +116,8 @@ RTValue VisionResizeOpCPU::process(const List& images,
     MXCHECK(false) << "Invalid interp type for CPU resize op: " << interpolation;
   }
 
+  std::vector<NDArray> outputs = GetBatchOutputs(out, batch_size);
+
   // construct resize_task_input
   std::vector<ResizeTaskInputPtr> resize_task_inputs;
   resize_task_inputs.reserve(batch_size);
@@ -116,8 +125,8 @@ RTValue VisionResizeOpCPU::process(const List& images,
     auto nd_view = images[i].As<NDArray>();
     int cur_height = desired_height[i].As<int>();
     int cur_width = desired_width[i].As<int>();
-    resize_task_inputs.emplace_back(
-        std::make_shared<ResizeTaskInput>(nd_view, cur_height, cur_width, interp_flags));
+    resize_task_inputs.emplace_back(std::make_shared<ResizeTaskInput>(
+        nd_view, cur_height, cur_width, interp_flags, outputs.empty() ? NDArray() : outputs[i]));
   }
   List ret;
 
@@ -144,13 +153,15 @@ MATX_REGISTER_NATIVE_OBJECT(VisionResizeOpCPU)
       return std::make_shared<VisionResizeOpCPU>(args[0]);
     })
     .RegisterFunction("process", [](void* self, PyArgs args) -> RTValue {
-      MXCHECK_EQ(args.size(), 5) << "[VisionResizeOpCPU][func: process] Expect 5 arguments but get "
-                                 << args.size();
+      // args[4] is sync, the optional args[5] is out
+      MXCHECK(args.size() == 5 || args.size() == 6)
+          << "[VisionResizeOpCPU][func: process] Expect 5 or 6 arguments but get " << args.size();
       return reinterpret_cast<VisionResizeOpCPU*>(self)->process(
           args[0].AsObjectView<List>().data(),
           args[1].AsObjectView<List>().data(),
           args[2].AsObjectView<List>().data(),
-          args[3].As<unicode_view>());
+          args[3].As<unicode_view>(),
+          args.size() == 6 ? args[5] : Any());
     });
 
 MATX_REGISTER_NATIVE_OBJECT(VisionResizeGeneralOp)
@@ -30,16 +30,133 @@
 namespace byted_matx_vision {
 namespace ops {
 
+using matxscript::runtime::Any;
 using matxscript::runtime::DataType;
 using matxscript::runtime::DeviceAPI;
 using matxscript::runtime::List;
 using matxscript::runtime::NDArray;
 using matxscript::runtime::unicode_view;
 
+namespace {
+
+#if CV_VERSION_MAJOR >= 4
+using MatAccessFlag = cv::AccessFlag;
+#else
+using MatAccessFlag = int;
+#endif
+
+class NDArrayMatAllocator : public cv::MatAllocator {
+ public:
+  cv::UMatData* allocate(int dims,
+                         const int* sizes,
+                         int type,
+                         void* data0,
+                         size_t* step,
+                         MatAccessFlag flags,
+                         cv::UMatUsageFlags usage_flags) const override {
+    if (data0 != nullptr || dims != 2) {
+      return cv::Mat::getStdAllocator()->allocate(
+          dims, sizes, type, data0, step, flags, usage_flags);
+    }
+    int channels = CV_MAT_CN(type);
+    std::vector<int64_t> shape{sizes[0], sizes[1]};
+    if (channels > 1) {
+      shape.push_back(channels);
+    }
+    auto* owner = new NDArray(
+        NDArray::Empty(shape, OpencvDepthToDLDataType(CV_MAT_DEPTH(type)), {kDLCPU, 0}));
+    step[1] = CV_ELEM_SIZE(type);
+    step[0] = step[1] * sizes[1];
+    cv::UMatData* u = new cv::UMatData(this);
+    u->data = u->origdata = static_cast<uchar*>(const_cast<void*>(owner->RawData()));
+    u->size = step[0] * sizes[0];
+    u->userdata = owner;
+    return u;
+  }
+
+  bool allocate(cv::UMatData* u,
+                MatAccessFlag access_flags,
+                cv::UMatUsageFlags usage_flags) const override {
+    return u != nullptr;
+  }
+
+  void deallocate(cv::UMatData* u) const override {
+    if (u == nullptr) {
+      return;
+    }
+    MXCHECK(u->urefcount == 0 && u->refcount == 0);
+    delete static_cast<NDArray*>(u->userdata);
+    delete u;
+  }
+};
+
+// the NDArray which owns the data of mat if it is a whole buffer of the NDArray allocator
+const NDArray* GetMatOwner(const cv::Mat& mat) {
+  if (mat.u == nullptr || mat.u->currAllocator != GetNDArrayMatAllocator() ||
+      mat.u->userdata == nullptr || mat.data != mat.u->data || !mat.isContinuous()) {
+    return nullptr;
+  }
+  return static_cast<const NDArray*>(mat.u->userdata);
+}
+
+}  // namespace
+
+cv::MatAllocator* GetNDArrayMatAllocator() {
+  static NDArrayMatAllocator allocator;
+  return &allocator;
+}
+
+std::vector<NDArray> GetBatchOutputs(const Any& out, int64_t batch_size) {
+  std::vector<NDArray> outputs;
+  if (out.is_nullptr()) {
+    return outputs;
+  }
+  outputs.reserve(batch_size);
+  if (out.IsObjectRef<List>()) {
+    auto out_list = out.AsObjectViewNoCheck<List>();
+    MXCHECK_EQ(out_list.data().size(), batch_size)
+        << "the size of out should be equal to batch size";
+    for (auto& item : out_list.data()) {
+      outputs.emplace_back(item.As<NDArray>());
+    }
+  } else {
+    NDArray batch = out.As<NDArray>();
+    MXCHECK(batch->ndim > 0 && batch->shape[0] == batch_size)
+        << "the first dim of out should be equal to batch size";
+    for (int64_t i = 0; i < batch_size; ++i) {
+      outputs.emplace_back(batch.get_item(i).As<NDArray>());
+    }
+  }
+  for (auto& output : outputs) {
+    MXCHECK(output->device.device_type == kDLCPU) << "out should be on cpu";
+    MXCHECK(output.IsContiguous()) << "out should be contiguous";
+  }
+  return outputs;
+}
+
+cv::Mat MakeOutputMat(const NDArray& out) {
+  if (out.defined()) {
+    return NDArrayToOpencvMat(out);
+  }
+  cv::Mat mat;
+  mat.allocator = GetNDArrayMatAllocator();
+  return mat;
+}
+
+NDArray OutputMatToNDArray(const cv::Mat& mat, const NDArray& out) {
+  if (!out.defined()) {
+    return OpencvMatToNDArray(mat);
+  }
+  MXCHECK(mat.data == out.RawData())
+      << "the output shape or dtype does not match out, expect shape: [" << mat.rows << ", "
+      << mat.cols << ", " << mat.channels()
+      << "], dtype: " << DataType(OpencvDepthToDLDataType(mat.depth()));
+  return out;
+}
+
 // only support NDArray in HWC format
 cv::Mat NDArrayToOpencvMat(const NDArray& ndarray) {
   List shape = ndarray.ShapeList();
-  auto* data_ref = ndarray.operator->();
   int64_t height = shape[0].As<int64_t>();
   int64_t width = shape[1].As<int64_t>();
   int64_t dim = shape.size();
@@ -56,7 +173,8 @@ cv::Mat NDArrayToOpencvMat(const NDArray& ndarray) {
   if (!ndarray.IsContiguous()) {
     MXLOG(FATAL) << "Don't implements not contiguous NDArray to OpencvMat!";
   }
-  cv::Mat matSrc = cv::Mat(cv::Size(width, height), opencv_type, (void*)data_ref->data);
+  cv::Mat matSrc =
+      cv::Mat(cv::Size(width, height), opencv_type, const_cast<void*>(ndarray.RawData()));
   return matSrc;
 }
 
@@ -78,6 +196,12 @@ NDArray OpencvMatToNDArray(const cv::Mat& mat,
   }
 
   DataType dtype(OpencvDepthToDLDataType(opencv_depth));
+  if (ctx.device_type == kDLCPU) {
+    const NDArray* owner = GetMatOwner(mat);
+    if (owner != nullptr && owner->Shape() == ndarry_shape && owner->DataType() == dtype) {
+      return *owner;
+    }
+  }
   NDArray dst_arr = NDArray::Empty(ndarry_shape, dtype, ctx);
   DLTensor to;
   to.data = const_cast<void*>(dst_arr.RawData());
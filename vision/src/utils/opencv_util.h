@@ -19,10 +19,13 @@
  */
 #pragma once
 
+#include <vector>
+
 #include <opencv2/opencv.hpp>
 
 #include <matxscript/runtime/container/ndarray.h>
 #include <matxscript/runtime/dlpack.h>
+#include <matxscript/runtime/runtime_value.h>
 #include "matxscript/runtime/c_runtime_api.h"
 
 namespace byted_matx_vision {
@@ -33,6 +36,21 @@ matxscript::runtime::NDArray OpencvMatToNDArray(const cv::Mat& mat,
                                                 DLDevice ctx = {DLDeviceType::kDLCPU, 0},
                                                 MATXScriptStreamHandle stream = nullptr,
                                                 bool sync = true);
+
+// the buffers of a mat created by this allocator are NDArrays, OpencvMatToNDArray returns them
+// on cpu without a copy
+cv::MatAllocator* GetNDArrayMatAllocator();
+
+// out is None, a list of NDArray or a batch NDArray whose items are the outputs,
+// return an empty vector for None
+std::vector<matxscript::runtime::NDArray> GetBatchOutputs(const matxscript::runtime::Any& out,
+                                                          int64_t batch_size);
+// a mat on the out buffer, or an empty mat using the NDArray allocator if out is not defined
+cv::Mat MakeOutputMat(const matxscript::runtime::NDArray& out);
+// check that the op wrote into out instead of reallocating the mat
+matxscript::runtime::NDArray OutputMatToNDArray(const cv::Mat& mat,
+                                                const matxscript::runtime::NDArray& out);
+
 int UnicodeToOpencvInterp(matxscript::runtime::unicode_view opencv_interp);
 int UnicodeToOpencvColorCode(matxscript::runtime::unicode_view color_code);
 